@@ -0,0 +1,58 @@
+"""Positions per second of the 49 plane AlphaGo encoder.
+
+Positions are taken from the middle of random self-play games. The
+second pass encodes the same positions again, so every ladder read
+comes from the encoder's cache.
+
+    python benchmarks/alphago_encoder.py --positions 200
+"""
+import argparse
+import random
+import time
+
+from dlgo import goboard_array
+from dlgo import goboard_fast
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.encoders.alphago import AlphaGoEncoder
+
+
+def sample_positions(goboard, num_positions, skip_moves):
+    bot = FastRandomBot()
+    positions = []
+    while len(positions) < num_positions:
+        game = goboard.GameState.new_game(19)
+        num_moves = 0
+        while not game.is_over() and len(positions) < num_positions:
+            if num_moves >= skip_moves:
+                positions.append(game)
+            game = game.apply_move(bot.select_move(game))
+            num_moves += 1
+    return positions
+
+
+def positions_per_second(encoder, positions):
+    start = time.time()
+    for game_state in positions:
+        encoder.encode(game_state)
+    return len(positions) / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--positions', type=int, default=200)
+    parser.add_argument('--skip-moves', type=int, default=50)
+    args = parser.parse_args()
+
+    for goboard in (goboard_fast, goboard_array):
+        random.seed(0)
+        positions = sample_positions(
+            goboard, args.positions, args.skip_moves)
+        encoder = AlphaGoEncoder()
+        first = positions_per_second(encoder, positions)
+        cached = positions_per_second(encoder, positions)
+        print('%-13s %6.1f positions/s, %6.1f positions/s cached' % (
+            goboard.__name__.split('.')[-1], first, cached))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Trainer idle time of train.py's chunk preparation, old and new.
+
+train.py used to start one process per chunk for a round of `workers`
+chunks, wait for the whole round and receive float64 X and one-hot Y
+through a queue. ChunkPipeline keeps its workers, prepares chunks ahead
+into shared memory and hands each over as soon as it is ready. The
+trainer is simulated by sleeping --fit seconds per chunk.
+
+    python benchmarks/chunk_pipeline.py --games 200 --chunks 8 --workers 2
+"""
+import argparse
+import multiprocessing
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from dlgo.corpora import ChunkPipeline, build_index, encode_chunk
+from dlgo.encoders.betago import BetaGoEncoder
+from process_zip import write_archive
+
+
+def _old_worker(worker_idx, chunk_number, corpus_index, output_q):
+    encoder = BetaGoEncoder((19, 19))
+    size = corpus_index.chunk_size
+    features = np.zeros((size,) + encoder.shape(), dtype=np.float32)
+    labels = np.zeros(size, dtype=np.int16)
+    n = encode_chunk(corpus_index.get_chunk(chunk_number), encoder,
+                     features, labels)
+    X = features[:n].astype(np.float64)
+    Y = np.zeros((n, 19 * 19))
+    Y[np.arange(n), labels[:n]] = 1
+    output_q.put((worker_idx, X, Y))
+
+
+def old_rounds(corpus_index, num_workers, num_chunks):
+    """Yield chunks the way the old prepare_training_data did."""
+    next_chunk = 0
+    while True:
+        q = multiprocessing.Queue()
+        workers = []
+        for i in range(num_workers):
+            workers.append(multiprocessing.Process(
+                target=_old_worker, args=(i, next_chunk, corpus_index, q)))
+            next_chunk = (next_chunk + 1) % corpus_index.num_chunks
+        for worker in workers:
+            worker.start()
+        results = sorted(q.get() for _ in workers)
+        for worker in workers:
+            worker.join()
+        for _, X, Y in results:
+            yield X, Y
+
+
+def new_pipeline(corpus_index, num_workers, num_chunks):
+    with ChunkPipeline(corpus_index, BetaGoEncoder((19, 19)),
+                       num_workers) as pipeline:
+        for _, X, labels, _ in pipeline.chunks():
+            yield X, labels
+
+
+def trainer_idle(chunks, num_chunks, fit):
+    idle = 0.0
+    for _ in range(num_chunks):
+        start = time.time()
+        next(chunks)
+        idle += time.time() - start
+        time.sleep(fit)
+    chunks.close()
+    return idle
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--moves', type=int, default=200)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--chunks', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--fit', type=float, default=1.0,
+                        help='Simulated training seconds per chunk.')
+    args = parser.parse_args()
+
+    random.seed(0)
+    data_dir = tempfile.mkdtemp()
+    try:
+        path = data_dir + '/KGS-bench.tar.gz'
+        write_archive(path, args.games, args.moves)
+        corpus_index = build_index(path, args.chunk_size)
+        for name, chunks in (('old rounds', old_rounds),
+                             ('pipeline', new_pipeline)):
+            start = time.time()
+            idle = trainer_idle(
+                chunks(corpus_index, args.workers, args.chunks),
+                args.chunks, args.fit)
+            print('%-11s trainer idle %6.2f s of %6.2f s' % (
+                name + ':', idle, time.time() - start))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
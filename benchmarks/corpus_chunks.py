@@ -0,0 +1,74 @@
+"""Time CorpusIndex.get_chunk for the first and the last chunk of a
+corpus.
+
+A chunk used to be read by extracting the whole tarball to a temporary
+directory and reading every SGF in it, before replaying the games from
+the chunk's starting file. The index now records where every game's
+SGF data is, and a chunk seeks straight to its own games. That work is
+timed separately below as "extract all".
+
+    python benchmarks/corpus_chunks.py --games 400
+"""
+import argparse
+import gzip
+import os
+import random
+import shutil
+import tarfile
+import tempfile
+import time
+
+from dlgo.corpora import build_index
+from process_zip import write_archive
+
+
+def time_chunk(index, chunk_number):
+    start = time.time()
+    for _ in index.get_chunk(chunk_number):
+        pass
+    return time.time() - start
+
+
+def extract_all(path):
+    start = time.time()
+    temp_dir = tempfile.mkdtemp()
+    try:
+        with tarfile.open(path) as archive:
+            archive.extractall(temp_dir)
+            for name in archive.getnames():
+                full_path = os.path.join(temp_dir, name)
+                if os.path.isfile(full_path):
+                    open(full_path, 'rb').read()
+    finally:
+        shutil.rmtree(temp_dir)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=400)
+    parser.add_argument('--moves', type=int, default=200)
+    parser.add_argument('--chunk-size', type=int, default=400)
+    args = parser.parse_args()
+
+    random.seed(0)
+    data_dir = tempfile.mkdtemp()
+    try:
+        gz_path = data_dir + '/KGS-bench.tar.gz'
+        tar_path = data_dir + '/KGS-bench.tar'
+        write_archive(gz_path, args.games, args.moves)
+        with gzip.open(gz_path) as source, open(tar_path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        for path in (tar_path, gz_path):
+            index = build_index(path, args.chunk_size)
+            last = index.num_chunks - 1
+            print('%s, %d chunks:' % (os.path.basename(path), index.num_chunks))
+            print('  first chunk:  %6.2f s' % time_chunk(index, 0))
+            print('  last chunk:   %6.2f s' % time_chunk(index, last))
+            print('  extract all:  %6.2f s' % extract_all(path))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Examples per second of replaying corpus games into encoder input,
+with a deep copied board per position and with position snapshots.
+
+CorpusIndex used to yield copy.deepcopy(board) of a goboard_fast board
+for every position, which the trainer wrapped in a GameState to encode.
+It now yields a PositionSnapshot of a goboard_array board. Both are
+timed with the betago encoder on the same games, and the size of what
+is kept per position is compared as pickled bytes.
+
+    python benchmarks/corpus_snapshots.py --games 50
+"""
+import argparse
+import copy
+import pickle
+import random
+import time
+
+import numpy as np
+
+from dlgo import goboard_array, goboard_fast
+from dlgo.encoders.betago import BetaGoEncoder
+from dlgo.gosgf import read_game_record
+from dlgo.gotypes import Player, Point
+from dlgo.snapshot import PositionSnapshot
+from process_zip import random_sgf
+
+PLAYERS = {'b': Player.black, 'w': Player.white}
+
+
+def deepcopy_examples(record):
+    board = goboard_fast.Board(19, 19)
+    for color, move in record.moves:
+        if move is not None:
+            yield copy.deepcopy(board), color
+            board.place_stone(PLAYERS[color], Point(move[0] + 1, move[1] + 1))
+
+
+def snapshot_examples(record):
+    board = goboard_array.Board(19, 19)
+    ko_point = None
+    for color, move in record.moves:
+        if move is not None:
+            yield PositionSnapshot.from_board(
+                board, PLAYERS[color], ko_point), color
+            board.place_stone(PLAYERS[color], Point(move[0] + 1, move[1] + 1))
+            ko_point = board.ko_point()
+
+
+def encode_deepcopied(encoder, board, color, out):
+    encoder.encode_into(
+        goboard_fast.GameState(board, PLAYERS[color], None, None), out)
+
+
+def encode_snapshot(encoder, snapshot, color, out):
+    encoder.encode_into(snapshot, out)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--moves', type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(0)
+    records = [read_game_record(random_sgf(args.moves))
+               for _ in range(args.games)]
+    encoder = BetaGoEncoder((19, 19))
+    out = np.zeros(encoder.shape(), dtype=np.float32)
+    for name, examples, encode in (
+            ('deepcopy', deepcopy_examples, encode_deepcopied),
+            ('snapshot', snapshot_examples, encode_snapshot)):
+        num_examples = 0
+        start = time.time()
+        for record in records:
+            for position, color in examples(record):
+                out[...] = 0
+                encode(encoder, position, color, out)
+                num_examples += 1
+        elapsed = time.time() - start
+        kept = [position for position, _ in examples(records[0])]
+        size = len(pickle.dumps(kept, pickle.HIGHEST_PROTOCOL)) / len(kept)
+        print('%-9s %7.1f examples/s, %6.0f bytes per position' % (
+            name + ':', num_examples / elapsed, size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""How long a training loop waits on DataGenerator for its batches.
+
+Writes a shard of random seven-plane chunks to a temporary directory,
+then draws an epoch of batches with and without the prefetch thread.
+Each batch is followed by --step-ms of sleep, standing in for a training step.
+
+    python benchmarks/data_generator.py --chunks 40 --step-ms 20
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from dlgo.data.compact import compress_features, compress_labels
+from dlgo.data.generator import DataGenerator
+from dlgo.data.manifest import ShardManifest
+from dlgo.encoders.sevenplane import SevenPlaneEncoder
+
+SHAPE = (7, 19, 19)
+
+
+def write_shard(data_dir, num_chunks, chunk_size=1024):
+    """Write one shard of num_chunks full chunks, recorded as a single
+    game, and return the manifest.
+    """
+    archive = 'KGS-bench.tar.gz'
+    manifest = ShardManifest(data_dir, SevenPlaneEncoder((19, 19)))
+    file_base = manifest.file_base(archive, [0])
+    for chunk in range(num_chunks):
+        features = np.random.randint(2, size=(chunk_size,) + SHAPE)
+        labels = np.random.randint(361, size=chunk_size)
+        base = '%s/%s_%%s_%d' % (data_dir, file_base, chunk)
+        np.save(base % 'features', compress_features(features))
+        np.save(base % 'labels', compress_labels(labels))
+    manifest.add(archive, file_base, [0], [num_chunks * chunk_size],
+                 chunk_size=chunk_size)
+    return manifest
+
+
+def waiting_time(generator, batch_size, step_seconds):
+    """Return (seconds spent waiting for batches, number of batches)."""
+    num_batches = generator.get_num_samples(batch_size) // batch_size
+    batches = generator.generate(batch_size)
+    waited = 0.0
+    for _ in range(num_batches):
+        start = time.time()
+        next(batches)
+        waited += time.time() - start
+        time.sleep(step_seconds)
+    batches.close()
+    return waited, num_batches
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chunks', type=int, default=40)
+    parser.add_argument('--batch-size', type=int, default=128)
+    parser.add_argument('--step-ms', type=float, default=20.0)
+    parser.add_argument('--shuffle-buffer', type=int, default=10000)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        manifest = write_shard(data_dir, args.chunks)
+        samples = [('KGS-bench.tar.gz', 0)]
+        for prefetch in (0, 4):
+            generator = DataGenerator(
+                data_dir, samples, manifest.segments(samples), SHAPE,
+                augment=True,
+                shuffle_buffer=args.shuffle_buffer, prefetch=prefetch)
+            waited, num_batches = waiting_time(
+                generator, args.batch_size, args.step_ms / 1000.0)
+            print('prefetch %d: %6.2f ms waiting per batch (%d batches)' % (
+                prefetch, 1000 * waited / num_batches, num_batches))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Games per second of the parallel GoDataProcessor for a growing number
+of workers.
+
+All sampled games come from one archive, the case that used to keep a
+single core busy while the rest idled. Every run writes the same shards;
+the benchmark checks that the output is identical.
+
+    python benchmarks/data_processing_scaling.py --games 200 --workers 1 2 4
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from dlgo.data.parallel_processor import GoDataProcessor
+from process_zip import write_archive
+
+
+def read_output(data_dir):
+    """Read and remove the shards and the manifest of a run."""
+    output = {}
+    for path in sorted(glob.glob(data_dir + '/*.npy')):
+        output[os.path.basename(path)] = np.load(path)
+        os.remove(path)
+    os.remove(data_dir + '/manifest.json')
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--moves', type=int, default=200)
+    parser.add_argument('--games-per-task', type=int, default=10)
+    parser.add_argument('--encoder', default='sevenplane')
+    parser.add_argument('--workers', type=int, nargs='+')
+    args = parser.parse_args()
+    workers = args.workers or [1, multiprocessing.cpu_count()]
+
+    random.seed(0)
+    data_dir = tempfile.mkdtemp()
+    try:
+        write_archive(data_dir + '/KGS-bench.tar.gz', args.games, args.moves)
+        samples = [('KGS-bench.tar.gz', i) for i in range(args.games)]
+        processor = GoDataProcessor(args.encoder, data_dir)
+        reference = None
+        base_rate = None
+        for num_workers in workers:
+            start = time.time()
+            processor.map_to_workers(
+                'train', samples, num_workers=num_workers,
+                games_per_task=args.games_per_task, report_every=None)
+            rate = args.games / (time.time() - start)
+            base_rate = base_rate or rate
+            output = read_output(data_dir)
+            if reference is None:
+                reference = output
+            same = sorted(output) == sorted(reference) and all(
+                np.array_equal(output[name], reference[name])
+                for name in reference)
+            print('%2d workers: %7.1f games/s, %4.2fx, output %s' % (
+                num_workers, rate, rate / base_rate,
+                'identical' if same else 'DIFFERENT'))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Memory allocated and time taken to encode a batch of positions,
+stacking encode() results versus Encoder.encode_batch into a
+preallocated buffer.
+
+`peak` is the most memory tracemalloc saw allocated at once while
+encoding, not counting the buffer itself.
+
+    python benchmarks/encode_batch.py --encoder simple --batch-size 256
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from dlgo import goboard_fast
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.encoders.base import get_encoder_by_name
+
+
+def sample_positions(board_size, num_positions):
+    bot = FastRandomBot()
+    positions = []
+    while len(positions) < num_positions:
+        game = goboard_fast.GameState.new_game(board_size)
+        while not game.is_over() and len(positions) < num_positions:
+            positions.append(game)
+            game = game.apply_move(bot.select_move(game))
+    return positions
+
+
+def measure(encode, positions):
+    tracemalloc.start()
+    start = time.time()
+    result = encode(positions)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def stacked(encoder):
+    def encode(positions):
+        return np.array([encoder.encode(game_state)
+                         for game_state in positions])
+    return encode
+
+
+def batched(encoder, out):
+    def encode(positions):
+        return encoder.encode_batch(positions, out=out)
+    return encode
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--encoder', default='simple')
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+
+    random.seed(0)
+    encoder = get_encoder_by_name(args.encoder, args.board_size)
+    positions = sample_positions(args.board_size, args.batch_size)
+    shape = (args.batch_size,) + tuple(encoder.shape())
+
+    methods = [('encode + np.array', stacked(encoder))]
+    for dtype in (np.float32, np.uint8):
+        out = np.zeros(shape, dtype=dtype)
+        methods.append(('encode_batch %s' % np.dtype(dtype).name,
+                        batched(encoder, out)))
+
+    expected = None
+    for name, encode in methods:
+        result, peak, elapsed = measure(encode, positions)
+        if expected is None:
+            expected = result
+        assert (result == expected).all()
+        print('%-20s: peak %8.1f KB, %6.1f ms' % (
+            name, peak / 1024, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
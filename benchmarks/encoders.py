@@ -0,0 +1,91 @@
+"""Encoding throughput of the board encoders.
+
+Positions are taken from random self-play games. For comparison, the
+`loop` line encodes the simple encoder's planes point by point, the way
+the encoders used to.
+
+    python benchmarks/encoders.py --board-size 19 --positions 500
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo import goboard_fast
+from dlgo import zero
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.encoders.base import get_encoder_by_name
+from dlgo.goboard import Move
+from dlgo.gotypes import Player, Point
+
+
+def sample_positions(goboard, board_size, num_positions):
+    bot = FastRandomBot()
+    positions = []
+    while len(positions) < num_positions:
+        game = goboard.GameState.new_game(board_size)
+        while not game.is_over() and len(positions) < num_positions:
+            positions.append(game)
+            game = game.apply_move(bot.select_move(game))
+    return positions
+
+
+class LoopEncoder():
+    """The simple encoder's planes, one point at a time."""
+    def __init__(self, board_size):
+        self.board_size = board_size
+
+    def encode(self, game_state):
+        board_tensor = np.zeros((11, self.board_size, self.board_size))
+        if game_state.next_player == Player.black:
+            board_tensor[8] = 1
+        else:
+            board_tensor[9] = 1
+        for r in range(self.board_size):
+            for c in range(self.board_size):
+                p = Point(row=r + 1, col=c + 1)
+                go_string = game_state.board.get_go_string(p)
+                if go_string is None:
+                    if game_state.does_move_violate_ko(
+                            game_state.next_player, Move.play(p)):
+                        board_tensor[10][r][c] = 1
+                else:
+                    liberty_plane = min(4, go_string.num_liberties) - 1
+                    if go_string.color == Player.white:
+                        liberty_plane += 4
+                    board_tensor[liberty_plane][r][c] = 1
+        return board_tensor
+
+
+def encodes_per_second(encoder, positions):
+    start = time.time()
+    for game_state in positions:
+        encoder.encode(game_state)
+    return len(positions) / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--positions', type=int, default=500)
+    args = parser.parse_args()
+
+    size = args.board_size
+    encoders = [('loop', LoopEncoder(size))]
+    for name in ['oneplane', 'sevenplane', 'betago', 'simple']:
+        encoders.append((name, get_encoder_by_name(name, size)))
+    encoders.append(('zero', zero.ZeroEncoder(size)))
+
+    random.seed(0)
+    for board_name, goboard in [('fast', goboard_fast),
+                                ('array', goboard_array)]:
+        positions = sample_positions(goboard, size, args.positions)
+        for name, encoder in encoders:
+            print('%5s board, %10s: %8.0f encodes/s' % (
+                board_name, name, encodes_per_second(encoder, positions)))
+
+
+if __name__ == '__main__':
+    main()
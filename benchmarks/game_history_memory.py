@@ -0,0 +1,62 @@
+"""Memory held by the chain of GameStates of random 19x19 games.
+
+Every state of a game stays reachable through previous_state, as it does
+for a game record or a self-play episode, so the memory of a game is
+what all of its boards take together.
+
+    python benchmarks/game_history_memory.py --num-games 5
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from dlgo import goboard_fast
+from dlgo.gotypes import Point
+
+
+def random_game(board_size, max_moves):
+    """Play a random game and return its last state."""
+    game = goboard_fast.GameState.new_game(board_size)
+    points = [Point(r, c)
+              for r in range(1, board_size + 1)
+              for c in range(1, board_size + 1)]
+    for _ in range(max_moves):
+        random.shuffle(points)
+        move = goboard_fast.Move.pass_turn()
+        for p in points:
+            candidate = goboard_fast.Move.play(p)
+            if game.is_valid_move(candidate):
+                move = candidate
+                break
+        game = game.apply_move(move)
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--num-games', type=int, default=5)
+    parser.add_argument('--moves', type=int, default=300)
+    args = parser.parse_args()
+
+    random.seed(0)
+    total_bytes = 0
+    total_time = 0.0
+    for _ in range(args.num_games):
+        tracemalloc.start()
+        start = time.time()
+        game = random_game(args.board_size, args.moves)
+        total_time += time.time() - start
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        total_bytes += size
+        del game
+    print('%d moves: %8.0f KiB/game, %6.0f bytes/state, %.2fs/game' % (
+        args.moves, total_bytes / args.num_games / 1024.,
+        total_bytes / args.num_games / (args.moves + 1),
+        total_time / args.num_games))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Rollouts per second of MCTSAgent for a growing number of workers.
+
+Each measurement runs one search from the empty board. The worker pool
+is started before timing, so only the search itself is measured.
+
+    python benchmarks/mcts_scaling.py --board-size 9 19 --workers 1 2 4
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import random
+import time
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo.mcts.mcts import MCTSAgent
+
+
+def rollouts_per_second(board_size, num_workers, num_rounds):
+    agent = MCTSAgent(num_rounds, temperature=1.4, reuse_tree=False,
+                      num_workers=num_workers)
+    game = goboard_array.GameState.new_game(board_size)
+    try:
+        if num_workers > 1:
+            agent.pool = multiprocessing.Pool(num_workers - 1)
+        start = time.time()
+        # select_move prints its candidate moves; keep the output short.
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent.select_move(game)
+        return num_rounds / (time.time() - start)
+    finally:
+        agent.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, nargs='+', default=[9, 19])
+    parser.add_argument('--workers', type=int, nargs='+')
+    parser.add_argument('--rounds', type=int, default=400)
+    args = parser.parse_args()
+
+    workers = args.workers
+    if workers is None:
+        workers = sorted(set([1, 2, 4, multiprocessing.cpu_count()]))
+    print('%d CPUs available' % multiprocessing.cpu_count())
+    for board_size in args.board_size:
+        baseline = None
+        for num_workers in workers:
+            random.seed(0)
+            np.random.seed(0)
+            rate = rollouts_per_second(board_size, num_workers, args.rounds)
+            if baseline is None:
+                baseline = rate
+            print('%dx%d %2d workers: %8.1f rollouts/s (x%.2f)' % (
+                board_size, board_size, num_workers, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
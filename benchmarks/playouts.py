@@ -0,0 +1,87 @@
+"""Random playouts per second for each board implementation.
+
+Two numbers are reported per backend: full random playouts with
+`FastRandomBot` (move selection included), and replaying the same games
+move by move through `GameState.apply_move`, which isolates the cost of
+the board engine itself.
+
+    python benchmarks/playouts.py --board-size 9 19 --num-games 50
+"""
+import argparse
+import time
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo import goboard_fast
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.gotypes import Player
+
+BACKENDS = [
+    ('goboard_fast', goboard_fast),
+    ('goboard_array', goboard_array),
+]
+
+
+def simulate_game(goboard, board_size, bots):
+    game = goboard.GameState.new_game(board_size)
+    moves = []
+    while not game.is_over():
+        move = bots[game.next_player].select_move(game)
+        game = game.apply_move(move)
+        moves.append(move)
+    game.winner()
+    return moves
+
+
+def replay_game(goboard, board_size, moves):
+    game = goboard.GameState.new_game(board_size)
+    for move in moves:
+        game = game.apply_move(move)
+    return game
+
+
+def benchmark(goboard, board_size, num_games, seed):
+    np.random.seed(seed)
+    bots = {
+        Player.black: FastRandomBot(),
+        Player.white: FastRandomBot(),
+    }
+    games = []
+    start = time.time()
+    for _ in range(num_games):
+        games.append(simulate_game(goboard, board_size, bots))
+    playout_time = time.time() - start
+
+    start = time.time()
+    for moves in games:
+        replay_game(goboard, board_size, moves)
+    replay_time = time.time() - start
+
+    num_moves = sum(len(moves) for moves in games)
+    return num_games / playout_time, num_moves / replay_time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, nargs='+', default=[9, 19])
+    parser.add_argument('--num-games', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for board_size in args.board_size:
+        baseline = None
+        for name, goboard in BACKENDS:
+            playouts, moves = benchmark(
+                goboard, board_size, args.num_games, args.seed)
+            if baseline is None:
+                baseline = (playouts, moves)
+            print('%dx%d %-14s %8.2f playouts/s (x%.2f) '
+                  '%10.1f replayed moves/s (x%.2f)' % (
+                      board_size, board_size, name,
+                      playouts, playouts / baseline[0],
+                      moves, moves / baseline[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Time GoDataProcessor.process_zip on a KGS style archive of random games.
+
+process_zip used to unpack the .tar.gz to a .tar on disk, parse every
+sampled SGF once to count the moves, and then parse and encode them
+again. It now reads the compressed archive as one stream and parses
+each game once. The old extra work is timed separately below: the
+unpacking and the counting pass, and the bytes the temporary tar file
+cost in writes and reads.
+
+    python benchmarks/process_zip.py --games 100
+"""
+import argparse
+import gzip
+import io
+import os
+import random
+import shutil
+import tarfile
+import tempfile
+import time
+
+from dlgo import goboard_fast
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.data.processor import GoDataProcessor
+from dlgo.gosgf import Sgf_game
+from dlgo.gotypes import Player
+
+
+def random_sgf(num_moves):
+    bot = FastRandomBot()
+    game = goboard_fast.GameState.new_game(19)
+    sgf = Sgf_game(19)
+    node = sgf.get_root()
+    for _ in range(num_moves):
+        if game.is_over():
+            break
+        move = bot.select_move(game)
+        node = node.new_child()
+        color = 'b' if game.next_player == Player.black else 'w'
+        if move.is_play:
+            node.set_move(color, (move.point.row - 1, move.point.col - 1))
+        else:
+            node.set_move(color, None)
+        game = game.apply_move(move)
+    return sgf.serialise()
+
+
+def write_archive(path, num_games, num_moves):
+    with tarfile.open(path, 'w:gz') as archive:
+        info = tarfile.TarInfo('kgs-19-bench')
+        info.type = tarfile.DIRTYPE
+        archive.addfile(info)
+        for i in range(num_games):
+            game = random_sgf(num_moves)
+            info = tarfile.TarInfo('kgs-19-bench/%d.sgf' % i)
+            info.size = len(game)
+            archive.addfile(info, io.BytesIO(game))
+
+
+def old_extra_work(data_dir, zip_file_name, game_list):
+    """Unpack to a tar file and count the moves with a first parse, as
+    the two-pass process_zip did. Returns the tar file size.
+    """
+    tar_path = data_dir + '/' + zip_file_name[:-3]
+    with gzip.open(data_dir + '/' + zip_file_name) as source, \
+            open(tar_path, 'wb') as target:
+        shutil.copyfileobj(source, target)
+    with tarfile.open(tar_path) as archive:
+        names = archive.getnames()
+        for index in game_list:
+            content = archive.extractfile(names[index + 1]).read()
+            sgf = Sgf_game.from_string(content)
+            for item in sgf.main_sequence_iter():
+                item.get_move()
+    size = os.path.getsize(tar_path)
+    os.remove(tar_path)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--moves', type=int, default=200)
+    parser.add_argument('--encoder', default='sevenplane')
+    args = parser.parse_args()
+
+    random.seed(0)
+    data_dir = tempfile.mkdtemp()
+    try:
+        zip_file_name = 'KGS-bench.tar.gz'
+        write_archive(data_dir + '/' + zip_file_name, args.games, args.moves)
+        game_list = list(range(args.games))
+        processor = GoDataProcessor(args.encoder, data_dir)
+
+        start = time.time()
+        processor.process_zip(zip_file_name, 'KGS-benchtrain', game_list)
+        single_pass = time.time() - start
+
+        start = time.time()
+        tar_size = old_extra_work(data_dir, zip_file_name, game_list)
+        extra = time.time() - start
+
+        print('single pass:      %6.2f s' % single_pass)
+        print('old extra work:   %6.2f s (unpacking and counting pass)' %
+              extra)
+        print('saved:            %5.1f%% of the old wall clock time' % (
+            100 * extra / (single_pass + extra)))
+        print('disk I/O saved:   %6.1f MB (temporary tar written and read)' %
+              (2 * tar_size / 1e6))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Time to score finished games with the reference scorer, the numpy
+scorer, and the numpy scorer over a whole batch of games.
+
+Games are random self-play games of the fast board.
+
+    python benchmarks/scoring.py --board-size 9 19 --games 100
+"""
+import argparse
+import random
+import time
+
+from dlgo import scoring
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.goboard_fast import GameState
+
+
+def play_games(board_size, num_games):
+    bot = FastRandomBot()
+    games = []
+    for _ in range(num_games):
+        game = GameState.new_game(board_size)
+        while not game.is_over():
+            game = game.apply_move(bot.select_move(game))
+        games.append(game)
+    return games
+
+
+def per_game(fn, games):
+    start = time.time()
+    fn(games)
+    return (time.time() - start) / len(games)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, nargs='+', default=[9, 19])
+    parser.add_argument('--games', type=int, default=100)
+    args = parser.parse_args()
+
+    random.seed(0)
+    for board_size in args.board_size:
+        games = play_games(board_size, args.games)
+        slow = per_game(lambda gs: [
+            scoring.evaluate_territory_slow(g.board) for g in gs], games)
+        fast = per_game(lambda gs: [
+            scoring.evaluate_territory(g.board) for g in gs], games)
+        batch = per_game(scoring.compute_game_results, games)
+        print('%dx%d: reference %7.1f us/game, numpy %7.1f us/game (x%.1f), '
+              'batch %7.1f us/game (x%.1f)' % (
+                  board_size, board_size, slow * 1e6, fast * 1e6, slow / fast,
+                  batch * 1e6, slow / batch))
+
+
+if __name__ == '__main__':
+    main()
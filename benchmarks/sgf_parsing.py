@@ -0,0 +1,51 @@
+"""Games per second of reading the main line of an SGF game with the full
+parser and with read_game_record, on the same random games. The benchmark
+checks that both readers agree on every game.
+
+    python benchmarks/sgf_parsing.py --games 200
+"""
+import argparse
+import random
+import time
+
+from dlgo.gosgf import Sgf_game, read_game_record
+from process_zip import random_sgf
+
+
+def full_parser(content):
+    sgf = Sgf_game.from_string(content)
+    moves = [node.get_move() for node in sgf.main_sequence_iter()]
+    return (sgf.get_handicap(), sgf.get_root().get_setup_stones(),
+            [move for move in moves if move[0] is not None])
+
+
+def fast_reader(content):
+    record = read_game_record(content)
+    return record.handicap, record.setup_stones, record.moves
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--moves', type=int, default=250)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    games = [random_sgf(args.moves) for _ in range(args.games)]
+    for content in games:
+        assert full_parser(content) == fast_reader(content)
+
+    rates = {}
+    for reader in (full_parser, fast_reader):
+        start = time.time()
+        for _ in range(args.repeat):
+            for content in games:
+                reader(content)
+        rates[reader] = args.games * args.repeat / (time.time() - start)
+        print('%-12s %8.1f games/s' % (reader.__name__ + ':', rates[reader]))
+    print('speedup:     %8.1fx' % (rates[fast_reader] / rates[full_parser]))
+
+
+if __name__ == '__main__':
+    main()
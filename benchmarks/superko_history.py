@@ -0,0 +1,90 @@
+"""Memory and time used by the superko history of long 19x19 games.
+
+Compares the per-state frozenset that GameState used to rebuild on
+every move with the shared SituationHistory, keeping every state of
+the game alive as a game record would.
+
+    python benchmarks/superko_history.py --num-games 5
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from dlgo import goboard_array
+from dlgo.gotypes import Point
+from dlgo.history import SituationHistory
+
+
+def random_game_situations(board_size, max_moves):
+    """Play a random game and return the situation after every move."""
+    game = goboard_array.GameState.new_game(board_size)
+    points = [Point(r, c)
+              for r in range(1, board_size + 1)
+              for c in range(1, board_size + 1)]
+    situations = [(game.next_player, game.board.zobrist_hash())]
+    for _ in range(max_moves):
+        random.shuffle(points)
+        move = goboard_array.Move.pass_turn()
+        for p in points:
+            candidate = goboard_array.Move.play(p)
+            if game.is_valid_move(candidate):
+                move = candidate
+                break
+        game = game.apply_move(move)
+        situations.append((game.next_player, game.board.zobrist_hash()))
+        if game.is_over():
+            break
+    return situations
+
+
+def build_frozensets(situations):
+    histories = [frozenset()]
+    for situation in situations[:-1]:
+        histories.append(frozenset(histories[-1] | {situation}))
+    return histories
+
+
+def build_situation_history(situations):
+    histories = [SituationHistory()]
+    for situation in situations[:-1]:
+        histories.append(histories[-1].with_situation(situation))
+    return histories
+
+
+def measure(build, situations):
+    tracemalloc.start()
+    start = time.time()
+    histories = build(situations)
+    elapsed = time.time() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.time()
+    for history, situation in zip(histories, situations):
+        situation in history
+    lookup = time.time() - start
+    return memory, elapsed, lookup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--num-games', type=int, default=5)
+    parser.add_argument('--max-moves', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    for i in range(args.num_games):
+        situations = random_game_situations(args.board_size, args.max_moves)
+        print('Game %d: %d moves' % (i + 1, len(situations) - 1))
+        for name, build in (('frozenset', build_frozensets),
+                            ('SituationHistory', build_situation_history)):
+            memory, elapsed, lookup = measure(build, situations)
+            print('  %-17s %10.1f KiB  build %7.2f ms  lookups %6.2f ms' % (
+                name, memory / 1024., elapsed * 1000, lookup * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Per-move latency of ZeroAgent for different leaf batch sizes.
+
+Uses the small 9x9 network from zero_demo.py with random weights, so
+only the speed of the search is meaningful.
+
+    python benchmarks/zero_batching.py --rounds 400 --batch-size 1 8 32
+"""
+import argparse
+import time
+
+from keras.layers import Conv2D, Dense, Flatten, Input
+from keras.models import Model
+
+from dlgo import zero
+from dlgo.goboard_fast import GameState
+
+
+def build_model(encoder):
+    board_input = Input(shape=encoder.shape(), name='board_input')
+    pb = board_input
+    for i in range(4):
+        pb = Conv2D(64, (3, 3),
+                    padding='same',
+                    data_format='channels_first',
+                    activation='relu')(pb)
+
+    policy_conv = Conv2D(2, (1, 1),
+                         data_format='channels_first',
+                         activation='relu')(pb)
+    policy_flat = Flatten()(policy_conv)
+    policy_output = Dense(encoder.num_moves(), activation='softmax')(
+        policy_flat)
+
+    value_conv = Conv2D(1, (1, 1),
+                        data_format='channels_first',
+                        activation='relu')(pb)
+    value_flat = Flatten()(value_conv)
+    value_hidden = Dense(256, activation='relu')(value_flat)
+    value_output = Dense(1, activation='tanh')(value_hidden)
+
+    return Model(
+        inputs=[board_input],
+        outputs=[policy_output, value_output])
+
+
+def time_moves(agent, num_moves):
+    game = GameState.new_game(agent.encoder.board_size)
+    # Warm up the model outside the timed region.
+    agent.select_move(game)
+    start = time.time()
+    for _ in range(num_moves):
+        game = game.apply_move(agent.select_move(game))
+    return (time.time() - start) / num_moves
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=400)
+    parser.add_argument('--moves', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, nargs='+',
+                        default=[1, 8, 16, 32])
+    args = parser.parse_args()
+
+    encoder = zero.ZeroEncoder(9)
+    model = build_model(encoder)
+    baseline = None
+    for batch_size in args.batch_size:
+        agent = zero.ZeroAgent(
+            model, encoder,
+            rounds_per_move=args.rounds, batch_size=batch_size)
+        seconds = time_moves(agent, args.moves)
+        if baseline is None:
+            baseline = seconds
+        print('batch size %3d: %7.3f s/move (x%.2f)' % (
+            batch_size, seconds, baseline / seconds))
+
+
+if __name__ == '__main__':
+    main()
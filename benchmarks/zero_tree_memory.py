@@ -0,0 +1,90 @@
+"""Memory used per ZeroAgent search tree node.
+
+Runs one search from the empty board with a uniform policy, so the
+tree shape depends only on the search itself, and reports:
+
+* total: everything allocated while building the tree (tracemalloc),
+  divided by the number of nodes. This includes each node's GameState.
+* stats: the branch statistics arrays of a node (ZeroTreeNode.nbytes).
+
+    python benchmarks/zero_tree_memory.py --board-size 19 --rounds 1600 10000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo import goboard_fast
+from dlgo import zero
+
+
+class UniformModel():
+    def __init__(self, num_moves):
+        self.num_moves = num_moves
+
+    def predict(self, model_input):
+        batch_size = model_input.shape[0]
+        priors = np.full(
+            (batch_size, self.num_moves), 1.0 / self.num_moves,
+            dtype=np.float32)
+        values = np.zeros((batch_size, 1), dtype=np.float32)
+        return priors, values
+
+
+def tree_nodes(root):
+    nodes = [root]
+    for node in nodes:
+        nodes.extend(node.children.values())
+    return nodes
+
+
+def measure(goboard, board_size, rounds, batch_size):
+    encoder = zero.ZeroEncoder(board_size)
+    agent = zero.ZeroAgent(
+        UniformModel(encoder.num_moves()), encoder,
+        rounds_per_move=rounds, batch_size=batch_size)
+    roots = []
+    create_node = agent.create_node
+
+    def record_root(*args, **kwargs):
+        roots.append(create_node(*args, **kwargs))
+        return roots[-1]
+    agent.create_node = record_root
+
+    game = goboard.GameState.new_game(board_size)
+    tracemalloc.start()
+    start = time.time()
+    agent.select_move(game)
+    elapsed = time.time() - start
+    total, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = tree_nodes(roots[0])
+    stats = sum(node.nbytes() for node in nodes)
+    return len(nodes), total, stats, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--rounds', type=int, nargs='+',
+                        default=[1600, 10000])
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--board', choices=['fast', 'array'],
+                        default='fast')
+    args = parser.parse_args()
+
+    goboard = goboard_fast if args.board == 'fast' else goboard_array
+    for rounds in args.rounds:
+        num_nodes, total, stats, elapsed = measure(
+            goboard, args.board_size, rounds, args.batch_size)
+        print('%6d rounds: %6d nodes, %8.0f bytes/node total, '
+              '%6.0f bytes/node stats (%.1fs)' % (
+                  rounds, num_nodes, total / num_nodes,
+                  stats / num_nodes, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,3 +5,4 @@ from .predict import *
 from .naive import *
 from .naive_fast import *
 from .termination import *
+from .timecontrol import *
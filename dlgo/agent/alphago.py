@@ -1,6 +1,8 @@
 # tag::alphago_imports[]
 import numpy as np
 from dlgo.agent.base import Agent
+from dlgo.agent.helpers import is_same_position
+from dlgo.agent.timecontrol import Deadline, visit_lead_is_safe
 from dlgo.goboard_fast import Move
 from dlgo import kerasutil
 import operator
@@ -78,10 +80,24 @@ class AlphaGoMCTS(Agent):
         self.rollout_limit = rollout_limit
         self.root = AlphaGoNode()
 # end::alphago_mcts_init[]
+        # Position the kept root belongs to, and the share of the
+        # previous search's visits that the last search started with.
+        self.root_state = None
+        self.root_visits = 0
+        self.reused_visit_fraction = 0.0
+        # Seconds per move; when set, simulations run until the time is
+        # up instead of num_simulations times.
+        self.move_time = None
 
 # tag::alphago_mcts_rollout[]
     def select_move(self, game_state):
-        for simulation in range(self.num_simulations):  # <1>
+        self.reuse_root(game_state)
+        deadline = None
+        if self.move_time is not None:
+            deadline = Deadline(self.move_time)
+        simulation = 0
+        while self.keep_searching(simulation, deadline):  # <1>
+            simulation += 1
             current_state = game_state
             node = self.root
             for depth in range(self.depth):  # <2>
@@ -115,16 +131,58 @@ class AlphaGoMCTS(Agent):
         move = max(self.root.children, key=lambda move:  # <1>
                    self.root.children.get(move).visit_count)  # <1>
 
-        self.root = AlphaGoNode()
+        self.root_visits = self.root.visit_count
         if move in self.root.children:  # <2>
             self.root = self.root.children[move]
             self.root.parent = None
+        else:
+            self.root = AlphaGoNode()
+        self.root_state = game_state.apply_move(move)
 
         return move
 # <1> Pick most visited child of the root as next move.
 # <2> If the picked move is a child, set new root to this child node.
 # end::alphago_mcts_selection[]
 
+    def set_move_time(self, seconds):
+        self.move_time = seconds
+
+    def keep_searching(self, simulations_done, deadline):
+        if deadline is None:
+            return simulations_done < self.num_simulations
+        if simulations_done == 0:
+            return True
+        if deadline.expired():
+            return False
+        # Stop early once the most visited move can't be overtaken.
+        visit_counts = [
+            child.visit_count for child in self.root.children.values()]
+        return not visit_lead_is_safe(
+            visit_counts, deadline.rounds_left(simulations_done))
+
+    def reuse_root(self, game_state):
+        """Move the root kept from the last search to `game_state`, or
+        start a fresh tree if it doesn't lead there.
+        """
+        root = None
+        if self.root_state is not None:
+            if is_same_position(self.root_state, game_state):
+                root = self.root
+            elif game_state.previous_state is not None and \
+                    is_same_position(
+                        self.root_state, game_state.previous_state):
+                # The opponent has replied to our move.
+                root = self.root.children.get(game_state.last_move)
+        if root is None:
+            self.root = AlphaGoNode()
+            self.reused_visit_fraction = 0.0
+        else:
+            root.parent = None
+            self.root = root
+            self.reused_visit_fraction = \
+                root.visit_count / float(max(1, self.root_visits))
+        self.root_state = game_state
+
 # tag::alphago_policy_probs[]
     def policy_probabilities(self, game_state):
         encoder = self.policy._encoder
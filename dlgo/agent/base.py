@@ -14,3 +14,10 @@ class Agent:
 
     def diagnostics(self):
         return {}
+
+    def set_move_time(self, seconds):
+        """Ask the agent to answer select_move within `seconds` (None
+        for no limit). Agents without a time-controlled search ignore
+        this.
+        """
+        pass
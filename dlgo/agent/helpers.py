@@ -4,6 +4,7 @@ from dlgo.gotypes import Point
 
 __all__ = [
     'is_point_an_eye',
+    'is_same_position',
 ]
 
 
@@ -42,3 +43,11 @@ def is_point_an_eye(board, point, color):
 # <4> Point is on the edge or corner.
 # <5> Point is in the middle.
 # end::eye[]
+
+
+def is_same_position(game_state, other):
+    """Return True if both game states have the same stones on the
+    board and the same player to move.
+    """
+    return game_state.next_player == other.next_player and \
+        game_state.board.zobrist_hash() == other.board.zobrist_hash()
@@ -25,6 +25,8 @@ class FastRandomBot(Agent):
 
     def select_move(self, game_state):
         """Choose a random valid move that preserves our own eyes."""
+        if hasattr(game_state.board, 'sensible_points'):
+            return self._select_sensible_move(game_state)
         dim = (game_state.board.num_rows, game_state.board.num_cols)
         if dim != self.dim:
             self._update_cache(dim)
@@ -39,3 +41,16 @@ class FastRandomBot(Agent):
                                         game_state.next_player):
                 return Move.play(p)
         return Move.pass_turn()
+
+    def _select_sensible_move(self, game_state):
+        # Array boards keep track of the points that are legal and don't
+        # fill an eye, so only ko is left to check.
+        if game_state.is_over():
+            return Move.pass_turn()
+        board = game_state.board
+        player = game_state.next_player
+        for idx in np.random.permutation(board.sensible_points(player)):
+            move = Move.play(board.point_at(idx))
+            if not game_state.does_move_violate_ko(player, move):
+                return move
+        return Move.pass_turn()
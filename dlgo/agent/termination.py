@@ -70,6 +70,9 @@ class TerminationAgent(Agent):
             return self.agent.select_move(game_state)
 # end::termination_agent[]
 
+    def set_move_time(self, seconds):
+        self.agent.set_move_time(seconds)
+
 
 # tag::get_termination[]
 def get(termination):
@@ -0,0 +1,140 @@
+import time
+
+from dlgo.gotypes import Player
+
+__all__ = [
+    'Deadline',
+    'TimeControl',
+    'visit_lead_is_safe',
+]
+
+
+class Deadline():
+    """Wall clock budget for one search."""
+    def __init__(self, seconds):
+        self.start = time.time()
+        self.end = self.start + seconds
+
+    def expired(self):
+        return time.time() >= self.end
+
+    def remaining(self):
+        return max(0.0, self.end - time.time())
+
+    def rounds_left(self, rounds_done):
+        """Estimate how many more rounds fit in the budget, at the rate
+        the search has managed so far.
+        """
+        elapsed = time.time() - self.start
+        if rounds_done == 0 or elapsed <= 0:
+            return float('inf')
+        return rounds_done * self.remaining() / elapsed
+
+
+def visit_lead_is_safe(visit_counts, remaining):
+    """Return True if the most visited move stays the most visited even
+    if all `remaining` visits go to the runner-up.
+    """
+    if len(visit_counts) < 2:
+        return True
+    best, second = sorted(visit_counts)[-2:][::-1]
+    return best - second > remaining
+
+
+class TimeControl():
+    """Game clock following GTP time_settings / time_left, with a policy
+    for how much of it to spend on each move.
+
+    Canadian byo-yomi as in the GTP spec: `main_time` seconds, then
+    `byo_yomi_time` seconds for every `byo_yomi_stones` moves. A
+    byo_yomi_time of 0 means sudden death; byo_yomi_time > 0 with
+    byo_yomi_stones == 0 means no time limit.
+    """
+    def __init__(self, main_time=0, byo_yomi_time=0, byo_yomi_stones=0,
+                 safety_margin=0.5, expected_game_length=None):
+        """`safety_margin` seconds are kept back on every move for
+        network and GTP overhead.
+        """
+        self.safety_margin = safety_margin
+        self.expected_game_length = expected_game_length
+        self.set_time_settings(main_time, byo_yomi_time, byo_yomi_stones)
+
+    def set_time_settings(self, main_time, byo_yomi_time, byo_yomi_stones):
+        self.main_time = main_time
+        self.byo_yomi_time = byo_yomi_time
+        self.byo_yomi_stones = byo_yomi_stones
+        # Per player: seconds left, and stones left in the current
+        # byo-yomi period (0 while still in main time).
+        self.time_left = {}
+        self.stones_left = {}
+        for player in (Player.black, Player.white):
+            if main_time > 0:
+                self.time_left[player] = main_time
+                self.stones_left[player] = 0
+            else:
+                self.time_left[player] = byo_yomi_time
+                self.stones_left[player] = byo_yomi_stones
+
+    def set_time_left(self, player, seconds, stones):
+        self.time_left[player] = seconds
+        self.stones_left[player] = stones
+
+    def is_unlimited(self):
+        if self.byo_yomi_stones > 0:
+            return False
+        # Byo-yomi time without stones means no limit, whatever the
+        # main time; all zeros is the default of no time settings.
+        return self.byo_yomi_time > 0 or self.main_time == 0
+
+    def move_time(self, player, game_state):
+        """Return the number of seconds `player` should spend on the
+        next move, or None if there is no time limit.
+        """
+        if self.is_unlimited():
+            return None
+        time_left = self.time_left[player]
+        stones = self.stones_left[player]
+        if stones > 0:
+            # In byo-yomi: share the period evenly.
+            budget = time_left / stones
+        else:
+            # In main time: spread it over the moves we still expect to
+            # play, keeping the byo-yomi period as a reserve.
+            budget = time_left / self.moves_to_play(game_state)
+            if self.byo_yomi_stones > 0:
+                budget += self.byo_yomi_time / self.byo_yomi_stones
+        return max(0.0, budget - self.safety_margin)
+
+    def moves_to_play(self, game_state):
+        """Estimate the number of moves we still have to make."""
+        board = game_state.board
+        game_length = self.expected_game_length
+        if game_length is None:
+            # Games tend to last about as many moves as there are
+            # points on the board.
+            game_length = board.num_rows * board.num_cols
+        moves_played = 0
+        state = game_state
+        while state is not None and state.previous_state is not None:
+            moves_played += 1
+            state = state.previous_state
+        # Always assume a reasonable amount of game is left, so we
+        # don't spend everything on a long game's later moves.
+        our_moves = max(game_length - moves_played, game_length // 4) // 2
+        return max(our_moves, 1)
+
+    def record_move(self, player, seconds):
+        """Charge `seconds` of thinking time to `player`'s clock."""
+        time_left = self.time_left[player] - seconds
+        if self.stones_left[player] > 0:
+            self.stones_left[player] -= 1
+            if self.stones_left[player] == 0:
+                # Period done: start a new one.
+                time_left = self.byo_yomi_time
+                self.stones_left[player] = self.byo_yomi_stones
+        elif time_left <= 0 and self.byo_yomi_stones > 0:
+            # Main time ran out: enter byo-yomi, and charge the
+            # overrun to the first period.
+            time_left += self.byo_yomi_time
+            self.stones_left[player] = self.byo_yomi_stones
+        self.time_left[player] = max(0.0, time_left)
@@ -0,0 +1,55 @@
+import unittest
+
+from dlgo.agent.timecontrol import TimeControl, visit_lead_is_safe
+from dlgo.goboard_fast import GameState
+from dlgo.gotypes import Player
+
+
+class TimeControlTest(unittest.TestCase):
+    def test_no_time_limit(self):
+        game = GameState.new_game(19)
+        self.assertIsNone(TimeControl().move_time(Player.black, game))
+        # GTP: byo-yomi time without stones means no limit.
+        self.assertIsNone(
+            TimeControl(0, 10, 0).move_time(Player.black, game))
+        self.assertIsNone(
+            TimeControl(600, 30, 0).move_time(Player.black, game))
+
+    def test_byo_yomi_is_shared_per_stone(self):
+        game = GameState.new_game(19)
+        tc = TimeControl(0, 100, 10, safety_margin=1)
+        self.assertAlmostEqual(9, tc.move_time(Player.black, game))
+        tc.set_time_left(Player.black, 30, 2)
+        self.assertAlmostEqual(14, tc.move_time(Player.black, game))
+
+    def test_main_time_is_spread_over_the_game(self):
+        game = GameState.new_game(9)
+        tc = TimeControl(400, 0, 0, safety_margin=0)
+        # 81 points, so about 40 moves each.
+        self.assertAlmostEqual(10, tc.move_time(Player.black, game))
+
+    def test_record_move_enters_byo_yomi(self):
+        tc = TimeControl(10, 30, 5)
+        tc.record_move(Player.black, 4)
+        self.assertEqual((6, 0), (
+            tc.time_left[Player.black], tc.stones_left[Player.black]))
+        tc.record_move(Player.black, 6)
+        self.assertEqual((30, 5), (
+            tc.time_left[Player.black], tc.stones_left[Player.black]))
+        tc.record_move(Player.black, 3)
+        self.assertEqual((27, 4), (
+            tc.time_left[Player.black], tc.stones_left[Player.black]))
+        self.assertEqual(10, tc.time_left[Player.white])
+
+    def test_overrun_is_charged_to_byo_yomi(self):
+        tc = TimeControl(10, 30, 5)
+        tc.record_move(Player.black, 14)
+        self.assertEqual((26, 5), (
+            tc.time_left[Player.black], tc.stones_left[Player.black]))
+        tc.record_move(Player.white, 50)
+        self.assertEqual(0, tc.time_left[Player.white])
+
+    def test_visit_lead(self):
+        self.assertTrue(visit_lead_is_safe([10, 3, 1], 6))
+        self.assertFalse(visit_lead_is_safe([10, 3, 1], 7))
+        self.assertTrue(visit_lead_is_safe([5], 100))
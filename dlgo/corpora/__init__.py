@@ -1,2 +1,3 @@
 from .archive import *
 from .index import *
+from .pipeline import *
@@ -1,15 +1,15 @@
 from __future__ import absolute_import
 from __future__ import print_function
+import bz2
+import gzip
 import os
-import shutil
 import tarfile
-import tempfile
-from contextlib import contextmanager
 
 __all__ = [
     'SGF',
     'SGFLocator',
     'find_sgfs',
+    'open_tarball_data',
 ]
 
 
@@ -17,10 +17,6 @@ def cmp(x, y):
     return (x > y) - (x < y)
 
 
-class SafetyError(Exception):
-    pass
-
-
 class SGF(object):
     def __init__(self, locator, contents):
         self.locator = locator
@@ -32,9 +28,13 @@ class SGF(object):
 
 class SGFLocator(object):
     # TODO Support zips and physical SGFs.
-    def __init__(self, archive_path, archive_filename):
+    def __init__(self, archive_path, archive_filename, offset=None, size=None):
         self.archive_path = archive_path
         self.archive_filename = archive_filename
+        # Where the SGF data starts in the uncompressed tar stream, and
+        # how many bytes it has.
+        self.offset = offset
+        self.size = size
 
     @property
     def physical_file(self):
@@ -50,10 +50,19 @@ class SGFLocator(object):
     def __str__(self):
         return '%s:%s' % (self.archive_path, self.archive_filename)
 
+    def read(self, data_file):
+        """Read the SGF from the open tar data of its archive, see
+        open_tarball_data.
+        """
+        data_file.seek(self.offset)
+        return data_file.read(self.size)
+
     def serialize(self):
         return {
             'archive_path': self.archive_path,
             'archive_filename': self.archive_filename,
+            'offset': self.offset,
+            'size': self.size,
         }
 
     @classmethod
@@ -61,19 +70,26 @@ class SGFLocator(object):
         return SGFLocator(
             archive_path=data['archive_path'],
             archive_filename=data['archive_filename'],
+            offset=data.get('offset'),
+            size=data.get('size'),
         )
 
 
-class TarballSGFLocator(SGFLocator):
-    def __init__(self, tarball_path, archive_filename):
-        self.tarball_path = tarball_path
-        self.archive_filename = archive_filename
+def open_tarball_data(tarball_path):
+    """Open the uncompressed tar stream of a tarball for reading members
+    at their offsets.
 
-    def __str__(self):
-        return '%s:%s' % (self.tarball_path, self.archive_filename)
-
-    def contents(self):
-        return tarfile.open(self.tarball_path).extractfile(self.archive_filename).read()
+    Seeking in a plain .tar file is free. A compressed tarball has to be
+    decompressed up to the offset, forwards from the current position or
+    from the start of the file.
+    """
+    with open(tarball_path, 'rb') as f:
+        magic = f.read(3)
+    if magic[:2] == b'\x1f\x8b':
+        return gzip.open(tarball_path, 'rb')
+    if magic == b'BZh':
+        return bz2.BZ2File(tarball_path, 'rb')
+    return open(tarball_path, 'rb')
 
 
 def find_sgfs(path):
@@ -83,6 +99,7 @@ def find_sgfs(path):
         return _walk_dir(path)
     if tarfile.is_tarfile(path):
         return _walk_tarball(path)
+    return []
 
 
 def _walk_dir(path):
@@ -94,32 +111,12 @@ def _walk_dir(path):
             yield sgf
 
 
-@contextmanager
-def tarball_iterator(tarball_path):
-    tempdir = tempfile.mkdtemp(prefix='tmp-betago')
-    tf = tarfile.open(tarball_path)
-
-    # Check for unsafe filenames. Theoretically a tarball can contain
-    # absolute filenames, or names like '../../whatever'
-    def name_is_safe(filename):
-        final_path = os.path.realpath(os.path.join(tempdir, filename))
-        dir_to_check = os.path.join(os.path.realpath(tempdir), '')
-        return os.path.commonprefix([final_path, dir_to_check]) == dir_to_check
-    if not all(name_is_safe(tf_entry.name) for tf_entry in tf):
-        raise SafetyError('Tarball %s contains unsafe filenames' % (tarball_path,))
-    sgf_names = [tf_entry.name for tf_entry in tf
-                 if tf_entry.isfile and tf_entry.name.endswith('.sgf')]
-    sgf_names.sort()
-    tf.extractall(tempdir)
-    try:
-        yield [SGF(SGFLocator(tarball_path, sgf_name), open(os.path.join(tempdir, sgf_name)).read())
-               for sgf_name in sgf_names]
-    finally:
-        shutil.rmtree(tempdir)
-        tf.close()
-
-
 def _walk_tarball(path):
-    with tarball_iterator(path) as tarball:
-        for sgf in tarball:
-            yield sgf
+    """Read the SGFs of a tarball as one stream, in archive order."""
+    with tarfile.open(path, 'r|*') as tf:
+        for member in tf:
+            if member.isfile() and member.name.endswith('.sgf'):
+                contents = tf.extractfile(member).read()
+                yield SGF(SGFLocator(path, member.name,
+                                     member.offset_data, member.size),
+                          contents)
@@ -1,12 +1,13 @@
 from __future__ import absolute_import
 from __future__ import print_function
-import copy
 import itertools
 import json
 
-from .archive import SGFLocator, find_sgfs, tarball_iterator
-from ..goboard_fast import Board
-from ..gosgf import Sgf_game
+from .archive import SGF, SGFLocator, find_sgfs, open_tarball_data
+from ..goboard_array import Board
+from ..gosgf import read_game_record
+from ..gotypes import Player, Point
+from ..snapshot import PositionSnapshot
 from six.moves import range
 
 __all__ = [
@@ -18,27 +19,39 @@ __all__ = [
 
 
 def _sequence(game_record):
-    """Extract game moves from a game record.
+    """Extract game moves from a game record."""
+    # move == None is a pass, which in theory we could try to
+    # predict, but not yet
+    return [(color, move) for color, move in game_record.moves
+            if move is not None]
+
+
+_players = {'b': Player.black, 'w': Player.white}
+
+# Format of serialized indexes. Indexes without a version predate tar
+# member offsets and per-game position counts.
+INDEX_VERSION = 2
 
-    The main sequence includes lots of stuff that is not actual game
-    moves.
-    """
-    seq = []
-    for item in game_record.get_main_sequence():
-        color, move = item.get_move()
-        # color == None is entries that are not actual game play
-        # move == None is a pass, which in theory we could try to
-        # predict, but not yet
-        if color is not None and move is not None:
-            seq.append((color, move))
-    return seq
+
+def _point(move):
+    row, col = move
+    return Point(row + 1, col + 1)
 
 
 class CorpusIndex(object):
-    def __init__(self, physical_files, chunk_size, boundaries):
+    """Chunks of chunk_size training examples over the games of a corpus.
+
+    Every game is listed with the offset of its SGF data in its archive
+    and its number of positions, so a chunk is read by seeking straight
+    to its own games.
+    """
+    def __init__(self, physical_files, chunk_size, boundaries, games,
+                 num_positions):
         self.physical_files = list(sorted(physical_files))
         self.chunk_size = chunk_size
         self.boundaries = list(boundaries)
+        self.games = list(games)
+        self.num_positions = list(num_positions)
 
     @property
     def num_chunks(self):
@@ -46,80 +59,125 @@ class CorpusIndex(object):
 
     def serialize(self):
         return {
+            'version': INDEX_VERSION,
             'physical_files': self.physical_files,
             'chunk_size': self.chunk_size,
             'boundaries': [boundary.serialize() for boundary in self.boundaries],
+            'games': [dict(locator.serialize(), num_positions=num_positions)
+                      for locator, num_positions
+                      in zip(self.games, self.num_positions)],
         }
 
     @classmethod
     def deserialize(cls, serialized):
+        version = serialized.get('version', 1)
+        if version != INDEX_VERSION:
+            raise ValueError(
+                'The corpus index format changed (version %d, expected %d). '
+                'Rebuild the index with train.py index.' % (
+                    version, INDEX_VERSION))
         return cls(
             serialized['physical_files'],
             serialized['chunk_size'],
-            [Pointer.deserialize(raw_boundary) for raw_boundary in serialized['boundaries']])
+            [Pointer.deserialize(raw_boundary) for raw_boundary in serialized['boundaries']],
+            [SGFLocator.deserialize(raw_game) for raw_game in serialized['games']],
+            [raw_game['num_positions'] for raw_game in serialized['games']])
 
-    def get_chunk(self, chunk_number):
+    def chunk_games(self, chunk_number):
+        """Return the indices of the games that hold examples of a chunk."""
         assert 0 <= chunk_number < self.num_chunks
         chunk_start = self.boundaries[chunk_number]
-        iterator = iter(self._generate_examples(chunk_start.locator))
+        games = []
+        examples_needed = chunk_start.position + self.chunk_size
+        game = chunk_start.game
+        while examples_needed > 0 and game < len(self.games):
+            games.append(game)
+            examples_needed -= self.num_positions[game]
+            game += 1
+        return games
+
+    def get_chunk(self, chunk_number):
+        chunk_start = self.boundaries[chunk_number]
+        iterator = iter(self._generate_examples(self.chunk_games(chunk_number)))
         # Skip to the appropriate move in the current game.
         for _ in range(chunk_start.position):
             next(iterator)
         return itertools.islice(iterator, self.chunk_size)
 
-    def _generate_examples(self, start):
+    def _generate_examples(self, games):
         """
         Args:
-            start (SGFLocator)
+            games (list of int): indices of the games to replay
+        """
+        data_file = None
+        physical_file = None
+        try:
+            for game in games:
+                locator = self.games[game]
+                if locator.physical_file != physical_file:
+                    if data_file is not None:
+                        data_file.close()
+                    physical_file = locator.physical_file
+                    data_file = open_tarball_data(physical_file)
+                sgf = SGF(locator, locator.read(data_file))
+                for example in self._generate_game_examples(sgf):
+                    yield example
+        finally:
+            if data_file is not None:
+                data_file.close()
+
+    @staticmethod
+    def _generate_game_examples(sgf):
+        """Yield (snapshot, color, move) for every move of a game, with a
+        PositionSnapshot of the position before the move.
         """
-        start_file_idx = self.physical_files.index(start.physical_file)
-        for physical_file in self.physical_files[start_file_idx:]:
-            for sgf in self._generate_games(physical_file):
-                if sgf.locator < start:
+        board = Board(19, 19)
+        try:
+            game_record = read_game_record(sgf.contents)
+            # Set up the handicap.
+            if game_record.handicap:
+                for setup in game_record.setup_stones:
+                    for move in setup:
+                        board.place_stone(Player.black, _point(move))
+            ko_point = None
+            last_color = None
+            for color, move in game_record.moves:
+                if move is None:
+                    # Passes are no examples, and end a ko.
+                    ko_point = None
                     continue
-                board = Board(19, 19)
-                try:
-                    game_record = Sgf_game.from_string(sgf.contents)
-                    # Set up the handicap.
-                    if game_record.get_handicap() > 0:
-                        for setup in game_record.get_root().get_setup_stones():
-                            for move in setup:
-                                board.apply_move('b', move)
-                    for i, (color, move) in enumerate(_sequence(game_record)):
-                        yield copy.deepcopy(board), color, move
-                        if move is not None:
-                            board.apply_move(color, move)
-                except ValueError:
-                    print(("Invalid SGF data, skipping game record %s" % (sgf,)))
-                    print(("Board was:\n%s" % (board,)))
-
-    def _generate_games(self, physical_file):
-        with tarball_iterator(physical_file) as tarball:
-            for sgf in tarball:
-                yield sgf
+                player = _players[color]
+                yield (PositionSnapshot.from_board(
+                           board, player,
+                           ko_point if color != last_color else None),
+                       color, move)
+                board.place_stone(player, _point(move))
+                ko_point = board.ko_point()
+                last_color = color
+        except ValueError:
+            print(("Invalid SGF data, skipping game record %s" % (sgf,)))
+            print(("Board was:\n%s" % (board,)))
 
 
 class Pointer(object):
-    """Identifies a specific training example inside a corpus."""
-    def __init__(self, locator, position):
-        self.locator = locator
+    """Identifies a specific training example inside a corpus: a position
+    in a game of the index."""
+    def __init__(self, game, position):
+        self.game = game
         self.position = position
 
     def __str__(self):
-        return '%s:%d' % (self.locator, self.position)
+        return 'game %d:%d' % (self.game, self.position)
 
     def serialize(self):
         return {
-            'locator': self.locator.serialize(),
+            'game': self.game,
             'position': self.position,
         }
 
     @classmethod
     def deserialize(cls, serialized):
-        return cls(
-            SGFLocator.deserialize(serialized['locator']),
-            serialized['position']
-        )
+        return cls(serialized['game'], serialized['position'])
 
 
 def build_index(path, chunk_size):
@@ -128,25 +186,31 @@ def build_index(path, chunk_size):
     """
     physical_files = set()
     boundaries = []
+    games = []
+    num_positions = []
     examples_needed = 0
     for sgf in find_sgfs(path):
         physical_files.add(sgf.locator.physical_file)
+        game = len(games)
         if examples_needed == 0:
             # The start of this SGF is a chunk boundary.
-            boundaries.append(Pointer(sgf.locator, 0))
+            boundaries.append(Pointer(game, 0))
             examples_needed = chunk_size
-        game_record = Sgf_game.from_string(sgf.contents)
-        num_positions = len(_sequence(game_record))
-        if examples_needed < num_positions:
+        game_record = read_game_record(sgf.contents)
+        game_positions = len(_sequence(game_record))
+        games.append(sgf.locator)
+        num_positions.append(game_positions)
+        position = 0
+        while game_positions - position > examples_needed:
             # The start of the next chunk is inside this SGF.
-            boundaries.append(Pointer(sgf.locator, examples_needed))
-            remaining_examples = num_positions - examples_needed
-            examples_needed = chunk_size - remaining_examples
-        else:
-            # This SGF is entirely contained within the current chunk.
-            examples_needed -= num_positions
-
-    return CorpusIndex(physical_files, chunk_size, boundaries)
+            position += examples_needed
+            boundaries.append(Pointer(game, position))
+            examples_needed = chunk_size
+        # The rest of this SGF is contained within the current chunk.
+        examples_needed -= game_positions - position
+
+    return CorpusIndex(physical_files, chunk_size, boundaries, games,
+                       num_positions)
 
 
 def load_index(input_stream):
@@ -0,0 +1,84 @@
+import io
+import json
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+from dlgo.corpora import build_index, load_index, store_index
+from dlgo.data.processor_test import GAMES, write_archive
+from dlgo.gotypes import Player, Point
+
+# Moves of GAMES, without passes: 3, 2 and 2 positions.
+MOVES = [('b', (18, 0)), ('w', (17, 1)), ('b', (16, 2)),
+         ('w', (15, 3)), ('b', (3, 15)),
+         ('b', (0, 18)), ('w', (1, 17))]
+
+
+class BuildIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.archive = self.data_dir + '/KGS-test.tar.gz'
+        write_archive(self.archive, GAMES)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def read_chunks(self, index):
+        return [[(color, move) for _, color, move in index.get_chunk(i)]
+                for i in range(index.num_chunks)]
+
+    def test_boundaries(self):
+        index = build_index(self.archive, 4)
+        self.assertEqual([self.archive], index.physical_files)
+        self.assertEqual([(0, 0), (1, 1)],
+                         [(boundary.game, boundary.position)
+                          for boundary in index.boundaries])
+        self.assertEqual([3, 2, 2], index.num_positions)
+        self.assertEqual(['kgs-19-2001/%d.sgf' % i for i in range(3)],
+                         [locator.game_file for locator in index.games])
+        self.assertEqual([0, 1], index.chunk_games(0))
+        self.assertEqual([1, 2], index.chunk_games(1))
+
+    def test_long_game(self):
+        index = build_index(self.archive, 2)
+        self.assertEqual([(0, 0), (0, 2), (1, 1), (2, 1)],
+                         [(boundary.game, boundary.position)
+                          for boundary in index.boundaries])
+        self.assertEqual([MOVES[0:2], MOVES[2:4], MOVES[4:6], MOVES[6:]],
+                         self.read_chunks(index))
+
+    def test_get_chunk(self):
+        index = build_index(self.archive, 4)
+        self.assertEqual([MOVES[:4], MOVES[4:]], self.read_chunks(index))
+        # The second chunk starts after white's first move in the
+        # handicap game.
+        board, _, _ = next(index.get_chunk(1))
+        self.assertEqual(Player.black, board.next_player)
+        self.assertEqual(Player.black, board.get(Point(16, 16)))
+        self.assertEqual(Player.black, board.get(Point(4, 4)))
+        self.assertEqual(Player.white, board.get(Point(16, 4)))
+        self.assertIsNone(board.get(Point(4, 16)))
+
+    def test_uncompressed_and_stored(self):
+        tar_path = self.data_dir + '/KGS-test.tar'
+        with tarfile.open(self.archive) as source, \
+                tarfile.open(tar_path, 'w') as target:
+            for member in source:
+                target.addfile(member, source.extractfile(member))
+        index = build_index(tar_path, 4)
+        stored = io.StringIO()
+        store_index(index, stored)
+        stored.seek(0)
+        index = load_index(stored)
+        self.assertEqual([MOVES[:4], MOVES[4:]], self.read_chunks(index))
+
+    def test_old_index_format(self):
+        serialized = build_index(self.archive, 4).serialize()
+        del serialized['version']
+        with self.assertRaises(ValueError):
+            load_index(io.StringIO(json.dumps(serialized)))
+
+
+if __name__ == '__main__':
+    unittest.main()
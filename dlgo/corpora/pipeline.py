@@ -0,0 +1,167 @@
+"""Prepare the training chunks of a corpus index in worker processes.
+
+A pool of long-lived workers encodes chunks into shared memory slots
+and hands back only the slot number, so the arrays are never pickled.
+The workers keep preparing the following chunks while the trainer fits
+one; chunks come out in order, each as soon as it is ready.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import multiprocessing
+import signal
+import time
+import traceback
+from collections import namedtuple
+
+import numpy as np
+import six.moves.queue as queue
+
+from ..gotypes import Point
+
+__all__ = [
+    'ChunkPipeline',
+    'ChunkTiming',
+    'encode_chunk',
+]
+
+# worker: number of the worker that prepared the chunk
+# worker_idle: seconds the worker waited for this task
+# prepare: seconds the worker took to encode the chunk
+# trainer_idle: seconds the consumer waited for the chunk
+ChunkTiming = namedtuple(
+    'ChunkTiming', 'worker worker_idle prepare trainer_idle')
+
+
+def encode_chunk(examples, encoder, features, labels):
+    """Encode the (snapshot, color, move) examples of a chunk into the
+    first rows of features and labels. Returns the number of examples.
+    """
+    num_examples = 0
+    for board_tensor, (snapshot, _, move) in zip(features, examples):
+        board_tensor[...] = 0
+        encoder.encode_into(snapshot, board_tensor)
+        row, col = move
+        labels[num_examples] = encoder.encode_point(Point(row + 1, col + 1))
+        num_examples += 1
+    return num_examples
+
+
+def _slot_arrays(buffers, dtype, shape):
+    return [np.frombuffer(buf, dtype=dtype).reshape(shape) for buf in buffers]
+
+
+def _worker(worker_idx, corpus_index, encoder, feature_buffers,
+            label_buffers, tasks, results):
+    # Make sure ^C gets handled in the main process.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    chunk_size = corpus_index.chunk_size
+    features = _slot_arrays(feature_buffers, np.float32,
+                            (chunk_size,) + tuple(encoder.shape()))
+    labels = _slot_arrays(label_buffers, np.int16, (chunk_size,))
+    wait_start = time.time()
+    for sequence, chunk_number, slot in iter(tasks.get, None):
+        start = time.time()
+        try:
+            result = encode_chunk(corpus_index.get_chunk(chunk_number),
+                                  encoder, features[slot], labels[slot])
+        except Exception:
+            result = traceback.format_exc()
+        done = time.time()
+        results.put((sequence, chunk_number, slot, result,
+                     ChunkTiming(worker_idx, start - wait_start,
+                                 done - start, None)))
+        wait_start = done
+
+
+class ChunkPipeline(object):
+    """Encode the chunks of a CorpusIndex in num_workers processes.
+
+    Every worker gets slots_per_worker shared memory slots' worth of
+    chunks to work ahead. Use as a context manager around chunks().
+    """
+    def __init__(self, corpus_index, encoder, num_workers=1,
+                 slots_per_worker=2):
+        self.corpus_index = corpus_index
+        self.encoder = encoder
+        self.num_workers = num_workers
+        num_slots = slots_per_worker * num_workers
+        chunk_size = corpus_index.chunk_size
+        feature_shape = (chunk_size,) + tuple(encoder.shape())
+        self._feature_buffers = [
+            multiprocessing.RawArray('f', int(np.prod(feature_shape)))
+            for _ in range(num_slots)]
+        self._label_buffers = [multiprocessing.RawArray('h', chunk_size)
+                               for _ in range(num_slots)]
+        self.features = _slot_arrays(self._feature_buffers, np.float32,
+                                     feature_shape)
+        self.labels = _slot_arrays(self._label_buffers, np.int16,
+                                   (chunk_size,))
+        self._tasks = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        self._workers = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        for worker_idx in range(self.num_workers):
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(worker_idx, self.corpus_index, self.encoder,
+                      self._feature_buffers, self._label_buffers,
+                      self._tasks, self._results))
+            process.daemon = True
+            process.start()
+            self._workers.append(process)
+
+    def close(self):
+        for _ in self._workers:
+            self._tasks.put(None)
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+
+    def chunks(self, first_chunk=0):
+        """Yield (chunk number, features, labels, timing) for every chunk
+        from first_chunk on, wrapping around at the end of the index.
+
+        features and labels are views of a shared memory slot, valid
+        until the next chunk is requested; labels are point indices.
+        """
+        num_chunks = self.corpus_index.num_chunks
+        free_slots = list(range(len(self.features)))
+        ready = {}
+        next_task = 0
+        expected = 0
+        while True:
+            # Tasks carry a sequence number, since a small index can
+            # have the same chunk in flight twice.
+            while free_slots:
+                self._tasks.put((next_task,
+                                 (first_chunk + next_task) % num_chunks,
+                                 free_slots.pop()))
+                next_task += 1
+            wait_start = time.time()
+            while expected not in ready:
+                try:
+                    result = self._results.get(timeout=1)
+                except queue.Empty:
+                    if not all(p.is_alive() for p in self._workers):
+                        raise RuntimeError('A chunk worker died')
+                    continue
+                ready[result[0]] = result
+            _, chunk_number, slot, result, timing = ready.pop(expected)
+            if not isinstance(result, int):
+                raise RuntimeError('Preparing chunk %d failed:\n%s' % (
+                    chunk_number, result))
+            timing = timing._replace(trainer_idle=time.time() - wait_start)
+            yield (chunk_number, self.features[slot][:result],
+                   self.labels[slot][:result], timing)
+            free_slots.append(slot)
+            expected += 1
@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from dlgo.corpora import ChunkPipeline, build_index, encode_chunk
+from dlgo.data.processor_test import GAMES, write_archive
+from dlgo.encoders.betago import BetaGoEncoder
+
+
+class ChunkPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.archive = self.data_dir + '/KGS-test.tar.gz'
+        write_archive(self.archive, GAMES)
+        self.index = build_index(self.archive, 2)
+        self.encoder = BetaGoEncoder((19, 19))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def encode(self, chunk_number):
+        features = np.zeros((2, 7, 19, 19), dtype=np.float32)
+        labels = np.zeros(2, dtype=np.int16)
+        num_examples = encode_chunk(self.index.get_chunk(chunk_number),
+                                    self.encoder, features, labels)
+        return features[:num_examples], labels[:num_examples]
+
+    def test_chunks_in_order(self):
+        # 4 chunks, from the third one on and wrapping around.
+        expected = [2, 3, 0, 1, 2, 3]
+        with ChunkPipeline(self.index, self.encoder, num_workers=2,
+                           slots_per_worker=1) as pipeline:
+            chunks = pipeline.chunks(2)
+            for chunk_number in expected:
+                number, features, labels, timing = next(chunks)
+                self.assertEqual(chunk_number, number)
+                want_features, want_labels = self.encode(chunk_number)
+                self.assertTrue(np.array_equal(want_features, features))
+                self.assertEqual(want_labels.tolist(), labels.tolist())
+                self.assertIn(timing.worker, (0, 1))
+                self.assertGreaterEqual(timing.trainer_idle, 0)
+        self.assertEqual([342, 324], self.encode(0)[1].tolist())
+
+    def test_failure(self):
+        self.index.games[0].archive_path = self.data_dir + '/missing.tar'
+        with ChunkPipeline(self.index, self.encoder) as pipeline:
+            with self.assertRaises(RuntimeError):
+                next(pipeline.chunks())
+
+
+if __name__ == '__main__':
+    unittest.main()
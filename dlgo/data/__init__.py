@@ -1,3 +1,4 @@
+from .compact import *
 from .generator import *
 from .index_processor import *
 from .parallel_processor import *
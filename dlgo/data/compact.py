@@ -0,0 +1,148 @@
+"""Compact on-disk format for encoded training data.
+
+Most encoders produce planes of 0s and 1s, so a chunk of features is
+stored with its bits packed into uint8, one row of bytes per example.
+Encoders with other values, such as the -1 of the one-plane encoder,
+set binary_planes = False and are stored as one int8 per value. The
+format is fixed per encoder, never per chunk, so the chunks of a shard
+can be concatenated. Labels are int16 point indices rather than one-hot
+rows. Both are expanded to float32 only when a batch is needed.
+"""
+import numpy as np
+
+__all__ = [
+    'NUM_SYMMETRIES',
+    'ChunkWriter',
+    'compress_features',
+    'expand_features',
+    'compress_labels',
+    'dihedral_transform',
+    'augment',
+]
+
+NUM_SYMMETRIES = 8
+
+
+def _int8_values(features):
+    stored = np.asarray(features).astype(np.int8)
+    if not (stored == features).all():
+        raise ValueError('Feature values must be integers from -128 to 127')
+    return stored
+
+
+def compress_features(features, binary=True):
+    """Return the compact form of a (num_examples, ...) feature array,
+    bit-packed if binary, else int8. Raises ValueError for values the
+    format can't hold.
+    """
+    num_examples = features.shape[0]
+    if not binary:
+        return _int8_values(features)
+    if not ((features == 0) | (features == 1)).all():
+        raise ValueError('Binary features must be 0 or 1')
+    bits = features.reshape((num_examples, -1)).astype(np.uint8)
+    return np.packbits(bits, axis=1)
+
+
+def expand_features(stored, shape, dtype=np.float32):
+    """Undo compress_features for examples of the given shape.
+
+    Chunks written as plain float arrays by older versions are
+    converted as they are.
+    """
+    if stored.dtype == np.uint8 and stored.ndim == 2:
+        size = int(np.prod(shape))
+        bits = np.unpackbits(stored, axis=1, count=size)
+        return bits.reshape((len(stored),) + tuple(shape)).astype(dtype)
+    return stored.astype(dtype)
+
+
+def compress_labels(labels):
+    """Point indices fit in int16 for any board up to 181x181."""
+    return np.asarray(labels).astype(np.int16)
+
+
+class ChunkWriter():
+    """Encodes examples into a fixed buffer and saves it as a compact
+    chunk each time it fills up: <file_base>_features_<n>.npy and
+    <file_base>_labels_<n>.npy.
+    """
+    def __init__(self, file_base, encoder, chunk_size=1024):
+        self.file_base = file_base
+        self.encoder = encoder
+        self.chunk_size = chunk_size
+        self.features = np.zeros(
+            (chunk_size,) + tuple(encoder.shape()), dtype=np.int8)
+        self.labels = np.zeros((chunk_size,), dtype=np.int16)
+        self.num_buffered = 0
+        self.num_chunks = 0
+        self.num_examples = 0
+
+    def add(self, game_states, labels):
+        """Encode game_states[i] with label labels[i]."""
+        start = 0
+        while start < len(game_states):
+            num = min(len(game_states) - start,
+                      self.chunk_size - self.num_buffered)
+            rows = slice(self.num_buffered, self.num_buffered + num)
+            # Encoded as float32 first, so that values int8 can't hold
+            # raise instead of being truncated.
+            self.features[rows] = _int8_values(
+                self.encoder.encode_batch(game_states[start:start + num]))
+            self.labels[rows] = labels[start:start + num]
+            self.num_buffered += num
+            self.num_examples += num
+            start += num
+            if self.num_buffered == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Save the buffered examples, if any, as a chunk."""
+        if self.num_buffered == 0:
+            return
+        chunk = self.num_chunks
+        np.save('%s_features_%d' % (self.file_base, chunk),
+                compress_features(self.features[:self.num_buffered],
+                                  self.encoder.binary_planes))
+        np.save('%s_labels_%d' % (self.file_base, chunk),
+                self.labels[:self.num_buffered])
+        self.num_chunks += 1
+        self.num_buffered = 0
+
+
+def dihedral_transform(planes, symmetry):
+    """Apply one of the 8 symmetries of the square, numbered 0 to 7, to
+    the last two axes of `planes`. Symmetry 0 is the identity.
+    """
+    if symmetry >= 4:
+        planes = planes[..., ::-1]
+    return np.rot90(planes, symmetry % 4, axes=(-2, -1))
+
+
+def augment(features, labels, symmetries=None):
+    """Apply a symmetry to each example of a batch.
+
+    features has shape (num_examples, num_planes, size, size), labels
+    holds point indices row * size + col. By default every example gets
+    a random symmetry. Returns new (features, labels) arrays.
+    """
+    num_examples, _, num_rows, num_cols = features.shape
+    if num_rows != num_cols:
+        raise ValueError('Symmetries need a square board')
+    if symmetries is None:
+        symmetries = np.random.randint(NUM_SYMMETRIES, size=num_examples)
+    grid = np.arange(num_rows * num_cols).reshape((num_rows, num_cols))
+    new_features = np.empty_like(features)
+    new_labels = np.empty_like(labels)
+    for symmetry in range(NUM_SYMMETRIES):
+        examples = np.nonzero(symmetries == symmetry)[0]
+        if len(examples) == 0:
+            continue
+        new_features[examples] = dihedral_transform(
+            features[examples], symmetry)
+        # The transformed grid lists the old index of every new point;
+        # invert it to look up where each label moves to.
+        old_indices = dihedral_transform(grid, symmetry).ravel()
+        new_indices = np.argsort(old_indices)
+        new_labels[examples] = new_indices[labels[examples]]
+    return new_features, new_labels
@@ -0,0 +1,110 @@
+import random
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from dlgo import goboard_fast
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.data.compact import NUM_SYMMETRIES, ChunkWriter, augment, \
+    compress_features, compress_labels, dihedral_transform, expand_features
+from dlgo.encoders.oneplane import OnePlaneEncoder
+from dlgo.encoders.sevenplane import SevenPlaneEncoder
+
+
+def random_game_states(num_moves):
+    random.seed(0)
+    bot = FastRandomBot()
+    game_states = [goboard_fast.GameState.new_game(5)]
+    for _ in range(num_moves):
+        game = game_states[-1]
+        game_states.append(game.apply_move(bot.select_move(game)))
+    return game_states
+
+
+class CompactTest(unittest.TestCase):
+    def test_round_trip(self):
+        game_states = random_game_states(20)
+        for encoder in (SevenPlaneEncoder((5, 5)), OnePlaneEncoder((5, 5))):
+            features = encoder.encode_batch(game_states)
+            stored = compress_features(features, encoder.binary_planes)
+            expanded = expand_features(stored, encoder.shape())
+            self.assertEqual(np.float32, expanded.dtype)
+            np.testing.assert_array_equal(features, expanded)
+
+    def test_binary_planes_are_packed(self):
+        encoder = SevenPlaneEncoder((5, 5))
+        features = encoder.encode_batch(random_game_states(20))
+        stored = compress_features(features)
+        self.assertEqual(np.uint8, stored.dtype)
+        self.assertEqual((21, 22), stored.shape)
+        self.assertEqual(np.int16, compress_labels([24, 3]).dtype)
+
+    def test_values_that_do_not_fit(self):
+        with self.assertRaises(ValueError):
+            compress_features(-np.ones((2, 1, 5, 5)))
+        with self.assertRaises(ValueError):
+            compress_features(np.full((2, 1, 5, 5), 0.5), binary=False)
+        with self.assertRaises(ValueError):
+            compress_features(np.full((2, 1, 5, 5), 200), binary=False)
+
+    def test_old_float_chunks(self):
+        features = np.random.randint(2, size=(3, 2, 5, 5)).astype(np.float64)
+        np.testing.assert_array_equal(
+            features, expand_features(features, (2, 5, 5)))
+
+    def test_symmetries(self):
+        board = np.arange(9).reshape((3, 3))
+        boards = set()
+        for symmetry in range(NUM_SYMMETRIES):
+            boards.add(tuple(dihedral_transform(board, symmetry).ravel()))
+        self.assertEqual(NUM_SYMMETRIES, len(boards))
+        np.testing.assert_array_equal(board, dihedral_transform(board, 0))
+
+    def test_augment_moves_labels_with_planes(self):
+        # Put each example's label on a plane of its own, so the label
+        # has to end up where that plane's stone does.
+        labels = np.array([0, 1, 7, 12, 18, 24, 3, 9])
+        features = np.zeros((len(labels), 2, 5, 5), dtype=np.float32)
+        features[np.arange(len(labels)), 0, labels // 5, labels % 5] = 1
+        features[:, 1, 0, 1] = 1
+        symmetries = np.arange(len(labels))
+        new_features, new_labels = augment(features, labels, symmetries)
+        label_planes = new_features[:, 0].reshape((len(labels), -1))
+        self.assertEqual(
+            new_labels.tolist(), label_planes.argmax(axis=1).tolist())
+        for i, symmetry in enumerate(symmetries):
+            np.testing.assert_array_equal(
+                dihedral_transform(features[i], symmetry), new_features[i])
+
+
+class ChunkWriterTest(unittest.TestCase):
+    def test_chunks(self):
+        game_states = random_game_states(9)
+        encoder = SevenPlaneEncoder((5, 5))
+        data_dir = tempfile.mkdtemp()
+        try:
+            writer = ChunkWriter(data_dir + '/test', encoder, chunk_size=4)
+            writer.add(game_states[:3], list(range(3)))
+            writer.add(game_states[3:], list(range(3, 10)))
+            self.assertEqual(2, writer.num_chunks)
+            writer.flush()
+            self.assertEqual(3, writer.num_chunks)
+            labels = [np.load('%s/test_labels_%d.npy' % (data_dir, chunk))
+                      for chunk in range(3)]
+            self.assertEqual([4, 4, 2], [len(chunk) for chunk in labels])
+            self.assertEqual(list(range(10)), np.concatenate(labels).tolist())
+            features = np.concatenate([
+                expand_features(
+                    np.load('%s/test_features_%d.npy' % (data_dir, chunk)),
+                    encoder.shape())
+                for chunk in range(3)])
+            np.testing.assert_array_equal(
+                encoder.encode_batch(game_states), features)
+        finally:
+            shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,50 +1,118 @@
 # tag::data_generator[]
-import glob
+import threading
+
 import numpy as np
 from keras.utils import to_categorical
+from six.moves import queue
+
+from dlgo.data import compact
 
 
 class DataGenerator:
-    def __init__(self, data_directory, samples):
+    def __init__(self, data_directory, samples, segments, feature_shape=None,
+                 augment=False, data_type='train', shuffle_buffer=0,
+                 prefetch=2):
         self.data_directory = data_directory
-        self.samples = samples
-        self.files = set(file_name for file_name, index in samples)  # <1>
-        self.num_samples = None
-
-    def get_num_samples(self, batch_size=128, num_classes=19 * 19):  # <2>
-        if self.num_samples is not None:
-            return self.num_samples
-        else:
-            self.num_samples = 0
-            for X, y in self._generate(batch_size=batch_size, num_classes=num_classes):
-                self.num_samples += X.shape[0]
-            return self.num_samples
-# <1> Our generator has access to a set of files that we sampled earlier.
-# <2> Depending on the application, we may need to know how many examples we have.
+        self.samples = samples  # <1>
+        self.feature_shape = feature_shape  # <2>
+        self.augment = augment  # <3>
+        self.data_type = data_type
+        self.shuffle_buffer = shuffle_buffer  # <4>
+        self.prefetch = prefetch  # <5>
+        self.chunks = segments  # <6>
+        self.num_samples = sum(end - start for _, _, start, end in segments)
+
+    def get_num_samples(self, batch_size=128, num_classes=19 * 19):  # <7>
+        return self.num_samples // batch_size * batch_size
+# <1> Our generator has access to the games that we sampled earlier.
+# <2> Features are stored compactly; the encoder's shape tells us how to unpack them.
+# <3> Optionally, every example gets a random rotation or reflection of the board.
+# <4> With a shuffle buffer, chunks are visited in random order and examples are mixed across chunks.
+# <5> A background thread keeps this many batches ready.
+# <6> The sampled games are read from rows of the manifest's shards, see ShardManifest.segments.
+# <7> The chunk index tells us how many examples we have, without reading them.
 # end::data_generator[]
 
 # tag::private_generate[]
     def _generate(self, batch_size, num_classes):
-        for zip_file_name in self.files:
-            file_name = zip_file_name.replace('.tar.gz', '') + 'train'
-            base = self.data_directory + '/' + file_name + '_features_*.npy'
-            for feature_file in glob.glob(base):
-                label_file = feature_file.replace('features', 'labels')
-                x = np.load(feature_file)
-                y = np.load(label_file)
-                x = x.astype('float32')
-                y = to_categorical(y.astype(int), num_classes)
-                while x.shape[0] >= batch_size:
-                    x_batch, x = x[:batch_size], x[batch_size:]
-                    y_batch, y = y[:batch_size], y[batch_size:]
-                    yield x_batch, y_batch  # <1>
-
-# <1> We return or "yield" batches of data as we go.
+        chunks = list(self.chunks)
+        if self.shuffle_buffer > 0:
+            np.random.shuffle(chunks)
+        buffered_x, buffered_y = [], []
+        num_buffered = 0
+        for i, (feature_file, label_file, start, end) in enumerate(chunks):
+            buffered_x.append(
+                np.load(feature_file, mmap_mode='r')[start:end])  # <1>
+            buffered_y.append(np.load(label_file, mmap_mode='r')[start:end])
+            num_buffered += end - start
+            is_last = i == len(chunks) - 1
+            if num_buffered < max(batch_size, self.shuffle_buffer) and \
+                    not is_last:
+                continue
+            x = np.concatenate(buffered_x)  # <2>
+            y = np.concatenate(buffered_y).astype(int)
+            if self.shuffle_buffer > 0:
+                order = np.random.permutation(len(x))
+                x, y = x[order], y[order]
+            num_batches = len(x) // batch_size
+            for batch_idx in range(num_batches):
+                batch = slice(batch_idx * batch_size,
+                              (batch_idx + 1) * batch_size)
+                yield self._expand(x[batch], y[batch], num_classes)  # <3>
+            rest = slice(num_batches * batch_size, None)
+            buffered_x, buffered_y = [x[rest]], [y[rest]]
+            num_buffered = len(buffered_x[0])
+
+    def _expand(self, x_batch, y_batch, num_classes):
+        x_batch = compact.expand_features(x_batch, self.feature_shape)
+        if self.augment:
+            x_batch, y_batch = compact.augment(x_batch, y_batch)
+        return x_batch, to_categorical(y_batch, num_classes)
+
+# <1> Chunks are memory-mapped, so only the examples we use get read.
+# <2> Buffered chunks are joined while still compact...
+# <3> ... and only the current batch is expanded to float32.
 # end::private_generate[]
 
 # tag::generate[]
     def generate(self, batch_size=128, num_classes=19 * 19):
-        while True:
-            for item in self._generate(batch_size, num_classes):
+        if self.get_num_samples(batch_size) == 0:
+            raise ValueError('Not enough examples for a single batch')
+        if self.prefetch <= 0:
+            while True:
+                for item in self._generate(batch_size, num_classes):
+                    yield item
+        batches = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self._prefetch,
+            args=(batches, stop, batch_size, num_classes))
+        worker.daemon = True
+        worker.start()
+        try:
+            while True:
+                item = batches.get()
+                if isinstance(item, Exception):
+                    raise item
                 yield item
+        finally:
+            stop.set()  # <1>
+
+    def _prefetch(self, batches, stop, batch_size, num_classes):
+        """Fill `batches` from a background thread until `stop` is set."""
+        try:
+            while True:
+                for item in self._generate(batch_size, num_classes):
+                    while not stop.is_set():
+                        try:
+                            batches.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+                    if stop.is_set():
+                        return
+        except Exception as e:
+            batches.put(e)
+
+# <1> Once the consumer drops the generator, the prefetch thread finishes.
 # end::generate[]
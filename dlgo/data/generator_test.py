@@ -0,0 +1,103 @@
+import itertools
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from dlgo.data.compact import compress_features, compress_labels
+from dlgo.data.generator import DataGenerator
+from dlgo.data.manifest import ShardManifest
+
+SHAPE = (2, 7, 7)
+
+
+class TinyEncoder():
+    version = 1
+
+    def name(self):
+        return 'tiny'
+
+    def shape(self):
+        return SHAPE
+
+
+class DataGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        # Shards of three archives, with chunks of 10, 10 and 7
+        # examples, written as the processors write them. Each
+        # example's label is its position in the data set, and its
+        # first plane marks that same point.
+        self.data_dir = tempfile.mkdtemp()
+        self.manifest = ShardManifest(self.data_dir, TinyEncoder())
+        self.samples = []
+        label = 0
+        for name, sizes in (('a', [10, 10]), ('b', [7]), ('c', [])):
+            archive = 'KGS-%s.tar.gz' % name
+            self.samples.append((archive, 0))
+            file_base = self.manifest.file_base(archive, [0])
+            for chunk, size in enumerate(sizes):
+                labels = np.arange(label, label + size)
+                label += size
+                features = np.zeros((size,) + SHAPE)
+                features[np.arange(size), 0, labels // 7, labels % 7] = 1
+                base = '%s/%s_%%s_%d' % (self.data_dir, file_base, chunk)
+                np.save(base % 'features', compress_features(features))
+                np.save(base % 'labels', compress_labels(labels))
+            self.manifest.add(archive, file_base, [0], [sum(sizes)],
+                              chunk_size=10)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def generator(self, samples=None, **kwargs):
+        samples = samples or self.samples
+        return DataGenerator(self.data_dir, samples,
+                             self.manifest.segments(samples), SHAPE, **kwargs)
+
+    def epoch(self, generator, batch_size):
+        num_batches = generator.get_num_samples(batch_size) // batch_size
+        batches = list(itertools.islice(
+            generator.generate(batch_size, 49), num_batches))
+        for x, y in batches:
+            self.assertEqual((batch_size,) + SHAPE, x.shape)
+            self.assertEqual(np.float32, x.dtype)
+            # The label still matches the features.
+            np.testing.assert_array_equal(
+                y, x[:, 0].reshape((batch_size, -1)))
+        return [int(label) for _, y in batches for label in y.argmax(axis=1)]
+
+    def test_num_samples(self):
+        generator = self.generator()
+        self.assertEqual(27, generator.num_samples)
+        self.assertEqual(24, generator.get_num_samples(batch_size=4))
+        b_only = self.generator([('KGS-b.tar.gz', 0)])
+        self.assertEqual(7, b_only.num_samples)
+
+    def test_batches_cross_chunks(self):
+        for prefetch in (0, 2):
+            generator = self.generator(prefetch=prefetch)
+            self.assertEqual(list(range(24)), self.epoch(generator, 8))
+
+    def test_shuffle(self):
+        np.random.seed(0)
+        generator = self.generator(shuffle_buffer=15)
+        labels = self.epoch(generator, 3)
+        self.assertEqual(27, len(labels))
+        self.assertEqual(list(range(27)), sorted(labels))
+        self.assertNotEqual(list(range(27)), labels)
+
+    def test_augment(self):
+        np.random.seed(1)
+        generator = self.generator(augment=True)
+        labels = self.epoch(generator, 9)
+        self.assertNotEqual(list(range(27)), labels)
+
+    def test_not_enough_examples(self):
+        generator = self.generator()
+        with self.assertRaises(ValueError):
+            next(generator.generate(batch_size=100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""Record of the encoded game shards in a data directory.
+
+A shard holds the examples of a batch of games from one archive, for
+one encoder. Its files are named after a hash of what went into it,
+shard-<key>_features_<chunk>.npy and shard-<key>_labels_<chunk>.npy,
+and data/manifest.json lists every shard with the examples each game
+contributed: a line with the format version, then one line of JSON per
+shard, appended as the shard is recorded. A build asks the manifest which sampled games are still
+missing, encodes only those, and records every shard as soon as it is
+written, so an interrupted build picks up where it stopped. Training
+data is read straight from the shards.
+"""
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+__all__ = [
+    'ShardManifest',
+]
+
+# Version 1 was a single JSON document, rewritten for every shard.
+MANIFEST_VERSION = 2
+
+
+class ShardManifest():
+    def __init__(self, data_directory, encoder):
+        self.data_directory = data_directory
+        self.path = os.path.join(data_directory, 'manifest.json')
+        # Shards of other encoders, or of older versions of this one,
+        # are kept in the manifest but never used.
+        self.encoder_key = {
+            'encoder': encoder.name(),
+            'encoder_version': encoder.version,
+            'shape': [int(dim) for dim in encoder.shape()],
+        }
+        self.shards = []
+        if os.path.exists(self.path):
+            self._load()
+        # archive -> game index -> (file base, chunk size, first row,
+        # end row)
+        self.games = {}
+        for shard in self.shards:
+            if self._matches(shard):
+                self._index_shard(shard)
+
+    def _load(self):
+        with open(self.path) as manifest_file:
+            lines = manifest_file.read().splitlines()
+        header = json.loads(lines[0])
+        version = header.get('version')
+        if version == 1:
+            self.shards = header['shards']
+            self.save()
+            return
+        if version != MANIFEST_VERSION:
+            raise ValueError(
+                'The shard manifest format changed (version %s, '
+                'expected %d). Remove %s and its shard files to '
+                'rebuild the data.' % (version, MANIFEST_VERSION, self.path))
+        for i, line in enumerate(lines[1:]):
+            try:
+                self.shards.append(json.loads(line))
+            except ValueError:
+                if i < len(lines) - 2:
+                    raise
+                # A build was interrupted while recording its last
+                # shard; drop the partial line, the shard is an orphan.
+                self.save()
+
+    def _matches(self, shard):
+        return all(shard[key] == value
+                   for key, value in self.encoder_key.items())
+
+    def _index_shard(self, shard):
+        games = self.games.setdefault(shard['archive'], {})
+        row = 0
+        for index, num_examples in shard['games']:
+            games[index] = (shard['file_base'], shard['chunk_size'],
+                            row, row + num_examples)
+            row += num_examples
+
+    def missing_games(self, samples):
+        """Return the (archive, game index) samples that aren't encoded
+        yet, without duplicates, in sorted order.
+        """
+        return sorted(set(
+            (archive, index) for archive, index in samples
+            if index not in self.games.get(archive, {})))
+
+    def plan(self, samples, games_per_shard=100):
+        """Split the missing games into new shards of at most
+        games_per_shard games from one archive each. Returns a list of
+        (archive, file base, game indices).
+
+        The same missing games are always split the same way, into
+        shards with the same names.
+        """
+        indices_by_archive = {}
+        for archive, index in self.missing_games(samples):
+            indices_by_archive.setdefault(archive, []).append(index)
+        shards = []
+        for archive in sorted(indices_by_archive):
+            indices = indices_by_archive[archive]
+            for start in range(0, len(indices), games_per_shard):
+                games = indices[start:start + games_per_shard]
+                shards.append((archive, self.file_base(archive, games),
+                               games))
+        return shards
+
+    def file_base(self, archive, games):
+        content = json.dumps([archive, games, self.encoder_key],
+                             sort_keys=True)
+        return 'shard-' + hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def add(self, archive, file_base, games, num_examples, chunk_size):
+        """Record a shard that has been written and append it to the
+        manifest file. num_examples[i] is the number of examples of games[i], and
+        chunk_size the chunk size of the ChunkWriter that wrote it.
+        """
+        shard = dict(self.encoder_key)
+        shard.update({
+            'archive': archive,
+            'file_base': file_base,
+            'chunk_size': chunk_size,
+            'games': [[index, count]
+                      for index, count in zip(games, num_examples)],
+        })
+        if not os.path.exists(self.path):
+            self.save()
+        with open(self.path, 'a') as manifest_file:
+            manifest_file.write(json.dumps(shard) + '\n')
+        self.shards.append(shard)
+        self._index_shard(shard)
+
+    def save(self):
+        """Rewrite the whole manifest file."""
+        # Write a new file and move it in place, so an interrupted save
+        # leaves the old manifest intact.
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as manifest_file:
+            manifest_file.write(
+                json.dumps({'version': MANIFEST_VERSION}) + '\n')
+            for shard in self.shards:
+                manifest_file.write(json.dumps(shard) + '\n')
+        os.replace(temp_path, self.path)
+
+    def remove_orphans(self, file_bases):
+        """Delete the files of the given shards if the manifest doesn't
+        know them, which an interrupted build that planned the same
+        shards left behind. Only pass the shards about to be written:
+        files of other shards may belong to a build that is running in
+        the same directory and hasn't recorded them yet.
+        """
+        known = set(shard['file_base'] for shard in self.shards)
+        for file_base in file_bases:
+            if file_base in known:
+                continue
+            pattern = os.path.join(self.data_directory, file_base + '_*.npy')
+            for path in glob.glob(pattern):
+                os.remove(path)
+
+    def segments(self, samples):
+        """Return the rows holding the examples of the sampled games, in
+        order of archive and game index, as a list of (feature file,
+        label file, first row, end row), one per run of consecutive
+        rows in a chunk file.
+        """
+        rows = []
+        for archive, index in sorted(set(samples)):
+            try:
+                rows.append(self.games[archive][index])
+            except KeyError:
+                raise KeyError('Game %d of %s has not been encoded' % (
+                    index, archive))
+        segments = []
+        for file_base, chunk_size, start, end in rows:
+            while start < end:
+                chunk = start // chunk_size
+                stop = min(end, (chunk + 1) * chunk_size)
+                base = os.path.join(self.data_directory, file_base)
+                segment = ('%s_features_%d.npy' % (base, chunk),
+                           '%s_labels_%d.npy' % (base, chunk),
+                           start - chunk * chunk_size,
+                           stop - chunk * chunk_size)
+                if segments and segments[-1][0] == segment[0] and \
+                        segments[-1][3] == segment[2]:
+                    # Continues the previous segment.
+                    segments[-1] = segments[-1][:3] + (segment[3],)
+                else:
+                    segments.append(segment)
+                start = stop
+        return segments
+
+    def load(self, samples):
+        """Return the compact (features, labels) of the sampled games."""
+        features, labels = [], []
+        for feature_file, label_file, start, end in self.segments(samples):
+            features.append(np.load(feature_file, mmap_mode='r')[start:end])
+            labels.append(np.load(label_file, mmap_mode='r')[start:end])
+        return np.concatenate(features), np.concatenate(labels)
@@ -0,0 +1,146 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from dlgo import goboard_fast
+from dlgo.data.compact import ChunkWriter, expand_features
+from dlgo.data.manifest import ShardManifest
+from dlgo.encoders.oneplane import OnePlaneEncoder
+from dlgo.encoders.sevenplane import SevenPlaneEncoder
+from dlgo.gotypes import Point
+
+
+class ShardManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.encoder = OnePlaneEncoder((19, 19))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_plan(self):
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        samples = [('b.tar.gz', 4), ('a.tar.gz', 7), ('b.tar.gz', 0),
+                   ('b.tar.gz', 2), ('b.tar.gz', 4)]
+        plan = manifest.plan(samples, games_per_shard=2)
+        self.assertEqual(
+            [('a.tar.gz', [7]), ('b.tar.gz', [0, 2]), ('b.tar.gz', [4])],
+            [(archive, games) for archive, _, games in plan])
+        self.assertEqual(plan, manifest.plan(samples, games_per_shard=2))
+        self.assertEqual(3, len(set(file_base for _, file_base, _ in plan)))
+
+        archive, file_base, games = plan[1]
+        manifest.add(archive, file_base, games, [10, 20], 1024)
+        self.assertEqual(
+            [('a.tar.gz', [7]), ('b.tar.gz', [4])],
+            [(archive, games) for archive, _, games
+             in manifest.plan(samples, games_per_shard=2)])
+
+    def test_saved_per_encoder(self):
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        manifest.add('a.tar.gz', 'shard-x', [0, 1], [5, 6], 1024)
+        reloaded = ShardManifest(self.data_dir, self.encoder)
+        self.assertEqual([], reloaded.missing_games([('a.tar.gz', 1)]))
+        other = ShardManifest(self.data_dir, SevenPlaneEncoder((19, 19)))
+        self.assertEqual([('a.tar.gz', 1)],
+                         other.missing_games([('a.tar.gz', 1)]))
+
+        class NewerEncoder(OnePlaneEncoder):
+            version = OnePlaneEncoder.version + 1
+        newer = ShardManifest(self.data_dir, NewerEncoder((19, 19)))
+        self.assertEqual([('a.tar.gz', 1)],
+                         newer.missing_games([('a.tar.gz', 1)]))
+
+    def test_appends_shards(self):
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        for index in range(3):
+            manifest.add('a.tar.gz', 'shard-%d' % index, [index], [5], 1024)
+        path = os.path.join(self.data_dir, 'manifest.json')
+        with open(path) as manifest_file:
+            self.assertEqual(4, len(manifest_file.readlines()))
+        # An interrupted append leaves a partial last line.
+        with open(path, 'a') as manifest_file:
+            manifest_file.write('{"archive": "a.t')
+        reloaded = ShardManifest(self.data_dir, self.encoder)
+        self.assertEqual(manifest.shards, reloaded.shards)
+        reloaded.add('a.tar.gz', 'shard-3', [3], [5], 1024)
+        self.assertEqual(
+            [], ShardManifest(self.data_dir, self.encoder).missing_games(
+                [('a.tar.gz', index) for index in range(4)]))
+
+    def test_reads_version_1(self):
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        manifest.add('a.tar.gz', 'shard-x', [0], [5], 1024)
+        with open(os.path.join(self.data_dir, 'manifest.json'), 'w') as f:
+            json.dump({'version': 1, 'shards': manifest.shards}, f)
+        reloaded = ShardManifest(self.data_dir, self.encoder)
+        self.assertEqual(manifest.shards, reloaded.shards)
+        self.assertEqual(manifest.shards, ShardManifest(
+            self.data_dir, self.encoder).shards)
+
+    def test_unknown_version(self):
+        with open(os.path.join(self.data_dir, 'manifest.json'), 'w') as f:
+            json.dump({'version': 99, 'shards': []}, f)
+        with self.assertRaises(ValueError):
+            ShardManifest(self.data_dir, self.encoder)
+
+    def test_segments(self):
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        manifest.add('a.tar.gz', 'shard-x', [0, 1, 2], [3, 4, 2],
+                     chunk_size=4)
+        base = os.path.join(self.data_dir, 'shard-x')
+
+        def segment(chunk, start, end):
+            return ('%s_features_%d.npy' % (base, chunk),
+                    '%s_labels_%d.npy' % (base, chunk), start, end)
+
+        # Game 0 has rows 0 to 3, game 1 rows 3 to 7, game 2 rows 7 to 9.
+        self.assertEqual(
+            [segment(0, 0, 4), segment(1, 0, 3)],
+            manifest.segments([('a.tar.gz', 1), ('a.tar.gz', 0)]))
+        self.assertEqual(
+            [segment(0, 0, 3), segment(1, 3, 4), segment(2, 0, 1)],
+            manifest.segments([('a.tar.gz', 0), ('a.tar.gz', 2)]))
+        with self.assertRaises(KeyError):
+            manifest.segments([('a.tar.gz', 3)])
+
+    def test_load_one_plane_chunks(self):
+        # The first chunk only holds the empty board, which is all 0s,
+        # the second one has -1s. Both must be stored the same way.
+        encoder = OnePlaneEncoder((5, 5))
+        game = goboard_fast.GameState.new_game(5)
+        game_states = [game, game.apply_move(
+            goboard_fast.Move.play(Point(3, 3)))]
+        manifest = ShardManifest(self.data_dir, encoder)
+        writer = ChunkWriter(os.path.join(self.data_dir, 'shard-x'),
+                             encoder, chunk_size=1)
+        writer.add(game_states, [12, 6])
+        writer.flush()
+        manifest.add('a.tar.gz', 'shard-x', [0], [2], chunk_size=1)
+        features, labels = manifest.load([('a.tar.gz', 0)])
+        np.testing.assert_array_equal(
+            encoder.encode_batch(game_states),
+            expand_features(features, encoder.shape()))
+        self.assertEqual([12, 6], labels.tolist())
+
+    def test_remove_orphans(self):
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        manifest.add('a.tar.gz', 'shard-x', [0], [5], 1024)
+        # shard-z may be another build's shard in progress.
+        for name in ('shard-x_features_0.npy', 'shard-y_features_0.npy',
+                     'shard-y_labels_0.npy', 'shard-z_features_0.npy',
+                     'KGS-atrain_features_0.npy'):
+            open(os.path.join(self.data_dir, name), 'w').close()
+        manifest.remove_orphans(['shard-x', 'shard-y'])
+        self.assertEqual(
+            ['KGS-atrain_features_0.npy', 'manifest.json',
+             'shard-x_features_0.npy', 'shard-z_features_0.npy'],
+            sorted(os.listdir(self.data_dir)))
+
+
+if __name__ == '__main__':
+    unittest.main()
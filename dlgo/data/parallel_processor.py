@@ -1,42 +1,54 @@
 from __future__ import print_function
 from __future__ import absolute_import
-import os
-import glob
-import os.path
 import tarfile
-import gzip
-import shutil
-import numpy as np
+import time
+import traceback
 import multiprocessing
 from os import sys
 from keras.utils import to_categorical
+import six.moves.queue as queue
 
-from dlgo.gosgf import Sgf_game
+from dlgo.gosgf import read_game_record
 from dlgo.goboard_fast import Board, GameState, Move
 from dlgo.gotypes import Player, Point
+from dlgo.data.compact import ChunkWriter, expand_features
 from dlgo.data.index_processor import KGSIndex
+from dlgo.data.manifest import ShardManifest
 from dlgo.data.sampling import Sampler
 from dlgo.data.generator import DataGenerator
 from dlgo.encoders.base import get_encoder_by_name
 
 
-def worker(jobinfo):
+def worker(clazz, encoder, data_directory, chunk_size, tasks, results):
+    """Process (zip file, shard file base, games) tasks until a None
+    task comes in. For every task, puts (task, examples per game, chunk
+    size of the shard) on `results`, or (task, traceback, chunk size)
+    if it failed.
+    """
+    processor = clazz(encoder=encoder, data_directory=data_directory,
+                      chunk_size=chunk_size)
     try:
-        clazz, encoder, zip_file, data_file_name, game_list = jobinfo
-        clazz(encoder=encoder).process_zip(zip_file, data_file_name, game_list)
-    except (KeyboardInterrupt, SystemExit):
-        raise Exception('>>> Exiting child process.')
+        for task in iter(tasks.get, None):
+            try:
+                result = processor.process_zip(*task)
+            except Exception:
+                result = traceback.format_exc()
+            results.put((task, result, processor.chunk_size))
+    except KeyboardInterrupt:
+        pass
 
 
 class GoDataProcessor:
-    def __init__(self, encoder='simple', data_directory='data'):
+    def __init__(self, encoder='simple', data_directory='data',
+                 chunk_size=1024):
         self.encoder_string = encoder
         self.encoder = get_encoder_by_name(encoder, 19)
         self.data_dir = data_directory
+        self.chunk_size = chunk_size
 
 # tag::load_generator[]
     def load_go_data(self, data_type='train', num_samples=1000,
-                     use_generator=False):
+                     use_generator=False, augment=False, shuffle_buffer=0):
         index = KGSIndex(data_directory=self.data_dir)
         index.download_files()
 
@@ -45,52 +57,50 @@ class GoDataProcessor:
 
         self.map_to_workers(data_type, data)  # <1>
         if use_generator:
-            generator = DataGenerator(self.data_dir, data)
+            manifest = ShardManifest(self.data_dir, self.encoder)
+            generator = DataGenerator(
+                self.data_dir, data, manifest.segments(data),
+                self.encoder.shape(), augment, data_type=data_type,
+                shuffle_buffer=shuffle_buffer)
             return generator  # <2>
         else:
             features_and_labels = self.consolidate_games(data_type, data)
             return features_and_labels  # <3>
 
-# <1> Map workload to CPUs
-# <2> Either return a Go data generator...
+# <1> Map workload to CPUs; only games that haven't been encoded before are processed.
+# <2> Either return a Go data generator, reading the sampled games from their shards...
 # <3> ... or return consolidated data as before.
 # end::load_generator[]
 
-    def unzip_data(self, zip_file_name):
-        this_gz = gzip.open(self.data_dir + '/' + zip_file_name)
-
-        tar_file = zip_file_name[0:-3]
-        this_tar = open(self.data_dir + '/' + tar_file, 'wb')
+    def process_zip(self, zip_file_name, data_file_name, game_list):
+        """Encode the given games of an archive into chunks. Returns the
+        number of examples of every game, in order of game index.
+        """
+        # Sampled games are given by their position in the archive,
+        # after the directory entry. The archive is read as one stream.
+        wanted = set(index + 1 for index in game_list)
+        writer = ChunkWriter(self.data_dir + '/' + data_file_name,
+                             self.encoder, self.chunk_size)
+        num_examples = []
+        zip_path = self.data_dir + '/' + zip_file_name
+        with tarfile.open(zip_path, 'r|gz') as zip_file:
+            for position, member in enumerate(zip_file):
+                if len(wanted) == 0:
+                    break
+                if position not in wanted:
+                    continue
+                wanted.remove(position)
+                if not member.name.endswith('.sgf'):
+                    raise ValueError(member.name + ' is not a valid sgf')
+                sgf_content = zip_file.extractfile(member).read()
+                sgf = read_game_record(sgf_content)
 
-        shutil.copyfileobj(this_gz, this_tar)
-        this_tar.close()
-        return tar_file
+                game_state, first_move_done = self.get_handicap(sgf)
 
-    def process_zip(self, zip_file_name, data_file_name, game_list):
-        tar_file = self.unzip_data(zip_file_name)
-        zip_file = tarfile.open(self.data_dir + '/' + tar_file)
-        name_list = zip_file.getnames()
-        total_examples = self.num_total_examples(zip_file, game_list, name_list)
-
-        shape = self.encoder.shape()
-        feature_shape = np.insert(shape, 0, np.asarray([total_examples]))
-        features = np.zeros(feature_shape)
-        labels = np.zeros((total_examples,))
-
-        counter = 0
-        for index in game_list:
-            name = name_list[index + 1]
-            if not name.endswith('.sgf'):
-                raise ValueError(name + ' is not a valid sgf')
-            sgf_content = zip_file.extractfile(name).read()
-            sgf = Sgf_game.from_string(sgf_content)
-
-            game_state, first_move_done = self.get_handicap(sgf)
-
-            for item in sgf.main_sequence_iter():
-                color, move_tuple = item.get_move()
-                point = None
-                if color is not None:
+                game_states = []
+                labels = []
+                for color, move_tuple in sgf.moves:
+                    point = None
                     if move_tuple is not None:
                         row, col = move_tuple
                         point = Point(row + 1, col + 1)
@@ -98,56 +108,24 @@ class GoDataProcessor:
                     else:
                         move = Move.pass_turn()
                     if first_move_done and point is not None:
-                        features[counter] = self.encoder.encode(game_state)
-                        labels[counter] = self.encoder.encode_point(point)
-                        counter += 1
+                        game_states.append(game_state)
+                        labels.append(self.encoder.encode_point(point))
                     game_state = game_state.apply_move(move)
                     first_move_done = True
-
-        feature_file_base = self.data_dir + '/' + data_file_name + '_features_%d'
-        label_file_base = self.data_dir + '/' + data_file_name + '_labels_%d'
-
-        chunk = 0  # Due to files with large content, split up after chunksize
-        chunksize = 1024
-        while features.shape[0] >= chunksize:
-            feature_file = feature_file_base % chunk
-            label_file = label_file_base % chunk
-            chunk += 1
-            current_features, features = features[:chunksize], features[chunksize:]
-            current_labels, labels = labels[:chunksize], labels[chunksize:]
-            np.save(feature_file, current_features)
-            np.save(label_file, current_labels)
+                writer.add(game_states, labels)
+                num_examples.append(len(game_states))
+        if wanted:
+            raise ValueError('%s has no member %d' % (
+                zip_file_name, min(wanted)))
+        writer.flush()
+        return num_examples
 
     def consolidate_games(self, name, samples):
-        files_needed = set(file_name for file_name, index in samples)
-        file_names = []
-        for zip_file_name in files_needed:
-            file_name = zip_file_name.replace('.tar.gz', '') + name
-            file_names.append(file_name)
-
-        feature_list = []
-        label_list = []
-        for file_name in file_names:
-            file_prefix = file_name.replace('.tar.gz', '')
-            base = self.data_dir + '/' + file_prefix + '_features_*.npy'
-            for feature_file in glob.glob(base):
-                label_file = feature_file.replace('features', 'labels')
-                x = np.load(feature_file)
-                y = np.load(label_file)
-                x = x.astype('float32')
-                y = to_categorical(y.astype(int), 19 * 19)
-                feature_list.append(x)
-                label_list.append(y)
-
-        features = np.concatenate(feature_list, axis=0)
-        labels = np.concatenate(label_list, axis=0)
-
-        feature_file = self.data_dir + '/' + name
-        label_file = self.data_dir + '/' + name
-
-        np.save(feature_file, features)
-        np.save(label_file, labels)
-
+        # Read straight from the shards, without writing a copy.
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        features, labels = manifest.load(samples)
+        features = expand_features(features, self.encoder.shape())
+        labels = to_categorical(labels.astype(int), 19 * 19)
         return features, labels
 
     @staticmethod
@@ -156,8 +134,8 @@ class GoDataProcessor:
         first_move_done = False
         move = None
         game_state = GameState.new_game(19)
-        if sgf.get_handicap() is not None and sgf.get_handicap() != 0:
-            for setup in sgf.get_root().get_setup_stones():
+        if sgf.handicap:
+            for setup in sgf.setup_stones:
                 for move in setup:
                     row, col = move
                     go_board.place_stone(Player.black, Point(row + 1, col + 1))  # black gets handicap
@@ -165,50 +143,79 @@ class GoDataProcessor:
             game_state = GameState(go_board, Player.white, None, move)
         return game_state, first_move_done
 
-    def map_to_workers(self, data_type, samples):
-        zip_names = set()
-        indices_by_zip_name = {}
-        for filename, index in samples:
-            zip_names.add(filename)
-            if filename not in indices_by_zip_name:
-                indices_by_zip_name[filename] = []
-            indices_by_zip_name[filename].append(index)
-
-        zips_to_process = []
-        for zip_name in zip_names:
-            base_name = zip_name.replace('.tar.gz', '')
-            data_file_name = base_name + data_type
-            if not os.path.isfile(self.data_dir + '/' + data_file_name):
-                zips_to_process.append((self.__class__, self.encoder_string, zip_name,
-                                        data_file_name, indices_by_zip_name[zip_name]))
-
-        cores = multiprocessing.cpu_count()  # Determine number of CPU cores and split work load among them
-        pool = multiprocessing.Pool(processes=cores)
-        p = pool.map_async(worker, zips_to_process)
+    def map_to_workers(self, data_type, samples, num_workers=None,
+                       games_per_task=100, report_every=10.0):
+        """Encode the sampled games that the manifest doesn't have yet,
+        in worker processes, and return the number of new examples.
+
+        The games are split into shards of `games_per_task` games, see
+        ShardManifest.plan, and every finished shard is recorded right
+        away. At most two shards per worker are queued at any time.
+        Progress is printed every `report_every` seconds; pass None for
+        no output. Shards serve every data type, so `data_type` is only
+        kept for compatibility.
+        """
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        tasks = manifest.plan(samples, games_per_task)
+        manifest.remove_orphans(file_base for _, file_base, _ in tasks)
+        if not tasks:
+            return 0
+        if num_workers is None:
+            num_workers = multiprocessing.cpu_count()
+        task_queue = multiprocessing.Queue(maxsize=2 * num_workers)
+        result_queue = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=worker,
+                args=(self.__class__, self.encoder_string, self.data_dir,
+                      self.chunk_size, task_queue, result_queue))
+            for _ in range(num_workers)]
+        for process in workers:
+            process.daemon = True
+            process.start()
+
+        num_games = sum(len(task[2]) for task in tasks)
+        games_done = examples_done = 0
+        start = last_report = time.time()
+        pending = list(reversed(tasks))
+        in_flight = 0
         try:
-            _ = p.get()
+            while pending or in_flight:
+                while pending and in_flight < 2 * num_workers:
+                    task_queue.put(pending.pop())
+                    in_flight += 1
+                try:
+                    task, result, chunk_size = result_queue.get(timeout=1)
+                except queue.Empty:
+                    # A worker that was killed never reports back.
+                    if not all(p.is_alive() for p in workers):
+                        raise RuntimeError('A data processing worker died')
+                    continue
+                in_flight -= 1
+                if not isinstance(result, list):
+                    raise RuntimeError('Processing %s failed:\n%s' % (
+                        task[0], result))
+                manifest.add(*(task + (result, chunk_size)))
+                games_done += len(task[2])
+                examples_done += sum(result)
+                now = time.time()
+                if report_every is not None and (
+                        now - last_report >= report_every or
+                        games_done == num_games):
+                    last_report = now
+                    print('%d/%d games, %d examples, %.1f games/s' % (
+                        games_done, num_games, examples_done,
+                        games_done / max(now - start, 1e-9)))
         except KeyboardInterrupt:  # Caught keyboard interrupt, terminating workers
-            pool.terminate()
-            pool.join()
+            for process in workers:
+                process.terminate()
             sys.exit(-1)
-
-    def num_total_examples(self, zip_file, game_list, name_list):
-        total_examples = 0
-        for index in game_list:
-            name = name_list[index + 1]
-            if name.endswith('.sgf'):
-                sgf_content = zip_file.extractfile(name).read()
-                sgf = Sgf_game.from_string(sgf_content)
-                game_state, first_move_done = self.get_handicap(sgf)
-
-                num_moves = 0
-                for item in sgf.main_sequence_iter():
-                    color, move = item.get_move()
-                    if color is not None:
-                        if first_move_done:
-                            num_moves += 1
-                        first_move_done = True
-                total_examples = total_examples + num_moves
-            else:
-                raise ValueError(name + ' is not a valid sgf')
-        return total_examples
+        except Exception:
+            for process in workers:
+                process.terminate()
+            raise
+        for _ in workers:
+            task_queue.put(None)
+        for process in workers:
+            process.join()
+        return examples_done
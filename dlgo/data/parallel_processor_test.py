@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from dlgo.data.manifest import ShardManifest
+from dlgo.data.parallel_processor import GoDataProcessor
+from dlgo.data.processor_test import GAMES, write_archive
+
+
+class CrashingProcessor(GoDataProcessor):
+    def process_zip(self, zip_file_name, data_file_name, game_list):
+        # Die the way an OOM kill or a segfault would, without a chance
+        # to report.
+        os._exit(1)
+
+
+class MapToWorkersTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        for name in ('KGS-a', 'KGS-b'):
+            write_archive('%s/%s.tar.gz' % (self.data_dir, name), GAMES)
+        self.samples = [('KGS-a.tar.gz', i) for i in range(3)] + \
+            [('KGS-b.tar.gz', 1)]
+        self.processor = GoDataProcessor('oneplane', self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def build(self, samples, num_workers=2):
+        return self.processor.map_to_workers(
+            'train', samples, num_workers=num_workers, games_per_task=2,
+            report_every=None)
+
+    def output(self):
+        files = sorted(name for name in os.listdir(self.data_dir)
+                       if name.endswith('.npy'))
+        return [(name, np.load(self.data_dir + '/' + name).tolist())
+                for name in files]
+
+    def test_same_output_for_any_number_of_workers(self):
+        outputs = []
+        for num_workers in (1, 3):
+            self.assertEqual(7, self.build(self.samples, num_workers))
+            outputs.append(self.output())
+            for name, _ in outputs[-1]:
+                os.remove(self.data_dir + '/' + name)
+            os.remove(self.data_dir + '/manifest.json')
+        # Three shards, of one chunk each.
+        self.assertEqual(6, len(outputs[0]))
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_only_missing_games_are_encoded(self):
+        self.assertEqual(4, self.build(self.samples[:2]))
+        files = self.output()
+        self.assertEqual(3, self.build(self.samples))
+        self.assertEqual(0, self.build(self.samples))
+        # The first shard was kept as it was.
+        output = self.output()
+        for shard_file in files:
+            self.assertIn(shard_file, output)
+        self.assertEqual(
+            [], ShardManifest(self.data_dir, self.processor.encoder)
+            .missing_games(self.samples))
+
+    def test_serves_from_shards(self):
+        self.build(self.samples)
+        features, labels = self.processor.consolidate_games(
+            'train', self.samples[2:])
+        self.assertEqual((3, 1, 19, 19), features.shape)
+        # The last game of each archive: rr, then dd and pp.
+        self.assertEqual([36, 288, 72], labels.argmax(axis=1).tolist())
+
+    def test_small_chunks(self):
+        self.processor = GoDataProcessor('oneplane', self.data_dir,
+                                         chunk_size=1)
+        self.build(self.samples)
+        self.assertEqual(14, len(self.output()))
+        _, labels = self.processor.consolidate_games(
+            'train', self.samples[2:])
+        self.assertEqual([36, 288, 72], labels.argmax(axis=1).tolist())
+
+    def test_failed_task(self):
+        with self.assertRaises(RuntimeError):
+            self.build([('KGS-a.tar.gz', 10)])
+
+    def test_killed_worker(self):
+        processor = CrashingProcessor('oneplane', self.data_dir)
+        with self.assertRaises(RuntimeError):
+            processor.map_to_workers('train', self.samples, num_workers=2,
+                                     report_every=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,23 +1,20 @@
 from __future__ import absolute_import
 
 # tag::base_imports[]
-import os.path
 import tarfile
-import gzip
-import glob
-import shutil
 
-import numpy as np
 from keras.utils import to_categorical
 # end::base_imports[]
 
 # tag::dlgo_imports[]
-from dlgo.gosgf import Sgf_game
+from dlgo.gosgf import read_game_record
 from dlgo.goboard_fast import Board, GameState, Move
 from dlgo.gotypes import Player, Point
 from dlgo.encoders.base import get_encoder_by_name
 
+from dlgo.data.compact import ChunkWriter, expand_features
 from dlgo.data.index_processor import KGSIndex
+from dlgo.data.manifest import ShardManifest
 from dlgo.data.sampling import Sampler  # <1>
 # <1> Sampler will be used to sample training and test data from files.
 # end::dlgo_imports[]
@@ -25,9 +22,11 @@ from dlgo.data.sampling import Sampler  # <1>
 
 # tag::processor_init[]
 class GoDataProcessor:
-    def __init__(self, encoder='oneplane', data_directory='data'):
+    def __init__(self, encoder='oneplane', data_directory='data',
+                 chunk_size=1024):
         self.encoder = get_encoder_by_name(encoder, 19)
         self.data_dir = data_directory
+        self.chunk_size = chunk_size
 # end::processor_init[]
 
 # tag::load_go_data[]
@@ -39,18 +38,12 @@ class GoDataProcessor:
         sampler = Sampler(data_dir=self.data_dir)
         data = sampler.draw_data(data_type, num_samples)  # <4>
 
-        zip_names = set()
-        indices_by_zip_name = {}
-        for filename, index in data:
-            zip_names.add(filename)  # <5>
-            if filename not in indices_by_zip_name:
-                indices_by_zip_name[filename] = []
-            indices_by_zip_name[filename].append(index)  # <6>
-        for zip_name in zip_names:
-            base_name = zip_name.replace('.tar.gz', '')
-            data_file_name = base_name + data_type
-            if not os.path.isfile(self.data_dir + '/' + data_file_name):
-                self.process_zip(zip_name, data_file_name, indices_by_zip_name[zip_name])  # <7>
+        manifest = ShardManifest(self.data_dir, self.encoder)  # <5>
+        for zip_name, data_file_name, games in manifest.plan(data):  # <6>
+            manifest.remove_orphans([data_file_name])
+            num_examples = self.process_zip(zip_name, data_file_name, games)  # <7>
+            manifest.add(zip_name, data_file_name, games, num_examples,
+                         self.chunk_size)
 
         features_and_labels = self.consolidate_games(data_type, data)  # <8>
         return features_and_labels
@@ -59,124 +52,84 @@ class GoDataProcessor:
 # <2> `num_samples` refers to the number of games to load data from.
 # <3> We download all games from KGS to our local data directory. If data is available, it won't be downloaded again.
 # <4> The `Sampler` instance selects the specified number of games for a data type.
-# <5> We collect all zip file names contained in the data in a list.
-# <6> Then we group all SGF file indices by zip file name.
-# <7> The zip files are then processed individually.
-# <8> Features and labels from each zip are then aggregated and returned.
+# <5> The manifest knows which games have already been encoded with this encoder.
+# <6> The games still missing are grouped into shards of games from one zip file.
+# <7> Each shard is processed and recorded right away, so an interrupted run can pick up where it left off.
+# <8> Features and labels of the sampled games are then aggregated and returned.
 # end::load_go_data[]
 
-# tag::unzip_data[]
-    def unzip_data(self, zip_file_name):
-        this_gz = gzip.open(self.data_dir + '/' + zip_file_name)  # <1>
-
-        tar_file = zip_file_name[0:-3]  # <2>
-        this_tar = open(self.data_dir + '/' + tar_file, 'wb')
-
-        shutil.copyfileobj(this_gz, this_tar)  # <3>
-        this_tar.close()
-        return tar_file
-
-# <1> Unpack the `gz` file into a `tar` file.
-# <2> Remove ".gz" at the end to get the name of the tar file.
-# <3> Copy the contents of the unpacked file into the `tar` file.
-# end::unzip_data[]
-
 # tag::read_sgf_files[]
     def process_zip(self, zip_file_name, data_file_name, game_list):
-        tar_file = self.unzip_data(zip_file_name)
-        zip_file = tarfile.open(self.data_dir + '/' + tar_file)
-        name_list = zip_file.getnames()
-        total_examples = self.num_total_examples(zip_file, game_list, name_list)  # <1>
-
-        shape = self.encoder.shape()  # <2>
-        feature_shape = np.insert(shape, 0, np.asarray([total_examples]))
-        features = np.zeros(feature_shape)
-        labels = np.zeros((total_examples,))
-
-        counter = 0
-        for index in game_list:
-            name = name_list[index + 1]
-            if not name.endswith('.sgf'):
-                raise ValueError(name + ' is not a valid sgf')
-            sgf_content = zip_file.extractfile(name).read()
-            sgf = Sgf_game.from_string(sgf_content)  # <3>
-
-            game_state, first_move_done = self.get_handicap(sgf)  # <4>
-
-            for item in sgf.main_sequence_iter():  # <5>
-                color, move_tuple = item.get_move()
-                point = None
-                if color is not None:
-                    if move_tuple is not None:  # <6>
+        wanted = set(index + 1 for index in game_list)  # <1>
+        writer = ChunkWriter(self.data_dir + '/' + data_file_name,
+                             self.encoder, self.chunk_size)  # <2>
+        num_examples = []
+        zip_path = self.data_dir + '/' + zip_file_name
+        with tarfile.open(zip_path, 'r|gz') as zip_file:  # <3>
+            for position, member in enumerate(zip_file):
+                if len(wanted) == 0:
+                    break
+                if position not in wanted:
+                    continue
+                wanted.remove(position)
+                if not member.name.endswith('.sgf'):
+                    raise ValueError(member.name + ' is not a valid sgf')
+                sgf_content = zip_file.extractfile(member).read()
+                sgf = read_game_record(sgf_content)  # <4>
+
+                game_state, first_move_done = self.get_handicap(sgf)  # <5>
+
+                game_states = []
+                labels = []
+                for color, move_tuple in sgf.moves:  # <6>
+                    point = None
+                    if move_tuple is not None:  # <7>
                         row, col = move_tuple
                         point = Point(row + 1, col + 1)
                         move = Move.play(point)
                     else:
-                        move = Move.pass_turn()  # <7>
+                        move = Move.pass_turn()  # <8>
                     if first_move_done and point is not None:
-                        features[counter] = self.encoder.encode(game_state)  # <8>
-                        labels[counter] = self.encoder.encode_point(point)  # <9>
-                        counter += 1
-                    game_state = game_state.apply_move(move)  # <10>
+                        game_states.append(game_state)  # <9>
+                        labels.append(self.encoder.encode_point(point))  # <10>
+                    game_state = game_state.apply_move(move)  # <11>
                     first_move_done = True
-# <1> Determine the total number of moves in all games in this zip file.
-# <2> Infer the shape of features and labels from the encoder we use.
-# <3> Read the SGF content as string, after extracting the zip file.
-# <4> Infer the initial game state by applying all handicap stones.
-# <5> Iterate over all moves in the SGF file.
-# <6> Read the coordinates of the stone to be played...
-# <7> ... or pass, if there is none.
-# <8> We encode the current game state as features...
-# <9> ... and the next move as label for the features.
-# <10> Afterwards the move is applied to the board and we proceed with the next one.
+                writer.add(game_states, labels)  # <12>
+                num_examples.append(len(game_states))
+        if wanted:
+            raise ValueError('%s has no member %d' % (
+                zip_file_name, min(wanted)))
+# <1> The sampled games are given by their position in the archive, after the directory entry.
+# <2> The writer collects encoded examples and stores them in chunks.
+# <3> We read the archive as a single stream, without unpacking it to disk first, and stop once all sampled games are read.
+# <4> Read the SGF content straight from the archive. We only need the setup and the moves of the main line, which `read_game_record` extracts much faster than the full SGF parser.
+# <5> Infer the initial game state by applying all handicap stones.
+# <6> Iterate over all moves of the main line.
+# <7> Read the coordinates of the stone to be played...
+# <8> ... or pass, if there is none.
+# <9> We keep the current game state, to encode all of a game's states as features in one batch...
+# <10> ... and the next move as label for the features.
+# <11> Afterwards the move is applied to the board and we proceed with the next one.
+# <12> Each game is encoded into the writer's buffer as soon as it has been read.
 # end::read_sgf_files[]
 
 # tag::store_features_and_labels[]
-        feature_file_base = self.data_dir + '/' + data_file_name + '_features_%d'
-        label_file_base = self.data_dir + '/' + data_file_name + '_labels_%d'
-
-        chunk = 0  # Due to files with large content, split up after chunksize
-        chunksize = 1024
-        while features.shape[0] >= chunksize:  # <1>
-            feature_file = feature_file_base % chunk
-            label_file = label_file_base % chunk
-            chunk += 1
-            current_features, features = features[:chunksize], features[chunksize:]
-            current_labels, labels = labels[:chunksize], labels[chunksize:]  # <2>
-            np.save(feature_file, current_features)
-            np.save(label_file, current_labels)  # <3>
-# <1> We process features and labels in chunks of size 1024.
-# <2> The current chunk is cut off from features and labels...
-# <3> ...  and then stored in a separate file.
+        writer.flush()  # <1>
+        return num_examples  # <2>
+
+# <1> Every full chunk of chunk_size examples was stored as soon as it filled up; the rest goes into one last, smaller chunk.
+# <2> We report how many examples each game contributed, in order of game index.
 # end::store_features_and_labels[]
 
 # tag::consolidate_games[]
     def consolidate_games(self, data_type, samples):
-        files_needed = set(file_name for file_name, index in samples)
-        file_names = []
-        for zip_file_name in files_needed:
-            file_name = zip_file_name.replace('.tar.gz', '') + data_type
-            file_names.append(file_name)
-
-        feature_list = []
-        label_list = []
-        for file_name in file_names:
-            file_prefix = file_name.replace('.tar.gz', '')
-            base = self.data_dir + '/' + file_prefix + '_features_*.npy'
-            for feature_file in glob.glob(base):
-                label_file = feature_file.replace('features', 'labels')
-                x = np.load(feature_file)
-                y = np.load(label_file)
-                x = x.astype('float32')
-                y = to_categorical(y.astype(int), 19 * 19)
-                feature_list.append(x)
-                label_list.append(y)
-        features = np.concatenate(feature_list, axis=0)
-        labels = np.concatenate(label_list, axis=0)
-        np.save('{}/features_{}.npy'.format(self.data_dir, data_type), features)
-        np.save('{}/labels_{}.npy'.format(self.data_dir, data_type), labels)
-
+        manifest = ShardManifest(self.data_dir, self.encoder)
+        features, labels = manifest.load(samples)  # <1>
+        features = expand_features(features, self.encoder.shape())
+        labels = to_categorical(labels.astype(int), 19 * 19)
         return features, labels
+
+# <1> The examples of the sampled games are read straight from their shards, without writing a consolidated copy.
 # end::consolidate_games[]
 
 # tag::get_handicap[]
@@ -186,8 +139,8 @@ class GoDataProcessor:
         first_move_done = False
         move = None
         game_state = GameState.new_game(19)
-        if sgf.get_handicap() is not None and sgf.get_handicap() != 0:
-            for setup in sgf.get_root().get_setup_stones():
+        if sgf.handicap:
+            for setup in sgf.setup_stones:
                 for move in setup:
                     row, col = move
                     go_board.place_stone(Player.black, Point(row + 1, col + 1))
@@ -195,26 +148,3 @@ class GoDataProcessor:
             game_state = GameState(go_board, Player.white, None, move)
         return game_state, first_move_done
 # end::get_handicap[]
-
-# tag::num_total_examples[]
-    def num_total_examples(self, zip_file, game_list, name_list):
-        total_examples = 0
-        for index in game_list:
-            name = name_list[index + 1]
-            if name.endswith('.sgf'):
-                sgf_content = zip_file.extractfile(name).read()
-                sgf = Sgf_game.from_string(sgf_content)
-                game_state, first_move_done = self.get_handicap(sgf)
-
-                num_moves = 0
-                for item in sgf.main_sequence_iter():
-                    color, move = item.get_move()
-                    if color is not None:
-                        if first_move_done:
-                            num_moves += 1
-                        first_move_done = True
-                total_examples = total_examples + num_moves
-            else:
-                raise ValueError(name + ' is not a valid sgf')
-        return total_examples
-# end::num_total_examples[]
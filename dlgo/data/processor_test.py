@@ -0,0 +1,95 @@
+import glob
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+import numpy as np
+
+from dlgo.data.compact import expand_features
+from dlgo.data.manifest import ShardManifest
+from dlgo.data.processor import GoDataProcessor
+
+GAMES = [
+    b'(;GM[1]FF[4]SZ[19];B[aa];W[bb];B[cc])',
+    # Two handicap stones, then white plays and black passes.
+    b'(;GM[1]FF[4]SZ[19]HA[2]AB[pd][dp];W[dd];B[pp];W[])',
+    b'(;GM[1]FF[4]SZ[19];B[ss];W[rr])',
+]
+
+
+def write_archive(path, games, directory='kgs-19-2001'):
+    with tarfile.open(path, 'w:gz') as archive:
+        info = tarfile.TarInfo(directory)
+        info.type = tarfile.DIRTYPE
+        archive.addfile(info)
+        for i, game in enumerate(games):
+            info = tarfile.TarInfo('%s/%d.sgf' % (directory, i))
+            info.size = len(game)
+            archive.addfile(info, io.BytesIO(game))
+
+
+class ProcessZipTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        write_archive(self.data_dir + '/KGS-test.tar.gz', GAMES)
+        self.processor = GoDataProcessor(data_directory=self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_process_zip(self):
+        num_examples = self.processor.process_zip(
+            'KGS-test.tar.gz', 'KGS-testtrain', [1, 0])
+        self.assertEqual([2, 2], num_examples)
+        features = np.load(self.data_dir + '/KGS-testtrain_features_0.npy')
+        labels = np.load(self.data_dir + '/KGS-testtrain_labels_0.npy')
+        # Games come in archive order. Without handicap the first move
+        # is not an example; passes never are.
+        # bb, cc, then dd and pp after the handicap stones.
+        self.assertEqual([324, 306, 288, 72], labels.tolist())
+        features = expand_features(features, (1, 19, 19))
+        self.assertEqual((4, 1, 19, 19), features.shape)
+        # Before white's bb, black's aa is an opponent stone.
+        self.assertEqual(-1, features[0, 0, 18, 0])
+        self.assertEqual(1, np.abs(features[0]).sum())
+        # Nothing but the chunks is left behind.
+        self.assertEqual(
+            ['KGS-test.tar.gz', 'KGS-testtrain_features_0.npy',
+             'KGS-testtrain_labels_0.npy'],
+            sorted(os.listdir(self.data_dir)))
+
+    def test_missing_game(self):
+        with self.assertRaises(ValueError):
+            self.processor.process_zip(
+                'KGS-test.tar.gz', 'KGS-testtrain', [0, 5])
+
+    def test_stops_after_last_wanted_game(self):
+        # A large game at the end of an archive that was cut off.
+        path = self.data_dir + '/KGS-cut.tar.gz'
+        comment = os.urandom(50000).hex().encode('ascii')
+        write_archive(path, GAMES + [b'(;C[' + comment + b'])'])
+        with open(path, 'rb+') as archive:
+            archive.truncate(os.path.getsize(path) // 2)
+        self.assertEqual([2], self.processor.process_zip(
+            'KGS-cut.tar.gz', 'KGS-cuttrain', [0]))
+
+    def test_consolidate_games(self):
+        samples = [('KGS-test.tar.gz', 2)]
+        manifest = ShardManifest(self.data_dir, self.processor.encoder)
+        for zip_name, file_base, games in manifest.plan(samples):
+            manifest.add(zip_name, file_base, games,
+                         self.processor.process_zip(zip_name, file_base, games),
+                         self.processor.chunk_size)
+        features, labels = self.processor.consolidate_games('train', samples)
+        self.assertEqual((1, 1, 19, 19), features.shape)
+        self.assertEqual((1, 361), labels.shape)
+        self.assertEqual(36, labels[0].argmax())
+        # No consolidated copy is written.
+        self.assertEqual([], glob.glob(self.data_dir + '/features_*'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 from dlgo.encoders.base import Encoder
-from dlgo.encoders.utils import is_ladder_escape, is_ladder_capture
+from dlgo.encoders.planes import stone_arrays
+from dlgo.encoders.ladders import LadderReader
 from dlgo.gotypes import Point, Player
 from dlgo.goboard_fast import Move
 from dlgo.agent.helpers_fast import is_point_an_eye
@@ -11,13 +12,14 @@ Stone colour            3               Player stone / opponent stone / empty
 Ones                    1               A constant plane filled with 1
 Zeros                   1               A constant plane filled with 0
 Sensibleness            1               Whether a move is legal and does not fill its own eyes
-Turns since             8               How many turns since a move was played
-Liberties               8               Number of liberties (empty adjacent points)
-Liberties after move    8               Number of liberties after this move is played
-Capture size            8               How many opponent stones would be captured
-Self-atari size         8               How many of own stones would be captured
+Turns since             8               How many turns since a move was played (1 to 8+)
+Liberties               8               Number of liberties (empty adjacent points, 1 to 8+)
+Liberties after move    8               Number of liberties after this move is played (1 to 8+)
+Capture size            8               How many opponent stones would be captured (0 to 7+)
+Self-atari size         8               How many of own stones would be captured (1 to 8+)
 Ladder capture          1               Whether a move at this point is a successful ladder capture
 Ladder escape           1               Whether a move at this point is a successful ladder escape
+Player color            1               Whether the current player is black
 """
 
 FEATURE_OFFSETS = {
@@ -41,89 +43,136 @@ def offset(feature):
 
 
 class AlphaGoEncoder(Encoder):
-    def __init__(self, board_size=(19, 19), use_player_plane=True):
+    """Encoder for the AlphaGo policy and value networks.
+
+    Move features (liberties after the move, capture and self-atari
+    size) are read off the strings next to each point instead of
+    playing the move. Ladders are read by a LadderReader, whose cache
+    makes positions the encoder has seen before cheap. For encoding
+    speed, see benchmarks/alphago_encoder.py.
+    """
+    def __init__(self, board_size=(19, 19), use_player_plane=True,
+                 ladder_reader=None):
         self.board_width, self.board_height = board_size
         self.use_player_plane = use_player_plane
         self.num_planes = 48 + use_player_plane
+        if ladder_reader is None:
+            ladder_reader = LadderReader()
+        self.ladders = ladder_reader
+        self.neighbor_table = {}
+        for r in range(1, self.board_height + 1):
+            for c in range(1, self.board_width + 1):
+                point = Point(row=r, col=c)
+                self.neighbor_table[point] = [
+                    nb for nb in point.neighbors()
+                    if 1 <= nb.row <= self.board_height and
+                    1 <= nb.col <= self.board_width]
 
     def name(self):
         return 'alphago'
 
     def encode(self, game_state):
-        board_tensor = np.zeros((self.num_planes, self.board_height, self.board_width))
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                point = Point(row=r + 1, col=c + 1)
-
-                go_string = game_state.board.get_go_string(point)
-                if go_string and go_string.color == game_state.next_player:
-                    board_tensor[offset("stone_color")][r][c] = 1
-                elif go_string and go_string.color == game_state.next_player.other:
-                    board_tensor[offset("stone_color") + 1][r][c] = 1
-                else:
-                    board_tensor[offset("stone_color") + 2][r][c] = 1
-
-                board_tensor[offset("ones")] = self.ones()
-                board_tensor[offset("zeros")] = self.zeros()
-
-                if not is_point_an_eye(game_state.board, point, game_state.next_player):
-                    board_tensor[offset("sensibleness")][r][c] = 1
-
-                ages = min(game_state.board.move_ages.get(r, c), 8)
-                if ages > 0:
-                    print(ages)
-                    board_tensor[offset("turns_since") + ages][r][c] = 1
-
-                if game_state.board.get_go_string(point):
-                    liberties = min(game_state.board.get_go_string(point).num_liberties, 8)
-                    board_tensor[offset("liberties") + liberties][r][c] = 1
-
-                move = Move(point)
-                if game_state.is_valid_move(move):
-                    new_state = game_state.apply_move(move)
-                    liberties = min(new_state.board.get_go_string(point).num_liberties, 8)
-                    board_tensor[offset("liberties_after") + liberties][r][c] = 1
-
-                    adjacent_strings = [game_state.board.get_go_string(nb)
-                                        for nb in point.neighbors()]
-                    capture_count = 0
-                    for go_string in adjacent_strings:
-                        other_player = game_state.next_player.other
-                        if go_string and go_string.num_liberties == 1 and go_string.color == other_player:
-                            capture_count += len(go_string.stones)
-                    capture_count = min(capture_count, 8)
-                    board_tensor[offset("capture_size") + capture_count][r][c] = 1
-
-                if go_string and go_string.num_liberties == 1:
-                    go_string = game_state.board.get_go_string(point)
-                    if go_string:
-                        num_atari_stones = min(len(go_string.stones), 8)
-                        board_tensor[offset("self_atari_size") + num_atari_stones][r][c] = 1
-
-                if is_ladder_capture(game_state, point):
-                    board_tensor[offset("ladder_capture")][r][c] = 1
-
-                if is_ladder_escape(game_state, point):
-                    board_tensor[offset("ladder_escape")][r][c] = 1
-
-                if self.use_player_plane:
-                    if game_state.next_player == Player.black:
-                        board_tensor[offset("ones")] = self.ones()
-                    else:
-                        board_tensor[offset("zeros")] = self.zeros()
-
+        board_tensor = np.zeros(self.shape())
+        self.encode_into(game_state, board_tensor)
         return board_tensor
 
+    def encode_into(self, game_state, board_tensor):
+        board = game_state.board
+        player = game_state.next_player
+        colors, liberties = stone_arrays(game_state)
+
+        stone_color = offset("stone_color")
+        board_tensor[stone_color] = colors == player.value
+        board_tensor[stone_color + 1] = colors == player.other.value
+        board_tensor[stone_color + 2] = colors == 0
+        board_tensor[offset("ones")] = 1
+
+        # One plane per 1, 2, ..., 8 or more turns since the stone was
+        # played, and per 1, 2, ..., 8 or more liberties.
+        rows, cols = np.nonzero(colors)
+        ages = np.array([board.move_ages.get(r, c)
+                         for r, c in zip(rows, cols)], dtype=np.int64)
+        on_board = ages >= 0
+        board_tensor[offset("turns_since") + np.minimum(ages[on_board], 7),
+                     rows[on_board], cols[on_board]] = 1
+        board_tensor[offset("liberties") +
+                     np.minimum(liberties[rows, cols], 8) - 1,
+                     rows, cols] = 1
+
+        ladder_capture, ladder_escape = self.ladders.ladder_status(game_state)
+        for point, libs_after, num_captured, size_after in \
+                self.legal_move_features(game_state):
+            r, c = point.row - 1, point.col - 1
+            if not is_point_an_eye(board, point, player):
+                board_tensor[offset("sensibleness"), r, c] = 1
+            board_tensor[offset("liberties_after") +
+                         min(libs_after, 8) - 1, r, c] = 1
+            board_tensor[offset("capture_size") +
+                         min(num_captured, 7), r, c] = 1
+            if libs_after == 1:
+                board_tensor[offset("self_atari_size") +
+                             min(size_after, 8) - 1, r, c] = 1
+            board_tensor[offset("ladder_capture"), r, c] = \
+                ladder_capture[r, c]
+            board_tensor[offset("ladder_escape"), r, c] = ladder_escape[r, c]
+
+        if self.use_player_plane and player == Player.black:
+            board_tensor[offset("current_player_color")] = 1
+
+    def legal_move_features(self, game_state):
+        """Yield (point, liberties after the move, number of captured
+        stones, size of our string after the move) for every legal move
+        of the next player, without playing any of them.
+        """
+        board = game_state.board
+        player = game_state.next_player
+        neighbor_table = self.neighbor_table
+        strings = {}
+        for point in neighbor_table:
+            strings[point] = board.get_go_string(point)
+        for point, neighbors in neighbor_table.items():
+            if strings[point] is not None:
+                continue
+            friendly = []
+            captured = []
+            libs_after = set()
+            for neighbor in neighbors:
+                go_string = strings[neighbor]
+                if go_string is None:
+                    libs_after.add(neighbor)
+                elif go_string.color == player:
+                    if go_string not in friendly:
+                        friendly.append(go_string)
+                elif go_string.num_liberties == 1:
+                    if go_string not in captured:
+                        captured.append(go_string)
+            for go_string in friendly:
+                libs_after |= go_string.liberties
+            libs_after.discard(point)
+            if not libs_after and not captured:
+                continue  # Self capture.
+            if captured and game_state.does_move_violate_ko(
+                    player, Move.play(point)):
+                continue
+            # Captured stones next to the new string become its
+            # liberties.
+            new_string = set([point])
+            for go_string in friendly:
+                new_string |= go_string.stones
+            for go_string in captured:
+                for stone in go_string.stones:
+                    if any(nb in new_string for nb in neighbor_table[stone]):
+                        libs_after.add(stone)
+            yield (point, len(libs_after),
+                   sum(len(go_string.stones) for go_string in captured),
+                   len(new_string))
+
     def ones(self):
         return np.ones((1, self.board_height, self.board_width))
 
-
     def zeros(self):
         return np.zeros((1, self.board_height, self.board_width))
 
-    def capture_size(self, game_state, num_planes=8):
-        pass
-
     def encode_point(self, point):
         return self.board_width * (point.row - 1) + (point.col - 1)
 
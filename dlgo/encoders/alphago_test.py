@@ -1,9 +1,13 @@
+import random
 import unittest
 
+import numpy as np
+
 from dlgo.agent.helpers import is_point_an_eye
+from dlgo.agent.naive_fast import FastRandomBot
 from dlgo.goboard_fast import Board, GameState, Move
 from dlgo.gotypes import Player, Point
-from dlgo.encoders.alphago import AlphaGoEncoder
+from dlgo.encoders.alphago import AlphaGoEncoder, offset
 
 
 class AlphaGoEncoderTest(unittest.TestCase):
@@ -20,6 +24,87 @@ class AlphaGoEncoderTest(unittest.TestCase):
         self.assertEquals(alphago.num_planes, 49)
         self.assertEquals(alphago.shape(), (49, 19, 19))
 
+    def random_game(self, num_moves):
+        random.seed(3)
+        bot = FastRandomBot()
+        game = GameState.new_game(9)
+        states = []
+        for _ in range(num_moves):
+            game = game.apply_move(bot.select_move(game))
+            states.append(game)
+        return states
+
+    def test_move_features_match_playing_the_move(self):
+        encoder = AlphaGoEncoder((9, 9))
+        for game in self.random_game(60)[::5]:
+            player = game.next_player
+            features = {}
+            for point, libs, captured, size in \
+                    encoder.legal_move_features(game):
+                features[point] = (libs, captured, size)
+            for r in range(1, 10):
+                for c in range(1, 10):
+                    point = Point(r, c)
+                    move = Move.play(point)
+                    if not game.is_valid_move(move):
+                        self.assertNotIn(point, features)
+                        continue
+                    next_game = game.apply_move(move)
+                    new_string = next_game.board.get_go_string(point)
+                    stones_before = self.count_stones(game, player.other)
+                    stones_after = self.count_stones(next_game, player.other)
+                    self.assertEqual(
+                        (new_string.num_liberties,
+                         stones_before - stones_after,
+                         len(new_string.stones)),
+                        features[point])
+
+    @staticmethod
+    def count_stones(game, player):
+        return sum(1 for r in range(1, 10) for c in range(1, 10)
+                   if game.board.get(Point(r, c)) == player)
+
+    def test_planes(self):
+        encoder = AlphaGoEncoder((9, 9))
+        game = self.random_game(30)[-1]
+        board_tensor = encoder.encode(game)
+        # Every point is in exactly one stone color plane, and every
+        # stone in one liberty plane.
+        stone_color = offset("stone_color")
+        np.testing.assert_array_equal(
+            1, board_tensor[stone_color:stone_color + 3].sum(axis=0))
+        liberties = board_tensor[offset("liberties"):
+                                 offset("liberties") + 8].sum(axis=0)
+        np.testing.assert_array_equal(
+            1 - board_tensor[stone_color + 2], liberties)
+        turns_since = board_tensor[offset("turns_since"):
+                                   offset("turns_since") + 8]
+        np.testing.assert_array_equal(
+            1 - board_tensor[stone_color + 2], turns_since.sum(axis=0))
+        last_move = game.last_move.point
+        self.assertEqual(1, turns_since[0].sum())
+        self.assertEqual(
+            1, turns_since[0, last_move.row - 1, last_move.col - 1])
+        for r in range(1, 10):
+            for c in range(1, 10):
+                point = Point(r, c)
+                sensible = game.is_valid_move(Move.play(point)) and \
+                    not is_point_an_eye(game.board, point, game.next_player)
+                self.assertEqual(
+                    sensible,
+                    board_tensor[offset("sensibleness"), r - 1, c - 1])
+        player_plane = board_tensor[offset("current_player_color")]
+        self.assertEqual(
+            game.next_player == Player.black, (player_plane == 1).all())
+
+    def test_ladder_cache(self):
+        encoder = AlphaGoEncoder((9, 9))
+        game = self.random_game(30)[-1]
+        first = encoder.encode(game)
+        num_cached = len(encoder.ladders.cache)
+        self.assertGreater(num_cached, 0)
+        np.testing.assert_array_equal(first, encoder.encode(game))
+        self.assertEqual(num_cached, len(encoder.ladders.cache))
 
 
 if __name__ == '__main__':
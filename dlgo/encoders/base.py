@@ -2,6 +2,8 @@
 import importlib
 # end::importlib[]
 
+import numpy as np
+
 __all__ = [
     'Encoder',
     'get_encoder_by_name',
@@ -36,6 +38,43 @@ class Encoder:
 # <6> Shape of the encoded board structure.
 # end::base_encoder[]
 
+    # Encoded training data records this; bump it in an encoder whose
+    # planes change, so that data from the old version isn't reused.
+    version = 1
+
+    # Whether every plane only holds 0s and 1s, which lets training
+    # data be stored with its bits packed. Encoders with other values
+    # are stored as one int8 per value.
+    binary_planes = True
+
+    def encode_into(self, game_state, board_tensor):
+        """Write the encoding of game_state into board_tensor, an array
+        of shape self.shape() filled with zeros.
+
+        Encoders override this to avoid allocating a tensor per call.
+        """
+        board_tensor[...] = self.encode(game_state)
+
+    def encode_batch(self, game_states, out=None, dtype=np.float32):
+        """Encode a list of game states into one array of shape
+        (len(game_states),) + self.shape().
+
+        If `out` is given, the states are written into its first
+        len(game_states) entries and that slice is returned; otherwise
+        a new array of `dtype` is allocated. Any dtype that holds the
+        encoder's values works, e.g. uint8 for encoders that only use
+        0 and 1.
+        """
+        num_states = len(game_states)
+        if out is None:
+            out = np.zeros((num_states,) + tuple(self.shape()), dtype=dtype)
+        else:
+            out = out[:num_states]
+            out[...] = 0
+        for board_tensor, game_state in zip(out, game_states):
+            self.encode_into(game_state, board_tensor)
+        return out
+
 
 # tag::encoder_by_name[]
 def get_encoder_by_name(name, board_size):  # <1>
@@ -1,7 +1,8 @@
 import numpy as np
 
 from dlgo.encoders.base import Encoder
-from dlgo.goboard import Move, Point
+from dlgo.encoders.planes import ko_mask, liberty_planes, stone_arrays
+from dlgo.goboard import Point
 
 
 class BetaGoEncoder(Encoder):
@@ -22,26 +23,17 @@ class BetaGoEncoder(Encoder):
 
     def encode(self, game_state):
         board_tensor = np.zeros(self.shape())
-        base_plane = {
-            game_state.next_player: 0,
-            game_state.next_player.other: 3,
-        }
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                p = Point(row=r + 1, col=c + 1)
-                go_string = game_state.board.get_go_string(p)
-
-                if go_string is None:
-                    if game_state.does_move_violate_ko(game_state.next_player,
-                                                       Move.play(p)):
-                        board_tensor[6][r][c] = 1
-                else:
-                    liberty_plane = min(3, go_string.num_liberties) - 1
-                    liberty_plane += base_plane[go_string.color]
-                    board_tensor[liberty_plane][r][c] = 1
-
+        self.encode_into(game_state, board_tensor)
         return board_tensor
 
+    def encode_into(self, game_state, board_tensor):
+        next_player = game_state.next_player
+        colors, liberties = stone_arrays(game_state)
+        liberty_planes(board_tensor, colors, liberties, next_player, 0, 3)
+        liberty_planes(
+            board_tensor, colors, liberties, next_player.other, 3, 3)
+        board_tensor[6] = ko_mask(game_state, colors, liberties)
+
     def encode_point(self, point):
         """Turn a board point into an integer index."""
         # Points are 1-indexed
@@ -0,0 +1,190 @@
+"""Ladder reading for the AlphaGo encoder's ladder planes.
+
+A ladder capture is a move that puts an opponent string with two
+liberties in atari, such that the string can't get away: whatever it
+does, the attacker can keep it in atari until it is captured. A ladder
+escape is a move that saves one of our strings in atari from exactly
+that.
+
+Ladders are read on an array board (dlgo.goboard_array) by playing and
+taking back stones, without copying. Ko is ignored. Every read has a
+node budget; a read that runs out counts as neither a capture nor an
+escape, and isn't cached.
+"""
+import numpy as np
+
+from dlgo.goboard_array import copy_board
+from dlgo.gotypes import Point
+
+__all__ = [
+    'LadderReader',
+    'ladder_status',
+]
+
+CAPTURE = 0
+ESCAPE = 1
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class LadderReader():
+    def __init__(self, max_nodes=100, cache_size=100000):
+        """`max_nodes` bounds the number of moves played for a single
+        ladder read; `cache_size` the number of cached read results.
+        """
+        self.max_nodes = max_nodes
+        self.cache_size = cache_size
+        # (zobrist hash, prey point, CAPTURE or ESCAPE) -> result, for
+        # positions where the attacker or the prey is to move.
+        self.cache = {}
+        self.num_nodes = 0
+
+    def ladder_status(self, game_state):
+        """Return (capture, escape): two boolean (num_rows, num_cols)
+        arrays marking the next player's ladder captures and ladder
+        escapes.
+        """
+        board = game_state.board
+        player = game_state.next_player
+        shape = (board.num_rows, board.num_cols)
+        capture = np.zeros(shape, dtype=np.bool_)
+        escape = np.zeros(shape, dtype=np.bool_)
+        # Opponent strings with two liberties can be chased, and our
+        # strings in atari may run.
+        reads = []
+        seen = set()
+        for r in range(1, board.num_rows + 1):
+            for c in range(1, board.num_cols + 1):
+                point = Point(row=r, col=c)
+                if point in seen:
+                    continue
+                go_string = board.get_go_string(point)
+                if go_string is None:
+                    continue
+                seen |= go_string.stones
+                if go_string.color != player and \
+                        go_string.num_liberties == 2:
+                    reads.append((point, CAPTURE, capture))
+                elif go_string.color == player and \
+                        go_string.num_liberties == 1:
+                    reads.append((point, ESCAPE, escape))
+        if not reads:
+            return capture, escape
+
+        board = copy_board(board)
+        for prey, goal, mask in reads:
+            if goal == CAPTURE:
+                moves = board.liberties(prey)
+            else:
+                moves = escape_moves(board, prey)
+            for move in moves:
+                if self.read(board, prey, move, player, goal):
+                    mask[move.row - 1, move.col - 1] = True
+        return capture, escape
+
+    def read(self, board, prey, move, player, goal):
+        """Play `move` for `player` and return True if that reaches
+        `goal` for the string at `prey`: CAPTURE it by ladder, or
+        ESCAPE from one.
+        """
+        if board.get(move) is not None or \
+                board.is_self_capture(player, move):
+            return False
+        self.num_nodes = 0
+        board.place_stone(player, move)
+        try:
+            if goal == CAPTURE:
+                return not self.prey_escapes(board, prey)
+            return self.escapes_after_move(board, prey)
+        except BudgetExceeded:
+            return False
+        finally:
+            board.undo()
+
+    def prey_escapes(self, board, prey):
+        """The string at `prey` is in atari with its owner to move.
+        Return True if it can get out of the ladder.
+        """
+        key = (board.zobrist_hash(), prey, ESCAPE)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        player = board.get(prey)
+        result = False
+        for move in escape_moves(board, prey):
+            if board.is_self_capture(player, move):
+                continue
+            self.play(board, player, move)
+            try:
+                result = self.escapes_after_move(board, prey)
+            finally:
+                board.undo()
+            if result:
+                break
+        self.store(key, result)
+        return result
+
+    def escapes_after_move(self, board, prey):
+        num_liberties = board.num_liberties(prey)
+        if num_liberties >= 3:
+            return True
+        if num_liberties == 2:
+            return not self.attacker_captures(board, prey)
+        return False
+
+    def attacker_captures(self, board, prey):
+        """The string at `prey` has two liberties with the attacker to
+        move. Return True if the attacker can capture it by ladder.
+        """
+        key = (board.zobrist_hash(), prey, CAPTURE)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        attacker = board.get(prey).other
+        result = False
+        for move in board.liberties(prey):
+            if board.is_self_capture(attacker, move):
+                continue
+            self.play(board, attacker, move)
+            try:
+                result = not self.prey_escapes(board, prey)
+            finally:
+                board.undo()
+            if result:
+                break
+        self.store(key, result)
+        return result
+
+    def play(self, board, player, move):
+        self.num_nodes += 1
+        if self.num_nodes > self.max_nodes:
+            raise BudgetExceeded()
+        board.place_stone(player, move)
+
+    def store(self, key, result):
+        if len(self.cache) >= self.cache_size:
+            # Drop the oldest entry.
+            del self.cache[next(iter(self.cache))]
+        self.cache[key] = result
+
+
+def escape_moves(board, prey):
+    """Moves that might save the string at `prey` from atari: its last
+    liberty, and capturing any adjacent opponent string in atari.
+    """
+    return board.liberties(prey) | board.adjacent_atari_liberties(prey)
+
+
+_default_reader = None
+
+
+def ladder_status(game_state):
+    """Return (capture, escape) ladder masks for the next player, see
+    LadderReader.ladder_status. Uses one shared reader and its cache.
+    """
+    global _default_reader
+    if _default_reader is None:
+        _default_reader = LadderReader()
+    return _default_reader.ladder_status(game_state)
@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo import goboard_fast
+from dlgo.encoders.ladders import LadderReader
+from dlgo.gotypes import Player, Point
+
+
+def ladder_game(goboard, next_player, black, white):
+    board = goboard.Board(9, 9)
+    for color, stones in ((Player.black, black), (Player.white, white)):
+        for stone in stones:
+            board.place_stone(color, Point(*stone))
+    return goboard.GameState(board, next_player, None, None)
+
+
+# Rows 3 to 5:
+# ...x.....
+# ..xo.....
+# ....x....
+# White's stone at (4, 4) has two liberties; either atari chases it
+# to the edge.
+BLACK = [(3, 4), (4, 3), (5, 5)]
+WHITE = [(4, 4)]
+
+
+class LadderReaderTest(unittest.TestCase):
+    def test_capture(self):
+        for goboard in (goboard_fast, goboard_array):
+            game = ladder_game(goboard, Player.black, BLACK, WHITE)
+            capture, escape = LadderReader().ladder_status(game)
+            self.assertEqual(
+                [[3, 4], [4, 3]], np.argwhere(capture).tolist())
+            self.assertFalse(escape.any())
+
+    def test_breaker(self):
+        # A white stone at the top edge breaks the ladder that starts
+        # with black's atari at (5, 4); the one from (4, 5) still works.
+        game = ladder_game(goboard_array, Player.black, BLACK,
+                           WHITE + [(1, 5)])
+        capture, _ = LadderReader().ladder_status(game)
+        self.assertFalse(capture[4, 3])
+        self.assertTrue(capture[3, 4])
+
+    def test_escape(self):
+        # Black has played the atari at (5, 4); white runs at (4, 5).
+        black = BLACK + [(5, 4)]
+        game = ladder_game(goboard_array, Player.white, black, WHITE)
+        _, escape = LadderReader().ladder_status(game)
+        self.assertFalse(escape.any())
+        game = ladder_game(goboard_array, Player.white, black,
+                           WHITE + [(1, 5)])
+        _, escape = LadderReader().ladder_status(game)
+        self.assertTrue(escape[3, 4])
+
+    def test_node_budget(self):
+        game = ladder_game(goboard_array, Player.black, BLACK, WHITE)
+        reader = LadderReader(max_nodes=3)
+        capture, _ = reader.ladder_status(game)
+        self.assertFalse(capture.any())
+        # Reads that ran out of budget aren't cached as results.
+        capture, _ = LadderReader().ladder_status(game)
+        self.assertTrue(capture.any())
+
+    def test_cache(self):
+        game = ladder_game(goboard_array, Player.black, BLACK, WHITE)
+        reader = LadderReader(cache_size=10)
+        first = reader.ladder_status(game)
+        self.assertEqual(10, len(reader.cache))
+        second = reader.ladder_status(game)
+        for expected, mask in zip(first, second):
+            self.assertEqual(expected.tolist(), mask.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
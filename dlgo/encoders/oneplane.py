@@ -3,6 +3,7 @@ import numpy as np
 
 from dlgo.encoders.base import Encoder
 from dlgo.goboard import Point
+from dlgo.scoring import board_colors
 # end::oneplane_imports[]
 
 
@@ -17,19 +18,15 @@ class OnePlaneEncoder(Encoder):
 
     def encode(self, game_state):  # <2>
         board_matrix = np.zeros(self.shape())
-        next_player = game_state.next_player
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                p = Point(row=r + 1, col=c + 1)
-                go_string = game_state.board.get_go_string(p)
-                if go_string is None:
-                    continue
-                if go_string.color == next_player:
-                    board_matrix[0, r, c] = 1
-                else:
-                    board_matrix[0, r, c] = -1
+        self.encode_into(game_state, board_matrix)
         return board_matrix
 
+    def encode_into(self, game_state, board_matrix):
+        next_player = game_state.next_player
+        colors = board_colors(game_state.board)
+        board_matrix[0][colors == next_player.value] = 1
+        board_matrix[0][colors == next_player.other.value] = -1
+
 # <1> We can reference this encoder by the name "oneplane".
 # <2> To encode, we fill a matrix with 1 if the point contains one of the current player's stones, -1 if the point contains the opponent's stones and 0 if the point is empty.
 # end::oneplane_encoder[]
@@ -53,6 +50,11 @@ class OnePlaneEncoder(Encoder):
 # <2> Turn an integer index into a board point.
 # end::oneplane_encoder_2[]
 
+    # Opponent stones are -1, so training data can't be bit-packed.
+    # Version 1 data could mix packed and unpacked chunks in one shard.
+    binary_planes = False
+    version = 2
+
 
 # tag::oneplane_create[]
 def create(board_size):
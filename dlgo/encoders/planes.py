@@ -0,0 +1,85 @@
+"""Array views of a game state that the encoders build their planes from.
+
+Boards that export `color_array()` and `liberty_array()` (goboard_fast
+and goboard_array) are read in a few numpy operations; any other board
+falls back to asking every point. A dlgo.snapshot.PositionSnapshot can
+stand in for a game state.
+"""
+import numpy as np
+
+from dlgo.goboard import Move
+from dlgo.gotypes import Point
+from dlgo.scoring import board_colors
+from dlgo.snapshot import PositionSnapshot
+
+__all__ = [
+    'ko_mask',
+    'liberty_planes',
+    'stone_arrays',
+]
+
+
+def stone_arrays(game_state):
+    """Return (colors, liberties), two (num_rows, num_cols) arrays.
+
+    colors holds 0 for empty points, otherwise the Player value of the
+    stone; liberties holds the liberties of the string on each point,
+    0 for empty points.
+    """
+    board = game_state.board
+    colors = board_colors(board)
+    if hasattr(board, 'liberty_array'):
+        return colors, board.liberty_array()
+    liberties = np.zeros(colors.shape, dtype=np.int32)
+    for r, c in zip(*np.nonzero(colors)):
+        go_string = board.get_go_string(Point(row=r + 1, col=c + 1))
+        liberties[r, c] = go_string.num_liberties
+    return colors, liberties
+
+
+def ko_mask(game_state, colors, liberties):
+    """Return a (num_rows, num_cols) boolean array of the empty points
+    where the next player's move would violate ko.
+    """
+    player = game_state.next_player
+    mask = np.zeros(colors.shape, dtype=np.bool_)
+    if isinstance(game_state, PositionSnapshot):
+        if game_state.ko_point is not None:
+            mask[game_state.ko_point.row - 1, game_state.ko_point.col - 1] = True
+        return mask
+    empty = colors == 0
+    if hasattr(game_state.board, 'will_capture'):
+        # These boards only check ko for moves that capture, and only
+        # a move next to an opponent string in atari can capture.
+        in_atari = (colors == player.other.value) & (liberties == 1)
+        if not in_atari.any():
+            return mask
+        candidates = empty & _next_to(in_atari)
+    else:
+        candidates = empty
+    for r, c in zip(*np.nonzero(candidates)):
+        move = Move.play(Point(row=int(r) + 1, col=int(c) + 1))
+        if game_state.does_move_violate_ko(player, move):
+            mask[r, c] = True
+    return mask
+
+
+def _next_to(mask):
+    """Points with at least one neighbor in `mask`."""
+    result = np.zeros_like(mask)
+    result[1:] |= mask[:-1]
+    result[:-1] |= mask[1:]
+    result[:, 1:] |= mask[:, :-1]
+    result[:, :-1] |= mask[:, 1:]
+    return result
+
+
+def liberty_planes(board_tensor, colors, liberties, player, first_plane,
+                   max_liberties):
+    """Mark `player`'s stones in board_tensor, on plane first_plane for
+    strings with one liberty, up to first_plane + max_liberties - 1 for
+    strings with max_liberties or more.
+    """
+    rows, cols = np.nonzero(colors == player.value)
+    planes = first_plane - 1 + np.minimum(liberties[rows, cols], max_liberties)
+    board_tensor[planes, rows, cols] = 1
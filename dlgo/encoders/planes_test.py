@@ -0,0 +1,132 @@
+import random
+import unittest
+
+import numpy as np
+
+from dlgo import goboard
+from dlgo import goboard_array
+from dlgo import goboard_fast
+from dlgo import zero
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.encoders.betago import BetaGoEncoder
+from dlgo.encoders.oneplane import OnePlaneEncoder
+from dlgo.encoders.sevenplane import SevenPlaneEncoder
+from dlgo.encoders.simple import SimpleEncoder
+from dlgo.gotypes import Player, Point
+
+
+def loop_encode(game_state, shape, base_plane, max_liberties, ko_plane):
+    """Point by point encoding, as the encoders used to do it."""
+    board_tensor = np.zeros(shape)
+    _, num_rows, num_cols = shape
+    for r in range(num_rows):
+        for c in range(num_cols):
+            p = Point(row=r + 1, col=c + 1)
+            go_string = game_state.board.get_go_string(p)
+            if go_string is None:
+                if game_state.does_move_violate_ko(
+                        game_state.next_player, goboard.Move.play(p)):
+                    board_tensor[ko_plane][r][c] = 1
+            else:
+                liberty_plane = min(max_liberties, go_string.num_liberties) - 1
+                liberty_plane += base_plane[go_string.color]
+                board_tensor[liberty_plane][r][c] = 1
+    return board_tensor
+
+
+def reference_encodings(game_state):
+    """Return (encoder, expected tensor) pairs for a game state."""
+    player = game_state.next_player
+    relative = {player: 0, player.other: 3}
+
+    simple = SimpleEncoder((5, 5))
+    expected = loop_encode(game_state, simple.shape(),
+                           {Player.black: 0, Player.white: 4}, 4, 10)
+    expected[8 if player == Player.black else 9] = 1
+    yield simple, expected
+
+    for encoder in (SevenPlaneEncoder((5, 5)), BetaGoEncoder((5, 5))):
+        yield encoder, loop_encode(
+            game_state, encoder.shape(), relative, 3, 6)
+
+    encoder = zero.ZeroEncoder(5)
+    expected = loop_encode(game_state, encoder.shape(),
+                           {player: 0, player.other: 4}, 4, 10)
+    expected[8 if player == Player.white else 9] = 1
+    yield encoder, expected
+
+    encoder = OnePlaneEncoder((5, 5))
+    expected = loop_encode(game_state, (7, 5, 5), relative, 1, 6)
+    yield encoder, expected[:1] - expected[3:4]
+
+
+def play_ko(goboard_module):
+    # .bw..
+    # b.bw.
+    # .bw..
+    # White captures at the center, black may not retake at once.
+    game = goboard_module.GameState.new_game(5)
+    moves = [(1, 2), (1, 3), (2, 1), (2, 4), (3, 2), (3, 3), (2, 3), (2, 2)]
+    for row, col in moves:
+        game = game.apply_move(goboard_module.Move.play(Point(row, col)))
+    return game
+
+
+class PlanesTest(unittest.TestCase):
+    def assert_matches_reference(self, game_state):
+        for encoder, expected in reference_encodings(game_state):
+            encoded = encoder.encode(game_state)
+            self.assertEqual(expected.dtype, encoded.dtype)
+            np.testing.assert_array_equal(expected, encoded)
+
+    def test_ko(self):
+        for goboard_module in (goboard, goboard_fast, goboard_array):
+            game = play_ko(goboard_module)
+            self.assertTrue(game.does_move_violate_ko(
+                Player.black, goboard.Move.play(Point(2, 3))))
+            self.assert_matches_reference(game)
+            self.assertEqual(1, SimpleEncoder((5, 5)).encode(game)[10].sum())
+
+    def test_random_games(self):
+        random.seed(1)
+        bot = FastRandomBot()
+        for goboard_module in (goboard_fast, goboard_array):
+            for _ in range(3):
+                game = goboard_module.GameState.new_game(5)
+                while not game.is_over():
+                    self.assert_matches_reference(game)
+                    game = game.apply_move(bot.select_move(game))
+
+
+class EncodeBatchTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(2)
+        bot = FastRandomBot()
+        self.game_states = [goboard_fast.GameState.new_game(5)]
+        for _ in range(10):
+            game = self.game_states[-1]
+            self.game_states.append(game.apply_move(bot.select_move(game)))
+
+    def test_matches_encode(self):
+        for encoder in (SimpleEncoder((5, 5)), OnePlaneEncoder((5, 5)),
+                        zero.ZeroEncoder(5)):
+            expected = np.array([encoder.encode(game_state)
+                                 for game_state in self.game_states])
+            encoded = encoder.encode_batch(self.game_states)
+            self.assertEqual(np.float32, encoded.dtype)
+            np.testing.assert_array_equal(expected, encoded)
+
+    def test_writes_into_buffer(self):
+        encoder = SimpleEncoder((5, 5))
+        out = np.full((20,) + encoder.shape(), 7, dtype=np.uint8)
+        encoded = encoder.encode_batch(self.game_states, out=out)
+        self.assertEqual(len(self.game_states), len(encoded))
+        self.assertTrue(np.shares_memory(out, encoded))
+        np.testing.assert_array_equal(
+            encoder.encode_batch(self.game_states), encoded)
+        # Entries past the batch are left alone.
+        self.assertTrue((out[len(self.game_states):] == 7).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,8 @@
 import numpy as np
 
 from dlgo.encoders.base import Encoder
-from dlgo.goboard import Move, Point
+from dlgo.encoders.planes import ko_mask, liberty_planes, stone_arrays
+from dlgo.goboard import Point
 
 
 class SevenPlaneEncoder(Encoder):
@@ -17,21 +18,17 @@ class SevenPlaneEncoder(Encoder):
 # tag::sevenplane_encode[]
     def encode(self, game_state):
         board_tensor = np.zeros(self.shape())
-        base_plane = {game_state.next_player: 0,
-                      game_state.next_player.other: 3}
-        for row in range(self.board_height):
-            for col in range(self.board_width):
-                p = Point(row=row + 1, col=col + 1)
-                go_string = game_state.board.get_go_string(p)
-                if go_string is None:
-                    if game_state.does_move_violate_ko(game_state.next_player,
-                                                       Move.play(p)):
-                        board_tensor[6][row][col] = 1  # <1>
-                else:
-                    liberty_plane = min(3, go_string.num_liberties) - 1
-                    liberty_plane += base_plane[go_string.color]
-                    board_tensor[liberty_plane][row][col] = 1  # <2>
+        self.encode_into(game_state, board_tensor)
         return board_tensor
+
+    def encode_into(self, game_state, board_tensor):
+        next_player = game_state.next_player
+        colors, liberties = stone_arrays(game_state)
+        board_tensor[6] = ko_mask(game_state, colors, liberties)  # <1>
+        liberty_planes(board_tensor, colors, liberties,
+                       next_player, 0, 3)  # <2>
+        liberty_planes(board_tensor, colors, liberties,
+                       next_player.other, 3, 3)
 # <1> Encoding moves prohibited by the ko rule
 # <2> Encoding black and white stones with 1, 2 or more liberties.
 # end::sevenplane_encode[]
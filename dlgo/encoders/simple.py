@@ -1,7 +1,7 @@
 import numpy as np
 
 from dlgo.encoders.base import Encoder
-from dlgo.goboard import Move
+from dlgo.encoders.planes import ko_mask, liberty_planes, stone_arrays
 from dlgo.gotypes import Player, Point
 
 
@@ -24,26 +24,18 @@ class SimpleEncoder(Encoder):
 
     def encode(self, game_state):
         board_tensor = np.zeros(self.shape())
+        self.encode_into(game_state, board_tensor)
+        return board_tensor
+
+    def encode_into(self, game_state, board_tensor):
         if game_state.next_player == Player.black:
             board_tensor[8] = 1
         else:
             board_tensor[9] = 1
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                p = Point(row=r + 1, col=c + 1)
-                go_string = game_state.board.get_go_string(p)
-
-                if go_string is None:
-                    if game_state.does_move_violate_ko(game_state.next_player,
-                                                       Move.play(p)):
-                        board_tensor[10][r][c] = 1
-                else:
-                    liberty_plane = min(4, go_string.num_liberties) - 1
-                    if go_string.color == Player.white:
-                        liberty_plane += 4
-                    board_tensor[liberty_plane][r][c] = 1
-
-        return board_tensor
+        colors, liberties = stone_arrays(game_state)
+        liberty_planes(board_tensor, colors, liberties, Player.black, 0, 4)
+        liberty_planes(board_tensor, colors, liberties, Player.white, 4, 4)
+        board_tensor[10] = ko_mask(game_state, colors, liberties)
 
     def encode_point(self, point):
         """Turn a board point into an integer index."""
@@ -0,0 +1,1132 @@
+"""Array-backed Go board.
+
+Drop-in replacement for the `Board` / `GameState` / `Move` classes in
+`dlgo.goboard_fast`. Instead of a dict of immutable `GoString` objects,
+the board is stored as a flat array with a one-point border around the
+playing area. Strings are kept as circular linked lists of stones with
+a representative ("head") stone per string, and every string tracks
+pseudo-liberties incrementally, so placing a stone only touches the
+strings next to it.
+
+Point(row, col) lives at index `row * (num_cols + 2) + col`.
+"""
+import array
+
+import numpy as np
+
+from dlgo.gotypes import Player, Point
+from dlgo.scoring import compute_game_result
+from dlgo import goboard_fast
+from dlgo import zobrist
+from dlgo.history import SituationHistory
+from dlgo.goboard_fast import GoString, Move
+from dlgo.goboard_fast import init_corner_table, init_neighbor_table
+from dlgo.goboard_fast import corner_tables, neighbor_tables
+
+__all__ = [
+    'Board',
+    'GameState',
+    'Move',
+    'SearchState',
+]
+
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+BORDER = 3
+
+# Maps the values stored in the color array back to players.
+PLAYERS = (None, Player.black, Player.white, None)
+
+geometries = {}
+
+
+class BoardGeometry():
+    """Lookup tables shared by all boards of the same size."""
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.stride = num_cols + 2
+        self.size = (num_rows + 2) * self.stride
+        self.offsets = (-self.stride, self.stride, -1, 1)
+        self.diagonals = (
+            -self.stride - 1, -self.stride + 1,
+            self.stride - 1, self.stride + 1)
+        # A point and its eight surrounding points.
+        self.around = (0,) + self.offsets + self.diagonals
+
+        self.empty_colors = bytearray([BORDER] * self.size)
+        self.empty_mask = bytearray(self.size)
+        self.points = [None] * self.size
+        self.on_board = []
+        # Zobrist code to xor in when a stone of the given color is
+        # placed on (or removed from) a point.
+        self.stone_codes = [None, [0] * self.size, [0] * self.size]
+        codes = zobrist.stone_codes(num_rows, num_cols)
+        for r in range(1, num_rows + 1):
+            for c in range(1, num_cols + 1):
+                idx = r * self.stride + c
+                p = Point(row=r, col=c)
+                self.empty_colors[idx] = EMPTY
+                self.empty_mask[idx] = 1
+                self.points[idx] = p
+                self.on_board.append(idx)
+                for player in (Player.black, Player.white):
+                    self.stone_codes[player.value][idx] = \
+                        codes[player.value][(r - 1) * num_cols + c - 1]
+
+
+def get_geometry(num_rows, num_cols):
+    dim = (num_rows, num_cols)
+    if dim not in geometries:
+        geometries[dim] = BoardGeometry(num_rows, num_cols)
+    return geometries[dim]
+
+
+class MoveAgeView():
+    """Read-only equivalent of `dlgo.utils.MoveAge` for an array board."""
+    def __init__(self, board):
+        self._board = board
+
+    def get(self, row, col):
+        board = self._board
+        idx = (row + 1) * board._stride + col + 1
+        if board._colors[idx] == EMPTY:
+            return -1
+        return board._num_placed - board._placed_at[idx]
+
+
+class Board():
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._geometry = get_geometry(num_rows, num_cols)
+        self._stride = self._geometry.stride
+        self._offsets = self._geometry.offsets
+        self._codes = self._geometry.stone_codes
+
+        size = self._geometry.size
+        self._colors = bytearray(self._geometry.empty_colors)
+        # String membership: head stone of the string, and the next
+        # stone in the string's circular list.
+        self._heads = array.array('i', [0] * size)
+        self._next = array.array('i', [0] * size)
+        # Per-string data, only meaningful at head indices. Pseudo
+        # liberties count every (stone, empty neighbor) adjacency; the
+        # sum and sum of squares of their indices let us detect
+        # strings with exactly one real liberty in O(1).
+        self._sizes = array.array('i', [0] * size)
+        self._lib_count = array.array('i', [0] * size)
+        self._lib_sum = array.array('q', [0] * size)
+        self._lib_sum_sq = array.array('q', [0] * size)
+        self._placed_at = array.array('i', [-1] * size)
+        self._num_placed = 0
+        self._hash = zobrist.EMPTY_BOARD
+        self._string_cache = {}
+        # Per color move masks, indexed by player value: legal ignores
+        # ko, sensible is legal and does not fill one of our own eyes,
+        # capture means the move would capture something. Every change
+        # queues the points around it, and the masks are brought up to
+        # date on the next query.
+        empty_mask = self._geometry.empty_mask
+        self._legal = [None, bytearray(empty_mask), bytearray(empty_mask)]
+        self._sensible = [None, bytearray(empty_mask), bytearray(empty_mask)]
+        self._captures = [None, bytearray(self._geometry.size),
+                          bytearray(self._geometry.size)]
+        self._stale = []
+        # One entry per placed stone (point index, merged strings,
+        # captured strings, overwritten values, points whose masks
+        # changed) so that undo() can take the stone back.
+        self._undo_stack = []
+
+        dim = (num_rows, num_cols)
+        if dim not in neighbor_tables:
+            init_neighbor_table(dim)
+        if dim not in corner_tables:
+            init_corner_table(dim)
+        self.neighbor_table = neighbor_tables[dim]
+        self.corner_table = corner_tables[dim]
+
+    def neighbors(self, point):
+        return self.neighbor_table[point]
+
+    def corners(self, point):
+        return self.corner_table[point]
+
+    @property
+    def move_ages(self):
+        return MoveAgeView(self)
+
+    def index(self, point):
+        """Return the flat array index of a point on the board."""
+        return point.row * self._stride + point.col
+
+    def place_stone(self, player, point):
+        assert self.is_on_grid(point)
+        idx = point.row * self._stride + point.col
+        colors = self._colors
+        if colors[idx] != EMPTY:
+            print('Illegal play on %s' % str(point))
+        assert colors[idx] == EMPTY
+        self._string_cache.clear()
+        color = player.value
+        other = BLACK + WHITE - color
+        heads = self._heads
+        lib_count = self._lib_count
+        lib_sum = self._lib_sum
+        lib_sum_sq = self._lib_sum_sq
+
+        # A stone captured here earlier may still be linked into its old
+        # string, which undo() has to be able to restore.
+        saved = (heads[idx], self._next[idx], self._sizes[idx],
+                 lib_count[idx], lib_sum[idx], lib_sum_sq[idx],
+                 self._placed_at[idx])
+        colors[idx] = color
+        heads[idx] = idx
+        self._next[idx] = idx
+        self._sizes[idx] = 1
+        lib_count[idx] = 0
+        lib_sum[idx] = 0
+        lib_sum_sq[idx] = 0
+        self._num_placed += 1
+        self._placed_at[idx] = self._num_placed
+        self._hash ^= self._codes[color][idx]
+
+        # Points whose move masks may change: the area around the new
+        # stone, plus the liberties of strings that go in or out of
+        # atari. Friendly strings in atari lose that status by joining
+        # the new stone, so note their liberty before merging.
+        changed = [idx + offset for offset in self._geometry.around]
+        for offset in self._offsets:
+            neighbor = idx + offset
+            if colors[neighbor] == color and \
+                    self._in_atari(heads[neighbor]):
+                changed.append(self._atari_liberty(heads[neighbor]))
+
+        # 0. The new stone takes a liberty from every adjacent string
+        #    and gains every adjacent empty point as a liberty.
+        idx_sq = idx * idx
+        for offset in self._offsets:
+            neighbor = idx + offset
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                lib_count[idx] += 1
+                lib_sum[idx] += neighbor
+                lib_sum_sq[idx] += neighbor * neighbor
+            elif neighbor_color != BORDER:
+                head = heads[neighbor]
+                lib_count[head] -= 1
+                lib_sum[head] -= idx
+                lib_sum_sq[head] -= idx_sq
+
+        # 1. Merge any adjacent strings of the same color.
+        merged = []
+        for offset in self._offsets:
+            neighbor = idx + offset
+            if colors[neighbor] == color and \
+                    heads[neighbor] != heads[idx]:
+                merged.append(
+                    self._merge_strings(heads[idx], heads[neighbor]))
+
+        # 2. Remove any adjacent strings of the opposite color that
+        #    have no liberties left.
+        captured = []
+        for offset in self._offsets:
+            neighbor = idx + offset
+            if colors[neighbor] == other and \
+                    lib_count[heads[neighbor]] == 0:
+                captured.append(heads[neighbor])
+                self._remove_string(heads[neighbor])
+
+        for offset in self._offsets:
+            neighbor = idx + offset
+            if colors[neighbor] != EMPTY and colors[neighbor] != BORDER and \
+                    self._in_atari(heads[neighbor]):
+                changed.append(self._atari_liberty(heads[neighbor]))
+        for head in captured:
+            self._captured_changes(head, color, changed)
+        self._mark_stale(changed)
+
+        self._undo_stack.append((idx, merged, captured, saved, changed))
+
+    def undo(self):
+        """Take back the most recent place_stone call, restoring any
+        stones it captured.
+        """
+        idx, merged, captured, saved, changed = self._undo_stack.pop()
+        self._string_cache.clear()
+        colors = self._colors
+        heads = self._heads
+        color = colors[idx]
+        # Undo the steps of place_stone in reverse order.
+        for head in reversed(captured):
+            self._restore_string(head, BLACK + WHITE - color)
+        for head, other_head in reversed(merged):
+            self._split_strings(head, other_head)
+        idx_sq = idx * idx
+        for offset in self._offsets:
+            neighbor = idx + offset
+            neighbor_color = colors[neighbor]
+            if neighbor_color != EMPTY and neighbor_color != BORDER:
+                head = heads[neighbor]
+                self._lib_count[head] += 1
+                self._lib_sum[head] += idx
+                self._lib_sum_sq[head] += idx_sq
+        colors[idx] = EMPTY
+        (heads[idx], self._next[idx], self._sizes[idx],
+         self._lib_count[idx], self._lib_sum[idx], self._lib_sum_sq[idx],
+         self._placed_at[idx]) = saved
+        self._num_placed -= 1
+        self._hash ^= self._codes[color][idx]
+        self._mark_stale(changed)
+
+    def _merge_strings(self, head, other_head):
+        if self._sizes[head] < self._sizes[other_head]:
+            head, other_head = other_head, head
+        heads = self._heads
+        next_stone = self._next
+        stone = other_head
+        while True:
+            heads[stone] = head
+            stone = next_stone[stone]
+            if stone == other_head:
+                break
+        next_stone[head], next_stone[other_head] = \
+            next_stone[other_head], next_stone[head]
+        self._sizes[head] += self._sizes[other_head]
+        self._lib_count[head] += self._lib_count[other_head]
+        self._lib_sum[head] += self._lib_sum[other_head]
+        self._lib_sum_sq[head] += self._lib_sum_sq[other_head]
+        return head, other_head
+
+    def _split_strings(self, head, other_head):
+        """Reverse a _merge_strings call."""
+        heads = self._heads
+        next_stone = self._next
+        next_stone[head], next_stone[other_head] = \
+            next_stone[other_head], next_stone[head]
+        stone = other_head
+        while True:
+            heads[stone] = other_head
+            stone = next_stone[stone]
+            if stone == other_head:
+                break
+        self._sizes[head] -= self._sizes[other_head]
+        self._lib_count[head] -= self._lib_count[other_head]
+        self._lib_sum[head] -= self._lib_sum[other_head]
+        self._lib_sum_sq[head] -= self._lib_sum_sq[other_head]
+
+    def _remove_string(self, head):
+        colors = self._colors
+        heads = self._heads
+        color = colors[head]
+        other = BLACK + WHITE - color
+        codes = self._codes[color]
+        stone = head
+        while True:
+            colors[stone] = EMPTY
+            self._hash ^= codes[stone]
+            stone = self._next[stone]
+            if stone == head:
+                break
+        # Removing a string creates liberties for the strings around it.
+        while True:
+            stone_sq = stone * stone
+            for offset in self._offsets:
+                neighbor = stone + offset
+                if colors[neighbor] == other:
+                    neighbor_head = heads[neighbor]
+                    self._lib_count[neighbor_head] += 1
+                    self._lib_sum[neighbor_head] += stone
+                    self._lib_sum_sq[neighbor_head] += stone_sq
+            stone = self._next[stone]
+            if stone == head:
+                break
+
+    def _restore_string(self, head, color):
+        """Put a string captured by _remove_string back on the board.
+
+        The string's links and head were left untouched when it was
+        removed, so only colors and neighboring liberties change.
+        """
+        colors = self._colors
+        heads = self._heads
+        other = BLACK + WHITE - color
+        codes = self._codes[color]
+        stone = head
+        while True:
+            colors[stone] = color
+            self._hash ^= codes[stone]
+            stone_sq = stone * stone
+            for offset in self._offsets:
+                neighbor = stone + offset
+                if colors[neighbor] == other:
+                    neighbor_head = heads[neighbor]
+                    self._lib_count[neighbor_head] -= 1
+                    self._lib_sum[neighbor_head] -= stone
+                    self._lib_sum_sq[neighbor_head] -= stone_sq
+            stone = self._next[stone]
+            if stone == head:
+                break
+
+    def _captured_changes(self, head, capturer, changed):
+        """Add the points whose masks change because the string at
+        `head` was captured: the area around each removed stone, and
+        the liberties of the capturing strings next to it.
+        """
+        around = self._geometry.around
+        stones = self._string_stones(head)
+        capturing_heads = set()
+        for stone in stones:
+            for offset in around:
+                changed.append(stone + offset)
+            for offset in self._offsets:
+                if self._colors[stone + offset] == capturer:
+                    capturing_heads.add(self._heads[stone + offset])
+        for capturing_head in capturing_heads:
+            changed.extend(self._string_liberties(capturing_head))
+
+    def _mark_stale(self, points):
+        self._stale.extend(points)
+        if len(self._stale) > self._geometry.size:
+            # Long run of moves without a query: cheaper to redo the
+            # whole board once than to keep queueing.
+            self._stale = list(self._geometry.on_board)
+
+    def _update_masks(self):
+        points = set(self._stale)
+        self._stale = []
+        colors = self._colors
+        heads = self._heads
+        lib_count = self._lib_count
+        lib_sum = self._lib_sum
+        lib_sum_sq = self._lib_sum_sq
+        offsets = self._offsets
+        black_legal, white_legal = self._legal[BLACK], self._legal[WHITE]
+        black_sensible, white_sensible = \
+            self._sensible[BLACK], self._sensible[WHITE]
+        black_captures, white_captures = \
+            self._captures[BLACK], self._captures[WHITE]
+        for idx in points:
+            color = colors[idx]
+            if color != EMPTY:
+                if color != BORDER:
+                    black_legal[idx] = white_legal[idx] = 0
+                    black_sensible[idx] = white_sensible[idx] = 0
+                    black_captures[idx] = white_captures[idx] = 0
+                continue
+            # For each color: is an adjacent string of that color in
+            # atari, and is one not in atari.
+            has_liberty = False
+            black_atari = white_atari = False
+            black_safe = white_safe = False
+            for offset in offsets:
+                neighbor = idx + offset
+                neighbor_color = colors[neighbor]
+                if neighbor_color == EMPTY:
+                    has_liberty = True
+                elif neighbor_color != BORDER:
+                    head = heads[neighbor]
+                    count = lib_count[head]
+                    total = lib_sum[head]
+                    in_atari = count and \
+                        total * total == count * lib_sum_sq[head]
+                    if neighbor_color == BLACK:
+                        if in_atari:
+                            black_atari = True
+                        else:
+                            black_safe = True
+                    elif in_atari:
+                        white_atari = True
+                    else:
+                        white_safe = True
+            black_captures[idx] = white_atari
+            white_captures[idx] = black_atari
+            if has_liberty:
+                # Can't be self capture, and can't be an eye.
+                black_legal[idx] = white_legal[idx] = 1
+                black_sensible[idx] = white_sensible[idx] = 1
+                continue
+            is_black_legal = white_atari or black_safe
+            is_white_legal = black_atari or white_safe
+            black_legal[idx] = is_black_legal
+            white_legal[idx] = is_white_legal
+            # An eye needs every neighbor to be a friendly stone.
+            black_sensible[idx] = is_black_legal and (
+                white_atari or white_safe or not self._is_eye(idx, BLACK))
+            white_sensible[idx] = is_white_legal and (
+                black_atari or black_safe or not self._is_eye(idx, WHITE))
+
+    def _set_strings(self, strings):
+        """Put whole strings on an empty board at once, without looking
+        for captures. `strings` is a list of (player, points) pairs.
+        """
+        colors = self._colors
+        stride = self._stride
+        members = []
+        for player, points in strings:
+            color = player.value
+            stones = [p.row * stride + p.col for p in points]
+            for idx in stones:
+                colors[idx] = color
+                self._hash ^= self._codes[color][idx]
+            members.append(stones)
+        # Pseudo liberties need every stone in place first.
+        for stones in members:
+            head = stones[0]
+            count = total = total_sq = 0
+            for i, idx in enumerate(stones):
+                self._heads[idx] = head
+                self._next[idx] = stones[i - 1]
+                self._num_placed += 1
+                self._placed_at[idx] = self._num_placed
+                for offset in self._offsets:
+                    neighbor = idx + offset
+                    if colors[neighbor] == EMPTY:
+                        count += 1
+                        total += neighbor
+                        total_sq += neighbor * neighbor
+            self._sizes[head] = len(stones)
+            self._lib_count[head] = count
+            self._lib_sum[head] = total
+            self._lib_sum_sq[head] = total_sq
+        self._string_cache.clear()
+        self._mark_stale(self._geometry.on_board)
+
+    def _is_eye(self, idx, color):
+        """Same rule as `dlgo.agent.helpers_fast.is_point_an_eye`."""
+        colors = self._colors
+        for offset in self._offsets:
+            neighbor_color = colors[idx + offset]
+            if neighbor_color != color and neighbor_color != BORDER:
+                return False
+        friendly_corners = 0
+        off_board_corners = 0
+        for offset in self._geometry.diagonals:
+            corner_color = colors[idx + offset]
+            if corner_color == color:
+                friendly_corners += 1
+            elif corner_color == BORDER:
+                off_board_corners += 1
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    def _atari_liberty(self, head):
+        return self._lib_sum[head] // self._lib_count[head]
+
+    def _in_atari(self, head):
+        """True if the string at `head` has exactly one liberty."""
+        count = self._lib_count[head]
+        if count == 0:
+            return False
+        lib_sum = self._lib_sum[head]
+        # All pseudo liberties are the same point iff the variance of
+        # their indices is zero.
+        return lib_sum * lib_sum == count * self._lib_sum_sq[head]
+
+    def _string_stones(self, head):
+        stones = [head]
+        stone = self._next[head]
+        while stone != head:
+            stones.append(stone)
+            stone = self._next[stone]
+        return stones
+
+    def _string_liberties(self, head):
+        colors = self._colors
+        liberties = set()
+        for stone in self._string_stones(head):
+            for offset in self._offsets:
+                if colors[stone + offset] == EMPTY:
+                    liberties.add(stone + offset)
+        return liberties
+
+    def is_self_capture(self, player, point):
+        idx = point.row * self._stride + point.col
+        colors = self._colors
+        color = player.value
+        friendly_heads = []
+        for offset in self._offsets:
+            neighbor = idx + offset
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                # This point has a liberty. Can't be self capture.
+                return False
+            elif neighbor_color == color:
+                # Gather for later analysis.
+                friendly_heads.append(self._heads[neighbor])
+            elif neighbor_color != BORDER:
+                if self._in_atari(self._heads[neighbor]):
+                    # This move is real capture, not a self capture.
+                    return False
+        return all(self._in_atari(head) for head in friendly_heads)
+
+    def will_capture(self, player, point):
+        idx = point.row * self._stride + point.col
+        colors = self._colors
+        other = BLACK + WHITE - player.value
+        for offset in self._offsets:
+            neighbor = idx + offset
+            if colors[neighbor] == other and \
+                    self._in_atari(self._heads[neighbor]):
+                # This move would capture.
+                return True
+        return False
+
+    def hash_after_move(self, player, point):
+        """Return the zobrist hash the board would have after `player`
+        plays at `point`, without modifying the board.
+        """
+        idx = point.row * self._stride + point.col
+        colors = self._colors
+        color = player.value
+        other = BLACK + WHITE - color
+        new_hash = self._hash ^ self._codes[color][idx]
+        captured = []
+        for offset in self._offsets:
+            neighbor = idx + offset
+            if colors[neighbor] == other:
+                head = self._heads[neighbor]
+                if head not in captured and self._in_atari(head):
+                    captured.append(head)
+                    codes = self._codes[other]
+                    for stone in self._string_stones(head):
+                        new_hash ^= codes[stone]
+        return new_hash
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    def get(self, point):
+        """Return the content of a point on the board.
+
+        Returns None if the point is empty, or a Player if there is a
+        stone on that point.
+        """
+        row, col = point
+        if 1 <= row <= self.num_rows and 1 <= col <= self.num_cols:
+            return PLAYERS[self._colors[row * self._stride + col]]
+        return None
+
+    def get_go_string(self, point):
+        """Return the entire string of stones at a point.
+
+        Returns None if the point is empty, or a GoString if there is
+        a stone on that point.
+        """
+        if not self.is_on_grid(point):
+            return None
+        idx = point.row * self._stride + point.col
+        color = self._colors[idx]
+        if color == EMPTY:
+            return None
+        head = self._heads[idx]
+        string = self._string_cache.get(head)
+        if string is None:
+            points = self._geometry.points
+            string = GoString(
+                PLAYERS[color],
+                [points[stone] for stone in self._string_stones(head)],
+                [points[lib] for lib in self._string_liberties(head)])
+            self._string_cache[head] = string
+        return string
+
+    def num_liberties(self, point):
+        """Return the number of liberties of the string at a point, or
+        0 if the point is empty.
+        """
+        idx = point.row * self._stride + point.col
+        if self._colors[idx] == EMPTY:
+            return 0
+        head = self._heads[idx]
+        if self._in_atari(head):
+            return 1
+        return len(self._string_liberties(head))
+
+    def adjacent_atari_liberties(self, point):
+        """Return the set of last liberties of the opponent strings in
+        atari next to the string at `point`: the moves that would let
+        that string capture its way out.
+        """
+        head = self._heads[point.row * self._stride + point.col]
+        colors = self._colors
+        heads = self._heads
+        other = BLACK + WHITE - colors[head]
+        points = self._geometry.points
+        liberties = set()
+        for stone in self._string_stones(head):
+            for offset in self._offsets:
+                neighbor = stone + offset
+                if colors[neighbor] == other and \
+                        self._in_atari(heads[neighbor]):
+                    liberties.add(
+                        points[self._atari_liberty(heads[neighbor])])
+        return liberties
+
+    def liberties(self, point):
+        """Return the set of liberties of the string at `point`."""
+        points = self._geometry.points
+        head = self._heads[point.row * self._stride + point.col]
+        return set(points[lib] for lib in self._string_liberties(head))
+
+    def ko_point(self):
+        """Return the point where the last stone captured a single
+        stone and could itself be taken back by a single stone, which
+        the opponent may not do right away; None if there is none.
+        """
+        if not self._undo_stack:
+            return None
+        idx, _, captured, _, _ = self._undo_stack[-1]
+        if len(captured) != 1 or self._sizes[captured[0]] != 1:
+            return None
+        if self._sizes[self._heads[idx]] != 1 or not self._in_atari(idx):
+            return None
+        return self._geometry.points[captured[0]]
+
+    def color_array(self):
+        """Return a (num_rows, num_cols) uint8 array of the stones on
+        the board: 0 for empty points, otherwise the Player value.
+        """
+        padded = np.frombuffer(self._colors, dtype=np.uint8).reshape(
+            self.num_rows + 2, self.num_cols + 2)
+        return padded[1:-1, 1:-1].copy()
+
+    def liberty_array(self):
+        """Return a (num_rows, num_cols) int32 array with the number of
+        liberties of the string at each point, 0 for empty points.
+        """
+        size = self._geometry.size
+        colors = np.frombuffer(self._colors, dtype=np.uint8)
+        is_stone = (colors == BLACK) | (colors == WHITE)
+        # Head of the string on every point, size for points without
+        # a stone.
+        heads = np.where(
+            is_stone, np.frombuffer(self._heads, dtype=np.int32), size)
+        empty = np.flatnonzero(colors == EMPTY)
+        # An empty point is a liberty of each distinct string next to
+        # it, so count every neighbor head that the point hasn't
+        # already counted for an earlier neighbor.
+        neighbor_heads = [heads[empty + offset] for offset in self._offsets]
+        counted = []
+        for i, neighbor in enumerate(neighbor_heads):
+            new = neighbor != size
+            for earlier in neighbor_heads[:i]:
+                new &= neighbor != earlier
+            counted.append(neighbor[new])
+        counts = np.bincount(
+            np.concatenate(counted), minlength=size + 1).astype(np.int32)
+        liberties = np.where(is_stone, counts[heads], 0)
+        return liberties.reshape(
+            self.num_rows + 2, self.num_cols + 2)[1:-1, 1:-1]
+
+    def _mask_view(self, values):
+        if self._stale:
+            self._update_masks()
+        padded = np.frombuffer(values, dtype=np.bool_).reshape(
+            self.num_rows + 2, self.num_cols + 2)
+        view = padded[1:-1, 1:-1]
+        view.flags.writeable = False
+        return view
+
+    def legal_mask(self, player):
+        """Return a (num_rows, num_cols) boolean array of the points
+        where `player` may play, ignoring ko.
+
+        The array is a read-only view that follows later changes to the
+        board; copy it to keep a snapshot.
+        """
+        return self._mask_view(self._legal[player.value])
+
+    def sensible_mask(self, player):
+        """Like legal_mask, but also excludes points that fill one of
+        `player`'s own eyes.
+        """
+        return self._mask_view(self._sensible[player.value])
+
+    def capture_mask(self, player):
+        """Like legal_mask, but only the points where `player` would
+        capture at least one stone.
+        """
+        return self._mask_view(self._captures[player.value])
+
+    def sensible_points(self, player):
+        """Return the flat indices of the sensible points for `player`,
+        as an array.
+        """
+        if self._stale:
+            self._update_masks()
+        return np.flatnonzero(
+            np.frombuffer(self._sensible[player.value], dtype=np.bool_))
+
+    def point_at(self, idx):
+        """Return the Point at a flat array index."""
+        return self._geometry.points[idx]
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and \
+            self.num_rows == other.num_rows and \
+            self.num_cols == other.num_cols and \
+            self._hash == other._hash
+
+    def copy(self):
+        copied = Board.__new__(Board)
+        copied.__dict__.update(self.__dict__)
+        copied._colors = self._colors[:]
+        copied._heads = self._heads[:]
+        copied._next = self._next[:]
+        copied._sizes = self._sizes[:]
+        copied._lib_count = self._lib_count[:]
+        copied._lib_sum = self._lib_sum[:]
+        copied._lib_sum_sq = self._lib_sum_sq[:]
+        copied._placed_at = self._placed_at[:]
+        copied._legal = [None, self._legal[BLACK][:], self._legal[WHITE][:]]
+        copied._sensible = [
+            None, self._sensible[BLACK][:], self._sensible[WHITE][:]]
+        copied._captures = [
+            None, self._captures[BLACK][:], self._captures[WHITE][:]]
+        copied._stale = self._stale[:]
+        copied._string_cache = {}
+        copied._undo_stack = []
+        return copied
+
+    def __deepcopy__(self, memodict={}):
+        return self.copy()
+
+    def __getstate__(self):
+        # Lookup tables are shared per board size; rebuild them on load
+        # instead of pickling them with every board.
+        state = self.__dict__.copy()
+        for name in ('_geometry', '_offsets', '_codes',
+                     'neighbor_table', 'corner_table'):
+            del state[name]
+        state['_string_cache'] = {}
+        state['_undo_stack'] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._geometry = get_geometry(self.num_rows, self.num_cols)
+        self._offsets = self._geometry.offsets
+        self._codes = self._geometry.stone_codes
+        dim = (self.num_rows, self.num_cols)
+        if dim not in neighbor_tables:
+            init_neighbor_table(dim)
+        if dim not in corner_tables:
+            init_corner_table(dim)
+        self.neighbor_table = neighbor_tables[dim]
+        self.corner_table = corner_tables[dim]
+
+    def zobrist_hash(self):
+        return self._hash
+
+
+def legal_move_mask(game_state):
+    board = game_state.board
+    if game_state.is_over():
+        return np.zeros((board.num_rows, board.num_cols), dtype=np.bool_)
+    player = game_state.next_player
+    mask = board.legal_mask(player).copy()
+    # Ko can only forbid moves that capture, so only those need the
+    # full check.
+    rows, cols = np.nonzero(mask & board.capture_mask(player))
+    for r, c in zip(rows.tolist(), cols.tolist()):
+        move = Move.play(Point(row=r + 1, col=c + 1))
+        if game_state.does_move_violate_ko(player, move):
+            mask[r, c] = False
+    return mask
+
+
+class GameState():
+    def __init__(self, board, next_player, previous, move):
+        self.board = board
+        self.next_player = next_player
+        self.previous_state = previous
+        if previous is None:
+            self.previous_states = SituationHistory()
+        else:
+            self.previous_states = previous.previous_states.with_situation(
+                (previous.next_player, previous.board.zobrist_hash()))
+        self.last_move = move
+        # Whether the game is over never changes for a given state, so
+        # work it out once instead of on every legality check.
+        self._is_over = self._compute_is_over()
+
+    def apply_move(self, move):
+        """Return the new GameState after applying the move."""
+        if move.is_play:
+            next_board = self.board.copy()
+            next_board.place_stone(self.next_player, move.point)
+        else:
+            next_board = self.board
+        return GameState(next_board, self.next_player.other, self, move)
+
+    @classmethod
+    def new_game(cls, board_size):
+        if isinstance(board_size, int):
+            board_size = (board_size, board_size)
+        board = Board(*board_size)
+        return GameState(board, Player.black, None, None)
+
+    @classmethod
+    def from_game_state(cls, game_state):
+        """Return a detached array-board copy of any game state.
+
+        The copy knows the situations that came before it, so ko and
+        is_over() work as usual, but its previous_state is None.
+        """
+        state = GameState.__new__(GameState)
+        state.board = copy_board(game_state.board)
+        state.next_player = game_state.next_player
+        state.previous_state = None
+        history = situation_history(game_state)
+        if not isinstance(history, SituationHistory):
+            history = SituationHistory.from_situations(history)
+        state.previous_states = history
+        state.last_move = game_state.last_move
+        state._is_over = game_state.is_over()
+        return state
+
+    def __getstate__(self):
+        # Pickle a detached copy: the chain of previous states would
+        # make the pickle grow with the length of the game.
+        state = self.__dict__.copy()
+        state['previous_state'] = None
+        state['previous_states'] = list(self.previous_states)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.previous_states = SituationHistory.from_situations(
+            self.previous_states)
+
+    def is_move_self_capture(self, player, move):
+        if not move.is_play:
+            return False
+        return self.board.is_self_capture(player, move.point)
+
+    @property
+    def situation(self):
+        return (self.next_player, self.board)
+
+    def does_move_violate_ko(self, player, move):
+        if not move.is_play:
+            return False
+        if not self.board.will_capture(player, move.point):
+            return False
+        next_situation = (
+            player.other,
+            self.board.hash_after_move(player, move.point))
+        return next_situation in self.previous_states
+
+    def is_valid_move(self, move):
+        if self.is_over():
+            return False
+        if move.is_pass or move.is_resign:
+            return True
+        return (
+            self.board.get(move.point) is None and
+            not self.is_move_self_capture(self.next_player, move) and
+            not self.does_move_violate_ko(self.next_player, move))
+
+    def is_over(self):
+        return self._is_over
+
+    def _compute_is_over(self):
+        if self.last_move is None:
+            return False
+        if self.last_move.is_resign:
+            return True
+        second_last_move = self.previous_state.last_move
+        if second_last_move is None:
+            return False
+        return self.last_move.is_pass and second_last_move.is_pass
+
+    def legal_mask(self):
+        """Return a (num_rows, num_cols) boolean array of the points
+        where the next player may legally play.
+        """
+        return legal_move_mask(self)
+
+    def legal_moves(self):
+        rows, cols = np.nonzero(self.legal_mask())
+        moves = [
+            Move.play(Point(row=r + 1, col=c + 1))
+            for r, c in zip(rows.tolist(), cols.tolist())]
+        # These two moves are always legal.
+        moves.append(Move.pass_turn())
+        moves.append(Move.resign())
+
+        return moves
+
+    def winner(self):
+        if not self.is_over():
+            return None
+        if self.last_move.is_resign:
+            return self.next_player
+        game_result = compute_game_result(self)
+        return game_result.winner
+
+
+def copy_board(board):
+    """Build an array Board with the same stones as any other board."""
+    if isinstance(board, Board):
+        return board.copy()
+    new_board = Board(board.num_rows, board.num_cols)
+    strings = []
+    seen = set()
+    for r in range(1, board.num_rows + 1):
+        for c in range(1, board.num_cols + 1):
+            p = Point(row=r, col=c)
+            if p in seen:
+                continue
+            go_string = board.get_go_string(p)
+            if go_string is not None:
+                seen |= go_string.stones
+                strings.append((go_string.color, list(go_string.stones)))
+    new_board._set_strings(strings)
+    return new_board
+
+
+def situation_history(game_state):
+    """Return the set of (next_player, zobrist hash) pairs of every
+    position that came before `game_state`, hashed the way an array
+    Board would hash them.
+    """
+    if isinstance(game_state.board, (Board, goboard_fast.Board)):
+        # Same zobrist scheme, so the stored hashes carry over.
+        return game_state.previous_states
+    history = set()
+    state = game_state.previous_state
+    while state is not None:
+        history.add(
+            (state.next_player, copy_board(state.board).zobrist_hash()))
+        state = state.previous_state
+    return history
+
+
+class SearchState():
+    """Mutable counterpart of GameState for tree searches.
+
+    Instead of creating a new state per move, a search calls play() to
+    walk down the tree and undo() to walk back up, so the whole search
+    shares one board. Supports the read-only parts of the GameState API
+    (board, next_player, last_move, is_valid_move, legal_moves,
+    is_over, winner), so agents and evaluation functions can be handed
+    a SearchState in place of a GameState.
+    """
+    def __init__(self, board, next_player, previous_states, last_moves):
+        self.board = board
+        self.next_player = next_player
+        # Situations from before the search started, and a multiset of
+        # the ones played since.
+        self._previous_states = previous_states
+        self._history = {}
+        self._situations = []
+        self._moves = list(last_moves)
+
+    @classmethod
+    def from_game_state(cls, game_state):
+        if game_state.previous_state is None:
+            second_last_move = None
+        else:
+            second_last_move = game_state.previous_state.last_move
+        return SearchState(
+            copy_board(game_state.board),
+            game_state.next_player,
+            situation_history(game_state),
+            [second_last_move, game_state.last_move])
+
+    @property
+    def last_move(self):
+        return self._moves[-1]
+
+    def play(self, move):
+        """Apply a move to this state in place."""
+        situation = (self.next_player, self.board.zobrist_hash())
+        self._history[situation] = self._history.get(situation, 0) + 1
+        self._situations.append(situation)
+        if move.is_play:
+            self.board.place_stone(self.next_player, move.point)
+        self._moves.append(move)
+        self.next_player = self.next_player.other
+
+    def undo(self):
+        """Take back the most recent play() call."""
+        move = self._moves.pop()
+        if move.is_play:
+            self.board.undo()
+        situation = self._situations.pop()
+        count = self._history[situation] - 1
+        if count:
+            self._history[situation] = count
+        else:
+            del self._history[situation]
+        self.next_player = self.next_player.other
+
+    def is_move_self_capture(self, player, move):
+        if not move.is_play:
+            return False
+        return self.board.is_self_capture(player, move.point)
+
+    @property
+    def situation(self):
+        return (self.next_player, self.board)
+
+    def does_move_violate_ko(self, player, move):
+        if not move.is_play:
+            return False
+        if not self.board.will_capture(player, move.point):
+            return False
+        next_situation = (
+            player.other,
+            self.board.hash_after_move(player, move.point))
+        return next_situation in self._history or \
+            next_situation in self._previous_states
+
+    def is_valid_move(self, move):
+        if self.is_over():
+            return False
+        if move.is_pass or move.is_resign:
+            return True
+        return (
+            self.board.get(move.point) is None and
+            not self.is_move_self_capture(self.next_player, move) and
+            not self.does_move_violate_ko(self.next_player, move))
+
+    def is_over(self):
+        last_move = self._moves[-1]
+        if last_move is None:
+            return False
+        if last_move.is_resign:
+            return True
+        second_last_move = self._moves[-2]
+        if second_last_move is None:
+            return False
+        return last_move.is_pass and second_last_move.is_pass
+
+    def legal_mask(self):
+        """Return a (num_rows, num_cols) boolean array of the points
+        where the next player may legally play.
+        """
+        return legal_move_mask(self)
+
+    def legal_moves(self):
+        rows, cols = np.nonzero(self.legal_mask())
+        moves = [
+            Move.play(Point(row=r + 1, col=c + 1))
+            for r, c in zip(rows.tolist(), cols.tolist())]
+        # These two moves are always legal.
+        moves.append(Move.pass_turn())
+        moves.append(Move.resign())
+
+        return moves
+
+    def winner(self):
+        if not self.is_over():
+            return None
+        if self.last_move.is_resign:
+            return self.next_player
+        game_result = compute_game_result(self)
+        return game_result.winner
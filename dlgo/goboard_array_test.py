@@ -0,0 +1,321 @@
+import pickle
+import random
+import unittest
+
+import numpy as np
+import six
+
+from dlgo import goboard_fast
+from dlgo.agent.helpers_fast import is_point_an_eye
+from dlgo.goboard_array import Board, GameState, Move, SearchState, \
+    copy_board
+from dlgo.gotypes import Player, Point
+
+
+class BoardTest(unittest.TestCase):
+    def test_capture(self):
+        board = Board(19, 19)
+        board.place_stone(Player.black, Point(2, 2))
+        board.place_stone(Player.white, Point(1, 2))
+        self.assertEqual(Player.black, board.get(Point(2, 2)))
+        board.place_stone(Player.white, Point(2, 1))
+        self.assertEqual(Player.black, board.get(Point(2, 2)))
+        board.place_stone(Player.white, Point(2, 3))
+        self.assertEqual(Player.black, board.get(Point(2, 2)))
+        board.place_stone(Player.white, Point(3, 2))
+        self.assertIsNone(board.get(Point(2, 2)))
+
+    def test_capture_two_stones(self):
+        board = Board(19, 19)
+        board.place_stone(Player.black, Point(2, 2))
+        board.place_stone(Player.black, Point(2, 3))
+        board.place_stone(Player.white, Point(1, 2))
+        board.place_stone(Player.white, Point(1, 3))
+        self.assertEqual(Player.black, board.get(Point(2, 2)))
+        self.assertEqual(Player.black, board.get(Point(2, 3)))
+        board.place_stone(Player.white, Point(3, 2))
+        board.place_stone(Player.white, Point(3, 3))
+        self.assertEqual(Player.black, board.get(Point(2, 2)))
+        self.assertEqual(Player.black, board.get(Point(2, 3)))
+        board.place_stone(Player.white, Point(2, 1))
+        board.place_stone(Player.white, Point(2, 4))
+        self.assertIsNone(board.get(Point(2, 2)))
+        self.assertIsNone(board.get(Point(2, 3)))
+
+    def test_capture_is_not_suicide(self):
+        board = Board(19, 19)
+        board.place_stone(Player.black, Point(1, 1))
+        board.place_stone(Player.black, Point(2, 2))
+        board.place_stone(Player.black, Point(1, 3))
+        board.place_stone(Player.white, Point(2, 1))
+        board.place_stone(Player.white, Point(1, 2))
+        self.assertIsNone(board.get(Point(1, 1)))
+        self.assertEqual(Player.white, board.get(Point(2, 1)))
+        self.assertEqual(Player.white, board.get(Point(1, 2)))
+
+    def test_remove_liberties(self):
+        board = Board(5, 5)
+        board.place_stone(Player.black, Point(3, 3))
+        board.place_stone(Player.white, Point(2, 2))
+        white_string = board.get_go_string(Point(2, 2))
+        six.assertCountEqual(
+            self,
+            [Point(2, 3), Point(2, 1), Point(1, 2), Point(3, 2)],
+            white_string.liberties)
+        board.place_stone(Player.black, Point(3, 2))
+        white_string = board.get_go_string(Point(2, 2))
+        six.assertCountEqual(
+            self,
+            [Point(2, 3), Point(2, 1), Point(1, 2)],
+            white_string.liberties)
+
+    def test_empty_triangle(self):
+        board = Board(5, 5)
+        board.place_stone(Player.black, Point(1, 1))
+        board.place_stone(Player.black, Point(1, 2))
+        board.place_stone(Player.black, Point(2, 2))
+        board.place_stone(Player.white, Point(2, 1))
+
+        black_string = board.get_go_string(Point(1, 1))
+        six.assertCountEqual(
+            self,
+            [Point(3, 2), Point(2, 3), Point(1, 3)],
+            black_string.liberties)
+
+    def test_self_capture(self):
+        # ooo..
+        # x.xo.
+        board = Board(5, 5)
+        board.place_stone(Player.black, Point(1, 1))
+        board.place_stone(Player.black, Point(1, 3))
+        board.place_stone(Player.white, Point(2, 1))
+        board.place_stone(Player.white, Point(2, 2))
+        board.place_stone(Player.white, Point(2, 3))
+        board.place_stone(Player.white, Point(1, 4))
+
+        self.assertTrue(board.is_self_capture(Player.black, Point(1, 2)))
+
+    def test_not_self_capture(self):
+        # o.o..
+        # x.xo.
+        board = Board(5, 5)
+        board.place_stone(Player.black, Point(1, 1))
+        board.place_stone(Player.black, Point(1, 3))
+        board.place_stone(Player.white, Point(2, 1))
+        board.place_stone(Player.white, Point(2, 3))
+        board.place_stone(Player.white, Point(1, 4))
+
+        self.assertFalse(board.is_self_capture(Player.black, Point(1, 2)))
+
+    def test_not_self_capture_is_other_capture(self):
+        # xx...
+        # oox..
+        # x.o..
+        board = Board(5, 5)
+        board.place_stone(Player.black, Point(3, 1))
+        board.place_stone(Player.black, Point(3, 2))
+        board.place_stone(Player.black, Point(2, 3))
+        board.place_stone(Player.black, Point(1, 1))
+        board.place_stone(Player.white, Point(2, 1))
+        board.place_stone(Player.white, Point(2, 2))
+        board.place_stone(Player.white, Point(1, 3))
+
+        self.assertFalse(board.is_self_capture(Player.black, Point(1, 2)))
+
+
+class GameTest(unittest.TestCase):
+    def test_new_game(self):
+        start = GameState.new_game(19)
+        next_state = start.apply_move(Move.play(Point(16, 16)))
+
+        self.assertEqual(start, next_state.previous_state)
+        self.assertEqual(Player.white, next_state.next_player)
+        self.assertEqual(Player.black, next_state.board.get(Point(16, 16)))
+
+    def test_matches_goboard_fast(self):
+        random.seed(1)
+        for board_size in (5, 9):
+            game = GameState.new_game(board_size)
+            reference = goboard_fast.GameState.new_game(board_size)
+            for _ in range(150):
+                legal = reference.legal_moves()
+                self.assertEqual(legal, game.legal_moves())
+                # Only pass once there is nothing else to play.
+                move = random.choice(legal[:-2] or legal[-2:-1])
+                game = game.apply_move(move)
+                reference = reference.apply_move(move)
+                self.assertEqual(
+                    reference.board.zobrist_hash(),
+                    game.board.zobrist_hash())
+                for r in range(1, board_size + 1):
+                    for c in range(1, board_size + 1):
+                        p = Point(r, c)
+                        self.assertEqual(
+                            reference.board.get_go_string(p),
+                            game.board.get_go_string(p))
+                if game.is_over():
+                    break
+
+    def test_copy_board(self):
+        random.seed(5)
+        reference = goboard_fast.GameState.new_game(7)
+        game = GameState.new_game(7)
+        for _ in range(60):
+            legal = reference.legal_moves()
+            move = random.choice(legal[:-2] or legal[-2:-1])
+            reference = reference.apply_move(move)
+            game = game.apply_move(move)
+        board = copy_board(reference.board)
+        self.assertEqual(game.board.zobrist_hash(), board.zobrist_hash())
+        for player in (Player.black, Player.white):
+            np.testing.assert_array_equal(
+                game.board.legal_mask(player), board.legal_mask(player))
+        # Captures need the liberties to be right.
+        for move in game.legal_moves()[:-2]:
+            board.place_stone(game.next_player, move.point)
+            game.board.place_stone(game.next_player, move.point)
+            self.assertEqual(game.board.zobrist_hash(), board.zobrist_hash())
+            board.undo()
+            game.board.undo()
+
+    def test_pickle_keeps_history(self):
+        random.seed(2)
+        reference = goboard_fast.GameState.new_game(5)
+        for _ in range(30):
+            legal = reference.legal_moves()
+            reference = reference.apply_move(random.choice(legal[:-2]))
+        for game in (GameState.from_game_state(reference),
+                     pickle.loads(pickle.dumps(
+                         GameState.from_game_state(reference)))):
+            self.assertIsNone(game.previous_state)
+            self.assertEqual(
+                reference.board.zobrist_hash(), game.board.zobrist_hash())
+            self.assertEqual(
+                set(reference.previous_states), set(game.previous_states))
+            self.assertEqual(reference.legal_moves(), game.legal_moves())
+            move = Move.play(reference.legal_moves()[0].point)
+            self.assertEqual(
+                reference.apply_move(move).board.zobrist_hash(),
+                game.apply_move(move).board.zobrist_hash())
+
+
+class UndoTest(unittest.TestCase):
+    def snapshot(self, board):
+        return board.zobrist_hash(), [
+            board.get_go_string(Point(r, c))
+            for r in range(1, board.num_rows + 1)
+            for c in range(1, board.num_cols + 1)]
+
+    def test_undo_restores_captures(self):
+        board = Board(5, 5)
+        board.place_stone(Player.black, Point(2, 2))
+        board.place_stone(Player.black, Point(2, 3))
+        board.place_stone(Player.white, Point(1, 2))
+        board.place_stone(Player.white, Point(1, 3))
+        board.place_stone(Player.white, Point(3, 2))
+        board.place_stone(Player.white, Point(3, 3))
+        board.place_stone(Player.white, Point(2, 1))
+        before = self.snapshot(board)
+        board.place_stone(Player.white, Point(2, 4))
+        self.assertIsNone(board.get(Point(2, 2)))
+        board.undo()
+        self.assertEqual(before, self.snapshot(board))
+
+    def test_undo_random_game(self):
+        random.seed(2)
+        state = SearchState.from_game_state(GameState.new_game(7))
+        snapshots = []
+        for _ in range(120):
+            legal = state.legal_moves()
+            move = random.choice(legal[:-2] or legal[-2:-1])
+            snapshots.append(
+                (self.snapshot(state.board), state.next_player, legal))
+            state.play(move)
+            if state.is_over():
+                break
+        while snapshots:
+            state.undo()
+            board_snapshot, next_player, legal = snapshots.pop()
+            self.assertEqual(board_snapshot, self.snapshot(state.board))
+            self.assertEqual(next_player, state.next_player)
+            self.assertEqual(legal, state.legal_moves())
+
+    def test_search_state_matches_game_state(self):
+        random.seed(3)
+        game = goboard_fast.GameState.new_game(5)
+        for _ in range(60):
+            state = SearchState.from_game_state(game)
+            self.assertEqual(game.legal_moves(), state.legal_moves())
+            legal = game.legal_moves()
+            game = game.apply_move(random.choice(legal[:-2] or legal[-2:-1]))
+            if game.is_over():
+                break
+
+
+class MaskTest(unittest.TestCase):
+    def expected_masks(self, state, player):
+        board = state.board
+        legal = np.zeros((board.num_rows, board.num_cols), dtype=bool)
+        sensible = np.zeros_like(legal)
+        for r in range(1, board.num_rows + 1):
+            for c in range(1, board.num_cols + 1):
+                p = Point(r, c)
+                legal[r - 1, c - 1] = board.get(p) is None and \
+                    not board.is_self_capture(player, p)
+                sensible[r - 1, c - 1] = legal[r - 1, c - 1] and \
+                    not is_point_an_eye(board, p, player)
+        return legal, sensible
+
+    def check_masks(self, state):
+        for player in (Player.black, Player.white):
+            legal, sensible = self.expected_masks(state, player)
+            np.testing.assert_array_equal(
+                legal, state.board.legal_mask(player))
+            np.testing.assert_array_equal(
+                sensible, state.board.sensible_mask(player))
+
+    def test_masks_follow_play_and_undo(self):
+        random.seed(4)
+        state = SearchState.from_game_state(GameState.new_game(6))
+        num_played = 0
+        for _ in range(150):
+            self.check_masks(state)
+            legal = state.legal_moves()
+            state.play(random.choice(legal[:-2] or legal[-2:-1]))
+            num_played += 1
+            if state.is_over():
+                break
+        for _ in range(num_played):
+            state.undo()
+            self.check_masks(state)
+
+    def test_legal_mask_excludes_ko(self):
+        # .xo..
+        # xo.o.
+        # .xo..
+        game = GameState.new_game(5)
+        for move in [(1, 2), (1, 3), (2, 1), (2, 2), (3, 2), (3, 3),
+                     (5, 5), (2, 4), (2, 3)]:
+            game = game.apply_move(Move.play(Point(*move)))
+        self.assertIsNone(game.board.get(Point(2, 2)))
+        self.assertTrue(game.board.legal_mask(Player.white)[1, 1])
+        self.assertFalse(game.legal_mask()[1, 1])
+        self.assertNotIn(Move.play(Point(2, 2)), game.legal_moves())
+
+    def test_ko_point(self):
+        board = Board(5, 5)
+        for player, point in [(Player.black, (1, 2)), (Player.white, (1, 3)),
+                              (Player.black, (2, 1)), (Player.white, (2, 2)),
+                              (Player.black, (3, 2)), (Player.white, (3, 3)),
+                              (Player.white, (2, 4))]:
+            board.place_stone(player, Point(*point))
+            self.assertIsNone(board.ko_point())
+        board.place_stone(Player.black, Point(2, 3))
+        self.assertEqual(Point(2, 2), board.ko_point())
+        # The next stone ends the ko.
+        board.place_stone(Player.white, Point(5, 5))
+        self.assertIsNone(board.ko_point())
+
+
+if __name__ == '__main__':
+    unittest.main()
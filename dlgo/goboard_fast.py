@@ -1,8 +1,12 @@
 import copy
+
+import numpy as np
+
 from dlgo.gotypes import Player, Point
 from dlgo.scoring import compute_game_result
 from dlgo import zobrist
-from dlgo.utils import MoveAge
+from dlgo.history import SituationHistory
+from dlgo.persistent_grid import PersistentGrid
 
 __all__ = [
     'Board',
@@ -91,12 +95,30 @@ class GoString():
         return GoString(self.color, self.stones, copy.deepcopy(self.liberties))
 
 
+class MoveAgeView():
+    """Read-only equivalent of `dlgo.utils.MoveAge` for a fast board."""
+    def __init__(self, board):
+        self._board = board
+
+    def get(self, row, col):
+        placed_at = self._board._placed_at.get(Point(row + 1, col + 1))
+        if placed_at is None:
+            return -1
+        return self._board._num_placed - placed_at
+
+
 class Board():
     def __init__(self, num_rows, num_cols):
         self.num_rows = num_rows
         self.num_cols = num_cols
-        self._grid = {}
+        # Both grids share their unchanged rows with the boards they
+        # are copied from, see __deepcopy__.
+        self._grid = PersistentGrid(num_rows, num_cols)
+        # Value of _num_placed after the stone on each point was placed.
+        self._placed_at = PersistentGrid(num_rows, num_cols)
+        self._num_placed = 0
         self._hash = zobrist.EMPTY_BOARD
+        self._stone_codes = zobrist.stone_codes(num_rows, num_cols)
 
         global neighbor_tables
         dim = (num_rows, num_cols)
@@ -106,8 +128,17 @@ class Board():
             init_corner_table(dim)
         self.neighbor_table = neighbor_tables[dim]
         self.corner_table = corner_tables[dim]
-        self.move_ages = MoveAge(self)
 
+    def _stone_code(self, player, point):
+        """Zobrist code for a stone of player appearing on or leaving
+        point.
+        """
+        return self._stone_codes[player.value][
+            (point.row - 1) * self.num_cols + point.col - 1]
+
+    @property
+    def move_ages(self):
+        return MoveAgeView(self)
 
     def neighbors(self, point):
         return self.neighbor_table[point]
@@ -124,8 +155,8 @@ class Board():
         adjacent_same_color = []
         adjacent_opposite_color = []
         liberties = []
-        self.move_ages.increment_all()
-        self.move_ages.add(point)
+        self._num_placed += 1
+        self._placed_at[point] = self._num_placed
         for neighbor in self.neighbor_table[point]:
             neighbor_string = self._grid.get(neighbor)
             if neighbor_string is None:
@@ -143,10 +174,8 @@ class Board():
             new_string = new_string.merged_with(same_color_string)
         for new_string_point in new_string.stones:
             self._grid[new_string_point] = new_string
-        # Remove empty-point hash code.
-        self._hash ^= zobrist.HASH_CODE[point, None]
-        # Add filled point hash code.
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        # Swap the empty-point hash code for the filled point one.
+        self._hash ^= self._stone_code(player, point)
 # end::apply_zobrist[]
 
         # 2. Reduce liberties of any adjacent strings of the opposite
@@ -166,7 +195,7 @@ class Board():
 
     def _remove_string(self, string):
         for point in string.stones:
-            self.move_ages.reset_age(point)
+            self._placed_at[point] = None
             # Removing a string can create liberties for other strings.
             for neighbor in self.neighbor_table[point]:
                 neighbor_string = self._grid.get(neighbor)
@@ -175,10 +204,8 @@ class Board():
                 if neighbor_string is not string:
                     self._replace_string(neighbor_string.with_liberty(point))
             self._grid[point] = None
-            # Remove filled point hash code.
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
-            # Add empty point hash code.
-            self._hash ^= zobrist.HASH_CODE[point, None]
+            # Swap the filled point hash code for the empty point one.
+            self._hash ^= self._stone_code(string.color, point)
 
     def is_self_capture(self, player, point):
         friendly_strings = []
@@ -211,6 +238,24 @@ class Board():
                     return True
         return False
 
+    def hash_after_move(self, player, point):
+        """Return the zobrist hash the board would have after `player`
+        plays at `point`, without modifying the board.
+        """
+        new_hash = self._hash ^ self._stone_code(player, point)
+        captured = []
+        for neighbor in self.neighbor_table[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None or neighbor_string.color == player:
+                continue
+            if neighbor_string.num_liberties == 1 and \
+                    neighbor_string not in captured:
+                captured.append(neighbor_string)
+                for stone in neighbor_string.stones:
+                    new_hash ^= self._stone_code(
+                        neighbor_string.color, stone)
+        return new_hash
+
     def is_on_grid(self, point):
         return 1 <= point.row <= self.num_rows and \
             1 <= point.col <= self.num_cols
@@ -226,6 +271,24 @@ class Board():
             return None
         return string.color
 
+    def color_array(self):
+        """Return a (num_rows, num_cols) uint8 array of the stones on
+        the board: 0 for empty points, otherwise the Player value.
+        """
+        colors = np.zeros((self.num_rows, self.num_cols), dtype=np.uint8)
+        for point, string in self._grid.items():
+            colors[point.row - 1, point.col - 1] = string.color.value
+        return colors
+
+    def liberty_array(self):
+        """Return a (num_rows, num_cols) int32 array with the number of
+        liberties of the string at each point, 0 for empty points.
+        """
+        liberties = np.zeros((self.num_rows, self.num_cols), dtype=np.int32)
+        for point, string in self._grid.items():
+            liberties[point.row - 1, point.col - 1] = string.num_liberties
+        return liberties
+
     def get_go_string(self, point):
         """Return the entire string of stones at a point.
 
@@ -244,11 +307,18 @@ class Board():
             self._hash() == other._hash()
 
     def __deepcopy__(self, memodict={}):
-        copied = Board(self.num_rows, self.num_cols)
-        # Can do a shallow copy b/c the dictionary maps tuples
-        # (immutable) to GoStrings (also immutable)
-        copied._grid = copy.copy(self._grid)
+        copied = Board.__new__(Board)
+        copied.num_rows = self.num_rows
+        copied.num_cols = self.num_cols
+        # The grids can share their rows b/c they map points to
+        # GoStrings and move numbers (both immutable)
+        copied._grid = self._grid.copy()
+        copied._placed_at = self._placed_at.copy()
+        copied._num_placed = self._num_placed
         copied._hash = self._hash
+        copied._stone_codes = self._stone_codes
+        copied.neighbor_table = self.neighbor_table
+        copied.corner_table = self.corner_table
         return copied
 
 # tag::return_zobrist[]
@@ -314,11 +384,10 @@ class GameState():
         self.next_player = next_player
         self.previous_state = previous
         if previous is None:
-            self.previous_states = frozenset()
+            self.previous_states = SituationHistory()
         else:
-            self.previous_states = frozenset(
-                previous.previous_states |
-                {(previous.next_player, previous.board.zobrist_hash())})
+            self.previous_states = previous.previous_states.with_situation(
+                (previous.next_player, previous.board.zobrist_hash()))
         self.last_move = move
 
     def apply_move(self, move):
@@ -351,9 +420,9 @@ class GameState():
             return False
         if not self.board.will_capture(player, move.point):
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        next_situation = (player.other, next_board.zobrist_hash())
+        next_situation = (
+            player.other,
+            self.board.hash_after_move(player, move.point))
         return next_situation in self.previous_states
 
     def is_valid_move(self, move):
@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 import six
@@ -116,6 +117,20 @@ class BoardTest(unittest.TestCase):
 
         self.assertFalse(board.is_self_capture(Player.black, Point(1, 2)))
 
+    def test_move_ages(self):
+        board = Board(19, 19)
+        board.place_stone(Player.black, Point(2, 2))
+        board.place_stone(Player.white, Point(1, 2))
+        board.place_stone(Player.white, Point(2, 1))
+        copied = copy.deepcopy(board)
+        board.place_stone(Player.white, Point(2, 3))
+        board.place_stone(Player.white, Point(3, 2))
+        self.assertEqual(-1, board.move_ages.get(1, 1))
+        self.assertEqual(3, board.move_ages.get(0, 1))
+        self.assertEqual(0, board.move_ages.get(2, 1))
+        self.assertEqual(2, copied.move_ages.get(1, 1))
+        self.assertEqual(-1, copied.move_ages.get(1, 2))
+
 
 class GameTest(unittest.TestCase):
     def test_new_game(self):
@@ -126,6 +141,22 @@ class GameTest(unittest.TestCase):
         self.assertEqual(Player.white, next_state.next_player)
         self.assertEqual(Player.black, next_state.board.get(Point(16, 16)))
 
+    def test_previous_boards_unchanged(self):
+        game = GameState.new_game(5)
+        moves = [Point(2, 2), Point(1, 2), Point(5, 5), Point(2, 1),
+                 Point(5, 4), Point(2, 3), Point(4, 4), Point(3, 2)]
+        for point in moves:
+            game = game.apply_move(Move.play(point))
+        self.assertIsNone(game.board.get(Point(2, 2)))
+        self.assertEqual(Player.black,
+                         game.previous_state.board.get(Point(2, 2)))
+        state = game
+        for point in reversed(moves):
+            color = state.previous_state.next_player
+            self.assertEqual(color, state.board.get(point))
+            state = state.previous_state
+            self.assertIsNone(state.board.get(point))
+
 
 if __name__ == '__main__':
     unittest.main()
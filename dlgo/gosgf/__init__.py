@@ -1 +1,2 @@
 from .sgf import *
+from .sgf_fast import *
@@ -0,0 +1,203 @@
+"""Read the moves of an SGF game without building its game tree.
+
+Sgf_game.from_string tokenises the whole file, keeps every property of
+every node and wraps each node in an object, when bulk ingestion of a
+game record only needs its board size, handicap and setup stones, komi,
+result and the moves of the main line. read_game_record scans the raw
+bytes with a single compiled regex, keeps the root properties and the
+B and W values of the main line, and stops at the end of the main line.
+
+Root properties are interpreted with the same sgf_properties.Presenter
+the full parser uses, on access, so both readers accept the same games
+and report the same values.
+"""
+from __future__ import absolute_import
+import re
+
+import six
+
+from . import sgf_properties
+
+__all__ = [
+    'GameRecord',
+    'read_game_record',
+]
+
+_find_start_re = re.compile(r"\(\s*;".encode('ascii'))
+# One token per match: a whole node holding nothing but a move, which
+# is most of them, a PropValue with its brackets, a PropIdent, a
+# delimiter, or anything else, which is an error.
+_token_re = re.compile(r"""
+\s*
+(?:
+    ; \s* ([BW]) \s* \[ ([a-z]{0,2}) \] (?= \s* [;()] )   # move node
+    |
+    ( \[ [^\\\]]* (?: \\. [^\\\]]* )* \] )   # PropValue
+    |
+    ( [A-Z]{1,8} )                          # PropIdent
+    |
+    ( [;()] )                               # delimiter
+    |
+    ( . )                                   # junk
+)
+""".encode('ascii'), re.VERBOSE | re.DOTALL)
+
+_colours = {b'B': 'b', b'W': 'w'}
+
+# Board size -> raw move value -> (row, col), for the moves on the board.
+_point_tables = {}
+
+
+def _point_table(size):
+    table = _point_tables.get(size)
+    if table is None:
+        letters = [six.int2byte(97 + i) for i in range(size)]
+        table = {}
+        for col, col_s in enumerate(letters):
+            for sgf_row, row_s in enumerate(letters):
+                table[col_s + row_s] = (size - 1 - sgf_row, col)
+        _point_tables[size] = table
+    return table
+
+
+class GameRecord(object):
+    """The parts of an SGF game that bulk readers need.
+
+    moves is the list of (colour, move) of the main line, including the
+    root node, with colour 'b' or 'w' and move (row, col) or None for a
+    pass, as Node.get_move returns them.
+    """
+    def __init__(self, root_properties, moves, size, presenter):
+        self._root = root_properties
+        self.moves = moves
+        self.size = size
+        self._presenter = presenter
+
+    def _get(self, identifier, default):
+        values = self._root.get(identifier)
+        if values is None:
+            return default
+        return self._presenter.interpret(identifier, values)
+
+    @property
+    def handicap(self):
+        """Number of handicap stones, as Sgf_game.get_handicap."""
+        handicap = self._get(b'HA', 0)
+        if handicap == 1:
+            raise ValueError
+        return handicap or None
+
+    @property
+    def komi(self):
+        return self._get(b'KM', 0.0)
+
+    @property
+    def result(self):
+        """The RE property as a utf-8 encoded string, or None."""
+        return self._get(b'RE', None)
+
+    @property
+    def setup_stones(self):
+        """(black points, white points, empty points) of the root node,
+        as Node.get_setup_stones.
+        """
+        return (self._get(b'AB', set()), self._get(b'AW', set()),
+                self._get(b'AE', set()))
+
+
+def read_game_record(s):
+    """Read the first game of an SGF string into a GameRecord.
+
+    Raises ValueError where Sgf_game.from_string and reading the main
+    line would. Unlike the full parser, nothing after the end of the
+    main line is checked.
+    """
+    if not isinstance(s, six.binary_type):
+        s = s.encode('ascii')
+    m = _find_start_re.search(s)
+    if not m:
+        raise ValueError("no SGF data found")
+
+    root = None
+    node = None
+    raw_moves = []
+    colour = raw = None
+    identifier = None
+    has_value = True
+    in_node = False
+    for move_ident, move_value, value, prop_ident, delimiter, junk in \
+            _token_re.findall(s, m.start()):
+        if move_ident:
+            # A delimiter, a node and its end at once.
+            if not has_value:
+                raise ValueError("property with no values")
+            if colour is not None:
+                raw_moves.append((colour, raw))
+                colour = raw = None
+            node = identifier = None
+            if root is None:
+                root = {move_ident: [move_value]}
+            raw_moves.append((_colours[move_ident], move_value))
+            continue
+        if value:
+            if identifier is None:
+                raise ValueError("unexpected value")
+            has_value = True
+            if node is not None:
+                node.setdefault(identifier, []).append(value[1:-1])
+            if identifier == b'B':
+                # As in Node.get_raw_move, B wins over W.
+                if colour != 'b':
+                    colour, raw = 'b', value[1:-1]
+            elif identifier == b'W':
+                if colour is None:
+                    colour, raw = 'w', value[1:-1]
+            continue
+        if not has_value:
+            raise ValueError("property with no values")
+        if prop_ident:
+            if not in_node:
+                raise ValueError("property value outside a node")
+            identifier = prop_ident
+            has_value = False
+            continue
+        if junk:
+            raise ValueError("unexpected end of SGF data")
+        # A delimiter ends the current node.
+        node = identifier = None
+        in_node = delimiter == b';'
+        if colour is not None:
+            raw_moves.append((colour, raw))
+            colour = raw = None
+        if delimiter == b';':
+            if root is None:
+                root = node = {}
+        elif delimiter == b')':
+            # The first variation to end is the end of the main line.
+            break
+    else:
+        raise ValueError("unexpected end of SGF data")
+
+    try:
+        size_s = root[b'SZ'][0]
+    except KeyError:
+        size = 19
+    else:
+        try:
+            size = int(size_s)
+        except ValueError:
+            raise ValueError("bad SZ property: %s" % size_s)
+    if not 1 <= size <= 26:
+        raise ValueError("size out of range: %s" % size)
+    encoding = root.get(b'CA', [b"ISO-8859-1"])[0]
+    presenter = sgf_properties.Presenter(size, encoding)
+
+    points = _point_table(size)
+    moves = []
+    for colour, raw in raw_moves:
+        point = points.get(raw)
+        if point is None:
+            # A pass, or invalid.
+            point = sgf_properties.interpret_go_point(raw, size)
+        moves.append((colour, point))
+    return GameRecord(root, moves, size, presenter)
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+from dlgo.gosgf import Sgf_game, read_game_record
+
+GAMES = [
+    b'(;GM[1]FF[4]SZ[19];B[aa];W[bb];B[cc])',
+    b'(;GM[1]FF[4]SZ[19]HA[2]KM[0.5]RE[W+R]AB[pd][dp];W[dd];B[pp];W[])',
+    # Comments, a move in the root, B and W in one node, tt as a pass
+    # and variations, of which only the first is read.
+    b'junk (;SZ[9]CA[UTF-8]B[cc]AB[aa:bb]C[not (;B[aa\\]) a move]\n'
+    b';W[tt]B[ee] ;C[empty];W[ii](;B[hh](;W[gg])(;W[ff]))(;B[dd]))',
+    # The full parser ignores everything after the first game.
+    b'(;SZ[13]AW[]AE[ab];B[];W[mm])(;B[aa])',
+    b'(;B[aa])',
+]
+
+
+def main_line(s):
+    """Read a game with the full parser."""
+    sgf = Sgf_game.from_string(s)
+    moves = [node.get_move() for node in sgf.main_sequence_iter()]
+    root = sgf.get_root()
+    result = root.get(b'RE') if root.has_property(b'RE') else None
+    return (sgf.get_size(), sgf.get_handicap(), sgf.get_komi(), result,
+            root.get_setup_stones(),
+            [move for move in moves if move[0] is not None])
+
+
+def random_game(size, num_moves):
+    sgf = Sgf_game(size)
+    node = sgf.get_root()
+    for i in range(num_moves):
+        node = node.new_child()
+        move = (random.randrange(size), random.randrange(size))
+        if random.random() < 0.05:
+            move = None
+        node.set_move('bw'[i % 2], move)
+        if random.random() < 0.05:
+            node.add_comment_text(b'[tricky]; (B[aa])')
+    return sgf.serialise()
+
+
+class ReadGameRecordTest(unittest.TestCase):
+    def assert_same_as_full_parser(self, s):
+        record = read_game_record(s)
+        self.assertEqual(
+            main_line(s),
+            (record.size, record.handicap, record.komi, record.result,
+             record.setup_stones, record.moves))
+
+    def test_games(self):
+        for s in GAMES:
+            self.assert_same_as_full_parser(s)
+
+    def test_random_games(self):
+        random.seed(0)
+        for size in (9, 19, 25):
+            for _ in range(10):
+                self.assert_same_as_full_parser(random_game(size, 100))
+
+    def test_values(self):
+        record = read_game_record(GAMES[1])
+        self.assertEqual(2, record.handicap)
+        self.assertEqual(0.5, record.komi)
+        self.assertEqual(b'W+R', record.result)
+        self.assertEqual([('w', (15, 3)), ('b', (3, 15)), ('w', None)],
+                         record.moves)
+
+    def test_invalid(self):
+        for s in (b'', b'(;B[aa]', b'(;B[zz])', b'(;SZ[x])', b'(;B[aa]C)',
+                  b'(;B[aa];b[bb])', b'([aa];B[bb])', b'(;HA[1])'):
+            with self.assertRaises(ValueError):
+                main_line(s)
+            with self.assertRaises(ValueError):
+                record = read_game_record(s)
+                record.handicap
+
+
+if __name__ == '__main__':
+    unittest.main()
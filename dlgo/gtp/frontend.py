@@ -1,11 +1,14 @@
 from __future__ import absolute_import
 # tag::gtp_frontend_imports[]
 import sys
+import time
 
 from dlgo.gtp import command, response
 from dlgo.gtp.board import gtp_position_to_coords, coords_to_gtp_position
 from dlgo.goboard_fast import GameState, Move
 from dlgo.agent.termination import TerminationAgent
+from dlgo.agent.timecontrol import TimeControl
+from dlgo.gotypes import Player
 from dlgo.utils import print_board
 # end::gtp_frontend_imports[]
 
@@ -34,6 +37,12 @@ HANDICAP_STONES = {
 }
 
 
+def gtp_color_to_player(color):
+    if color.lower() in ('b', 'black'):
+        return Player.black
+    return Player.white
+
+
 class GTPFrontend:
 
     def __init__(self, termination_agent, termination=None):
@@ -42,6 +51,7 @@ class GTPFrontend:
         self._input = sys.stdin
         self._output = sys.stdout
         self._stopped = False
+        self.time_control = TimeControl()
 
         self.handlers = {
             'boardsize': self.handle_boardsize,
@@ -51,8 +61,8 @@ class GTPFrontend:
             'known_command': self.handle_known_command,
             'komi': self.ignore,
             'showboard': self.handle_showboard,
-            'time_settings': self.ignore,
-            'time_left': self.ignore,
+            'time_settings': self.handle_time_settings,
+            'time_left': self.handle_time_left,
             'play': self.handle_play,
             'protocol_version': self.handle_protocol_version,
             'quit': self.handle_quit,
@@ -84,7 +94,12 @@ class GTPFrontend:
         return response.success()
 
     def handle_genmove(self, color):
+        player = gtp_color_to_player(color)
+        self.agent.set_move_time(
+            self.time_control.move_time(player, self.game_state))
+        start = time.time()
         move = self.agent.select_move(self.game_state)
+        self.time_control.record_move(player, time.time() - start)
         self.game_state = self.game_state.apply_move(move)
         if move.is_pass:
             return response.success('pass')
@@ -106,6 +121,9 @@ class GTPFrontend:
 
     def handle_clear_board(self):
         self.game_state = GameState.new_game(19)
+        tc = self.time_control
+        tc.set_time_settings(
+            tc.main_time, tc.byo_yomi_time, tc.byo_yomi_stones)
         return response.success()
 
     def handle_known_command(self, command_name):
@@ -121,11 +139,13 @@ class GTPFrontend:
         return response.success()
 
     def handle_time_left(self, color, time, stones):
-        # TODO: Arguments: color color, int time, int stones
+        self.time_control.set_time_left(
+            gtp_color_to_player(color), int(time), int(stones))
         return response.success()
 
     def handle_time_settings(self, main_time, byo_yomi_time, byo_yomi_stones):
-        # TODO: Arguments: int main_time, int byo_yomi_time, int byo_yomi_stones
+        self.time_control.set_time_settings(
+            int(main_time), int(byo_yomi_time), int(byo_yomi_stones))
         return response.success()
 
     def handle_unknown(self, *args):
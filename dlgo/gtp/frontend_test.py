@@ -0,0 +1,45 @@
+import unittest
+
+from dlgo.agent.base import Agent
+from dlgo.goboard_fast import Move
+from dlgo.gtp import command
+from dlgo.gtp.frontend import GTPFrontend
+
+
+class PassingAgent(Agent):
+    def __init__(self):
+        Agent.__init__(self)
+        self.move_times = []
+
+    def set_move_time(self, seconds):
+        self.move_times.append(seconds)
+
+    def select_move(self, game_state):
+        return Move.pass_turn()
+
+
+class GTPFrontendTest(unittest.TestCase):
+    def send(self, frontend, line):
+        resp = frontend.process(command.parse(line))
+        self.assertTrue(resp.success)
+        return resp
+
+    def test_time_settings_reach_the_agent(self):
+        agent = PassingAgent()
+        frontend = GTPFrontend(agent)
+        self.send(frontend, 'genmove black')
+        self.send(frontend, 'time_settings 0 60 6')
+        self.send(frontend, 'genmove white')
+        self.send(frontend, 'time_left black 20 4')
+        self.send(frontend, 'genmove black')
+        self.assertIsNone(agent.move_times[0])
+        margin = frontend.time_control.safety_margin
+        self.assertAlmostEqual(10 - margin, agent.move_times[1])
+        self.assertAlmostEqual(5 - margin, agent.move_times[2])
+
+    def test_byo_yomi_without_stones_is_unlimited(self):
+        agent = PassingAgent()
+        frontend = GTPFrontend(agent)
+        self.send(frontend, 'time_settings 600 30 0')
+        self.send(frontend, 'genmove black')
+        self.assertIsNone(agent.move_times[0])
@@ -0,0 +1,100 @@
+__all__ = [
+    'SituationHistory',
+]
+
+
+class _Table():
+    """Multiset of situations for one line of play through a game tree.
+
+    `owner` is the history node whose line the counts currently
+    describe.
+    """
+    def __init__(self, owner):
+        self.counts = {}
+        self.owner = owner
+
+    def add(self, situation):
+        self.counts[situation] = self.counts.get(situation, 0) + 1
+
+    def remove(self, situation):
+        count = self.counts[situation] - 1
+        if count:
+            self.counts[situation] = count
+        else:
+            del self.counts[situation]
+
+
+class SituationHistory():
+    """Persistent set of the (next_player, zobrist hash) situations
+    that came before a game state.
+
+    Each node only stores the one situation it adds on top of its
+    parent, so extending the history is O(1) time and memory. All nodes
+    of a game tree share a single hash table that holds the situations
+    along the path to the node that was queried last. A lookup on a
+    different node first walks the table over to that node's line,
+    which costs the distance between the two nodes in the tree: nothing
+    for a game played move by move, and a couple of steps when a search
+    jumps between siblings.
+    """
+    def __init__(self, parent=None, situation=None):
+        self.parent = parent
+        self.situation = situation
+        if parent is None:
+            self.depth = 0
+            self._table = _Table(self)
+        else:
+            self.depth = parent.depth + 1
+            self._table = parent._table
+            if self._table.owner is parent:
+                # Common case: keep playing along the same line.
+                self._table.add(situation)
+                self._table.owner = self
+
+    @classmethod
+    def from_situations(cls, situations):
+        """Build a history holding each of `situations`."""
+        history = cls()
+        for situation in situations:
+            history = history.with_situation(situation)
+        return history
+
+    def with_situation(self, situation):
+        """Return a new history that also contains `situation`."""
+        return SituationHistory(self, situation)
+
+    def _reroot(self):
+        table = self._table
+        if table.owner is self:
+            return
+        old = table.owner
+        new = self
+        added = []
+        # Walk both nodes up to their common ancestor, dropping the
+        # situations on the old line and collecting the new ones.
+        while old.depth > new.depth:
+            table.remove(old.situation)
+            old = old.parent
+        while new.depth > old.depth:
+            added.append(new.situation)
+            new = new.parent
+        while old is not new:
+            table.remove(old.situation)
+            old = old.parent
+            added.append(new.situation)
+            new = new.parent
+        for situation in reversed(added):
+            table.add(situation)
+        table.owner = self
+
+    def __contains__(self, situation):
+        self._reroot()
+        return situation in self._table.counts
+
+    def __iter__(self):
+        self._reroot()
+        return iter(list(self._table.counts))
+
+    def __len__(self):
+        self._reroot()
+        return len(self._table.counts)
@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from dlgo.history import SituationHistory
+
+
+class SituationHistoryTest(unittest.TestCase):
+    def test_line_of_play(self):
+        history = SituationHistory()
+        for i in range(10):
+            history = history.with_situation(i)
+        self.assertEqual(10, len(history))
+        self.assertIn(0, history)
+        self.assertIn(9, history)
+        self.assertNotIn(10, history)
+
+    def test_branches_match_frozensets(self):
+        random.seed(0)
+        nodes = [(SituationHistory(), frozenset())]
+        for _ in range(500):
+            history, expected = random.choice(nodes)
+            situation = random.randint(0, 50)
+            nodes.append((
+                history.with_situation(situation),
+                expected | {situation}))
+        for _ in range(200):
+            history, expected = random.choice(nodes)
+            self.assertEqual(expected, frozenset(history))
+            situation = random.randint(0, 50)
+            self.assertEqual(situation in expected, situation in history)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,13 @@
 import math
+import multiprocessing
 import random
 
+import numpy as np
+
 from dlgo import agent
+from dlgo import goboard_array
+from dlgo.agent.helpers import is_same_position
+from dlgo.agent.timecontrol import Deadline
 from dlgo.gotypes import Player
 from dlgo.utils import coords_from_point
 
@@ -84,35 +90,94 @@ class MCTSNode(object):
 # end::mcts-readers[]
 
 
+def find_child(node, move):
+    for child in node.children:
+        if child.move == move:
+            return child
+    return None
+
+
+def best_move_is_settled(root, remaining):
+    """Return True if `remaining` more rollouts can't change which child
+    of `root` has the best winning fraction.
+    """
+    if root.can_add_child() or not root.children:
+        # An untried move could still turn out best.
+        return False
+    player = root.game_state.next_player
+    best = max(root.children, key=lambda child: child.winning_frac(player))
+    # The best move at its worst: it loses every remaining rollout.
+    worst_best = best.win_counts[player] / \
+        float(best.num_rollouts + remaining)
+    for child in root.children:
+        if child is best:
+            continue
+        # Any other move at its best: it wins them all.
+        best_other = (child.win_counts[player] + remaining) / \
+            float(child.num_rollouts + remaining)
+        if best_other >= worst_best:
+            return False
+    return True
+
+
+def search_root(args):
+    """Run a separate search from a position and return the statistics
+    of the root's children. Worker function for root parallelization.
+    """
+    game_state, num_rounds, temperature, move_time, seed = args
+    random.seed(seed)
+    np.random.seed(seed)
+    bot = MCTSAgent(num_rounds, temperature, reuse_tree=False)
+    root = MCTSNode(game_state)
+    deadline = None
+    if move_time is not None:
+        deadline = Deadline(move_time)
+    bot.search(root, num_rounds, deadline)
+    return [
+        (child.move, child.win_counts[Player.black],
+         child.win_counts[Player.white], child.num_rollouts)
+        for child in root.children
+    ]
+
+
 class MCTSAgent(agent.Agent):
-    def __init__(self, num_rounds, temperature):
+    def __init__(self, num_rounds, temperature, reuse_tree=True,
+                 num_workers=1):
+        """With `num_workers` > 1 the rounds are split between this
+        process and a pool of num_workers - 1 worker processes, each
+        growing its own tree from the same root. Their statistics for
+        the root's children are added up before picking a move.
+        """
         agent.Agent.__init__(self)
         self.num_rounds = num_rounds
         self.temperature = temperature
+        self.num_workers = num_workers
+        self.pool = None
+        # Seconds per move; when set, the search runs until the time is
+        # up instead of for a fixed number of rounds.
+        self.move_time = None
+        # Keep the tree below the chosen move for the next search.
+        self.reuse_tree = reuse_tree
+        self.subtree = None
+        self.subtree_rollouts = 0
+        # Share of the previous search's rollouts that the last search
+        # started with.
+        self.reused_visit_fraction = 0.0
 
 # tag::mcts-signature[]
     def select_move(self, game_state):
-        root = MCTSNode(game_state)
+        root = self.reuse_subtree(game_state)
+        if root is None:
+            root = MCTSNode(game_state)
 # end::mcts-signature[]
 
-# tag::mcts-rounds[]
-        for i in range(self.num_rounds):
-            node = root
-            while (not node.can_add_child()) and (not node.is_terminal()):
-                node = self.select_child(node)
-
-            # Add a new child node into the tree.
-            if node.can_add_child():
-                node = node.add_random_child()
-
-            # Simulate a random game from this node.
-            winner = self.simulate_random_game(node.game_state)
-
-            # Propagate scores back up the tree.
-            while node is not None:
-                node.record_win(winner)
-                node = node.parent
-# end::mcts-rounds[]
+        deadline = None
+        if self.move_time is not None:
+            deadline = Deadline(self.move_time)
+        if self.num_workers > 1:
+            self.parallel_search(root, deadline)
+        else:
+            self.search(root, self.num_rounds, deadline)
 
         scored_moves = [
             (child.winning_frac(game_state.next_player), child.move, child.num_rollouts)
@@ -133,8 +198,125 @@ class MCTSAgent(agent.Agent):
                 best_pct = child_pct
                 best_move = child.move
         print('Select move %s with win pct %.3f' % (best_move, best_pct))
-        return best_move
 # end::mcts-selection[]
+        if self.reuse_tree:
+            self.keep_subtree(root, best_move)
+        return best_move
+
+    def keep_subtree(self, root, move):
+        """Hold on to the tree below `move` for the next search."""
+        self.subtree = None
+        self.subtree_rollouts = root.num_rollouts
+        if move is not None:
+            self.subtree = find_child(root, move)
+        if self.subtree is not None:
+            # Let the rest of the old tree go.
+            self.subtree.parent = None
+
+    def reuse_subtree(self, game_state):
+        """Return the node of the kept subtree that matches
+        `game_state` as a new root, or None if there isn't one.
+        """
+        node = self.subtree
+        self.subtree = None
+        self.reused_visit_fraction = 0.0
+        if node is None:
+            return None
+        if not is_same_position(node.game_state, game_state):
+            # The kept node is the position after our own move, so look
+            # for the opponent's reply below it.
+            if game_state.last_move is None:
+                return None
+            node = find_child(node, game_state.last_move)
+            if node is None or \
+                    not is_same_position(node.game_state, game_state):
+                return None
+        node.parent = None
+        self.reused_visit_fraction = \
+            node.num_rollouts / float(max(1, self.subtree_rollouts))
+        return node
+
+    def set_move_time(self, seconds):
+        self.move_time = seconds
+
+    def search(self, root, num_rounds, deadline=None):
+        """Grow the tree below `root` by `num_rounds` rollouts, or until
+        `deadline` if there is one.
+        """
+        i = 0
+# tag::mcts-rounds[]
+        while self.keep_searching(root, i, num_rounds, deadline):
+            i += 1
+            node = root
+            while (not node.can_add_child()) and (not node.is_terminal()):
+                node = self.select_child(node)
+
+            # Add a new child node into the tree.
+            if node.can_add_child():
+                node = node.add_random_child()
+
+            # Simulate a random game from this node.
+            winner = self.simulate_random_game(node.game_state)
+
+            # Propagate scores back up the tree.
+            while node is not None:
+                node.record_win(winner)
+                node = node.parent
+# end::mcts-rounds[]
+
+    def keep_searching(self, root, rounds_done, num_rounds, deadline):
+        if deadline is None:
+            return rounds_done < num_rounds
+        if rounds_done == 0:
+            return True
+        if deadline.expired():
+            return False
+        return not best_move_is_settled(
+            root, deadline.rounds_left(rounds_done))
+
+    def parallel_search(self, root, deadline=None):
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.num_workers - 1)
+        # Workers get a detached copy of the position, which pickles
+        # without the rest of the game.
+        game_state = goboard_array.GameState.from_game_state(
+            root.game_state)
+        shares = [
+            self.num_rounds // self.num_workers +
+            (1 if i < self.num_rounds % self.num_workers else 0)
+            for i in range(self.num_workers)
+        ]
+        move_time = None
+        if deadline is not None:
+            move_time = deadline.remaining()
+        tasks = [
+            (game_state, share, self.temperature, move_time,
+             random.randrange(2**31))
+            for share in shares[1:]
+        ]
+        results = self.pool.map_async(search_root, tasks)
+        self.search(root, shares[0], deadline)
+
+        children = {child.move: child for child in root.children}
+        for stats in results.get():
+            for move, black_wins, white_wins, num_rollouts in stats:
+                child = children.get(move)
+                if child is None:
+                    root.unvisited_moves.remove(move)
+                    child = MCTSNode(
+                        root.game_state.apply_move(move), root, move)
+                    root.children.append(child)
+                    children[move] = child
+                for node in (child, root):
+                    node.win_counts[Player.black] += black_wins
+                    node.win_counts[Player.white] += white_wins
+                    node.num_rollouts += num_rollouts
+
+    def close(self):
+        """Shut down the worker pool, if there is one."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
 
 # tag::mcts-uct[]
     def select_child(self, node):
@@ -165,7 +347,10 @@ class MCTSAgent(agent.Agent):
             Player.black: agent.FastRandomBot(),
             Player.white: agent.FastRandomBot(),
         }
+        # The rollout is thrown away afterwards, so play it out on a
+        # single mutable board.
+        game = goboard_array.SearchState.from_game_state(game)
         while not game.is_over():
             bot_move = bots[game.next_player].select_move(game)
-            game = game.apply_move(bot_move)
+            game.play(bot_move)
         return game.winner()
@@ -0,0 +1,60 @@
+import random
+import time
+import unittest
+
+import numpy as np
+
+from dlgo.goboard_fast import GameState, Move
+from dlgo.gotypes import Point
+from dlgo.mcts.mcts import MCTSAgent
+
+
+class MCTSAgentTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+
+    def test_reuses_subtree(self):
+        agent = MCTSAgent(30, temperature=1.4)
+        game = GameState.new_game(5)
+        game = game.apply_move(agent.select_move(game))
+        self.assertEqual(0.0, agent.reused_visit_fraction)
+        # Reply with the opponent move the search looked at most.
+        reply = max(agent.subtree.children, key=lambda n: n.num_rollouts)
+        carried = reply.num_rollouts
+        game = game.apply_move(reply.move)
+        agent.select_move(game)
+        self.assertAlmostEqual(carried / 30.0, agent.reused_visit_fraction)
+        self.assertIsNone(reply.parent)
+        self.assertEqual(carried + 30, reply.num_rollouts)
+
+    def test_unrelated_position_starts_fresh(self):
+        agent = MCTSAgent(10, temperature=1.4)
+        agent.select_move(GameState.new_game(5))
+        game = GameState.new_game(5).apply_move(
+            Move.play(Point(1, 1))).apply_move(Move.play(Point(5, 5)))
+        agent.select_move(game)
+        self.assertEqual(0.0, agent.reused_visit_fraction)
+
+    def test_parallel_search_counts_every_rollout(self):
+        agent = MCTSAgent(40, temperature=1.4, num_workers=3)
+        try:
+            game = GameState.new_game(5)
+            game = game.apply_move(agent.select_move(game))
+        finally:
+            agent.close()
+        # 14 rollouts in this process and 13 in each worker, all added
+        # up at the root and its children.
+        self.assertEqual(40, agent.subtree_rollouts)
+        self.assertEqual(
+            game.board.zobrist_hash(),
+            agent.subtree.game_state.board.zobrist_hash())
+
+    def test_move_time(self):
+        agent = MCTSAgent(100000, temperature=1.4)
+        agent.set_move_time(0.3)
+        start = time.time()
+        move = agent.select_move(GameState.new_game(5))
+        self.assertLess(time.time() - start, 1.0)
+        self.assertTrue(move.is_play)
+        self.assertGreater(agent.subtree_rollouts, 0)
@@ -1,6 +1,8 @@
 import random
 
 from dlgo.agent import Agent
+from dlgo.agent.timecontrol import Deadline
+from dlgo.goboard_array import SearchState
 from dlgo.gotypes import Player
 
 __all__ = [
@@ -11,6 +13,8 @@ MAX_SCORE = 999999
 MIN_SCORE = -999999
 
 
+# `game_state` is a mutable SearchState: moves are played and taken back
+# on the same board instead of copying it for every node.
 # tag::alpha-beta-prune-1[]
 def alpha_beta_result(game_state, max_depth, best_black, best_white, eval_fn):
     if game_state.is_over():                                   # <1>
@@ -24,11 +28,12 @@ def alpha_beta_result(game_state, max_depth, best_black, best_white, eval_fn):
 
     best_so_far = MIN_SCORE
     for candidate_move in game_state.legal_moves():            # <3>
-        next_state = game_state.apply_move(candidate_move)     # <4>
+        game_state.play(candidate_move)                        # <4>
         opponent_best_result = alpha_beta_result(              # <5>
-            next_state, max_depth - 1,                         # <5>
+            game_state, max_depth - 1,                         # <5>
             best_black, best_white,                            # <5>
             eval_fn)                                           # <5>
+        game_state.undo()                                      # <4>
         our_result = -1 * opponent_best_result                 # <6>
 
         if our_result > best_so_far:                           # <7>
@@ -57,41 +62,92 @@ def alpha_beta_result(game_state, max_depth, best_black, best_white, eval_fn):
 # end::alpha-beta-prune-4[]
 
 
+class SearchTimeout(Exception):
+    pass
+
+
 # tag::alpha-beta-agent[]
 class AlphaBetaAgent(Agent):
     def __init__(self, max_depth, eval_fn):
         Agent.__init__(self)
         self.max_depth = max_depth
         self.eval_fn = eval_fn
+        # Seconds per move; when set, search deeper and deeper until
+        # the time is up, up to max_depth.
+        self.move_time = None
 
     def select_move(self, game_state):
+        search_state = SearchState.from_game_state(game_state)
+        if self.move_time is None:
+            best_moves, _ = self.best_moves(
+                search_state, self.max_depth, self.eval_fn)
+        else:
+            best_moves = self.deepen(search_state)
+        # For variety, randomly select among all equally good moves.
+        return random.choice(best_moves)
+
+    def best_moves(self, search_state, max_depth, eval_fn):
+        """Return the best moves at `search_state` and their score."""
         best_moves = []
         best_score = None
         best_black = MIN_SCORE
         best_white = MIN_SCORE
         # Loop over all legal moves.
-        for possible_move in game_state.legal_moves():
-            # Calculate the game state if we select this move.
-            next_state = game_state.apply_move(possible_move)
+        for possible_move in search_state.legal_moves():
+            # Play the move on the search board.
+            search_state.play(possible_move)
             # Since our opponent plays next, figure out their best
             # possible outcome from there.
             opponent_best_outcome = alpha_beta_result(
-                next_state, self.max_depth,
+                search_state, max_depth,
                 best_black, best_white,
-                self.eval_fn)
+                eval_fn)
+            search_state.undo()
             # Our outcome is the opposite of our opponent's outcome.
             our_best_outcome = -1 * opponent_best_outcome
             if (not best_moves) or our_best_outcome > best_score:
                 # This is the best move so far.
                 best_moves = [possible_move]
                 best_score = our_best_outcome
-                if game_state.next_player == Player.black:
+                if search_state.next_player == Player.black:
                     best_black = best_score
-                elif game_state.next_player == Player.white:
+                elif search_state.next_player == Player.white:
                     best_white = best_score
             elif our_best_outcome == best_score:
                 # This is as good as our previous best move.
                 best_moves.append(possible_move)
-        # For variety, randomly select among all equally good moves.
-        return random.choice(best_moves)
+        return best_moves, best_score
 # end::alpha-beta-agent[]
+
+    def set_move_time(self, seconds):
+        self.move_time = seconds
+
+    def deepen(self, search_state):
+        """Iterative deepening: return the best moves of the deepest
+        search that finished before the deadline.
+        """
+        deadline = Deadline(self.move_time)
+
+        def timed_eval_fn(game_state):
+            if deadline.expired():
+                raise SearchTimeout()
+            return self.eval_fn(game_state)
+
+        # Always finish the shallowest search, so there is a move.
+        best_moves, best_score = self.best_moves(
+            search_state, 0, self.eval_fn)
+        for depth in range(1, self.max_depth + 1):
+            if best_score == MAX_SCORE:
+                # We already have a forced win.
+                break
+            started = deadline.remaining()
+            try:
+                best_moves, best_score = self.best_moves(
+                    search_state, depth, timed_eval_fn)
+            except SearchTimeout:
+                break
+            # The next depth takes a lot longer than this one; don't
+            # start it if even this one wouldn't fit again.
+            if started - deadline.remaining() > deadline.remaining():
+                break
+        return best_moves
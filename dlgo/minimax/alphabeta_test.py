@@ -0,0 +1,45 @@
+import time
+import unittest
+
+from dlgo.goboard_fast import GameState, Move
+from dlgo.gotypes import Player, Point
+from dlgo.minimax.alphabeta import AlphaBetaAgent
+
+
+def capture_diff(game_state):
+    black_stones = 0
+    white_stones = 0
+    for r in range(1, game_state.board.num_rows + 1):
+        for c in range(1, game_state.board.num_cols + 1):
+            color = game_state.board.get(Point(r, c))
+            if color == Player.black:
+                black_stones += 1
+            elif color == Player.white:
+                white_stones += 1
+    diff = black_stones - white_stones
+    if game_state.next_player == Player.black:
+        return diff
+    return -1 * diff
+
+
+class AlphaBetaAgentTest(unittest.TestCase):
+    def setUp(self):
+        game = GameState.new_game(5)
+        # White stone at (1, 1) in atari; black to capture at (1, 2).
+        for move in [(2, 1), (1, 1), (3, 3)]:
+            game = game.apply_move(Move.play(Point(*move)))
+        self.game = game.apply_move(Move.pass_turn())
+
+    def test_deepening_finds_capture(self):
+        agent = AlphaBetaAgent(1, capture_diff)
+        agent.set_move_time(10)
+        self.assertEqual(
+            Move.play(Point(1, 2)), agent.select_move(self.game))
+
+    def test_move_time_is_kept(self):
+        agent = AlphaBetaAgent(20, capture_diff)
+        agent.set_move_time(0.5)
+        start = time.time()
+        move = agent.select_move(self.game)
+        self.assertLess(time.time() - start, 2.0)
+        self.assertTrue(self.game.is_valid_move(move))
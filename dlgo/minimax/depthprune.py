@@ -1,6 +1,7 @@
 import random
 
 from dlgo.agent import Agent
+from dlgo.goboard_array import SearchState
 from dlgo.scoring import GameResult
 
 __all__ = [
@@ -19,6 +20,8 @@ def reverse_game_result(game_result):
     return GameResult.draw
 
 
+# `game_state` is a mutable SearchState: moves are played and taken back
+# on the same board instead of copying it for every node.
 # tag::depth-prune[]
 def best_result(game_state, max_depth, eval_fn):
     if game_state.is_over():                               # <1>
@@ -32,9 +35,10 @@ def best_result(game_state, max_depth, eval_fn):
 
     best_so_far = MIN_SCORE
     for candidate_move in game_state.legal_moves():        # <3>
-        next_state = game_state.apply_move(candidate_move) # <4>
+        game_state.play(candidate_move)                    # <4>
         opponent_best_result = best_result(                # <5>
-            next_state, max_depth - 1, eval_fn)            # <5>
+            game_state, max_depth - 1, eval_fn)            # <5>
+        game_state.undo()                                  # <4>
         our_result = -1 * opponent_best_result             # <6>
         if our_result > best_so_far:                       # <7>
             best_so_far = our_result                       # <7>
@@ -53,13 +57,15 @@ class DepthPrunedAgent(Agent):
     def select_move(self, game_state):
         best_moves = []
         best_score = None
+        search_state = SearchState.from_game_state(game_state)
         # Loop over all legal moves.
-        for possible_move in game_state.legal_moves():
-            # Calculate the game state if we select this move.
-            next_state = game_state.apply_move(possible_move)
+        for possible_move in search_state.legal_moves():
+            # Play the move on the search board.
+            search_state.play(possible_move)
             # Since our opponent plays next, figure out their best
             # possible outcome from there.
-            opponent_best_outcome = best_result(next_state, self.max_depth, self.eval_fn)
+            opponent_best_outcome = best_result(search_state, self.max_depth, self.eval_fn)
+            search_state.undo()
             # Our outcome is the opposite of our opponent's outcome.
             our_best_outcome = -1 * opponent_best_outcome
             if (not best_moves) or our_best_outcome > best_score:
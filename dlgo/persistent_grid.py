@@ -0,0 +1,69 @@
+"""A point -> value map for board grids that copies in O(rows).
+
+Consecutive positions of a game differ in a handful of points, so a
+board that copies its whole grid for every move mostly duplicates
+entries it already holds. PersistentGrid keeps one list per board row
+and shares the rows between copies: copy() only copies the list of
+rows, and the first write to a shared row copies that row alone. Each
+board of a game then holds only the rows its move changed.
+"""
+from dlgo.gotypes import Point
+
+__all__ = [
+    'PersistentGrid',
+]
+
+
+class PersistentGrid():
+    """Map from the points of a num_rows x num_cols board to values,
+    with None for points without a value.
+
+    Rows are shared with the grids this one was copied from or into;
+    _owned has bit r set for each row r that only this grid holds and
+    can therefore write in place.
+    """
+    __slots__ = ('num_rows', 'num_cols', '_rows', '_owned')
+
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._rows = [[None] * num_cols for _ in range(num_rows)]
+        self._owned = (1 << num_rows) - 1
+
+    def get(self, point, default=None):
+        """Return the value on point, or default if there is none or the
+        point is off the board.
+        """
+        row, col = point
+        if 1 <= row <= self.num_rows and 1 <= col <= self.num_cols:
+            value = self._rows[row - 1][col - 1]
+            if value is not None:
+                return value
+        return default
+
+    def __setitem__(self, point, value):
+        row, col = point
+        bit = 1 << (row - 1)
+        if not self._owned & bit:
+            # Copy on first write.
+            self._rows[row - 1] = self._rows[row - 1][:]
+            self._owned |= bit
+        self._rows[row - 1][col - 1] = value
+
+    def items(self):
+        """Yield (point, value) for every point with a value."""
+        for r, row in enumerate(self._rows):
+            for c, value in enumerate(row):
+                if value is not None:
+                    yield Point(r + 1, c + 1), value
+
+    def copy(self):
+        """Return a copy that shares all rows with this grid."""
+        copied = PersistentGrid.__new__(PersistentGrid)
+        copied.num_rows = self.num_rows
+        copied.num_cols = self.num_cols
+        copied._rows = self._rows[:]
+        copied._owned = 0
+        # Neither grid may write to the shared rows any more.
+        self._owned = 0
+        return copied
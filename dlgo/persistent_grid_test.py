@@ -0,0 +1,44 @@
+import unittest
+
+from dlgo.gotypes import Point
+from dlgo.persistent_grid import PersistentGrid
+
+
+class PersistentGridTest(unittest.TestCase):
+    def test_get_and_set(self):
+        grid = PersistentGrid(3, 4)
+        grid[Point(3, 4)] = 'a'
+        grid[Point(1, 2)] = 'b'
+        self.assertEqual('a', grid.get(Point(3, 4)))
+        self.assertIsNone(grid.get(Point(2, 2)))
+        self.assertIsNone(grid.get(Point(0, 1)))
+        self.assertIsNone(grid.get(Point(4, 4)))
+        self.assertEqual('x', grid.get(Point(1, 5), 'x'))
+        grid[Point(3, 4)] = None
+        self.assertEqual([(Point(1, 2), 'b')], list(grid.items()))
+
+    def test_copies_are_independent(self):
+        grid = PersistentGrid(3, 3)
+        grid[Point(1, 1)] = 'a'
+        copied = grid.copy()
+        copied[Point(1, 2)] = 'b'
+        grid[Point(2, 2)] = 'c'
+        copy_of_copy = copied.copy()
+        copy_of_copy[Point(1, 1)] = None
+        self.assertEqual([(Point(1, 1), 'a'), (Point(2, 2), 'c')],
+                         list(grid.items()))
+        self.assertEqual([(Point(1, 1), 'a'), (Point(1, 2), 'b')],
+                         list(copied.items()))
+        self.assertEqual([(Point(1, 2), 'b')], list(copy_of_copy.items()))
+
+    def test_copy_shares_unchanged_rows(self):
+        grid = PersistentGrid(3, 3)
+        copied = grid.copy()
+        copied[Point(2, 1)] = 'a'
+        self.assertIs(grid._rows[0], copied._rows[0])
+        self.assertIsNot(grid._rows[1], copied._rows[1])
+        self.assertIs(grid._rows[2], copied._rows[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
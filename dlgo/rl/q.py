@@ -37,21 +37,19 @@ class QAgent(Agent):
         self.policy = policy
 
     def select_move(self, game_state):
-        board_tensor = self.encoder.encode(game_state)
-
         # Loop over all legal moves.
         moves = []
-        board_tensors = []
         for move in game_state.legal_moves():
             if not move.is_play:
                 continue
             moves.append(self.encoder.encode_point(move.point))
-            board_tensors.append(board_tensor)
         if not moves:
             return goboard.Move.pass_turn()
 
         num_moves = len(moves)
-        board_tensors = np.array(board_tensors)
+        # The same board goes with every move; encode it once.
+        board_tensors = np.repeat(
+            self.encoder.encode_batch([game_state]), num_moves, axis=0)
         move_vectors = np.zeros((num_moves, self.encoder.num_points()))
         for i, move in enumerate(moves):
             move_vectors[i][move] = 1
@@ -73,7 +71,7 @@ class QAgent(Agent):
                                    game_state.next_player):
                 if self.collector is not None:
                     self.collector.record_decision(
-                        state=board_tensor,
+                        state=board_tensors[0],
                         action=moves[move_idx],
                     )
                 self.last_move_value = float(values[move_idx])
@@ -26,8 +26,7 @@ class ValueAgent(Agent):
         self.last_move_value = 0
 
     def predict(self, game_state):
-        encoded_state = self.encoder.encode(game_state)
-        input_tensor = np.array([encoded_state])
+        input_tensor = self.encoder.encode_batch([game_state])
         return self.model.predict(input_tensor)[0]
 
     def set_temperature(self, temperature):
@@ -45,19 +44,17 @@ class ValueAgent(Agent):
 
         # Loop over all legal moves.
         moves = []
-        board_tensors = []
+        next_states = []
         for move in game_state.legal_moves():
             if not move.is_play:
                 continue
-            next_state = game_state.apply_move(move)
-            board_tensor = self.encoder.encode(next_state)
             moves.append(move)
-            board_tensors.append(board_tensor)
+            next_states.append(game_state.apply_move(move))
         if not moves:
             return goboard.Move.pass_turn()
 
         # num_moves = len(moves)
-        board_tensors = np.array(board_tensors)
+        board_tensors = self.encoder.encode_batch(next_states)
 
         # Values of the next state from opponent's view.
         opp_values = self.model.predict(board_tensors)
@@ -80,7 +77,7 @@ class ValueAgent(Agent):
                                    game_state.next_player):
                 if self.collector is not None:
                     self.collector.record_decision(
-                        state=board_tensor,
+                        state=board_tensors[move_idx],
                         action=self.encoder.encode_point(move.point),
                     )
                 self.last_move_value = float(values[move_idx])
@@ -2,9 +2,22 @@
 from __future__ import absolute_import
 from collections import namedtuple
 
+import numpy as np
+
 from dlgo.gotypes import Player, Point
 # end::scoring_imports[]
 
+__all__ = [
+    'GameResult',
+    'Territory',
+    'board_colors',
+    'compute_game_result',
+    'compute_game_results',
+    'evaluate_territory',
+    'evaluate_territory_slow',
+    'territory_counts',
+]
+
 
 # tag::scoring_territory[]
 class Territory:
@@ -28,6 +41,18 @@ class Territory:
                 self.num_dame += 1
                 self.dame_points.append(point)
 
+    @classmethod
+    def from_counts(cls, num_black_territory, num_white_territory,
+                    num_black_stones, num_white_stones, dame_points):
+        territory = cls({})
+        territory.num_black_territory = num_black_territory
+        territory.num_white_territory = num_white_territory
+        territory.num_black_stones = num_black_stones
+        territory.num_white_stones = num_white_stones
+        territory.num_dame = len(dame_points)
+        territory.dame_points = dame_points
+        return territory
+
 # <1> A `territory_map` splits the board into stones, territory and neutral points (dame).
 # <2> Depending on the status of a point, we increment the respective counter.
 # end::scoring_territory[]
@@ -54,17 +79,20 @@ class GameResult(namedtuple('GameResult', 'b w komi')):
 # end::scoring_game_result[]
 
 
-""" evaluate_territory:
+""" evaluate_territory_slow:
 Map a board into territory and dame.
 
 Any points that are completely surrounded by a single color are
 counted as territory; it makes no attempt to identify even
 trivially dead groups.
+
+This is the reference implementation; evaluate_territory gives the
+same counts using numpy.
 """
 
 
 # tag::scoring_evaluate_territory[]
-def evaluate_territory(board):
+def evaluate_territory_slow(board):
 
     status = {}
     for r in range(1, board.num_rows + 1):
@@ -128,6 +156,123 @@ def _collect_region(start_pos, board, visited=None):
 # end::scoring_collect_region[]
 
 
+def board_colors(board):
+    """Return a (num_rows, num_cols) uint8 array of the stones on a
+    board: 0 for empty points, otherwise the Player value.
+    """
+    if hasattr(board, 'color_array'):
+        return board.color_array()
+    colors = np.zeros((board.num_rows, board.num_cols), dtype=np.uint8)
+    for r in range(board.num_rows):
+        for c in range(board.num_cols):
+            stone = board.get(Point(row=r + 1, col=c + 1))
+            if stone is not None:
+                colors[r, c] = stone.value
+    return colors
+
+
+def _classify_points(colors):
+    """Split a (..., num_rows, num_cols) stack of boards into black
+    territory, white territory and dame masks.
+
+    Empty regions are labelled with connected components: every empty
+    point starts with its own index as label and repeatedly takes the
+    smallest label among its empty neighbors, with pointer jumping so
+    long regions converge in a few rounds.
+    """
+    colors = np.asarray(colors, dtype=np.uint8)
+    # Pad every board with a ring of non-empty border points, so
+    # regions never leak across board edges or from one board into
+    # the next.
+    pad = [(0, 0)] * (colors.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(colors, pad, constant_values=3)
+    empty = padded == 0
+    inner_empty = empty[..., 1:-1, 1:-1]
+
+    size = padded.size
+    labels = np.where(empty, np.arange(size).reshape(padded.shape), size)
+    # One extra slot so that non-empty points (label `size`) can be
+    # looked up too.
+    flat = np.empty(size + 1, dtype=labels.dtype)
+    flat[size] = size
+    while True:
+        smallest = np.minimum.reduce([
+            labels[..., 1:-1, 1:-1],
+            labels[..., :-2, 1:-1], labels[..., 2:, 1:-1],
+            labels[..., 1:-1, :-2], labels[..., 1:-1, 2:]])
+        smallest = np.where(inner_empty, smallest, size)
+        flat[:size] = labels.ravel()
+        # Every label is an index in the same region, so following it
+        # keeps the point in its region.
+        smallest = flat[smallest]
+        if np.array_equal(smallest, labels[..., 1:-1, 1:-1]):
+            break
+        labels[..., 1:-1, 1:-1] = smallest
+    region = labels[..., 1:-1, 1:-1]
+
+    def touches(color):
+        is_color = padded == color
+        next_to = (is_color[..., :-2, 1:-1] | is_color[..., 2:, 1:-1] |
+                   is_color[..., 1:-1, :-2] | is_color[..., 1:-1, 2:])
+        regions = np.zeros(size + 1, dtype=np.bool_)
+        regions[region[next_to & inner_empty]] = True
+        return regions[region] & inner_empty
+
+    near_black = touches(Player.black.value)
+    near_white = touches(Player.white.value)
+    territory_b = near_black & ~near_white
+    territory_w = near_white & ~near_black
+    dame = inner_empty & ~territory_b & ~territory_w
+    return territory_b, territory_w, dame
+
+
+def territory_counts(colors):
+    """Score a (num_boards, num_rows, num_cols) stack of boards at once.
+
+    Returns four arrays of length num_boards: black territory, white
+    territory, black stones and white stones.
+    """
+    colors = np.asarray(colors, dtype=np.uint8)
+    territory_b, territory_w, _ = _classify_points(colors)
+    return (
+        territory_b.sum(axis=(-2, -1)),
+        territory_w.sum(axis=(-2, -1)),
+        (colors == Player.black.value).sum(axis=(-2, -1)),
+        (colors == Player.white.value).sum(axis=(-2, -1)),
+    )
+
+
+def evaluate_territory(board):
+    """Map a board into territory and dame, like evaluate_territory_slow.
+
+    Dame points are listed in row major order.
+    """
+    colors = board_colors(board)
+    territory_b, territory_w, dame = _classify_points(colors)
+    dame_points = [Point(row=int(r) + 1, col=int(c) + 1)
+                   for r, c in zip(*np.nonzero(dame))]
+    return Territory.from_counts(
+        int(territory_b.sum()), int(territory_w.sum()),
+        int((colors == Player.black.value).sum()),
+        int((colors == Player.white.value).sum()),
+        dame_points)
+
+
+def compute_game_results(game_states, komi=7.5):
+    """Score many finished games in one vectorized pass.
+
+    All games must be played on the same board size.
+    """
+    colors = np.stack([board_colors(state.board) for state in game_states])
+    black_territory, white_territory, black_stones, white_stones = \
+        territory_counts(colors)
+    return [
+        GameResult(int(bt + bs), int(wt + ws), komi=komi)
+        for bt, wt, bs, ws in zip(
+            black_territory, white_territory, black_stones, white_stones)
+    ]
+
+
 # tag::scoring_compute_game_result[]
 def compute_game_result(game_state):
     territory = evaluate_territory(game_state.board)
@@ -1,7 +1,12 @@
 import unittest
 
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo import goboard_fast
 from dlgo import scoring
-from dlgo.goboard import Board
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.goboard import Board, GameState
 from dlgo.gotypes import Player, Point
 
 
@@ -37,3 +42,72 @@ class ScoringTest(unittest.TestCase):
         self.assertEqual(9, territory.num_white_stones)
         self.assertEqual(3, territory.num_white_territory)
         self.assertEqual(0, territory.num_dame)
+
+    def random_boards(self, num_boards, num_rows, num_cols):
+        rng = np.random.RandomState(0)
+        boards = []
+        for _ in range(num_boards):
+            board = Board(num_rows, num_cols)
+            density = rng.uniform(0.1, 0.9)
+            for r in range(1, num_rows + 1):
+                for c in range(1, num_cols + 1):
+                    if rng.uniform() < density:
+                        player = Player.black if rng.uniform() < 0.5 \
+                            else Player.white
+                        board._grid[Point(r, c)] = _Stone(player)
+            boards.append(board)
+        return boards
+
+    def test_matches_reference(self):
+        for num_rows, num_cols in [(5, 5), (9, 7), (19, 19)]:
+            for board in self.random_boards(20, num_rows, num_cols):
+                fast = scoring.evaluate_territory(board)
+                slow = scoring.evaluate_territory_slow(board)
+                self.assertEqual(slow.num_black_stones, fast.num_black_stones)
+                self.assertEqual(slow.num_white_stones, fast.num_white_stones)
+                self.assertEqual(
+                    slow.num_black_territory, fast.num_black_territory)
+                self.assertEqual(
+                    slow.num_white_territory, fast.num_white_territory)
+                self.assertEqual(slow.num_dame, fast.num_dame)
+                self.assertEqual(
+                    sorted(slow.dame_points), sorted(fast.dame_points))
+
+    def test_batch_matches_single(self):
+        boards = self.random_boards(10, 9, 9)
+        states = [GameState(board, Player.black, None, None)
+                  for board in boards]
+        expected = [scoring.compute_game_result(state) for state in states]
+        self.assertEqual(expected, scoring.compute_game_results(states))
+
+    def test_played_games(self):
+        # FastRandomBot draws from np.random.
+        np.random.seed(0)
+        bot = FastRandomBot()
+        for goboard in (goboard_fast, goboard_array):
+            game = goboard.GameState.new_game(9)
+            while not game.is_over():
+                game = game.apply_move(bot.select_move(game))
+            fast = scoring.evaluate_territory(game.board)
+            slow = scoring.evaluate_territory_slow(game.board)
+            self.assertEqual(
+                (slow.num_black_stones, slow.num_white_stones,
+                 slow.num_black_territory, slow.num_white_territory,
+                 slow.num_dame),
+                (fast.num_black_stones, fast.num_white_stones,
+                 fast.num_black_territory, fast.num_white_territory,
+                 fast.num_dame))
+
+    def test_empty_board_is_dame(self):
+        territory = scoring.evaluate_territory(Board(3, 4))
+        self.assertEqual(12, territory.num_dame)
+        self.assertEqual(0, territory.num_black_territory)
+        self.assertEqual(0, territory.num_white_territory)
+
+
+class _Stone():
+    """Stand-in for a GoString: only the color matters for scoring, and
+    random boards don't need legal strings.
+    """
+    def __init__(self, color):
+        self.color = color
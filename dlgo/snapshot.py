@@ -0,0 +1,109 @@
+"""Compact, immutable snapshots of Go positions.
+
+A snapshot keeps what the plane encoders read from a game state, the
+stones, the liberties of the string on every point, the player to move
+and the point that player may not play because of ko, in two byte
+strings of num_rows * num_cols bytes. The encoders built on
+dlgo.encoders.planes (oneplane, sevenplane, simple and betago) accept a
+snapshot in place of a game state. Lists of snapshots stack into arrays
+with stack_snapshots.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from dlgo.gotypes import Player
+
+__all__ = [
+    'PositionSnapshot',
+    'stack_snapshots',
+]
+
+
+class PositionSnapshot(namedtuple(
+        'PositionSnapshot',
+        'num_rows num_cols stones liberties next_player ko_point')):
+    """A Go position as the plane encoders see it.
+
+    Args:
+        stones (bytes): 0 for empty points, otherwise the Player value,
+            row by row
+        liberties (bytes): liberties of the string on every point, at
+            most 255, 0 for empty points
+        ko_point (Point): where next_player may not play because of ko,
+            or None
+    """
+    __slots__ = ()
+
+    def __new__(cls, num_rows, num_cols, stones, liberties, next_player,
+                ko_point=None):
+        return super(PositionSnapshot, cls).__new__(
+            cls, num_rows, num_cols, stones, liberties, next_player,
+            ko_point)
+
+    @classmethod
+    def from_board(cls, board, next_player, ko_point=None):
+        """Snapshot a board that exports color_array() and
+        liberty_array(), such as goboard_array.Board.
+        """
+        liberties = np.minimum(board.liberty_array(), 255).astype(np.uint8)
+        return cls(board.num_rows, board.num_cols,
+                   board.color_array().tobytes(), liberties.tobytes(),
+                   next_player, ko_point)
+
+    # The encoders read the stones from game_state.board, which for a
+    # snapshot is the snapshot itself.
+    @property
+    def board(self):
+        return self
+
+    def color_array(self):
+        """Return the stones as a read-only (num_rows, num_cols) uint8
+        array: 0 for empty points, otherwise the Player value.
+        """
+        return np.frombuffer(self.stones, dtype=np.uint8).reshape(
+            self.num_rows, self.num_cols)
+
+    def liberty_array(self):
+        """Return a (num_rows, num_cols) int32 array with the number of
+        liberties of the string at each point, 0 for empty points.
+        """
+        return np.frombuffer(self.liberties, dtype=np.uint8).reshape(
+            self.num_rows, self.num_cols).astype(np.int32)
+
+    def get(self, point):
+        """Return the Player with a stone on point, or None."""
+        value = self.stones[(point.row - 1) * self.num_cols + point.col - 1]
+        return Player(value) if value else None
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    def does_move_violate_ko(self, player, move):
+        return player == self.next_player and move.is_play and \
+            move.point == self.ko_point
+
+
+def stack_snapshots(snapshots):
+    """Stack snapshots of one board size into arrays.
+
+    Returns (stones, liberties, next_players, ko): two uint8 arrays of
+    shape (len(snapshots), num_rows, num_cols) as in the snapshots, the
+    Player values of the players to move, and a boolean array that is
+    True on the ko points.
+    """
+    num_rows, num_cols = snapshots[0].num_rows, snapshots[0].num_cols
+    shape = (len(snapshots), num_rows, num_cols)
+    stones = np.frombuffer(
+        b''.join(s.stones for s in snapshots), dtype=np.uint8).reshape(shape)
+    liberties = np.frombuffer(
+        b''.join(s.liberties for s in snapshots),
+        dtype=np.uint8).reshape(shape)
+    next_players = np.array([s.next_player.value for s in snapshots],
+                            dtype=np.uint8)
+    ko = np.zeros(shape, dtype=np.bool_)
+    for i, snapshot in enumerate(snapshots):
+        if snapshot.ko_point is not None:
+            ko[i, snapshot.ko_point.row - 1, snapshot.ko_point.col - 1] = True
+    return stones, liberties, next_players, ko
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.encoders.betago import BetaGoEncoder
+from dlgo.encoders.oneplane import OnePlaneEncoder
+from dlgo.encoders.sevenplane import SevenPlaneEncoder
+from dlgo.encoders.simple import SimpleEncoder
+from dlgo.gotypes import Player, Point
+from dlgo.snapshot import PositionSnapshot, stack_snapshots
+
+
+def random_positions(num_moves, seed):
+    """Yield (game state, snapshot) pairs of a random 5x5 game."""
+    random.seed(seed)
+    bot = FastRandomBot()
+    game = goboard_array.GameState.new_game(5)
+    # A board of our own, to read the ko point after every stone.
+    board = goboard_array.Board(5, 5)
+    ko_point = None
+    for _ in range(num_moves):
+        if game.is_over():
+            break
+        yield game, PositionSnapshot.from_board(
+            board, game.next_player, ko_point)
+        move = bot.select_move(game)
+        ko_point = None
+        if move.is_play:
+            board.place_stone(game.next_player, move.point)
+            ko_point = board.ko_point()
+        game = game.apply_move(move)
+
+
+ENCODERS = [SimpleEncoder((5, 5)), SevenPlaneEncoder((5, 5)),
+            BetaGoEncoder((5, 5)), OnePlaneEncoder((5, 5))]
+
+
+class PositionSnapshotTest(unittest.TestCase):
+    def assert_same_encodings(self, game, snapshot):
+        for encoder in ENCODERS:
+            self.assertTrue(np.array_equal(
+                encoder.encode(game), encoder.encode(snapshot)))
+
+    def test_encoders_match_game_state(self):
+        for seed in range(3):
+            for game, snapshot in random_positions(200, seed):
+                self.assert_same_encodings(game, snapshot)
+
+    def test_ko(self):
+        # .xo..
+        # xo.o.
+        # .xo..
+        game = goboard_array.GameState.new_game(5)
+        board = goboard_array.Board(5, 5)
+        for move in [(1, 2), (1, 3), (2, 1), (2, 2), (3, 2), (3, 3),
+                     (5, 5), (2, 4), (2, 3)]:
+            board.place_stone(game.next_player, Point(*move))
+            game = game.apply_move(goboard_array.Move.play(Point(*move)))
+        snapshot = PositionSnapshot.from_board(
+            board, game.next_player, board.ko_point())
+        self.assertEqual(Point(2, 2), snapshot.ko_point)
+        self.assert_same_encodings(game, snapshot)
+        self.assertEqual(1, BetaGoEncoder((5, 5)).encode(snapshot)[6, 1, 1])
+
+    def test_snapshot(self):
+        board = goboard_array.Board(5, 5)
+        board.place_stone(Player.black, Point(1, 1))
+        board.place_stone(Player.white, Point(1, 2))
+        snapshot = PositionSnapshot.from_board(board, Player.black)
+        self.assertEqual(50, len(snapshot.stones) + len(snapshot.liberties))
+        self.assertEqual(Player.white, snapshot.get(Point(1, 2)))
+        self.assertIsNone(snapshot.get(Point(2, 2)))
+        self.assertTrue(np.array_equal(board.liberty_array(),
+                                       snapshot.liberty_array()))
+        with self.assertRaises(AttributeError):
+            snapshot.next_player = Player.white
+        # Snapshots don't follow the board.
+        board.place_stone(Player.black, Point(2, 2))
+        self.assertIsNone(snapshot.get(Point(2, 2)))
+
+    def test_stack_snapshots(self):
+        snapshots = [snapshot for _, snapshot in random_positions(30, 0)]
+        stones, liberties, next_players, ko = stack_snapshots(snapshots)
+        self.assertEqual((len(snapshots), 5, 5), stones.shape)
+        for i, snapshot in enumerate(snapshots):
+            self.assertTrue(np.array_equal(snapshot.color_array(), stones[i]))
+            self.assertTrue(np.array_equal(snapshot.liberty_array(),
+                                           liberties[i]))
+            self.assertEqual(snapshot.next_player.value, next_players[i])
+            self.assertEqual(snapshot.ko_point is not None, ko[i].any())
+
+
+if __name__ == '__main__':
+    unittest.main()
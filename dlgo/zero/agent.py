@@ -2,39 +2,49 @@ import numpy as np
 from keras.optimizers import SGD
 
 from ..agent import Agent
+from ..agent.helpers import is_same_position
+from ..agent.timecontrol import Deadline, visit_lead_is_safe
 
 __all__ = [
     'ZeroAgent',
 ]
 
 
-# tag::branch_struct[]
-class Branch:
-    def __init__(self, prior):
-        self.prior = prior
-        self.visit_count = 0
-        self.total_value = 0.0
-# end::branch_struct[]
+def valid_move_indices(game_state, encoder):
+    """Return the sorted encoder indices of the valid moves."""
+    if hasattr(game_state, 'legal_mask'):
+        # Array boards track legal points, including ko.
+        valid = np.append(
+            game_state.legal_mask().ravel(), not game_state.is_over())
+        return np.flatnonzero(valid).astype(np.int16)
+    return np.array([
+        idx for idx in range(encoder.num_moves())
+        if game_state.is_valid_move(encoder.decode_move_index(idx))
+    ], dtype=np.int16)
 
 
 # tag::node_class_defn[]
 class ZeroTreeNode:
 # end::node_class_defn[]
 # tag::node_class_body[]
-    def __init__(self, state, value, priors, parent, last_move):
+    def __init__(self, state, value, priors, parent, last_move, encoder):
         self.state = state
         self.value = value
         self.parent = parent                      # <1>
         self.last_move = last_move                # <1>
+        self.encoder = encoder
         self.total_visit_count = 1
-        self.branches = {}
-        for move, p in priors.items():
-            if state.is_valid_move(move):
-                self.branches[move] = Branch(p)
+        # Branch statistics live in parallel arrays, one slot per valid
+        # move, ordered by encoder move index.
+        self.move_indices = valid_move_indices(state, encoder)
+        self.priors = np.asarray(priors)[self.move_indices]
+        self.visit_counts = np.zeros(len(self.move_indices), dtype=np.int32)
+        self.total_values = np.zeros(len(self.move_indices))
         self.children = {}                        # <2>
 
     def moves(self):                              # <3>
-        return self.branches.keys()               # <3>
+        return [self.move_at(slot)                # <3>
+                for slot in range(len(self.move_indices))]
 
     def add_child(self, move, child_node):        # <4>
         self.children[move] = child_node          # <4>
@@ -46,26 +56,73 @@ class ZeroTreeNode:
         return self.children[move]                # <6>
 # end::node_class_body[]
 
+    def is_terminal(self):
+        """True if there are no moves left, i.e. the game is over."""
+        return len(self.move_indices) == 0
+
+    def move_at(self, slot):
+        return self.encoder.decode_move_index(int(self.move_indices[slot]))
+
+    def slot(self, move):
+        """Return the array slot of `move`, or None if it's not a valid
+        move here.
+        """
+        idx = self.encoder.encode_move(move)
+        slot = int(np.searchsorted(self.move_indices, idx))
+        if slot < len(self.move_indices) and \
+                self.move_indices[slot] == idx:
+            return slot
+        return None
+
 # tag::node_record_visit[]
     def record_visit(self, move, value):
+        slot = self.slot(move)
         self.total_visit_count += 1
-        self.branches[move].visit_count += 1
-        self.branches[move].total_value += value
+        self.visit_counts[slot] += 1
+        self.total_values[slot] += value
 # end::node_record_visit[]
 
+    def add_virtual_loss(self, move):
+        """Count a pending visit to `move` as a loss until the real
+        value comes back from the network.
+        """
+        slot = self.slot(move)
+        self.total_visit_count += 1
+        self.visit_counts[slot] += 1
+        self.total_values[slot] -= 1.0
+
+    def remove_virtual_loss(self, move):
+        slot = self.slot(move)
+        self.total_visit_count -= 1
+        self.visit_counts[slot] -= 1
+        self.total_values[slot] += 1.0
+
+    def expected_values(self):
+        """Average value of every branch, 0 for unvisited ones."""
+        return np.divide(
+            self.total_values, self.visit_counts,
+            out=np.zeros(len(self.total_values)),
+            where=self.visit_counts > 0)
+
+    def nbytes(self):
+        """Bytes used by the branch statistics arrays."""
+        return self.move_indices.nbytes + self.priors.nbytes + \
+            self.visit_counts.nbytes + self.total_values.nbytes
+
 # tag::node_class_helpers[]
     def expected_value(self, move):
-        branch = self.branches[move]
-        if branch.visit_count == 0:
+        slot = self.slot(move)
+        if self.visit_counts[slot] == 0:
             return 0.0
-        return branch.total_value / branch.visit_count
+        return self.total_values[slot] / self.visit_counts[slot]
 
     def prior(self, move):
-        return self.branches[move].prior
+        return self.priors[self.slot(move)]
 
     def visit_count(self, move):
-        if move in self.branches:
-            return self.branches[move].visit_count
+        slot = self.slot(move)
+        if slot is not None:
+            return self.visit_counts[slot]
         return 0
 # end::node_class_helpers[]
 
@@ -73,7 +130,15 @@ class ZeroTreeNode:
 # tag::zero_defn[]
 class ZeroAgent(Agent):
 # end::zero_defn[]
-    def __init__(self, model, encoder, rounds_per_move=1600, c=2.0):
+    def __init__(self, model, encoder, rounds_per_move=1600, c=2.0,
+                 batch_size=1, reuse_tree=True):
+        """`batch_size` is the number of leaves evaluated together in
+        one call to the model. Larger batches make each round cheaper,
+        at the cost of a slightly less focused search.
+
+        With `reuse_tree`, the part of the search tree below the move
+        that was played is kept for the next move.
+        """
         self.model = model
         self.encoder = encoder
 
@@ -81,87 +146,222 @@ class ZeroAgent(Agent):
 
         self.num_rounds = rounds_per_move
         self.c = c
+        self.batch_size = batch_size
+        # Model input buffer, reused for every batch of leaves.
+        self.model_input = np.zeros(
+            (batch_size,) + tuple(encoder.shape()), dtype=np.float32)
+
+        # Seconds per move; when set, the search runs until the time is
+        # up instead of for a fixed number of rounds.
+        self.move_time = None
+
+        self.reuse_tree = reuse_tree
+        self.subtree = None
+        self.subtree_visits = 0
+        # Share of the previous search's visits that the last search
+        # started with.
+        self.reused_visit_fraction = 0.0
 
 # tag::zero_select_move_defn[]
     def select_move(self, game_state):
 # end::zero_select_move_defn[]
 # tag::zero_walk_down[]
-        root = self.create_node(game_state)           # <1>
-
-        for i in range(self.num_rounds):              # <2>
-            node = root
-            next_move = self.select_branch(node)
-            while node.has_child(next_move):          # <3>
-                node = node.get_child(next_move)
+        root = self.reuse_subtree(game_state)
+        if root is None:
+            root = self.create_node(game_state)       # <1>
+
+        deadline = None
+        if self.move_time is not None:
+            deadline = Deadline(self.move_time)
+        num_rounds = 0
+        while self.keep_searching(root, num_rounds, deadline):  # <2>
+            # Collect up to batch_size leaves. The virtual loss makes
+            # each walk look less attractive to the walks after it, so
+            # they spread out over different leaves.
+            leaves = []
+            pending = set()
+            batch_size = self.batch_size
+            if deadline is None:
+                batch_size = min(batch_size, self.num_rounds - num_rounds)
+            while len(leaves) < batch_size:
+                node = root
                 next_move = self.select_branch(node)
+                node.add_virtual_loss(next_move)
+                while node.has_child(next_move):      # <3>
+                    child_node = node.get_child(next_move)
+                    if child_node.is_terminal():
+                        break
+                    node = child_node
+                    next_move = self.select_branch(node)
+                    node.add_virtual_loss(next_move)
+                if node.has_child(next_move):
+                    # The game is over after next_move, so there is
+                    # nothing to expand; back up the value we have.
+                    self.remove_virtual_loss(node, next_move)
+                    self.back_up(
+                        node, next_move,
+                        -1 * node.get_child(next_move).value)
+                    num_rounds += 1
+                    batch_size -= 1
+                    continue
+                if (id(node), next_move) in pending:
+                    # Every walk leads to a leaf that is already
+                    # waiting for the network; evaluate what we have.
+                    self.remove_virtual_loss(node, next_move)
+                    break
+                pending.add((id(node), next_move))
+                leaves.append((node, next_move))
 # end::zero_walk_down[]
 
 # tag::zero_back_up[]
-            new_state = node.state.apply_move(next_move)
-            child_node = self.create_node(
-                new_state, move=next_move, parent=node)
-
-            move = next_move
-            value = -1 * child_node.value             # <1>
-            while node is not None:
-                node.record_visit(move, value)
-                move = node.last_move
-                node = node.parent
-                value = -1 * value
+            if not leaves:
+                continue
+            child_nodes = self.create_nodes([
+                (node.state.apply_move(next_move), next_move, node)
+                for node, next_move in leaves])
+
+            for (node, move), child_node in zip(leaves, child_nodes):
+                self.remove_virtual_loss(node, move)
+                self.back_up(node, move, -1 * child_node.value)  # <1>
+            num_rounds += len(leaves)
 # end::zero_back_up[]
 
 # tag::zero_record_collector[]
         if self.collector is not None:
             root_state_tensor = self.encoder.encode(game_state)
-            visit_counts = np.array([
-                root.visit_count(
-                    self.encoder.decode_move_index(idx))
-                for idx in range(self.encoder.num_moves())
-            ])
+            visit_counts = np.zeros(self.encoder.num_moves(), dtype=int)
+            visit_counts[root.move_indices] = root.visit_counts
             self.collector.record_decision(
                 root_state_tensor, visit_counts)
 # end::zero_record_collector[]
 
 # tag::zero_select_max_visit_count[]
-        return max(root.moves(), key=root.visit_count)
+        move = root.move_at(np.argmax(root.visit_counts))
 # end::zero_select_max_visit_count[]
+        if self.reuse_tree:
+            self.keep_subtree(root, move)
+        return move
+
+    def keep_subtree(self, root, move):
+        """Hold on to the tree below `move` for the next search."""
+        self.subtree = None
+        self.subtree_visits = root.total_visit_count
+        if root.has_child(move):
+            self.subtree = root.get_child(move)
+            # Let the rest of the old tree go.
+            self.subtree.parent = None
+
+    def reuse_subtree(self, game_state):
+        """Return the node of the kept subtree that matches
+        `game_state` as a new root, or None if there isn't one.
+
+        The kept node is the position after our own move, so usually the
+        match is its child for the opponent's reply.
+        """
+        node = self.subtree
+        self.subtree = None
+        self.reused_visit_fraction = 0.0
+        if node is None:
+            return None
+        if not is_same_position(node.state, game_state):
+            move = game_state.last_move
+            if move is None or not node.has_child(move):
+                return None
+            node = node.get_child(move)
+            if not is_same_position(node.state, game_state):
+                return None
+        node.parent = None
+        self.reused_visit_fraction = (node.total_visit_count - 1) / \
+            float(max(1, self.subtree_visits - 1))
+        return node
 
     def set_collector(self, collector):
         self.collector = collector
 
+    def set_move_time(self, seconds):
+        self.move_time = seconds
+
+    def keep_searching(self, root, num_rounds, deadline):
+        if deadline is None:
+            return num_rounds < self.num_rounds
+        if num_rounds == 0:
+            return True
+        if deadline.expired():
+            return False
+        # Stop early once the rounds we still have time for can't
+        # change the most visited move.
+        return not visit_lead_is_safe(
+            root.visit_counts, deadline.rounds_left(num_rounds))
+
 # tag::zero_select_branch[]
     def select_branch(self, node):
         total_n = node.total_visit_count
 
-        def score_branch(move):
-            q = node.expected_value(move)
-            p = node.prior(move)
-            n = node.visit_count(move)
-            return q + self.c * p * np.sqrt(total_n) / (n + 1)
+        q = node.expected_values()
+        p = node.priors
+        n = node.visit_counts
+        scores = q + self.c * p * np.sqrt(total_n) / (n + 1)
 
-        return max(node.moves(), key=score_branch)             # <1>
+        return node.move_at(np.argmax(scores))                 # <1>
 # end::zero_select_branch[]
 
 # tag::zero_create_node[]
     def create_node(self, game_state, move=None, parent=None):
-        state_tensor = self.encoder.encode(game_state)
-        model_input = np.array([state_tensor])                 # <1>
+        model_input = self.encoder.encode_batch(
+            [game_state], out=self.model_input)                # <1>
         priors, values = self.model.predict(model_input)
         priors = priors[0]                                     # <2>
         value = values[0][0]                                   # <2>
-        move_priors = {                                        # <3>
-            self.encoder.decode_move_index(idx): p             # <3>
-            for idx, p in enumerate(priors)                    # <3>
-        }                                                      # <3>
         new_node = ZeroTreeNode(
             game_state, value,
-            move_priors,
-            parent, move)
+            priors,
+            parent, move,
+            self.encoder)
         if parent is not None:
             parent.add_child(move, new_node)
         return new_node
 # end::zero_create_node[]
 
+    def create_nodes(self, leaves):
+        """Expand a list of (game_state, move, parent) leaves with a
+        single call to the model.
+        """
+        model_input = self.encoder.encode_batch(
+            [game_state for game_state, _, _ in leaves],
+            out=self.model_input)
+        priors, values = self.model.predict(model_input)
+        new_nodes = []
+        for (game_state, move, parent), move_priors, value in zip(
+                leaves, priors, values):
+            new_node = ZeroTreeNode(
+                game_state, value[0],
+                move_priors,
+                parent, move,
+                self.encoder)
+            if parent is not None:
+                parent.add_child(move, new_node)
+            new_nodes.append(new_node)
+        return new_nodes
+
+    def back_up(self, node, move, value):
+        """Record `value`, seen from the player to move at `node`, on
+        every branch from `move` up to the root.
+        """
+        while node is not None:
+            node.record_visit(move, value)
+            move = node.last_move
+            node = node.parent
+            value = -1 * value
+
+    def remove_virtual_loss(self, node, move):
+        """Take back the virtual loss added on the way down to `move`
+        at `node`.
+        """
+        while node is not None:
+            node.remove_virtual_loss(move)
+            move = node.last_move
+            node = node.parent
+
 # tag::zero_train[]
     def train(self, experience, learning_rate, batch_size):     # <1>
         num_examples = experience.states.shape[0]
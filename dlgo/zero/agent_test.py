@@ -0,0 +1,156 @@
+import time
+import unittest
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo import zero
+from dlgo.goboard_fast import GameState, Move
+from dlgo.gotypes import Point
+
+
+class FakeModel():
+    """Deterministic stand-in for a policy/value network."""
+    def __init__(self, num_moves):
+        self.num_moves = num_moves
+        self.batch_sizes = []
+
+    def predict(self, model_input):
+        batch_size = model_input.shape[0]
+        self.batch_sizes.append(batch_size)
+        # Vary the outputs with the position so the search isn't flat.
+        totals = model_input.reshape((batch_size, -1)).sum(axis=1)
+        priors = np.ones((batch_size, self.num_moves))
+        priors[:, 0] += totals
+        priors /= priors.sum(axis=1, keepdims=True)
+        values = np.tanh(totals / 10.0 - 1.0).reshape((batch_size, 1))
+        return priors, values
+
+
+def visit_totals(node):
+    """Check every node's visit bookkeeping and return the number of
+    nodes in the tree.
+    """
+    count = 1
+    branch_visits = sum(node.visit_count(move) for move in node.moves())
+    assert node.total_visit_count == branch_visits + 1
+    for child in node.children.values():
+        count += visit_totals(child)
+    return count
+
+
+def search_tree(agent, game_state):
+    """Run select_move and return the root of the tree it searched."""
+    roots = []
+    create_node = agent.create_node
+
+    def record_root(*args, **kwargs):
+        roots.append(create_node(*args, **kwargs))
+        return roots[-1]
+    agent.create_node = record_root
+    agent.select_move(game_state)
+    return roots[0]
+
+
+class ZeroAgentTest(unittest.TestCase):
+    def search(self, batch_size, rounds=40):
+        encoder = zero.ZeroEncoder(5)
+        model = FakeModel(encoder.num_moves())
+        agent = zero.ZeroAgent(
+            model, encoder, rounds_per_move=rounds, batch_size=batch_size)
+        collector = zero.ZeroExperienceCollector()
+        collector.begin_episode()
+        agent.set_collector(collector)
+        move = agent.select_move(GameState.new_game(5))
+        return move, model, collector
+
+    def test_batched_search_visits(self):
+        for batch_size in (1, 8):
+            move, model, collector = self.search(batch_size)
+            # One root evaluation, then every round is one leaf.
+            self.assertEqual(41, sum(model.batch_sizes))
+            self.assertTrue(max(model.batch_sizes) <= batch_size)
+            self.assertEqual(
+                40, collector._current_episode_visit_counts[0].sum())
+
+    def test_batches_are_used(self):
+        _, model, _ = self.search(8)
+        self.assertTrue(len(model.batch_sizes) < 20)
+
+    def test_virtual_loss_is_removed(self):
+        encoder = zero.ZeroEncoder(5)
+        agent = zero.ZeroAgent(
+            FakeModel(encoder.num_moves()), encoder,
+            rounds_per_move=30, batch_size=4)
+        root = search_tree(agent, GameState.new_game(5))
+        self.assertEqual(31, root.total_visit_count)
+        self.assertEqual(31, visit_totals(root))
+
+    def test_select_branch_matches_puct(self):
+        encoder = zero.ZeroEncoder(5)
+        agent = zero.ZeroAgent(
+            FakeModel(encoder.num_moves()), encoder, rounds_per_move=50)
+        root = search_tree(agent, GameState.new_game(5))
+
+        def score(move):
+            q = root.expected_value(move)
+            p = root.prior(move)
+            n = root.visit_count(move)
+            return q + agent.c * p * np.sqrt(root.total_visit_count) / (n + 1)
+        self.assertEqual(
+            max(root.moves(), key=score), agent.select_branch(root))
+
+    def test_valid_moves_on_array_board(self):
+        encoder = zero.ZeroEncoder(5)
+        fast_game = GameState.new_game(5)
+        array_game = goboard_array.GameState.new_game(5)
+        for move in [(3, 3), (2, 3), (3, 2), (4, 3)]:
+            move = Move.play(Point(*move))
+            fast_game = fast_game.apply_move(move)
+            array_game = array_game.apply_move(move)
+            self.assertEqual(
+                zero.agent.valid_move_indices(fast_game, encoder).tolist(),
+                zero.agent.valid_move_indices(array_game, encoder).tolist())
+
+    def test_reuses_subtree(self):
+        encoder = zero.ZeroEncoder(5)
+        agent = zero.ZeroAgent(
+            FakeModel(encoder.num_moves()), encoder, rounds_per_move=40)
+        collector = zero.ZeroExperienceCollector()
+        collector.begin_episode()
+        agent.set_collector(collector)
+
+        game = GameState.new_game(5)
+        game = game.apply_move(agent.select_move(game))
+        self.assertEqual(0.0, agent.reused_visit_fraction)
+        # Reply with the opponent move the search looked at most.
+        subtree = agent.subtree
+        reply = subtree.move_at(np.argmax(subtree.visit_counts))
+        carried = subtree.get_child(reply).total_visit_count - 1
+        game = game.apply_move(reply)
+        agent.select_move(game)
+
+        self.assertAlmostEqual(carried / 40.0, agent.reused_visit_fraction)
+        self.assertEqual(
+            carried + 40, collector._current_episode_visit_counts[1].sum())
+
+    def test_unrelated_position_starts_fresh(self):
+        encoder = zero.ZeroEncoder(5)
+        agent = zero.ZeroAgent(
+            FakeModel(encoder.num_moves()), encoder, rounds_per_move=20)
+        agent.select_move(GameState.new_game(5))
+        game = GameState.new_game(5).apply_move(
+            Move.play(Point(1, 1))).apply_move(Move.play(Point(5, 5)))
+        agent.select_move(game)
+        self.assertEqual(0.0, agent.reused_visit_fraction)
+
+    def test_move_time(self):
+        encoder = zero.ZeroEncoder(5)
+        agent = zero.ZeroAgent(
+            FakeModel(encoder.num_moves()), encoder,
+            rounds_per_move=100000, batch_size=4)
+        agent.set_move_time(0.3)
+        start = time.time()
+        root = search_tree(agent, GameState.new_game(5))
+        self.assertLess(time.time() - start, 1.0)
+        self.assertGreater(root.total_visit_count, 1)
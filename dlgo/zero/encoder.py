@@ -1,10 +1,12 @@
 import numpy as np
 
+from dlgo.encoders.base import Encoder
+from dlgo.encoders.planes import ko_mask, liberty_planes, stone_arrays
 from dlgo.goboard_fast import Move
 from dlgo.gotypes import Player, Point
 
 
-class ZeroEncoder:
+class ZeroEncoder(Encoder):
     def __init__(self, board_size):
         self.board_size = board_size
         # 0 - 3. our stones with 1, 2, 3, 4+ liberties
@@ -16,27 +18,20 @@ class ZeroEncoder:
 
     def encode(self, game_state):
         board_tensor = np.zeros(self.shape())
+        self.encode_into(game_state, board_tensor)
+        return board_tensor
+
+    def encode_into(self, game_state, board_tensor):
         next_player = game_state.next_player
         if game_state.next_player == Player.white:
             board_tensor[8] = 1
         else:
             board_tensor[9] = 1
-        for r in range(self.board_size):
-            for c in range(self.board_size):
-                p = Point(row=r + 1, col=c + 1)
-                go_string = game_state.board.get_go_string(p)
-
-                if go_string is None:
-                    if game_state.does_move_violate_ko(next_player,
-                                                       Move.play(p)):
-                        board_tensor[10][r][c] = 1
-                else:
-                    liberty_plane = min(4, go_string.num_liberties) - 1
-                    if go_string.color != next_player:
-                        liberty_plane += 4
-                    board_tensor[liberty_plane][r][c] = 1
-
-        return board_tensor
+        colors, liberties = stone_arrays(game_state)
+        liberty_planes(board_tensor, colors, liberties, next_player, 0, 4)
+        liberty_planes(
+            board_tensor, colors, liberties, next_player.other, 4, 4)
+        board_tensor[10] = ko_mask(game_state, colors, liberties)
 
 # tag::encode_move[]
     def encode_move(self, move):
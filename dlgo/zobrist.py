@@ -1,1091 +1,351 @@
-from dlgo.gotypes import Player, Point
+"""Zobrist hash codes for boards of any size.
 
-__all__ = ['HASH_CODE', 'EMPTY_BOARD']
+Every point has three codes, one for each of its states: empty, black
+and white. code_table(num_rows, num_cols) returns them as a
+(num_rows * num_cols, 3) uint64 array, with a row per point in flat
+index order, (row - 1) * num_cols + col - 1, and a column per state,
+0 for empty and the Player value for a stone. Tables are generated on
+first use and cached per board size.
 
-HASH_CODE = {
-    (Point(row=1, col=1), None): 6402364705153495313,
-    (Point(row=1, col=1), Player.black): 444191475187629924,
-    (Point(row=1, col=1), Player.white): 3180807544946524599,
-    (Point(row=1, col=2), None): 3474352554071515715,
-    (Point(row=1, col=2), Player.black): 4452486373405451057,
-    (Point(row=1, col=2), Player.white): 2625197482182378633,
-    (Point(row=1, col=3), None): 4301395653233812397,
-    (Point(row=1, col=3), Player.black): 1052743445463685251,
-    (Point(row=1, col=3), Player.white): 4333922193950527979,
-    (Point(row=1, col=4), None): 579019433439089653,
-    (Point(row=1, col=4), Player.black): 6933861647704254864,
-    (Point(row=1, col=4), Player.white): 7471883531373616369,
-    (Point(row=1, col=5), None): 6620703135527919578,
-    (Point(row=1, col=5), Player.black): 266726669874565249,
-    (Point(row=1, col=5), Player.white): 971215397166039728,
-    (Point(row=1, col=6), None): 4901139204652546593,
-    (Point(row=1, col=6), Player.black): 3661296273230053320,
-    (Point(row=1, col=6), Player.white): 2091383563393534946,
-    (Point(row=1, col=7), None): 5841479823883894579,
-    (Point(row=1, col=7), Player.black): 1343795425674087019,
-    (Point(row=1, col=7), Player.white): 7027629093182269949,
-    (Point(row=1, col=8), None): 6974526363558785031,
-    (Point(row=1, col=8), Player.black): 3308889409935951416,
-    (Point(row=1, col=8), Player.white): 8001375756973022700,
-    (Point(row=1, col=9), None): 3326669231944330056,
-    (Point(row=1, col=9), Player.black): 182527627536217527,
-    (Point(row=1, col=9), Player.white): 647055117537790819,
-    (Point(row=1, col=10), None): 6580632857085978264,
-    (Point(row=1, col=10), Player.black): 6659120627973877329,
-    (Point(row=1, col=10), Player.white): 6957515196384025093,
-    (Point(row=1, col=11), None): 9041661876709162103,
-    (Point(row=1, col=11), Player.black): 9191630649994762430,
-    (Point(row=1, col=11), Player.white): 7667317760915857375,
-    (Point(row=1, col=12), None): 1146547653441411500,
-    (Point(row=1, col=12), Player.black): 4291861776441109562,
-    (Point(row=1, col=12), Player.white): 5261049327471094678,
-    (Point(row=1, col=13), None): 2778587950653512497,
-    (Point(row=1, col=13), Player.black): 465534554861083261,
-    (Point(row=1, col=13), Player.white): 3865103907397000387,
-    (Point(row=1, col=14), None): 4402854031209572266,
-    (Point(row=1, col=14), Player.black): 2607843465059610177,
-    (Point(row=1, col=14), Player.white): 5449307550544736426,
-    (Point(row=1, col=15), None): 5205560982133491164,
-    (Point(row=1, col=15), Player.black): 1757319192084209670,
-    (Point(row=1, col=15), Player.white): 2204336175311806893,
-    (Point(row=1, col=16), None): 6377548462923823584,
-    (Point(row=1, col=16), Player.black): 5370945101679060223,
-    (Point(row=1, col=16), Player.white): 2750848819294718078,
-    (Point(row=1, col=17), None): 1922634541266613353,
-    (Point(row=1, col=17), Player.black): 3035185049417693555,
-    (Point(row=1, col=17), Player.white): 9116106208682090693,
-    (Point(row=1, col=18), None): 9132932969976328558,
-    (Point(row=1, col=18), Player.black): 9192639340869719841,
-    (Point(row=1, col=18), Player.white): 5306307051004961905,
-    (Point(row=1, col=19), None): 1273340342344806167,
-    (Point(row=1, col=19), Player.black): 4527122623697748155,
-    (Point(row=1, col=19), Player.white): 3428488706066419650,
-    (Point(row=2, col=1), None): 6449118728834868339,
-    (Point(row=2, col=1), Player.black): 1585640068930406174,
-    (Point(row=2, col=1), Player.white): 9134544091463577840,
-    (Point(row=2, col=2), None): 8328734357465609043,
-    (Point(row=2, col=2), Player.black): 3825472901644543968,
-    (Point(row=2, col=2), Player.white): 4331833334881670434,
-    (Point(row=2, col=3), None): 7939176487324947983,
-    (Point(row=2, col=3), Player.black): 8678508756355018553,
-    (Point(row=2, col=3), Player.white): 5235979586169535941,
-    (Point(row=2, col=4), None): 7263218545755892903,
-    (Point(row=2, col=4), Player.black): 4448713833350756341,
-    (Point(row=2, col=4), Player.white): 4465157666470120555,
-    (Point(row=2, col=5), None): 3239965565957128280,
-    (Point(row=2, col=5), Player.black): 4557763796869350033,
-    (Point(row=2, col=5), Player.white): 8842890046215258149,
-    (Point(row=2, col=6), None): 3769355537864191299,
-    (Point(row=2, col=6), Player.black): 6885240998881489694,
-    (Point(row=2, col=6), Player.white): 4415950635220041552,
-    (Point(row=2, col=7), None): 7621263210603790530,
-    (Point(row=2, col=7), Player.black): 7256234720016582174,
-    (Point(row=2, col=7), Player.white): 499138474184864094,
-    (Point(row=2, col=8), None): 5025506371434802894,
-    (Point(row=2, col=8), Player.black): 2778062765892278994,
-    (Point(row=2, col=8), Player.white): 3712877991078905475,
-    (Point(row=2, col=9), None): 840509165269696992,
-    (Point(row=2, col=9), Player.black): 8647746146718318171,
-    (Point(row=2, col=9), Player.white): 535387047113016018,
-    (Point(row=2, col=10), None): 8708635127468887087,
-    (Point(row=2, col=10), Player.black): 975639018856529464,
-    (Point(row=2, col=10), Player.white): 12436055714459141,
-    (Point(row=2, col=11), None): 8895395780204337051,
-    (Point(row=2, col=11), Player.black): 4412612752235080739,
-    (Point(row=2, col=11), Player.white): 3784840302641714006,
-    (Point(row=2, col=12), None): 577424424841274797,
-    (Point(row=2, col=12), Player.black): 4746030903634755766,
-    (Point(row=2, col=12), Player.white): 6316652347533303429,
-    (Point(row=2, col=13), None): 6441043060651851472,
-    (Point(row=2, col=13), Player.black): 8551628441633633049,
-    (Point(row=2, col=13), Player.white): 6158877703276773492,
-    (Point(row=2, col=14), None): 7740666914240334555,
-    (Point(row=2, col=14), Player.black): 6148556273867368376,
-    (Point(row=2, col=14), Player.white): 2671810666463534590,
-    (Point(row=2, col=15), None): 3756484191730342703,
-    (Point(row=2, col=15), Player.black): 3556222011996989557,
-    (Point(row=2, col=15), Player.white): 3861437304505402972,
-    (Point(row=2, col=16), None): 236496246506091899,
-    (Point(row=2, col=16), Player.black): 818014148096696419,
-    (Point(row=2, col=16), Player.white): 6468780300745379509,
-    (Point(row=2, col=17), None): 399155553254586720,
-    (Point(row=2, col=17), Player.black): 3702070310203979897,
-    (Point(row=2, col=17), Player.white): 593549611371714409,
-    (Point(row=2, col=18), None): 8767893947804512198,
-    (Point(row=2, col=18), Player.black): 5133383106902779321,
-    (Point(row=2, col=18), Player.white): 6828977111791572903,
-    (Point(row=2, col=19), None): 4592011223739099001,
-    (Point(row=2, col=19), Player.black): 7614885855104742178,
-    (Point(row=2, col=19), Player.white): 1065785641268353102,
-    (Point(row=3, col=1), None): 3214339223890817952,
-    (Point(row=3, col=1), Player.black): 1804735232890689478,
-    (Point(row=3, col=1), Player.white): 5530191433834147475,
-    (Point(row=3, col=2), None): 2459542802743141529,
-    (Point(row=3, col=2), Player.black): 7430710132699508883,
-    (Point(row=3, col=2), Player.white): 5227922030234559936,
-    (Point(row=3, col=3), None): 8310487749316464853,
-    (Point(row=3, col=3), Player.black): 6539250671230328204,
-    (Point(row=3, col=3), Player.white): 1636391802322895807,
-    (Point(row=3, col=4), None): 3201605223513475804,
-    (Point(row=3, col=4), Player.black): 4693922249704781826,
-    (Point(row=3, col=4), Player.white): 1779229419151637822,
-    (Point(row=3, col=5), None): 558201485475450064,
-    (Point(row=3, col=5), Player.black): 4865685331756308707,
-    (Point(row=3, col=5), Player.white): 7052208577881940555,
-    (Point(row=3, col=6), None): 4805567071864461468,
-    (Point(row=3, col=6), Player.black): 7559097505437019193,
-    (Point(row=3, col=6), Player.white): 4643844473324317561,
-    (Point(row=3, col=7), None): 1519687966931990918,
-    (Point(row=3, col=7), Player.black): 6786702668528296933,
-    (Point(row=3, col=7), Player.white): 3684977632621123172,
-    (Point(row=3, col=8), None): 2610234951903747791,
-    (Point(row=3, col=8), Player.black): 7104169818985152575,
-    (Point(row=3, col=8), Player.white): 4560982823209099388,
-    (Point(row=3, col=9), None): 159142264817205456,
-    (Point(row=3, col=9), Player.black): 781602136172868089,
-    (Point(row=3, col=9), Player.white): 5569741163936435548,
-    (Point(row=3, col=10), None): 9067722428313912262,
-    (Point(row=3, col=10), Player.black): 4723369690040452091,
-    (Point(row=3, col=10), Player.white): 6378019894347085307,
-    (Point(row=3, col=11), None): 460746804383889904,
-    (Point(row=3, col=11), Player.black): 8100714703851785038,
-    (Point(row=3, col=11), Player.white): 305499469080745306,
-    (Point(row=3, col=12), None): 5297676611173878612,
-    (Point(row=3, col=12), Player.black): 1927546534823338275,
-    (Point(row=3, col=12), Player.white): 896019098429197548,
-    (Point(row=3, col=13), None): 1286564752928684810,
-    (Point(row=3, col=13), Player.black): 3212624103038956378,
-    (Point(row=3, col=13), Player.white): 1020352911642252781,
-    (Point(row=3, col=14), None): 5449294960749378567,
-    (Point(row=3, col=14), Player.black): 1189228143402220965,
-    (Point(row=3, col=14), Player.white): 7591720174038768320,
-    (Point(row=3, col=15), None): 6931960571125079076,
-    (Point(row=3, col=15), Player.black): 1055891884634482278,
-    (Point(row=3, col=15), Player.white): 3800778189645971447,
-    (Point(row=3, col=16), None): 715891830713545573,
-    (Point(row=3, col=16), Player.black): 7852768451293332371,
-    (Point(row=3, col=16), Player.white): 5078429455126308573,
-    (Point(row=3, col=17), None): 1778533326402989039,
-    (Point(row=3, col=17), Player.black): 2458344364044189676,
-    (Point(row=3, col=17), Player.white): 3689804324801256999,
-    (Point(row=3, col=18), None): 2170672545712705912,
-    (Point(row=3, col=18), Player.black): 898230024106306560,
-    (Point(row=3, col=18), Player.white): 1336093135229730915,
-    (Point(row=3, col=19), None): 8702635158959698093,
-    (Point(row=3, col=19), Player.black): 8425171920202584706,
-    (Point(row=3, col=19), Player.white): 915181043986995702,
-    (Point(row=4, col=1), None): 4004871713182262070,
-    (Point(row=4, col=1), Player.black): 2821066776118968440,
-    (Point(row=4, col=1), Player.white): 606591794771243444,
-    (Point(row=4, col=2), None): 5230740409529799347,
-    (Point(row=4, col=2), Player.black): 2209315354228125698,
-    (Point(row=4, col=2), Player.white): 4054461639177786028,
-    (Point(row=4, col=3), None): 7152330581273339063,
-    (Point(row=4, col=3), Player.black): 1725271973127949257,
-    (Point(row=4, col=3), Player.white): 8476625611840964372,
-    (Point(row=4, col=4), None): 7083050387819501721,
-    (Point(row=4, col=4), Player.black): 8531110550199435366,
-    (Point(row=4, col=4), Player.white): 8808199961093427400,
-    (Point(row=4, col=5), None): 1011681971776576307,
-    (Point(row=4, col=5), Player.black): 7907947182356614813,
-    (Point(row=4, col=5), Player.white): 5256367253333525286,
-    (Point(row=4, col=6), None): 8090533373807174698,
-    (Point(row=4, col=6), Player.black): 7592576832065363597,
-    (Point(row=4, col=6), Player.white): 9108827166927302462,
-    (Point(row=4, col=7), None): 148442356257871513,
-    (Point(row=4, col=7), Player.black): 5610751411300577227,
-    (Point(row=4, col=7), Player.white): 7691118390552077387,
-    (Point(row=4, col=8), None): 1342630896765287083,
-    (Point(row=4, col=8), Player.black): 6123849063435974300,
-    (Point(row=4, col=8), Player.white): 8196583757814147075,
-    (Point(row=4, col=9), None): 2129147695078284758,
-    (Point(row=4, col=9), Player.black): 9111181793229849285,
-    (Point(row=4, col=9), Player.white): 5479420289394836701,
-    (Point(row=4, col=10), None): 5923407029508913502,
-    (Point(row=4, col=10), Player.black): 8044078599318789644,
-    (Point(row=4, col=10), Player.white): 5479153792641138286,
-    (Point(row=4, col=11), None): 393887881715599288,
-    (Point(row=4, col=11), Player.black): 726705351862230621,
-    (Point(row=4, col=11), Player.white): 8139510337319572969,
-    (Point(row=4, col=12), None): 2822056917918869985,
-    (Point(row=4, col=12), Player.black): 2433442482806939237,
-    (Point(row=4, col=12), Player.white): 3125525600398009853,
-    (Point(row=4, col=13), None): 5684229964252598350,
-    (Point(row=4, col=13), Player.black): 4686403392452973091,
-    (Point(row=4, col=13), Player.white): 6085779330032826349,
-    (Point(row=4, col=14), None): 7826091629117900271,
-    (Point(row=4, col=14), Player.black): 8931528487227229778,
-    (Point(row=4, col=14), Player.white): 4535458209118169084,
-    (Point(row=4, col=15), None): 1833797249778996213,
-    (Point(row=4, col=15), Player.black): 2965594857841836131,
-    (Point(row=4, col=15), Player.white): 4097061679336533589,
-    (Point(row=4, col=16), None): 943390866590328013,
-    (Point(row=4, col=16), Player.black): 6711478166371935177,
-    (Point(row=4, col=16), Player.white): 3101246156323461394,
-    (Point(row=4, col=17), None): 3173861742912989385,
-    (Point(row=4, col=17), Player.black): 8548142168299395065,
-    (Point(row=4, col=17), Player.white): 5335277406341172729,
-    (Point(row=4, col=18), None): 2203934612495904377,
-    (Point(row=4, col=18), Player.black): 4062952182080696242,
-    (Point(row=4, col=18), Player.white): 4159099634239066734,
-    (Point(row=4, col=19), None): 1279838196939269452,
-    (Point(row=4, col=19), Player.black): 8838438865276977743,
-    (Point(row=4, col=19), Player.white): 9213692649117641996,
-    (Point(row=5, col=1), None): 3970787424252681183,
-    (Point(row=5, col=1), Player.black): 9121673643611892697,
-    (Point(row=5, col=1), Player.white): 5357186677382163771,
-    (Point(row=5, col=2), None): 4932472531976974592,
-    (Point(row=5, col=2), Player.black): 714832167672743793,
-    (Point(row=5, col=2), Player.white): 2437081593430763803,
-    (Point(row=5, col=3), None): 8256778408589110131,
-    (Point(row=5, col=3), Player.black): 6080470963214502273,
-    (Point(row=5, col=3), Player.white): 2495757575503324631,
-    (Point(row=5, col=4), None): 89160742088962376,
-    (Point(row=5, col=4), Player.black): 2416021242026214464,
-    (Point(row=5, col=4), Player.white): 8327480479404806966,
-    (Point(row=5, col=5), None): 6540335895073663871,
-    (Point(row=5, col=5), Player.black): 1122643827088857012,
-    (Point(row=5, col=5), Player.white): 482721879645106227,
-    (Point(row=5, col=6), None): 3289361158875287472,
-    (Point(row=5, col=6), Player.black): 8704118699776142494,
-    (Point(row=5, col=6), Player.white): 2996745166287033854,
-    (Point(row=5, col=7), None): 2377104713468886038,
-    (Point(row=5, col=7), Player.black): 4141699207365748082,
-    (Point(row=5, col=7), Player.white): 862169453568162505,
-    (Point(row=5, col=8), None): 4917939387271042997,
-    (Point(row=5, col=8), Player.black): 1484651023567990862,
-    (Point(row=5, col=8), Player.white): 5673769096719125195,
-    (Point(row=5, col=9), None): 3020492033375902908,
-    (Point(row=5, col=9), Player.black): 1775183889184447121,
-    (Point(row=5, col=9), Player.white): 631398328521238939,
-    (Point(row=5, col=10), None): 6981674218688302866,
-    (Point(row=5, col=10), Player.black): 2273351100975277247,
-    (Point(row=5, col=10), Player.white): 5777225017176976571,
-    (Point(row=5, col=11), None): 4330705311243731973,
-    (Point(row=5, col=11), Player.black): 3963482564690695107,
-    (Point(row=5, col=11), Player.white): 2288727862300371672,
-    (Point(row=5, col=12), None): 9014811060966004298,
-    (Point(row=5, col=12), Player.black): 4289286217307604131,
-    (Point(row=5, col=12), Player.white): 697355111142392607,
-    (Point(row=5, col=13), None): 8235685956105459657,
-    (Point(row=5, col=13), Player.black): 8168007848538534157,
-    (Point(row=5, col=13), Player.white): 2804272276044443686,
-    (Point(row=5, col=14), None): 8225900234506491415,
-    (Point(row=5, col=14), Player.black): 2200277323150620183,
-    (Point(row=5, col=14), Player.white): 203974965768980816,
-    (Point(row=5, col=15), None): 2752315560833329864,
-    (Point(row=5, col=15), Player.black): 1237373329060552168,
-    (Point(row=5, col=15), Player.white): 2457801072451683571,
-    (Point(row=5, col=16), None): 9206495611621710488,
-    (Point(row=5, col=16), Player.black): 7479150707332996833,
-    (Point(row=5, col=16), Player.white): 653894659358868314,
-    (Point(row=5, col=17), None): 6953138104722064453,
-    (Point(row=5, col=17), Player.black): 6400962948817612487,
-    (Point(row=5, col=17), Player.white): 2768989623510194233,
-    (Point(row=5, col=18), None): 7417012331464802806,
-    (Point(row=5, col=18), Player.black): 3980447420236150362,
-    (Point(row=5, col=18), Player.white): 6919602418177107430,
-    (Point(row=5, col=19), None): 5668464032013017166,
-    (Point(row=5, col=19), Player.black): 8757112649996924998,
-    (Point(row=5, col=19), Player.white): 6290723394473004617,
-    (Point(row=6, col=1), None): 7238406206765822665,
-    (Point(row=6, col=1), Player.black): 423812617168567217,
-    (Point(row=6, col=1), Player.white): 3104019267489386807,
-    (Point(row=6, col=2), None): 2765613177652849486,
-    (Point(row=6, col=2), Player.black): 4362573117234489564,
-    (Point(row=6, col=2), Player.white): 4916634655561473640,
-    (Point(row=6, col=3), None): 2657467858928810457,
-    (Point(row=6, col=3), Player.black): 3735127098437132220,
-    (Point(row=6, col=3), Player.white): 170273614138368740,
-    (Point(row=6, col=4), None): 7029981726712463215,
-    (Point(row=6, col=4), Player.black): 8526383184719402860,
-    (Point(row=6, col=4), Player.white): 7823091606639214527,
-    (Point(row=6, col=5), None): 2860601882956863443,
-    (Point(row=6, col=5), Player.black): 3122201562173091301,
-    (Point(row=6, col=5), Player.white): 2822640494234751573,
-    (Point(row=6, col=6), None): 8157066395471718803,
-    (Point(row=6, col=6), Player.black): 5551543367155764251,
-    (Point(row=6, col=6), Player.white): 3323265190680832478,
-    (Point(row=6, col=7), None): 6286132655359072642,
-    (Point(row=6, col=7), Player.black): 6092326308893543831,
-    (Point(row=6, col=7), Player.white): 5832654969028746701,
-    (Point(row=6, col=8), None): 1211077220123420512,
-    (Point(row=6, col=8), Player.black): 627083288764982946,
-    (Point(row=6, col=8), Player.white): 5563068161605367514,
-    (Point(row=6, col=9), None): 2611182155893117641,
-    (Point(row=6, col=9), Player.black): 553160645565891622,
-    (Point(row=6, col=9), Player.white): 2201330596883065552,
-    (Point(row=6, col=10), None): 4003057723226907800,
-    (Point(row=6, col=10), Player.black): 4216348254493350495,
-    (Point(row=6, col=10), Player.white): 6796279568887386894,
-    (Point(row=6, col=11), None): 5340047233161030150,
-    (Point(row=6, col=11), Player.black): 776091550552755915,
-    (Point(row=6, col=11), Player.white): 6969021693827360652,
-    (Point(row=6, col=12), None): 6197898450384910086,
-    (Point(row=6, col=12), Player.black): 8829570073548991273,
-    (Point(row=6, col=12), Player.white): 8769820237202793209,
-    (Point(row=6, col=13), None): 5291242650150271421,
-    (Point(row=6, col=13), Player.black): 6662086761910395834,
-    (Point(row=6, col=13), Player.white): 3457949163291068790,
-    (Point(row=6, col=14), None): 4232629379719922985,
-    (Point(row=6, col=14), Player.black): 6544339295308139893,
-    (Point(row=6, col=14), Player.white): 5399631532724418690,
-    (Point(row=6, col=15), None): 2613162652827432819,
-    (Point(row=6, col=15), Player.black): 2049677909257218173,
-    (Point(row=6, col=15), Player.white): 1464310709531746579,
-    (Point(row=6, col=16), None): 5464082436111998573,
-    (Point(row=6, col=16), Player.black): 8795629608094445377,
-    (Point(row=6, col=16), Player.white): 4842434302155018932,
-    (Point(row=6, col=17), None): 6727888049076736664,
-    (Point(row=6, col=17), Player.black): 5100997362160864456,
-    (Point(row=6, col=17), Player.white): 5540122784933976079,
-    (Point(row=6, col=18), None): 3891535108343851883,
-    (Point(row=6, col=18), Player.black): 6932220238214217651,
-    (Point(row=6, col=18), Player.white): 3024710041380052487,
-    (Point(row=6, col=19), None): 5157851649025310803,
-    (Point(row=6, col=19), Player.black): 3859403834721659588,
-    (Point(row=6, col=19), Player.white): 5734093285794028742,
-    (Point(row=7, col=1), None): 8754311069462869784,
-    (Point(row=7, col=1), Player.black): 4135756281096723130,
-    (Point(row=7, col=1), Player.white): 2660262621554400597,
-    (Point(row=7, col=2), None): 3186047861180874773,
-    (Point(row=7, col=2), Player.black): 8437617441112518392,
-    (Point(row=7, col=2), Player.white): 5700847880115193089,
-    (Point(row=7, col=3), None): 2451349687867204270,
-    (Point(row=7, col=3), Player.black): 5024753648402413878,
-    (Point(row=7, col=3), Player.white): 4707342013474535257,
-    (Point(row=7, col=4), None): 894458264737334111,
-    (Point(row=7, col=4), Player.black): 7400549340701852518,
-    (Point(row=7, col=4), Player.white): 4982178515371346946,
-    (Point(row=7, col=5), None): 7889078960323713327,
-    (Point(row=7, col=5), Player.black): 3463688502071051813,
-    (Point(row=7, col=5), Player.white): 5439043411360527203,
-    (Point(row=7, col=6), None): 8158999343965029092,
-    (Point(row=7, col=6), Player.black): 4417991440989120207,
-    (Point(row=7, col=6), Player.white): 7911029905557355535,
-    (Point(row=7, col=7), None): 1269318264525121990,
-    (Point(row=7, col=7), Player.black): 5526412712629111132,
-    (Point(row=7, col=7), Player.white): 7056989575271047877,
-    (Point(row=7, col=8), None): 7310640724609976681,
-    (Point(row=7, col=8), Player.black): 8450643432045855842,
-    (Point(row=7, col=8), Player.white): 2142109716255387536,
-    (Point(row=7, col=9), None): 2372815664597218093,
-    (Point(row=7, col=9), Player.black): 5788558840708187518,
-    (Point(row=7, col=9), Player.white): 3942803655429791644,
-    (Point(row=7, col=10), None): 6132824217092640719,
-    (Point(row=7, col=10), Player.black): 3172679522121416254,
-    (Point(row=7, col=10), Player.white): 1516842868586377042,
-    (Point(row=7, col=11), None): 4781290152295674513,
-    (Point(row=7, col=11), Player.black): 4930726143183960084,
-    (Point(row=7, col=11), Player.white): 2266423932357799570,
-    (Point(row=7, col=12), None): 7235698355734347131,
-    (Point(row=7, col=12), Player.black): 165973395613352972,
-    (Point(row=7, col=12), Player.white): 4371681950815139985,
-    (Point(row=7, col=13), None): 8393902247179788641,
-    (Point(row=7, col=13), Player.black): 7590340859497507303,
-    (Point(row=7, col=13), Player.white): 4206211316467976619,
-    (Point(row=7, col=14), None): 8229545792753994899,
-    (Point(row=7, col=14), Player.black): 838711893588053696,
-    (Point(row=7, col=14), Player.white): 4477295381157072518,
-    (Point(row=7, col=15), None): 4173090253482017435,
-    (Point(row=7, col=15), Player.black): 4072906910742500792,
-    (Point(row=7, col=15), Player.white): 4907262873264099313,
-    (Point(row=7, col=16), None): 5867380728191338030,
-    (Point(row=7, col=16), Player.black): 8135365657022021506,
-    (Point(row=7, col=16), Player.white): 4189409989034502083,
-    (Point(row=7, col=17), None): 5874705238031490949,
-    (Point(row=7, col=17), Player.black): 1337494314650889511,
-    (Point(row=7, col=17), Player.white): 3148591770173058627,
-    (Point(row=7, col=18), None): 3722649922881024055,
-    (Point(row=7, col=18), Player.black): 3934330035566479726,
-    (Point(row=7, col=18), Player.white): 6860352147551392319,
-    (Point(row=7, col=19), None): 4259121313222633299,
-    (Point(row=7, col=19), Player.black): 6710991919328058302,
-    (Point(row=7, col=19), Player.white): 729487318318649743,
-    (Point(row=8, col=1), None): 2708867513683618113,
-    (Point(row=8, col=1), Player.black): 8284401402821228502,
-    (Point(row=8, col=1), Player.white): 266774759783490574,
-    (Point(row=8, col=2), None): 5918755146055395138,
-    (Point(row=8, col=2), Player.black): 5702689780266635942,
-    (Point(row=8, col=2), Player.white): 2220258171102127975,
-    (Point(row=8, col=3), None): 6653466860005395853,
-    (Point(row=8, col=3), Player.black): 5694510591981484870,
-    (Point(row=8, col=3), Player.white): 2556856366938374080,
-    (Point(row=8, col=4), None): 8020600426333158407,
-    (Point(row=8, col=4), Player.black): 6356921100593396180,
-    (Point(row=8, col=4), Player.white): 5149748205727967954,
-    (Point(row=8, col=5), None): 3051160807432229960,
-    (Point(row=8, col=5), Player.black): 260378505723678285,
-    (Point(row=8, col=5), Player.white): 1822942542127719912,
-    (Point(row=8, col=6), None): 2059368881907087243,
-    (Point(row=8, col=6), Player.black): 7630446262559191057,
-    (Point(row=8, col=6), Player.white): 2352065658131437765,
-    (Point(row=8, col=7), None): 1000694156378281597,
-    (Point(row=8, col=7), Player.black): 6211828436070597931,
-    (Point(row=8, col=7), Player.white): 9013248265871745105,
-    (Point(row=8, col=8), None): 2815401307423159003,
-    (Point(row=8, col=8), Player.black): 7483337698674146232,
-    (Point(row=8, col=8), Player.white): 9052402633085182507,
-    (Point(row=8, col=9), None): 6384879156631677794,
-    (Point(row=8, col=9), Player.black): 8426441507681753452,
-    (Point(row=8, col=9), Player.white): 1854388785471876700,
-    (Point(row=8, col=10), None): 142227175561852656,
-    (Point(row=8, col=10), Player.black): 65994339143027192,
-    (Point(row=8, col=10), Player.white): 1426413243849234911,
-    (Point(row=8, col=11), None): 8430986503980830376,
-    (Point(row=8, col=11), Player.black): 619817367324323140,
-    (Point(row=8, col=11), Player.white): 4677987248292530730,
-    (Point(row=8, col=12), None): 1508615909331847777,
-    (Point(row=8, col=12), Player.black): 8162333180096663164,
-    (Point(row=8, col=12), Player.white): 5852637502964969314,
-    (Point(row=8, col=13), None): 3275974798452305241,
-    (Point(row=8, col=13), Player.black): 631782669438325441,
-    (Point(row=8, col=13), Player.white): 8555593582322512786,
-    (Point(row=8, col=14), None): 4134515947666502889,
-    (Point(row=8, col=14), Player.black): 4197594044100261270,
-    (Point(row=8, col=14), Player.white): 2117711969623158939,
-    (Point(row=8, col=15), None): 2704155668255596809,
-    (Point(row=8, col=15), Player.black): 8386704845222266124,
-    (Point(row=8, col=15), Player.white): 6995258630292617909,
-    (Point(row=8, col=16), None): 4620356030723102193,
-    (Point(row=8, col=16), Player.black): 8844257309346066382,
-    (Point(row=8, col=16), Player.white): 4397164639691657310,
-    (Point(row=8, col=17), None): 6924436026869042932,
-    (Point(row=8, col=17), Player.black): 7384357565442669286,
-    (Point(row=8, col=17), Player.white): 7926866768428985043,
-    (Point(row=8, col=18), None): 1215192570725879370,
-    (Point(row=8, col=18), Player.black): 5352654741175191994,
-    (Point(row=8, col=18), Player.white): 7230246477789996181,
-    (Point(row=8, col=19), None): 4928595744231691382,
-    (Point(row=8, col=19), Player.black): 8616104833462014511,
-    (Point(row=8, col=19), Player.white): 1892938770974011968,
-    (Point(row=9, col=1), None): 6743386700188933609,
-    (Point(row=9, col=1), Player.black): 3950154523875636246,
-    (Point(row=9, col=1), Player.white): 6192177334781799846,
-    (Point(row=9, col=2), None): 1158215549499412747,
-    (Point(row=9, col=2), Player.black): 5196418744428607937,
-    (Point(row=9, col=2), Player.white): 2762022000374018832,
-    (Point(row=9, col=3), None): 3437874067203692545,
-    (Point(row=9, col=3), Player.black): 3176712490511609694,
-    (Point(row=9, col=3), Player.white): 5532505359918782509,
-    (Point(row=9, col=4), None): 1681133576289494651,
-    (Point(row=9, col=4), Player.black): 3265322080508945804,
-    (Point(row=9, col=4), Player.white): 8813436625971083059,
-    (Point(row=9, col=5), None): 4809082433745526062,
-    (Point(row=9, col=5), Player.black): 8937671368406148786,
-    (Point(row=9, col=5), Player.white): 7053786125698232633,
-    (Point(row=9, col=6), None): 6949320065309673474,
-    (Point(row=9, col=6), Player.black): 8712247726931233578,
-    (Point(row=9, col=6), Player.white): 4800931047663682160,
-    (Point(row=9, col=7), None): 5528666175740154755,
-    (Point(row=9, col=7), Player.black): 1327409937908817374,
-    (Point(row=9, col=7), Player.white): 4968243361936629567,
-    (Point(row=9, col=8), None): 1766252635293279171,
-    (Point(row=9, col=8), Player.black): 8371827633496203896,
-    (Point(row=9, col=8), Player.white): 7664536919037887122,
-    (Point(row=9, col=9), None): 834007951221734505,
-    (Point(row=9, col=9), Player.black): 1372011264285931700,
-    (Point(row=9, col=9), Player.white): 6958136041648042869,
-    (Point(row=9, col=10), None): 8335642646378469991,
-    (Point(row=9, col=10), Player.black): 8846790262314288081,
-    (Point(row=9, col=10), Player.white): 4754132456638923854,
-    (Point(row=9, col=11), None): 728530736027322184,
-    (Point(row=9, col=11), Player.black): 1223080923982888743,
-    (Point(row=9, col=11), Player.white): 9083073265780692130,
-    (Point(row=9, col=12), None): 8398287296122274253,
-    (Point(row=9, col=12), Player.black): 917843401066074734,
-    (Point(row=9, col=12), Player.white): 3892412035384001864,
-    (Point(row=9, col=13), None): 5810603813584124513,
-    (Point(row=9, col=13), Player.black): 2044483860325592702,
-    (Point(row=9, col=13), Player.white): 3568871320809511757,
-    (Point(row=9, col=14), None): 7084073977275282610,
-    (Point(row=9, col=14), Player.black): 308871768499422692,
-    (Point(row=9, col=14), Player.white): 2975360071744976769,
-    (Point(row=9, col=15), None): 965035502713851221,
-    (Point(row=9, col=15), Player.black): 4686998987103768104,
-    (Point(row=9, col=15), Player.white): 6763319247795544372,
-    (Point(row=9, col=16), None): 335543540674458061,
-    (Point(row=9, col=16), Player.black): 8858140030017112705,
-    (Point(row=9, col=16), Player.white): 7051082800217888273,
-    (Point(row=9, col=17), None): 5822265270841595340,
-    (Point(row=9, col=17), Player.black): 1571417258931187188,
-    (Point(row=9, col=17), Player.white): 6177082688753647598,
-    (Point(row=9, col=18), None): 8031848734766952378,
-    (Point(row=9, col=18), Player.black): 5983730123854807911,
-    (Point(row=9, col=18), Player.white): 696389077836533043,
-    (Point(row=9, col=19), None): 2882479314766007597,
-    (Point(row=9, col=19), Player.black): 8713061394733110502,
-    (Point(row=9, col=19), Player.white): 1050853813804221676,
-    (Point(row=10, col=1), None): 1950234272191381469,
-    (Point(row=10, col=1), Player.black): 5175079759805257525,
-    (Point(row=10, col=1), Player.white): 4757374552741113331,
-    (Point(row=10, col=2), None): 8813779413874243703,
-    (Point(row=10, col=2), Player.black): 2093855662644194547,
-    (Point(row=10, col=2), Player.white): 7326110078467404228,
-    (Point(row=10, col=3), None): 1896199623460553578,
-    (Point(row=10, col=3), Player.black): 3494786890845576880,
-    (Point(row=10, col=3), Player.white): 4822579479625204366,
-    (Point(row=10, col=4), None): 4110133747305616117,
-    (Point(row=10, col=4), Player.black): 6809121397298136095,
-    (Point(row=10, col=4), Player.white): 1142547570472052062,
-    (Point(row=10, col=5), None): 3920574724383796057,
-    (Point(row=10, col=5), Player.black): 8490022816923582618,
-    (Point(row=10, col=5), Player.white): 7912568750051101101,
-    (Point(row=10, col=6), None): 2611484310505569377,
-    (Point(row=10, col=6), Player.black): 8026232239820375548,
-    (Point(row=10, col=6), Player.white): 8243417593632187738,
-    (Point(row=10, col=7), None): 4606569151749803495,
-    (Point(row=10, col=7), Player.black): 7986741646505653418,
-    (Point(row=10, col=7), Player.white): 4082810198274077169,
-    (Point(row=10, col=8), None): 2580857269279378932,
-    (Point(row=10, col=8), Player.black): 8706569330971570630,
-    (Point(row=10, col=8), Player.white): 5645076841868909104,
-    (Point(row=10, col=9), None): 7424587179509651130,
-    (Point(row=10, col=9), Player.black): 2184698807655211705,
-    (Point(row=10, col=9), Player.white): 3156600238538578747,
-    (Point(row=10, col=10), None): 3310293293796591705,
-    (Point(row=10, col=10), Player.black): 2282523187695085649,
-    (Point(row=10, col=10), Player.white): 1907651172290516840,
-    (Point(row=10, col=11), None): 4081014091650373916,
-    (Point(row=10, col=11), Player.black): 860252683717739433,
-    (Point(row=10, col=11), Player.white): 3113425945782685885,
-    (Point(row=10, col=12), None): 8496032273814956766,
-    (Point(row=10, col=12), Player.black): 8112914414093410853,
-    (Point(row=10, col=12), Player.white): 5674386181867331442,
-    (Point(row=10, col=13), None): 460960048795654073,
-    (Point(row=10, col=13), Player.black): 2096970978170442551,
-    (Point(row=10, col=13), Player.white): 65888111676722484,
-    (Point(row=10, col=14), None): 2150527785864224937,
-    (Point(row=10, col=14), Player.black): 6933109289082883821,
-    (Point(row=10, col=14), Player.white): 5299541951288090098,
-    (Point(row=10, col=15), None): 2156046386939312224,
-    (Point(row=10, col=15), Player.black): 1577851428011824440,
-    (Point(row=10, col=15), Player.white): 5883930708901612338,
-    (Point(row=10, col=16), None): 5894456861931156456,
-    (Point(row=10, col=16), Player.black): 1789633680523736723,
-    (Point(row=10, col=16), Player.white): 2060351134511504306,
-    (Point(row=10, col=17), None): 6528956843065007787,
-    (Point(row=10, col=17), Player.black): 1750562304957394079,
-    (Point(row=10, col=17), Player.white): 2614619476442229857,
-    (Point(row=10, col=18), None): 4285372643475982199,
-    (Point(row=10, col=18), Player.black): 1253633533403755994,
-    (Point(row=10, col=18), Player.white): 7708574052894177945,
-    (Point(row=10, col=19), None): 1146181610758603993,
-    (Point(row=10, col=19), Player.black): 2907147452008658037,
-    (Point(row=10, col=19), Player.white): 1624893857574645652,
-    (Point(row=11, col=1), None): 6600889724937353275,
-    (Point(row=11, col=1), Player.black): 5251013867839258866,
-    (Point(row=11, col=1), Player.white): 182706400080058445,
-    (Point(row=11, col=2), None): 8452575339349872181,
-    (Point(row=11, col=2), Player.black): 1016978115270879205,
-    (Point(row=11, col=2), Player.white): 3675955787731333716,
-    (Point(row=11, col=3), None): 7988035518794270861,
-    (Point(row=11, col=3), Player.black): 8013990723634243579,
-    (Point(row=11, col=3), Player.white): 5188540287965720978,
-    (Point(row=11, col=4), None): 2626010928596301180,
-    (Point(row=11, col=4), Player.black): 8676164363279579784,
-    (Point(row=11, col=4), Player.white): 6136845334252258012,
-    (Point(row=11, col=5), None): 7739883564023534804,
-    (Point(row=11, col=5), Player.black): 3870292117782701049,
-    (Point(row=11, col=5), Player.white): 3379418719542278107,
-    (Point(row=11, col=6), None): 3191367889339035055,
-    (Point(row=11, col=6), Player.black): 3887270346160412488,
-    (Point(row=11, col=6), Player.white): 8311930232282244556,
-    (Point(row=11, col=7), None): 1057014878116115124,
-    (Point(row=11, col=7), Player.black): 117733489483515854,
-    (Point(row=11, col=7), Player.white): 283931416477096805,
-    (Point(row=11, col=8), None): 4288592364095064501,
-    (Point(row=11, col=8), Player.black): 4374889157940996903,
-    (Point(row=11, col=8), Player.white): 5253619226708660761,
-    (Point(row=11, col=9), None): 462087282971616580,
-    (Point(row=11, col=9), Player.black): 6706345442552767344,
-    (Point(row=11, col=9), Player.white): 7091181745596794369,
-    (Point(row=11, col=10), None): 4934056123847552657,
-    (Point(row=11, col=10), Player.black): 5070506725134408311,
-    (Point(row=11, col=10), Player.white): 3795547590811991174,
-    (Point(row=11, col=11), None): 1297554240296777509,
-    (Point(row=11, col=11), Player.black): 1523276519119352578,
-    (Point(row=11, col=11), Player.white): 8129907947090939767,
-    (Point(row=11, col=12), None): 9071521583323485530,
-    (Point(row=11, col=12), Player.black): 5078701995274613057,
-    (Point(row=11, col=12), Player.white): 3789082397402468533,
-    (Point(row=11, col=13), None): 8203112540552071704,
-    (Point(row=11, col=13), Player.black): 1862648691335708078,
-    (Point(row=11, col=13), Player.white): 3563230535496567664,
-    (Point(row=11, col=14), None): 5294618759427954761,
-    (Point(row=11, col=14), Player.black): 146067844120509946,
-    (Point(row=11, col=14), Player.white): 3458225018555978949,
-    (Point(row=11, col=15), None): 8339043895005418257,
-    (Point(row=11, col=15), Player.black): 2177022254647070435,
-    (Point(row=11, col=15), Player.white): 4164108108099808472,
-    (Point(row=11, col=16), None): 8992767240077238223,
-    (Point(row=11, col=16), Player.black): 8266732303263193660,
-    (Point(row=11, col=16), Player.white): 7769342006007064958,
-    (Point(row=11, col=17), None): 8150564971404507664,
-    (Point(row=11, col=17), Player.black): 6165614977864587183,
-    (Point(row=11, col=17), Player.white): 877272186653260412,
-    (Point(row=11, col=18), None): 7327898938204419879,
-    (Point(row=11, col=18), Player.black): 329182253602334078,
-    (Point(row=11, col=18), Player.white): 2400841112928608,
-    (Point(row=11, col=19), None): 3977123413101628477,
-    (Point(row=11, col=19), Player.black): 5062038999931368386,
-    (Point(row=11, col=19), Player.white): 2721390189772895402,
-    (Point(row=12, col=1), None): 4360033836765261028,
-    (Point(row=12, col=1), Player.black): 8204114360619351780,
-    (Point(row=12, col=1), Player.white): 6954811528197685000,
-    (Point(row=12, col=2), None): 9036247333791858215,
-    (Point(row=12, col=2), Player.black): 2199614172029597010,
-    (Point(row=12, col=2), Player.white): 1856723800642548680,
-    (Point(row=12, col=3), None): 5674729209171125804,
-    (Point(row=12, col=3), Player.black): 7883502993642673307,
-    (Point(row=12, col=3), Player.white): 9110809727914459295,
-    (Point(row=12, col=4), None): 8083477365681075767,
-    (Point(row=12, col=4), Player.black): 7653855125822988063,
-    (Point(row=12, col=4), Player.white): 2550946436039360190,
-    (Point(row=12, col=5), None): 3349324930458867787,
-    (Point(row=12, col=5), Player.black): 3252660232637555005,
-    (Point(row=12, col=5), Player.white): 1234973871658377379,
-    (Point(row=12, col=6), None): 2372796904463625457,
-    (Point(row=12, col=6), Player.black): 2714474110718573658,
-    (Point(row=12, col=6), Player.white): 2922932858700824842,
-    (Point(row=12, col=7), None): 6984466958382389975,
-    (Point(row=12, col=7), Player.black): 1304272032505844829,
-    (Point(row=12, col=7), Player.white): 4412464546816746704,
-    (Point(row=12, col=8), None): 3476365136404014733,
-    (Point(row=12, col=8), Player.black): 6371091448955140245,
-    (Point(row=12, col=8), Player.white): 1466560588593637266,
-    (Point(row=12, col=9), None): 4642717582336135617,
-    (Point(row=12, col=9), Player.black): 8948855720666141590,
-    (Point(row=12, col=9), Player.white): 6213597555189260145,
-    (Point(row=12, col=10), None): 2671207131631953832,
-    (Point(row=12, col=10), Player.black): 2289855430531536781,
-    (Point(row=12, col=10), Player.white): 1079994396639798172,
-    (Point(row=12, col=11), None): 3677910639930301919,
-    (Point(row=12, col=11), Player.black): 264717285611233850,
-    (Point(row=12, col=11), Player.white): 6132419899442887956,
-    (Point(row=12, col=12), None): 5036790561745105113,
-    (Point(row=12, col=12), Player.black): 3894831455188040975,
-    (Point(row=12, col=12), Player.white): 8397680417073351336,
-    (Point(row=12, col=13), None): 7486952213357644434,
-    (Point(row=12, col=13), Player.black): 8019055082110826633,
-    (Point(row=12, col=13), Player.white): 2763271402461037383,
-    (Point(row=12, col=14), None): 4187848061922147931,
-    (Point(row=12, col=14), Player.black): 8212920524602598463,
-    (Point(row=12, col=14), Player.white): 6059940661878438388,
-    (Point(row=12, col=15), None): 1706069461311095556,
-    (Point(row=12, col=15), Player.black): 800160352722785413,
-    (Point(row=12, col=15), Player.white): 3325247341665160990,
-    (Point(row=12, col=16), None): 8027599743141047580,
-    (Point(row=12, col=16), Player.black): 445641289634904717,
-    (Point(row=12, col=16), Player.white): 3567511526301907961,
-    (Point(row=12, col=17), None): 7385537632455963735,
-    (Point(row=12, col=17), Player.black): 62410261542762687,
-    (Point(row=12, col=17), Player.white): 2167299545513438560,
-    (Point(row=12, col=18), None): 1985116491241899714,
-    (Point(row=12, col=18), Player.black): 6255202715009013310,
-    (Point(row=12, col=18), Player.white): 8414900668028793600,
-    (Point(row=12, col=19), None): 2429276353133396490,
-    (Point(row=12, col=19), Player.black): 1847682822850556028,
-    (Point(row=12, col=19), Player.white): 7348162734895443377,
-    (Point(row=13, col=1), None): 2740644359063616243,
-    (Point(row=13, col=1), Player.black): 4300965642275840365,
-    (Point(row=13, col=1), Player.white): 7818198876660425920,
-    (Point(row=13, col=2), None): 7691740946004035704,
-    (Point(row=13, col=2), Player.black): 1739396463365117424,
-    (Point(row=13, col=2), Player.white): 1205206435048225510,
-    (Point(row=13, col=3), None): 6071201435843963197,
-    (Point(row=13, col=3), Player.black): 1859468397498404977,
-    (Point(row=13, col=3), Player.white): 8918623117509719449,
-    (Point(row=13, col=4), None): 1821748043159364911,
-    (Point(row=13, col=4), Player.black): 4631942953520085482,
-    (Point(row=13, col=4), Player.white): 5013417302799730077,
-    (Point(row=13, col=5), None): 7862578350480619139,
-    (Point(row=13, col=5), Player.black): 1727990950976565183,
-    (Point(row=13, col=5), Player.white): 6945730708205859564,
-    (Point(row=13, col=6), None): 1241167448281569216,
-    (Point(row=13, col=6), Player.black): 7159801058727899484,
-    (Point(row=13, col=6), Player.white): 550198735512664108,
-    (Point(row=13, col=7), None): 1293671948176065378,
-    (Point(row=13, col=7), Player.black): 8954381719324200566,
-    (Point(row=13, col=7), Player.white): 6469536102592732480,
-    (Point(row=13, col=8), None): 7309379715586934845,
-    (Point(row=13, col=8), Player.black): 3942431050182997112,
-    (Point(row=13, col=8), Player.white): 3562871107319467957,
-    (Point(row=13, col=9), None): 3554368399876695750,
-    (Point(row=13, col=9), Player.black): 4820981967630837995,
-    (Point(row=13, col=9), Player.white): 6506003644779812706,
-    (Point(row=13, col=10), None): 75165547083973152,
-    (Point(row=13, col=10), Player.black): 2726396203636676247,
-    (Point(row=13, col=10), Player.white): 3528833049631923826,
-    (Point(row=13, col=11), None): 1312496585560927648,
-    (Point(row=13, col=11), Player.black): 1552363990659818621,
-    (Point(row=13, col=11), Player.white): 3092638618649416205,
-    (Point(row=13, col=12), None): 7293160852328703843,
-    (Point(row=13, col=12), Player.black): 3028478959388987959,
-    (Point(row=13, col=12), Player.white): 135459696849454266,
-    (Point(row=13, col=13), None): 8240027998143891221,
-    (Point(row=13, col=13), Player.black): 6832571697712871192,
-    (Point(row=13, col=13), Player.white): 6670610197927269334,
-    (Point(row=13, col=14), None): 7897243161474883760,
-    (Point(row=13, col=14), Player.black): 4194661492642604232,
-    (Point(row=13, col=14), Player.white): 8897469759656018470,
-    (Point(row=13, col=15), None): 3628909237245382490,
-    (Point(row=13, col=15), Player.black): 3621083416792383737,
-    (Point(row=13, col=15), Player.white): 1044951076593964374,
-    (Point(row=13, col=16), None): 5074519954533631651,
-    (Point(row=13, col=16), Player.black): 4785826263584180796,
-    (Point(row=13, col=16), Player.white): 2896995813186829821,
-    (Point(row=13, col=17), None): 2521897184292838739,
-    (Point(row=13, col=17), Player.black): 3726710280247918589,
-    (Point(row=13, col=17), Player.white): 1346132077020756898,
-    (Point(row=13, col=18), None): 362426564225769883,
-    (Point(row=13, col=18), Player.black): 6262172930722527705,
-    (Point(row=13, col=18), Player.white): 971261805966150392,
-    (Point(row=13, col=19), None): 2719861366189057701,
-    (Point(row=13, col=19), Player.black): 308866103452104365,
-    (Point(row=13, col=19), Player.white): 6218592345396876308,
-    (Point(row=14, col=1), None): 8924232850905585413,
-    (Point(row=14, col=1), Player.black): 5694058760963514477,
-    (Point(row=14, col=1), Player.white): 2244012173554539786,
-    (Point(row=14, col=2), None): 5591784495217181424,
-    (Point(row=14, col=2), Player.black): 3889975433169933029,
-    (Point(row=14, col=2), Player.white): 5849393950258914488,
-    (Point(row=14, col=3), None): 2133780521550489293,
-    (Point(row=14, col=3), Player.black): 1396880423203366649,
-    (Point(row=14, col=3), Player.white): 4110208832263932145,
-    (Point(row=14, col=4), None): 1117238335814674381,
-    (Point(row=14, col=4), Player.black): 8749019886330822436,
-    (Point(row=14, col=4), Player.white): 5088905729799233472,
-    (Point(row=14, col=5), None): 5334171861263963358,
-    (Point(row=14, col=5), Player.black): 734689735421136974,
-    (Point(row=14, col=5), Player.white): 5026682058626472335,
-    (Point(row=14, col=6), None): 2884149941149311262,
-    (Point(row=14, col=6), Player.black): 5148069458024981520,
-    (Point(row=14, col=6), Player.white): 3775111677789921901,
-    (Point(row=14, col=7), None): 268536115391065705,
-    (Point(row=14, col=7), Player.black): 1584289617759234736,
-    (Point(row=14, col=7), Player.white): 6110944001437383435,
-    (Point(row=14, col=8), None): 4431372681799391870,
-    (Point(row=14, col=8), Player.black): 8495880876011258463,
-    (Point(row=14, col=8), Player.white): 1779102438903325334,
-    (Point(row=14, col=9), None): 8457042363905943411,
-    (Point(row=14, col=9), Player.black): 5991947578814289866,
-    (Point(row=14, col=9), Player.white): 1819755688896508506,
-    (Point(row=14, col=10), None): 8020269451533821453,
-    (Point(row=14, col=10), Player.black): 76807380073689101,
-    (Point(row=14, col=10), Player.white): 4875460073468700149,
-    (Point(row=14, col=11), None): 649950192155371578,
-    (Point(row=14, col=11), Player.black): 8420286392003412464,
-    (Point(row=14, col=11), Player.white): 7330202131997174971,
-    (Point(row=14, col=12), None): 3437898181839925521,
-    (Point(row=14, col=12), Player.black): 4579844043636482751,
-    (Point(row=14, col=12), Player.white): 5675298027485555095,
-    (Point(row=14, col=13), None): 2782341101524300525,
-    (Point(row=14, col=13), Player.black): 4475387273802659322,
-    (Point(row=14, col=13), Player.white): 5102347129208604848,
-    (Point(row=14, col=14), None): 1833468644417825643,
-    (Point(row=14, col=14), Player.black): 6290874629857104695,
-    (Point(row=14, col=14), Player.white): 8561294844716308608,
-    (Point(row=14, col=15), None): 254966696020520283,
-    (Point(row=14, col=15), Player.black): 7367677728278944549,
-    (Point(row=14, col=15), Player.white): 1824843138712013229,
-    (Point(row=14, col=16), None): 1055401592349859307,
-    (Point(row=14, col=16), Player.black): 7827546914560571253,
-    (Point(row=14, col=16), Player.white): 5667720198339318907,
-    (Point(row=14, col=17), None): 1408031708744953358,
-    (Point(row=14, col=17), Player.black): 2861774344483343859,
-    (Point(row=14, col=17), Player.white): 3381675511593998274,
-    (Point(row=14, col=18), None): 7336561305202704811,
-    (Point(row=14, col=18), Player.black): 6556318742702303239,
-    (Point(row=14, col=18), Player.white): 1324000411936927448,
-    (Point(row=14, col=19), None): 8954819160184438559,
-    (Point(row=14, col=19), Player.black): 8052349090182791458,
-    (Point(row=14, col=19), Player.white): 7239229860948448453,
-    (Point(row=15, col=1), None): 8291809624538792221,
-    (Point(row=15, col=1), Player.black): 2538083883736520226,
-    (Point(row=15, col=1), Player.white): 8274655105676915846,
-    (Point(row=15, col=2), None): 6931566474393815647,
-    (Point(row=15, col=2), Player.black): 4545000441550109050,
-    (Point(row=15, col=2), Player.white): 5873594683098786847,
-    (Point(row=15, col=3), None): 8315099980556599349,
-    (Point(row=15, col=3), Player.black): 8464849721411205594,
-    (Point(row=15, col=3), Player.white): 2458216153093656083,
-    (Point(row=15, col=4), None): 479004347673471424,
-    (Point(row=15, col=4), Player.black): 1244855509357968671,
-    (Point(row=15, col=4), Player.white): 4575261232844901683,
-    (Point(row=15, col=5), None): 5715414256790813417,
-    (Point(row=15, col=5), Player.black): 1250921919857759889,
-    (Point(row=15, col=5), Player.white): 1081204847824126909,
-    (Point(row=15, col=6), None): 6624630350275454462,
-    (Point(row=15, col=6), Player.black): 5516454750686759462,
-    (Point(row=15, col=6), Player.white): 2756644124819897588,
-    (Point(row=15, col=7), None): 3340176754373011181,
-    (Point(row=15, col=7), Player.black): 3206204824346623496,
-    (Point(row=15, col=7), Player.white): 26430015510255603,
-    (Point(row=15, col=8), None): 4930751566536492850,
-    (Point(row=15, col=8), Player.black): 597522933322154360,
-    (Point(row=15, col=8), Player.white): 371967473456796557,
-    (Point(row=15, col=9), None): 3841041044456046036,
-    (Point(row=15, col=9), Player.black): 4311573471646846043,
-    (Point(row=15, col=9), Player.white): 6618550024651892578,
-    (Point(row=15, col=10), None): 6025152064570605573,
-    (Point(row=15, col=10), Player.black): 4840379054011716996,
-    (Point(row=15, col=10), Player.white): 412450886724929897,
-    (Point(row=15, col=11), None): 4728798248329881085,
-    (Point(row=15, col=11), Player.black): 518079527071036378,
-    (Point(row=15, col=11), Player.white): 4288178157707188241,
-    (Point(row=15, col=12), None): 7092648339647305837,
-    (Point(row=15, col=12), Player.black): 6594680907138298189,
-    (Point(row=15, col=12), Player.white): 3384010508749114041,
-    (Point(row=15, col=13), None): 3175325380222444724,
-    (Point(row=15, col=13), Player.black): 4042200394647250377,
-    (Point(row=15, col=13), Player.white): 989323389652347970,
-    (Point(row=15, col=14), None): 6992105915936304959,
-    (Point(row=15, col=14), Player.black): 5167926881444962887,
-    (Point(row=15, col=14), Player.white): 1880109307190105705,
-    (Point(row=15, col=15), None): 6777615500034728810,
-    (Point(row=15, col=15), Player.black): 5501299262012918754,
-    (Point(row=15, col=15), Player.white): 3399344572582604150,
-    (Point(row=15, col=16), None): 7672486937793083068,
-    (Point(row=15, col=16), Player.black): 4590561347678556578,
-    (Point(row=15, col=16), Player.white): 2744835452180995638,
-    (Point(row=15, col=17), None): 579802781452674641,
-    (Point(row=15, col=17), Player.black): 7815051084238234798,
-    (Point(row=15, col=17), Player.white): 8825071524309684872,
-    (Point(row=15, col=18), None): 7856181308947372757,
-    (Point(row=15, col=18), Player.black): 4870193313166468144,
-    (Point(row=15, col=18), Player.white): 3688724226392407154,
-    (Point(row=15, col=19), None): 8922173895957909887,
-    (Point(row=15, col=19), Player.black): 1877065985697984506,
-    (Point(row=15, col=19), Player.white): 8655554446381557936,
-    (Point(row=16, col=1), None): 6556031236969286246,
-    (Point(row=16, col=1), Player.black): 6443645201743780202,
-    (Point(row=16, col=1), Player.white): 2762067543878927108,
-    (Point(row=16, col=2), None): 2366571831079956419,
-    (Point(row=16, col=2), Player.black): 939033849504052381,
-    (Point(row=16, col=2), Player.white): 846003791900350306,
-    (Point(row=16, col=3), None): 7165211158568592344,
-    (Point(row=16, col=3), Player.black): 5129770743968664015,
-    (Point(row=16, col=3), Player.white): 7275730683128642676,
-    (Point(row=16, col=4), None): 6581020631265903357,
-    (Point(row=16, col=4), Player.black): 2951028199540884145,
-    (Point(row=16, col=4), Player.white): 7031281878075417899,
-    (Point(row=16, col=5), None): 4950460232062986255,
-    (Point(row=16, col=5), Player.black): 7911970555751691695,
-    (Point(row=16, col=5), Player.white): 6538335192289137380,
-    (Point(row=16, col=6), None): 7562886280055929503,
-    (Point(row=16, col=6), Player.black): 5515623507188643909,
-    (Point(row=16, col=6), Player.white): 486243866438770865,
-    (Point(row=16, col=7), None): 370952491074592131,
-    (Point(row=16, col=7), Player.black): 6186966918632387361,
-    (Point(row=16, col=7), Player.white): 8367573962684752055,
-    (Point(row=16, col=8), None): 5111164465840843253,
-    (Point(row=16, col=8), Player.black): 6843500356969554304,
-    (Point(row=16, col=8), Player.white): 1861655187442495092,
-    (Point(row=16, col=9), None): 8513801854010801898,
-    (Point(row=16, col=9), Player.black): 3769943096339235807,
-    (Point(row=16, col=9), Player.white): 7700883061110114305,
-    (Point(row=16, col=10), None): 6036858580882119589,
-    (Point(row=16, col=10), Player.black): 6235654762231292950,
-    (Point(row=16, col=10), Player.white): 2837846151478443838,
-    (Point(row=16, col=11), None): 1541044112500056336,
-    (Point(row=16, col=11), Player.black): 7770808223579816188,
-    (Point(row=16, col=11), Player.white): 3650766475271992051,
-    (Point(row=16, col=12), None): 5616154398682881462,
-    (Point(row=16, col=12), Player.black): 7534628418839371086,
-    (Point(row=16, col=12), Player.white): 7511668397119318463,
-    (Point(row=16, col=13), None): 6814315894443601661,
-    (Point(row=16, col=13), Player.black): 2269838876424946526,
-    (Point(row=16, col=13), Player.white): 28215113756749003,
-    (Point(row=16, col=14), None): 5048258071989020202,
-    (Point(row=16, col=14), Player.black): 1210825246322736323,
-    (Point(row=16, col=14), Player.white): 7284838970644067464,
-    (Point(row=16, col=15), None): 881739829658612186,
-    (Point(row=16, col=15), Player.black): 4941573376550531472,
-    (Point(row=16, col=15), Player.white): 3712836831209236121,
-    (Point(row=16, col=16), None): 8268238307895306528,
-    (Point(row=16, col=16), Player.black): 8124387305920822925,
-    (Point(row=16, col=16), Player.white): 4386167911205470553,
-    (Point(row=16, col=17), None): 3853246836506317104,
-    (Point(row=16, col=17), Player.black): 8901133131138247364,
-    (Point(row=16, col=17), Player.white): 2821377795133081773,
-    (Point(row=16, col=18), None): 5160743941508258720,
-    (Point(row=16, col=18), Player.black): 5018262052375639436,
-    (Point(row=16, col=18), Player.white): 597087507416802053,
-    (Point(row=16, col=19), None): 7990071123641771138,
-    (Point(row=16, col=19), Player.black): 2647034409199430891,
-    (Point(row=16, col=19), Player.white): 2295830542032634937,
-    (Point(row=17, col=1), None): 7737401394819595242,
-    (Point(row=17, col=1), Player.black): 8875600302167034488,
-    (Point(row=17, col=1), Player.white): 7731527998706009486,
-    (Point(row=17, col=2), None): 715720492641185994,
-    (Point(row=17, col=2), Player.black): 7688568884192057030,
-    (Point(row=17, col=2), Player.white): 7030239749929949703,
-    (Point(row=17, col=3), None): 4253369128350027031,
-    (Point(row=17, col=3), Player.black): 8432096447296282118,
-    (Point(row=17, col=3), Player.white): 2824769679627582916,
-    (Point(row=17, col=4), None): 6834520328610039054,
-    (Point(row=17, col=4), Player.black): 7274073934562428887,
-    (Point(row=17, col=4), Player.white): 1256090539020774254,
-    (Point(row=17, col=5), None): 8892327929102139278,
-    (Point(row=17, col=5), Player.black): 1496962392350061870,
-    (Point(row=17, col=5), Player.white): 1796572505418791468,
-    (Point(row=17, col=6), None): 2021874047425398325,
-    (Point(row=17, col=6), Player.black): 9143740157124297494,
-    (Point(row=17, col=6), Player.white): 7561920636246740497,
-    (Point(row=17, col=7), None): 2784943382009283738,
-    (Point(row=17, col=7), Player.black): 799530292803360910,
-    (Point(row=17, col=7), Player.white): 5507890572167645904,
-    (Point(row=17, col=8), None): 8480778420742478626,
-    (Point(row=17, col=8), Player.black): 2205835665899408082,
-    (Point(row=17, col=8), Player.white): 7406349870558287808,
-    (Point(row=17, col=9), None): 5950713963206029900,
-    (Point(row=17, col=9), Player.black): 335759533405404998,
-    (Point(row=17, col=9), Player.white): 5530597664334721975,
-    (Point(row=17, col=10), None): 3659090874879786197,
-    (Point(row=17, col=10), Player.black): 8488238512991604691,
-    (Point(row=17, col=10), Player.white): 5910244816057548126,
-    (Point(row=17, col=11), None): 2076767893426238081,
-    (Point(row=17, col=11), Player.black): 2617844579794470220,
-    (Point(row=17, col=11), Player.white): 7885087251066544813,
-    (Point(row=17, col=12), None): 3761481934439569715,
-    (Point(row=17, col=12), Player.black): 8094303581367369323,
-    (Point(row=17, col=12), Player.white): 2974339592992130823,
-    (Point(row=17, col=13), None): 5442299735028481451,
-    (Point(row=17, col=13), Player.black): 1325647306435444227,
-    (Point(row=17, col=13), Player.white): 7326156650190010263,
-    (Point(row=17, col=14), None): 6260299019469353142,
-    (Point(row=17, col=14), Player.black): 3910520021654792223,
-    (Point(row=17, col=14), Player.white): 6330832963346145639,
-    (Point(row=17, col=15), None): 7715541794810238533,
-    (Point(row=17, col=15), Player.black): 5259959809963739837,
-    (Point(row=17, col=15), Player.white): 9096504778234209399,
-    (Point(row=17, col=16), None): 4645917779744010099,
-    (Point(row=17, col=16), Player.black): 1023310894315491780,
-    (Point(row=17, col=16), Player.white): 2079758702188377299,
-    (Point(row=17, col=17), None): 2507490802149009596,
-    (Point(row=17, col=17), Player.black): 8907235051503820861,
-    (Point(row=17, col=17), Player.white): 6203853682362073138,
-    (Point(row=17, col=18), None): 6317701673188674690,
-    (Point(row=17, col=18), Player.black): 2902888034615956431,
-    (Point(row=17, col=18), Player.white): 425619146347537885,
-    (Point(row=17, col=19), None): 508022599436169859,
-    (Point(row=17, col=19), Player.black): 1108210081162658515,
-    (Point(row=17, col=19), Player.white): 741525160349831667,
-    (Point(row=18, col=1), None): 7275655697059903574,
-    (Point(row=18, col=1), Player.black): 3800636911197042933,
-    (Point(row=18, col=1), Player.white): 7946539222518770125,
-    (Point(row=18, col=2), None): 901341352621114628,
-    (Point(row=18, col=2), Player.black): 5028186539960225960,
-    (Point(row=18, col=2), Player.white): 3628128000369005397,
-    (Point(row=18, col=3), None): 3978631719280723405,
-    (Point(row=18, col=3), Player.black): 4782727626474374488,
-    (Point(row=18, col=3), Player.white): 2384708518039177872,
-    (Point(row=18, col=4), None): 7200653546508687593,
-    (Point(row=18, col=4), Player.black): 4372207454289246127,
-    (Point(row=18, col=4), Player.white): 7090970891832093476,
-    (Point(row=18, col=5), None): 8829578388259516991,
-    (Point(row=18, col=5), Player.black): 9016280767763678920,
-    (Point(row=18, col=5), Player.white): 6656385173221657964,
-    (Point(row=18, col=6), None): 3134115697796137611,
-    (Point(row=18, col=6), Player.black): 2888191479333958188,
-    (Point(row=18, col=6), Player.white): 4514119210060198337,
-    (Point(row=18, col=7), None): 7189652192474924525,
-    (Point(row=18, col=7), Player.black): 2100162033911112442,
-    (Point(row=18, col=7), Player.white): 4913440858593268517,
-    (Point(row=18, col=8), None): 4755153895757425922,
-    (Point(row=18, col=8), Player.black): 7473725857882692362,
-    (Point(row=18, col=8), Player.white): 3228343618994448971,
-    (Point(row=18, col=9), None): 5459321318135163507,
-    (Point(row=18, col=9), Player.black): 5449260555466291456,
-    (Point(row=18, col=9), Player.white): 4923923022378492258,
-    (Point(row=18, col=10), None): 1172134112848671359,
-    (Point(row=18, col=10), Player.black): 5411904721734930808,
-    (Point(row=18, col=10), Player.white): 6256527668732175076,
-    (Point(row=18, col=11), None): 1524737865180826028,
-    (Point(row=18, col=11), Player.black): 2436537771157275258,
-    (Point(row=18, col=11), Player.white): 2534150629171808577,
-    (Point(row=18, col=12), None): 3034951175408650286,
-    (Point(row=18, col=12), Player.black): 7881315621222457549,
-    (Point(row=18, col=12), Player.white): 4275762378733093568,
-    (Point(row=18, col=13), None): 3719558475377279183,
-    (Point(row=18, col=13), Player.black): 9165385662215474483,
-    (Point(row=18, col=13), Player.white): 1318870392083905240,
-    (Point(row=18, col=14), None): 751064176175730088,
-    (Point(row=18, col=14), Player.black): 5179285693550576190,
-    (Point(row=18, col=14), Player.white): 605057698816664948,
-    (Point(row=18, col=15), None): 2067130805696423017,
-    (Point(row=18, col=15), Player.black): 3558350152874909125,
-    (Point(row=18, col=15), Player.white): 6656234009731888208,
-    (Point(row=18, col=16), None): 840041880362035869,
-    (Point(row=18, col=16), Player.black): 8012761561191369061,
-    (Point(row=18, col=16), Player.white): 8429314462758985191,
-    (Point(row=18, col=17), None): 6731722567304497159,
-    (Point(row=18, col=17), Player.black): 3259245969865068356,
-    (Point(row=18, col=17), Player.white): 1400501091130114268,
-    (Point(row=18, col=18), None): 5645967359194989658,
-    (Point(row=18, col=18), Player.black): 8593741605046955819,
-    (Point(row=18, col=18), Player.white): 7069982885326507153,
-    (Point(row=18, col=19), None): 4491673721437735112,
-    (Point(row=18, col=19), Player.black): 8152184449595371282,
-    (Point(row=18, col=19), Player.white): 6216354364232214808,
-    (Point(row=19, col=1), None): 6923287377723231576,
-    (Point(row=19, col=1), Player.black): 875198948840092384,
-    (Point(row=19, col=1), Player.white): 2189944624992509414,
-    (Point(row=19, col=2), None): 4838986340159026209,
-    (Point(row=19, col=2), Player.black): 1452987734301440572,
-    (Point(row=19, col=2), Player.white): 2438199841949623401,
-    (Point(row=19, col=3), None): 6371277773154485271,
-    (Point(row=19, col=3), Player.black): 7704298800219576468,
-    (Point(row=19, col=3), Player.white): 1800359798299526174,
-    (Point(row=19, col=4), None): 4492737498613936055,
-    (Point(row=19, col=4), Player.black): 8836099552578613572,
-    (Point(row=19, col=4), Player.white): 6654771487561268466,
-    (Point(row=19, col=5), None): 7265682302720645301,
-    (Point(row=19, col=5), Player.black): 7456435998204002475,
-    (Point(row=19, col=5), Player.white): 7291672331108211290,
-    (Point(row=19, col=6), None): 4009822984326004538,
-    (Point(row=19, col=6), Player.black): 6223256581350032628,
-    (Point(row=19, col=6), Player.white): 843022137189959518,
-    (Point(row=19, col=7), None): 7981743819094088811,
-    (Point(row=19, col=7), Player.black): 3263333610358065810,
-    (Point(row=19, col=7), Player.white): 8410858849089095611,
-    (Point(row=19, col=8), None): 5933912452747329075,
-    (Point(row=19, col=8), Player.black): 7330118765495484200,
-    (Point(row=19, col=8), Player.white): 8493290295455668103,
-    (Point(row=19, col=9), None): 5526948185105544359,
-    (Point(row=19, col=9), Player.black): 6277944094504532807,
-    (Point(row=19, col=9), Player.white): 2840735193097970021,
-    (Point(row=19, col=10), None): 2443238057827578677,
-    (Point(row=19, col=10), Player.black): 1147469396919968445,
-    (Point(row=19, col=10), Player.white): 8077137366222441296,
-    (Point(row=19, col=11), None): 8769091502172322499,
-    (Point(row=19, col=11), Player.black): 350128161095099125,
-    (Point(row=19, col=11), Player.white): 4998452354131013285,
-    (Point(row=19, col=12), None): 1424786266620724313,
-    (Point(row=19, col=12), Player.black): 1453083478883669469,
-    (Point(row=19, col=12), Player.white): 37094861777903360,
-    (Point(row=19, col=13), None): 6245487595187324970,
-    (Point(row=19, col=13), Player.black): 4470875344147563095,
-    (Point(row=19, col=13), Player.white): 262354482543045354,
-    (Point(row=19, col=14), None): 287114867358884965,
-    (Point(row=19, col=14), Player.black): 8248181847107938759,
-    (Point(row=19, col=14), Player.white): 2328836216498553040,
-    (Point(row=19, col=15), None): 6383643812066851140,
-    (Point(row=19, col=15), Player.black): 8067987557991805378,
-    (Point(row=19, col=15), Player.white): 4032532876641780841,
-    (Point(row=19, col=16), None): 5320120584009006168,
-    (Point(row=19, col=16), Player.black): 1391203785520871408,
-    (Point(row=19, col=16), Player.white): 7837035815476897278,
-    (Point(row=19, col=17), None): 2348947234525505974,
-    (Point(row=19, col=17), Player.black): 3459665267267208229,
-    (Point(row=19, col=17), Player.white): 4050012508868328251,
-    (Point(row=19, col=18), None): 1756046589728040341,
-    (Point(row=19, col=18), Player.black): 7464872111700182003,
-    (Point(row=19, col=18), Player.white): 2016174654088690195,
-    (Point(row=19, col=19), None): 5927758607513907973,
-    (Point(row=19, col=19), Player.black): 5859898915817033326,
-    (Point(row=19, col=19), Player.white): 6217718608968288470,
-}
+A point's codes only depend on the point, never on the board size. The
+points of a 19x19 board keep the random codes the book drew with
+generate_zobrist.py, so hashes stored by earlier versions, in
+experience files or superko histories, stay valid. Points beyond row or
+column 19 get codes from a fixed integer hash of (row, col, state).
+"""
+import binascii
+
+import numpy as np
+
+__all__ = [
+    'EMPTY_BOARD',
+    'HASH_CODE',
+    'code_table',
+    'stone_codes',
+]
+
+MAX63 = 0x7fffffffffffffff
 
 EMPTY_BOARD = 9181944435492932548
+
+_CLASSIC_SIZE = 19
+# Big-endian codes for the points of a 19x19 board, row by row, each
+# point with its empty, black and white code.
+_CLASSIC_CODES = np.frombuffer(binascii.unhexlify(
+    '58d9c4c7352c3111062a15cb12d0bf642c247f9c076b81b73037613d71e762433dca68c4'
+    '2e196331246e93337ebb04893bb1a08e8d6923ad0e9c1896027bd8833c252f45f69a51eb'
+    '0809171b602f53f5603a066e711de99067b1767bea9d9cf15be1766c7c74dfda03b39a7e'
+    '39ff10810d7a73420c78c2b044045823a80e3a2132cf898fe756bfc81d06164531298be2'
+    '51111af34935ff3312a61ed1e6194a6b6187276d205469fd60ca7ec66884b0072deb8963'
+    '1848c6386f0a98db9ccc9dec2e2ab40a7f436b48028877e900fdb5b708facd337ef04b63'
+    '5b531ab7c3dfa6985c69f2edfadbee51608e0f3567da1a057d7a6f927470fc777f8f3b60'
+    '7787d8be6a67c8e15f6edfdf0fe95b04216ed9ac3b8fc18be1d96c3a4903007d35b8eb96'
+    '268f8704ffe21b310675e9360d2a1a7d35a39b868c5f5cc33d1a146a0024a7aa2430ebd0'
+    '84b3ae414b9fd4587612b0aa483dde220cb345dc1863407e9927e0061e9760128700e1ad'
+    '58819a898e69b9e04a896e1d0db464ff262cfa6d30dd487e1aae91edc117b4692a1f24b8'
+    'aa1e39737e82ea4c2f3aa0c57ebeb225d8e4716e7f92d0c69cd2172149a3ca261c4d2471'
+    '11abd04b7fa2ef173ed3920a602380bb2f94705031870fc2597fdf50a28564731601533d'
+    'da39071e7ec46b744cd470f073959bc5455433533516cf55f867e7e03c1dc3778fd15522'
+    '6e2d9ef3a023160f787041bbb2a86f3948a9efb134d4fdc564cc22c901cf2ca73dbd01a9'
+    '403cf7f53df76d3d80104c6b2cf6ab84235f40583f406e06728882917ab841a5387f8025'
+    '344f70e40a8bed435f8d4a357b49731e3d489bb4bdf37f5069c42a82c7cac0c264b35308'
+    '5d71c61e06ed4bcc3784f15e45be2f6b25d56ece268da95de4bf9ad23386cadc789fc683'
+    '0baa16a1f25c41e07802f74d7ee5fe5b076e13aec88442d278db498213458c2f0d8a2a84'
+    'bbf43e38002c2e86db446e057b72cb550f96979b3d3cbfeb4c54ac2334867433ca8a9356'
+    '08036c747f4c65ad41dd49f6182d00b657a941d7d05c1e8559632e899d25fed076ad7cc2'
+    '5ab333195578baa3d6e2c0746b6c5f8bf3ea0adb55540f5ac95d27b825142da531a89dfe'
+    '3421b6783c751b2f315a3d1407816875359694c5097c865c034834154bb5757b0b5a2b88'
+    '9e8c206359c5b96913f90eb5058a15dc61dd3960336065552d3a7879083cb63a0e61d769'
+    '79add1175b2f6fc6473d70bce6ee65b95ec566806f9c17a73fba19e0e393677969ad8256'
+    'feaa33220eca6e64da83184e2c9ba07e6b9df3a0190bb521e614d7c64cbf2fcf1197ae93'
+    '22220d25db5fa499671f2f7f00733093488d4f634591e5c07354c893c03e50d55ac015d6'
+    'cbeb1d8c16b5a1ac9ad143bf2c6e62fcea8e4adc4124296aa8f4b80218b117bade753d3e'
+    '07bf214b26dc0cd0438663079c29d8e361de7a565e9da24b42b0cdca76cb989c68e74f21'
+    'a21d6c3940723ff1c0a82b79151704277e6ab9865e2f361e99d323e53323aba20da45664'
+    '24396adbf0881ecf629714cf94a9403f3f4bddb66c09607c0235630bf32e40d00ad8cf00'
+    '724531f94d4bb2142f4d4d5c7dd70581757e43c6418cc7b525b543fb5883474d3ceeb5fb'
+    '0664e6c706b2b9f0706b851a8dde8b4e043d5a2605a0d55a498520cf3fea0b541ac0055c'
+    '602e21230c6f4c9f69d68cec11dacbd386da3b0a2c958899ba7eb35a0e2905912bf8d5ed'
+    '4b9fc8e52bcafc071080fcb21462fda5695b35468fbf5ac0603345698eec9c240ea74813'
+    '20db266634bf13a047e67ff709ef5bd3bb48f3656cfaa34cfabbc393467a34aec9af26dd'
+    '18ae9ea32571abef221dcb2c9a6fffec3334d17be67a9e271e1fc72dfae611780c772772'
+    'a9726c00128ac1a0a834c06378c5f8918b9e30ad74ec3939134552820cb3604f880419f6'
+    '3794299abb3d233627267149463a4078086b0c060301b1b4489752b0564e12b31ea9109b'
+    'f5957002384457611ea3d2ac63422ec4dcf5e4b717f165b7fb3a8bc975a3061537c24714'
+    '624c0cccd42c9899766497d87c3980667a3d03325f9550c80e0a3764a968db336dbeac10'
+    '72eace9d48f25e2adff0c3267047593ced38242a695e4066cd1dde8d7e690e0c35212f3e'
+    '020f5f895a5f56994ddd64ae7997afcb6abc576d4a54a44b12a1fbafe228baab54fc4847'
+    '1435b69c71c01d80183fa8031d8c408c477b9dd67e716b915d78c2c54c0acfb8d47284dd'
+    '52342b4f4dee395e6fa24edde1b7de0c4c09dd58381bfe6e05775ef106fd47b80a15c6aa'
+    'd21f9e5d70f55986dd8d95e92729f5d0a07ce9e121c5530b910d5e652b6018f94c1ce5fd'
+    '4ee2710940e8504e4109730e495852235475080e8c0577ed6c9bdcdf4d3b05ef7bf329d6'
+    '7e7606523ef12f36181e27fc1972f4e1ff2a53f52927e8cf9163406338dbafe3e3b82e55'
+    '0d1798feaf76e4cd5d23f5d55863a3c92b09d6f2b4b499122c0bd2707887e8c976a11a03'
+    '1705d7f94a0ab68897220df91e95f2da6601ae793862817bb0516fb239b81714dc46d26e'
+    '11c2e60f2a8aa54c7aa87151e5d7424f7fdd9ca5ec48ed0c371b121fcd2b5bdf7e96b1d9'
+    'a487abd94a588ce644d1ad3b4473a9a26cdbf10009eb9811b428077121d240cc0915691b'
+    '7295f8376111ab7354622c20157a498122a2b64ab55da5d7013cc338f81f714821876e84'
+    'dcc544407391276008ec53365ac3f0d8299a2b7f0f946e9cdaea97b406b2f8fdf18e3033'
+    '2da6288bd4ba8fb078cb3dd74efdec9e299693d9eee855fe20fd2c2478383c16397a457c'
+    '458d65720bf70a8cd01f7ac9444007d0fd3157b5149a8a3d6b30b04e4ebd46eebb884acb'
+    '29eaf18048449cbc18a2b85785d5da9108c32d6f3b48a99b60e3e3b61e6b4f121f8c90c8'
+    '175fe4bf502cd38b48556cbb3c19c1891794840537011e64a5d7d3c31fc331dd53f3ead8'
+    '7d1b0ae5be24164a3b869b16ca9944a309ad80c761f2031f724b08be1756d7c9715a97dc'
+    'bebdf10d26eac6c7031af026722844ae3b8fd6171e88f4915dbd761702d4aa2691bb8950'
+    '2632306b91402ac8112c087ca5325de8221bdd0dac0e84f37fc40afb0ce79a9867cb47f1'
+    '2c31dee1091319ba6b9c435a607e82445631044558d4c9e360b5eec7266d6d6450115839'
+    '66ee856b1fa6c1f6373d63d6e24bb65a60075dbcda6165e64eaa6e011a36e04e7987838e'
+    'd9257846574d2398fbcd8e496473fc18264272c905e1af5471a93bb12b13b113f6ac5137'
+    '26616e8840232b4e3c8af922df6e28dc443b652b771dde6824e138f0157839d933d5d64e'
+    '7547dfbc025ceef32d56e2e4618f83224e2eff6f7653cc54f010576c6c91345e2311ffbf'
+    '27b2e641a57517d32b5449c7567f2de5272c0893137ed2557133b8ab2f5e29934d0b0b47'
+    '727ecc1b2e1e9c1560f3a9de573cd4583da91982548c4a7fd95dcd9750f1c0caa6601dcd'
+    '10ce9c50ad06276008b3d8edbf6ba6a24d33fd04c1c5f6da243cc8560dd912c907ad38ad'
+    '26ae44261e8cb283c469ead0378db7ca4852e4983a837a65f66a1a5f5e513c4279c7130e'
+    '4a1ba8aa705eea060ac53b273fe10ecb60b6f04e9c92278c56035bcd8122f7067a88ef33'
+    '694eab2979b4a90a8e8122f9496e4527f69a79bd5c747c9cda8063ba2ffd1a716952c976'
+    '3abd51fed41685295ad229ea6a78cd754aef5845420978822443d1966e18b7731c71eb32'
+    'e53de87d145246d50270a1134bd4520693e81e6d7a105a86fe60af414333c8576c1dd2b4'
+    '5d5e4288e5d0929846ca62131bcd8cc84ce27851f009980f3601829013cbeb6b60343194'
+    '03883fb329f9edc1cd03de0747945ebf50510053358f5b56f55d6ac44f93977680b49cc6'
+    '797d8f890c9ab7183965286cec5c5aba24eb26c276ffdd552c371da63b1440157518705b'
+    'b826eef84f1d7af14cce05012204f18da596e2ae45bb82d228dfb9364153d69ee56bf759'
+    '0c69c10d8014c35f66b4086a63490366452440f6884acc026d7ba3842b1a592f30117e57'
+    '5a8cc6254b7b5d2a5412b363713a96acd3ae42e43d4fdbcedcdf66cf6dc99fc8e03cfc0f'
+    '119d863c87ef69c64cb1c314fa76095c61ef76a111aa62c565749d016ee1c9697546b76d'
+    '9294c4621dba4d700350af9020edef4675ccb32d50551798b5dbc57e36b7a708e5011f9c'
+    '551c2b21e1b84fcf2c079f373e33fe3e150ce88d6a2cef52425a8e0fa7a83291446d754d'
+    '993638141f73f48ef6a16e92646a5d51736c7d7b024da7ec87b3040c3cab55927552b891'
+    '747d219efa81216169564ecbde7b69e73a5f76e8284d49ab7235384be7e98c930ba3b406'
+    '06360ec03e228c6d6c5d4e8639e9cb79be70c29b3885df41920a55b8441a19955c5e8ff1'
+    '516d1faf81d1462e70e69ff648b5bf823a23c63046dfe7c351872549d8fe5f85128fbbfe'
+    '29deed272bb20b8873e22e4333a98261a475703736998c528717096e5f34ddee34e3923f'
+    '3b1b7044c1ee27535d223b982210dbbe0a1fa8d9dc89118f2597d4a6c8b5294172f81b2e'
+    'e7e837d603b3c63b07ef640e5223a4724925a7424f240624190b12a61ecff10b0e336767'
+    '5c55dcdb8b748d8d4f06f7366cc17b46237bc751a50ebfc06f4ee597c0ef3c075838520f'
+    '820df9d4477794b5651eead22a57e696af979448039d0cdf14ce8e4d194c64956d7865e8'
+    '1c9459164b90b78b69e4ca72ad8c301120a437411951d8c50de32e0887bc967d5634d90d'
+    '09a8852b7d157d8b27b0e051271250928d20b2db67da27fd0fc2fbb87da0983bacda622b'
+    '589ba5c3b0d3ab6274f0bbe7f1fa596c19bc1cc68184ee5c01f94adcd4c576f000ea7580'
+    '75ce89f813cba349ae8bd9df7500e18e5be3cea8089a089c94fbed4440eb8c9e06488a2a'
+    '14efae2d323a4a6171466ec80a0bce7c5138becce35b2f622d7699b8eae1ad5908c48afd'
+    '931e92c176bb93089cf1f3923960c0594ad974e93a40d98b15e435961d639fd0f5fb309b'
+    '25871740c7bbe10974638f9f3f85450c611426a96a93bab5401ecd548b1595f17abd1d29'
+    'f9b96fce3d05ddf14fbad05e601889e113724ef4667a8214eeadbae66e01e353da0eead3'
+    '10dd3b3467cf4e4a4a487320a50ec9ba6456fedd333124954465e3b7706e947677928db2'
+    '2a07922f1a4511c8717872405d955279cfdadde936d1c49c5382741655ef087a79e4eda6'
+    '1012cee7e13f110b481d6350f5d939c12654ac60221b73102fb5c83fde3418012c15f32d'
+    'de7daf5e4cc7684ff7e7582d17549614a2b7a67b2d50c121bdf9a58c7a4f9dea6d6c7733'
+    '42bd4afe6ef91d2e7c08fcc1790726b261e4151bd7d271396070f1c7c347080278e81f25'
+    'eef0cb2a42a05559f72342704cb9c4983eb59383126be84e3c60ddde44f2bf03c9ecdf3f'
+    '1882fd69ee40e3c3742eb4e0775722786a5de7b82b1ec2920b92fdd0186c3c69130a5cf9'
+    'c398f8b4609043dd3546337573ae26d29ffc5a677ac61cdf0ba0c3d141fa1247e51e444e'
+    '0a1c42d830dcc74810f9419ec58e7f277e0d8f02d3b494a2748cb5ccbf0b41cd0cbcd5b5'
+    'd7fad26e3604a01f9084c54850a36961ef363a611c5f773d23b9ee7e31872d8ebdee1b4d'
+    '624fafbfd214f4b20449553caa8e05e4294a9a389b3d77810d647ead3ee64d55410b90be'
+    'f8ef8e285ddc2305b36a613404a817128c93f1cd7aee6f6cc3d68a8161da7a72d4da9611'
+    '50ccd76a889b55cc15cecbabd882edf455b967fa53603fee6f76dbdea5746fba530a7ad8'
+    '302b836709aa122d39e88d3328009faa2d0a0d2d78eb032cbb3c94e60e9561f9daaa44ec'
+    '1b109fbcdec27fdd47d1939f6f819735420596f3379dedf37a50d5adf49ff8771d0edea1'
+    'a6d8ecf365ab924d0c7571c41a50a782d398836a307ffa293a8adeb042ed3e7c5026028e'
+    '390a20dde37f12f55e7edbd5a677841f0fdb24f63cf8e55e3668adf092456b5975d29ec5'
+    '19b1009a6dcf175b07a709ad243ddb24e830bc616f62e7b2834805fc726680a03ba6e55a'
+    '3fedd23ca351cde76ed69b3640c9b4aa38a90e3e6177f1f123d10c032f61cdf478d3f2ad'
+    '58def1c64e57577a91615a3067096eb3de9796ba1e519bfd938222b92bce7f314c015b3b'
+    '2df08636471a88591fad26bef22868511a7956a24fbbd76838a2acb1b82f191c0bf03b42'
+    '0e1283a92b351c66ecdc90bd75e7f856d0feaade7096dcacf12f22254ebf782b10965f72'
+    '0665a8b8dc1c97b91d19effe9227133700ea14e373698d341dd835a0940b60a960375a2a'
+    '4cbf0eed498bc15396ce9df21debd0c404c8386015e5a78392fcd53851a7ebce2b17cb32'
+    '51cd5149274533e818d60e59bdb136931c97d670cd219bb25a9b83a828bedeab184b3f24'
+    '382cac9f2448fe8f9c282c613b78b3b6e09007771165cd0e7d0c75da6afa5b42638cfa99'
+    '0fe80e1a2d5a04d92858433472a87475168cc85aba736f945b9b123b586ab83b48df594a'
+    'af3580f202891a80baf6584d754d947ccb2d0e350e1d0835291127e533039e5019c47254'
+    '6edb33fb5eef888d6f376a1a6b7ea7fb480165e6defff19224717706bf46b57c7867ed85'
+    '262eba88552a74512d9e82dc6b6997180481d4d435b60a2ce96ea3f92ee61b6ba59f77db'
+    '2c4a042fcfa42daf35f25bc8c0cd17487359e881fd0365cc0eab456e6c69f2b401a245fc'
+    '22d507ce03f0ba1e73b0db653b8424088056c9b53cb6ba828ec7eb2748e89ada1121d219'
+    '0669a9ef84bfa5445d11b9a5f46ae3706268f03a18080601447949e723c62e91465e0f00'
+    '76dd9a7734ac7e6c96703c861201d6b4f1b0f7251523c3ec68cd730270d33c342afb0f77'
+    '7de484d12a49155a467b2c8e7c6931413495865d71dc10b571d74f64c8288a1819d9751d'
+    'b4693dae3173234b11190b70497a43b5a8d298490206efee29e8fdfa2ffe1554f865d4c5'
+    '73ba3c3d883013111e365634cc5bcee339c9e2430d9cecd87cccba28bc92dfcf72b9553b'
+    '153fda3c6bd23f640692697e711c9fa86f4eba105590aa27d17257af0c2cb267e0cc3a7c'
+    '65b1ed4269a2f72704917d83fc54657e0008878d61b2c160373194ac29cfcc3d463ff9a6'
+    '8e1533c225c451f584a574aa3c81f3ac9113ace471dade8b3165bee46084743c9a03bf08'
+    '7d673312f13bfe271e86996f76bd355219c46875974ff3c84ec0b026552da62c6d67d434'
+    '41ccd49b7e70192d2883c09f702e47d60354b6376a37f4af60fb5f1f2366c844a12cbebe'
+    '2e7b31475d5c584b2d23c53f8d66a13d112382316f1620a320edde3686b36cf125abbfd2'
+    '615ffc5a289057f2d92e010a60edcfb17fd5dad71219b480d3fcd45d3d3c3920890464d0'
+    '303e87ac48e9e68d586aa9ead67ff895145a4515ccb62792406e3f0aff9b11c17c30b8dd'
+    '68871396563b220e2e4a9f71251208bbca69a7a81fc73361c3d4d78d0efce92e8320a39c'
+    '330a903d98acdddf03ac76f7fec3623a551abb6857d47d1445e6465470db70d9360d3892'
+    'a2803d0f748a8dd8b4e94aa867e6ff5ed781ca926f49681c4381b88926591cb339af8347'
+    '3a1e399fc82d7e5b71fa27b40573e43f54193beccf35b9f417ad2d22cb9703040b1abd99'
+    'f36494852e25a6d6de438f1e6f67c36f30f06d1c062f3c644def7a8d318258d4e9563bf9'
+    '667eb358b1d1345700ddb9cd5d9878bf1e13cb742c31ad601b8c8cee623e46c256cef1ba'
+    '522bd63e74c7bb92d20db30021b685f8e9c5c20a19a449bce999307c65f9eb133d34adb1'
+    '2608b98625aa3af33bb01976d302e16d6c7fd274aab3e4c06abe8da346e5c878182393de'
+    '2272d5f010b9c0de02107ae654413d8a0f52293d19ce28a7d7f510717bc55078f4c0f599'
+    '1948263176c6e52f4047f7933c7039ea45933c79842cc59d6d1d7d5a1f12f68317fb0e9d'
+    '580c2fbf606431477021f2ec11398337dd99d7c0635cb920eff1315c07a2b2d5ba19f82c'
+    '11f40bc85eec03627c445abb3b920e7659c868cee89add406570221fe401483d36b65426'
+    'f9a0b4783171dc652c478fb53153a73a538626c642e7918e913328eb5a49f7d83a7f5762'
+    '010b0aaab549c22025d61ae6f2bcd69730f8eef64af81e721236ecb0cf45ada0158b1ad3'
+    '2162e47d2aeb42702b40d20d6536832784d667632a0751916820123701e13fe0681804ba'
+    '725a75ce88a3c7155ed22bc2309037185c92c4a1f28d93d66d98a4d06097e0b03a366e67'
+    '3df8e4c87b7a299b0813c226325c79b978250f5a3240ac2ea7f7c0f90e806977c00b9556'
+    '466c51033f9bc6a3426aaba15dab8a3c28343257d8cb7dfd22ff9420a5d51d5333b7ef41'
+    '42f93ffd12ae6bfdef94bba20507990a39d7a19b56e7b51a21c879d90d7a9d7770844af8'
+    '25bee3808a01e6a504495015ab6bf6ad564ce0ca665814147bd93e7ecb1957054f055c46'
+    '516e606d1f24552ebc5edd0a4d9a025f31f502f035fbf80be71712e5512d38ce6c8064b8'
+    '1d9cb6143faa26cd1362b7580abbe6f9390a6527f7c3c8f10f813a58d7aea7cd796ac33b'
+    '7993bf24469f6ccc90221fc04a06c90bd185d4de0a32246bfbe7104e45c25cb32742998f'
+    '28068f17312b211e47719de57c9de4103463e411ce18e26d03ba082c973f6e6915fc8703'
+    '6fe0eab054ce6f312ffabb0b3d7f65f9c605da7e75e76ea4c4af825f18b0a43df9dd2296'
+    '755d7338ff0b27735327ac9383fcd7ca1941122856ac325a6f4db892ad97260d0110dfe7'
+    'bd6bb00d43a91d1b03b3a5f509051641951e283a74dadddc666b41f065ba1c008180acbb'
+    '2fb5de2e7e87b1113f8edfe483a422bf4ec2b57caac06997269cdc7d885332ed3e1bc503'
+    '8f4fb5fa46cf2dae3d3688b01971ca0499576b6b574dad253726533776cfd44d34b2d880'
+    '0389d2dbf1dbad5b663f3fdbb59f9b251953252a8dbd09ad0ea58a280f651deb6ca10872'
+    '591677754ea7c97dd452547b138a5561083aae0e27b7109a9e418df32eee1ff5fe3297c2'
+    '65d0b3a2e57bc1ab5afcb928dd01a807125fcb5c1bf8aed87c45e894dea7bf1f6fbfb0d5'
+    '97c901226476e934153b94c573126cebefccc11d233915d84c42562272d57afa44beb486'
+    '6031defbc3400a5f3f1315d23696797a5183333ea0b9ec1f73652b6084ef003575792ff9'
+    '11c779da221d56912a464e1306a5c3ea94f1e9c011469d7d7ff83d1f3f7e97d9ba560d33'
+    '4f513afc28383ae9115c2adbc2df16910f013614a3fcc3bd5bef6a346c70a5fe4c8e625e'
+    '4a334a2626419139e80ebcf42e5ab10fa36ba6ed2c7eba4cf052fe08005de5f585e597f3'
+    '446d8c6cef1bc732084ad3f129d1017805297e724364538d354e1e7aae7f7dd43bd5c93a'
+    '90820c5b5bd9d02e4b876762539da3e14e714005432c7b1aac9c158405b951e56e88c969'
+    '41a010f3de3125fd07309695c078b3da3b82ab508fb9d811626e26162171186d5b850358'
+    '4d07714d2ef66ba0e22e0ab92c11059c1670e4b43818c7d7a9e4a5c90dbac8619836ac42'
+    '6108f348e74a6f3f47b82a1e29b822471a177d7421f8d6695e0eed634fc0636a4c588a88'
+    '1b660be22f2ce5e0d5f02d766a7a263826fb36bc3fb4f3395004d1a226179d4d0e259e36'
+    '080bdf8ecc4526516c74a38e218d24ae7a78f3cb4be4d2886d06c346d2df1ad543966703'
+    'd2c524303330fb23e47f3c727bd1ede2fcd5917f1a0cad91a17f2ffa781eb4e8eea028b0'
+    '5afbb3acb7eb4a66596c6d2bcc96996a2654d5cc0e8a030420d7c08aaef76fc30d081e4f'
+    '97c1b49d0bbd9bf766da9762636ff195f72563d847309b501d7189cf64f89682014afc74'
+    '5b547b657a1f02fd28f4288323cb82b16194219d6253a52b44b3915a36cfe80f6dccf74d'
+    '10edf5af5abcd5373ed452e468f4c5007768ba9f4c8b6e5b54c5f84506bf7c38654ba0b1'
+    '0525e353430c1d8355dc85a1ee2d3321741f982f8da1e0b746ee8100670ae9f55ef8ff50'
+    'f56de18019d5ed878dc5ee74762719ad9c603eea34518745a8bc83df6adf0857d24a8801'
+    '53c73ae508bf5ba556897ef7e4c4e41627620e0a0a14ff3e1562e3749cc5e1106bd774e8'
+    '6828c0fc32aa20c4447df2f34df096ab813d9db6689060a0737bdd4e683ece9bd0d329bf'
+    '5e915033c39beefd1f80166e96ae435e00643d7f18c4accb460f03f83b67662a10cdb725'
+    '74243cc36518f272732974880c3c91b4131d71da4493fecdecd271903386a56d3136a699'
+    '72beaeef1c60692070bf9f35bb1a7e8d3cdecc79f09e815935797b9519db51307b872d6c'
+    '2bf4aac427278c28081508ad479ea545a2595ba045a472bfadac358c084947ecab66e305'
+    '6ee26f5a8ec6248224bc27c544916ceb1fdc6db6d25904396b60c592f6d57bea7b2c7773'
+    '2b040a786b4be7c05ddbc58e09eebffefa5870ca6ab348aa156396c661906dce0467da07'
+    '3b0700afd9ea8d177504d30b2ced9e062733990eae7efdc45ed918072cfcc50e64f2b3b4'
+    '2b8587d7116e87b0b00feb6e7b67e523506aff8e14c6475d5624f52e18eeb52cceb87a2c'
+    '1c0f23bbd95f46357ee5173a2fde431668f156c0ff2ece1126a61b402c3d049a0b188090'
+    'b1b5588e4c6ff54b17c68ad075b1c70a63275b221e9cb3d9e2d24ad266c8a3f77ce317c0'
+    '52952ed240da324c04a8db8446947f464cc0a145fa46b3b732c7b3c396153cd575cc47f4'
+    '77a78fd352056858acb43d5e1cd22965589b7281245473c67fd4c54c6d6d7513eec862ad'
+    '343377e3e351d9337054be38c792fe6b2946fa19e1ad07074b86eec643933dab1265a533'
+    '9d89be0365abbca85f70f79756e10cca2b3270b63644f53da9c9681f57dba309b894a167'
+    '6b131c623958164548ff219425b84abd7e3d46e6844b247740799d9b05502f730e3387d6'
+    '2e7651c41cdcc985467734d322cc65996ba6a8bc7b9cdb1637cb203d5618840dffb0c032'
+    '57acfc32fb4d4c82284921498e0413cf05e81a5bcba665dd070cdbdcd14372830f612732'
+    '803502d30a4a6d345eaa91f364f8524ef34d785634be9322542338f56e47c751fff0a9cd'
+    '0c82352f485a050445c7b50482bad0a83259b33195a493553736f0780fd445cd425fa96f'
+    'b173c55821182fc32e92ca9063eddc3ff64e98e93cad3383c539b7af62683074e0496b24'
+    '7a88f6c354acb23f7d20439685bd86c85c603b0c4a0dcd6c2b7e9d9f341d428b2814ead9'
+    '2102b22c3ea55f813567b1c163c6c6939f1385ed1d25463e2208a2fa44300c6da9579325'
+    '41fdb34638efad0267b80211fbbfdb0a2ccd616abf102a4b4bc367d06a29ea734b9fa99a'
+    '911db900445549e69a3ce162104441c3f176727f4b1af2abc145117856d3a6c4262f22e4'
+    '1528f5028db0c9ac21d052318ba6c27a232b1c921b1e49412a1e5003a0e3082e6d600ecc'
+    'edb3a0cd3b568f3ac05d82c0339e86b9ee2800cf7f31fdb311cfcd33124d91a248f0fad8'
+    '0a6c50e39079cda847e084e5b258423e086598c5769525741cafec8401cd64693161cc9c'
+    '7090ddc55c5fb190cbf174500ba86da3b36e2a9d6f330c2fbcb7496574faf0d7eccfdde7'
+    '5d6be2023eaa48072d3b2af0fd6e4f44136f94527c5b80dc4e5a81664a44845a77431a75'
+    '4c51af2b621d9ff9cffa4c913e55a173a540c8c87122609095986f125644ed5bce02a918'
+    '601475305b238d580c2554ce9568b2e01e643f089a745de64327887036257421142a0ca5'
+    '66097a3c21d639d68ed22469586b5360d23704176aeb2af08e8e589418fc29b2a589841e'
+    '3e5968f391f5efb77aa021ba376fb1445c5a7f68d17cbcf264d4e38f208198b5677a9508'
+    'd36280ab6531395a2a3fda5a37a5c0c260f2bf3a565d72e3757b04f40bb3042ad0ff875e'
+    '6ec4d9b6e145dc6b2d49b0a0f4fc4a9274b95f8f83e807bb52597defc2457e3365b9d02e'
+    '3ac87f2875de3a863ae857874cb3aa176134b4a7571fbce458b43b47276c519b758e2165'
+    '21e820119a8733350feca156420be2bd7017c1a3dbb90b5079b21242b5e0bac304dbe7b5'
+    '1bef22f5455e11eee2b1aea513c5db8f86c88459142a63b9abd995dd0083c9948b439f00'
+    '56ac6de0b83fc82a3e0bbd7012f7c25703a412030935aaea03fc09735ea8e46572776db0'
+    '6fb1a9c72051b033407600d0589742399edd79446ff73ff01e5f71c237f66f4939514469'
+    '49d4dd7be419bc58134e8c78d62677f06cc2be8d4183a5fe20992310860769b63003333b'
+    '01380425383488eb3efc3b3b185ebb11c5c6a59567988da28f9c03f31bfae42a6e1a3a13'
+    '5243a10c0321730551528b0450f88e6e5649c621c8e408d6'
+), dtype='>u8').astype(np.uint64).reshape(_CLASSIC_SIZE, _CLASSIC_SIZE, 3)
+
+# (num_rows, num_cols) -> code table
+_code_tables = {}
+# (num_rows, num_cols) -> stone codes
+_stone_codes = {}
+
+
+def _generated_codes(rows, cols):
+    """SplitMix64 of (row, col, state), cut down to 63 bits like the
+    book's codes.
+    """
+    keys = (rows.astype(np.uint64)[:, None] << np.uint64(32)) | \
+        (cols.astype(np.uint64)[:, None] << np.uint64(2)) | \
+        np.arange(3, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        x = keys + np.uint64(0x9e3779b97f4a7c15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+        x ^= x >> np.uint64(31)
+    return x & np.uint64(MAX63)
+
+
+def code_table(num_rows, num_cols):
+    """Return the read-only (num_rows * num_cols, 3) uint64 array of
+    zobrist codes for a board size.
+    """
+    dim = (num_rows, num_cols)
+    table = _code_tables.get(dim)
+    if table is None:
+        rows, cols = np.divmod(np.arange(num_rows * num_cols), num_cols)
+        table = _generated_codes(rows + 1, cols + 1)
+        classic_rows = min(num_rows, _CLASSIC_SIZE)
+        classic_cols = min(num_cols, _CLASSIC_SIZE)
+        table.reshape(num_rows, num_cols, 3)[
+            :classic_rows, :classic_cols] = \
+            _CLASSIC_CODES[:classic_rows, :classic_cols]
+        table.setflags(write=False)
+        _code_tables[dim] = table
+    return table
+
+
+def stone_codes(num_rows, num_cols):
+    """Return [None, black codes, white codes]: lists of Python ints with,
+    for every flat point index, the code to xor into a board hash when a
+    stone of that color is placed on or removed from the point.
+    """
+    dim = (num_rows, num_cols)
+    codes = _stone_codes.get(dim)
+    if codes is None:
+        table = code_table(num_rows, num_cols)
+        codes = [None,
+                 (table[:, 0] ^ table[:, 1]).tolist(),
+                 (table[:, 0] ^ table[:, 2]).tolist()]
+        _stone_codes[dim] = codes
+    return codes
+
+
+class _HashCodes():
+    """Looks up the code of a point for a state: HASH_CODE[point, player],
+    with None for empty, gives the same values as the dict HASH_CODE
+    used to be. Only indexing is supported: codes exist for every point
+    of any board size, so there is nothing to iterate over or count.
+    """
+    def __getitem__(self, key):
+        point, player = key
+        state = 0 if player is None else player.value
+        if 1 <= point.row <= _CLASSIC_SIZE and 1 <= point.col <= _CLASSIC_SIZE:
+            return int(_CLASSIC_CODES[point.row - 1, point.col - 1, state])
+        if point.row < 1 or point.col < 1:
+            raise KeyError(key)
+        return int(_generated_codes(np.array([point.row]),
+                                    np.array([point.col]))[0, state])
+
+
+HASH_CODE = _HashCodes()
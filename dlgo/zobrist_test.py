@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from dlgo import goboard_array, goboard_fast, zobrist
+from dlgo.gotypes import Player, Point
+
+
+class ZobristTest(unittest.TestCase):
+    def test_keeps_book_codes(self):
+        table = zobrist.code_table(19, 19)
+        self.assertEqual((361, 3), table.shape)
+        self.assertEqual([4110133747305616117, 6809121397298136095,
+                          1142547570472052062], table[9 * 19 + 3].tolist())
+        self.assertEqual(5927758607513907973, table[360, 0])
+        self.assertEqual(6809121397298136095,
+                         zobrist.HASH_CODE[Point(10, 4), Player.black])
+
+    def test_codes_depend_only_on_point(self):
+        small = zobrist.code_table(9, 13)
+        large = zobrist.code_table(25, 21)
+        for row in range(1, 10):
+            for col in range(1, 14):
+                self.assertEqual(small[(row - 1) * 13 + col - 1].tolist(),
+                                 large[(row - 1) * 21 + col - 1].tolist())
+        for point in (Point(3, 4), Point(25, 1), Point(20, 21)):
+            for state, player in enumerate(
+                    (None, Player.black, Player.white)):
+                self.assertEqual(
+                    large[(point.row - 1) * 21 + point.col - 1, state],
+                    zobrist.HASH_CODE[point, player])
+        self.assertEqual(3 * 25 * 21, len(set(large.ravel().tolist())))
+        self.assertLessEqual(large.max(), zobrist.MAX63)
+
+    def test_board_hash(self):
+        board = goboard_fast.Board(19, 19)
+        board.place_stone(Player.black, Point(10, 4))
+        self.assertEqual(zobrist.EMPTY_BOARD ^ 4110133747305616117 ^
+                         6809121397298136095, board.zobrist_hash())
+
+    def test_large_board(self):
+        random.seed(3)
+        game = goboard_fast.GameState.new_game(25)
+        reference = goboard_array.GameState.new_game(25)
+        for _ in range(100):
+            legal = game.legal_moves()
+            move = random.choice(legal[:-2])
+            game = game.apply_move(move)
+            reference = reference.apply_move(move)
+            self.assertEqual(reference.board.zobrist_hash(),
+                             game.board.zobrist_hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
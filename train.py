@@ -1,15 +1,11 @@
 import argparse
 import importlib
-import multiprocessing
 import os
-import signal
 import sys
-import time
 
 import numpy as np
-import six.moves.queue as queue
 
-from dlgo.corpora import build_index, load_index, store_index
+from dlgo.corpora import ChunkPipeline, build_index, load_index, store_index
 from dlgo.encoders.betago import BetaGoEncoder
 from dlgo.checkpoint import TrainingRun
 
@@ -60,119 +56,43 @@ def init(args):
     TrainingRun.create(args.progress, corpus_index, layer_fn)
 
 
-def _disable_keyboard_interrupt():
-    signal.signal(signal.SIGINT, signal.SIG_IGN)
-
-
-def _prepare_training_data_single_process(worker_idx, chunk, corpus_index, output_q, stop_q):
-    # Make sure ^C gets handled in the main process.
-    _disable_keyboard_interrupt()
-    processor = BetaGoEncoder(board_size=(19, 19))
-
-    chunk = corpus_index.get_chunk(chunk)
-    xs, ys = [], []
-    for board, next_color, next_move in chunk:
-        if not stop_q.empty():
-            print("Got stop signal, aborting.")
-            return
-
-        # TODO: old interface
-        feature, label = processor.feature_and_label(next_color, next_move, board,
-                                                     processor.num_planes)
-        xs.append(feature)
-        ys.append(label)
-    X = np.array(xs)
-    # one-hot encode the moves
-    nb_classes = 19 * 19
-    Y = np.zeros((len(ys), nb_classes))
-    for i, y in enumerate(ys):
-        Y[i][y] = 1
-    output_q.put((worker_idx, X, Y))
-    output_q.close()
-
-
-def prepare_training_data(num_workers, next_chunk, corpus_index, output_q, stop_q):
-    # Make sure ^C gets handled in the main process.
-    _disable_keyboard_interrupt()
-    stopped = False
-
-    while True:
-        if not stop_q.empty():
-            output_q.close()
-            output_q.join_thread()
-            stop_q.close()
-            stop_q.join_thread()
-            return
-        chunks_to_process = []
-        for _ in range(num_workers):
-            chunks_to_process.append(next_chunk)
-            next_chunk = (next_chunk + 1) % corpus_index.num_chunks
-        workers = []
-        inter_q = multiprocessing.Queue()
-        for i, chunk in enumerate(chunks_to_process):
-            workers.append(multiprocessing.Process(
-                target=_prepare_training_data_single_process,
-                args=(i, chunk, corpus_index, inter_q, stop_q)))
-        for worker in workers:
-            worker.start()
-        results = []
-        while len(results) < len(workers):
-            try:
-                results.append(inter_q.get(block=True, timeout=1))
-            except queue.Empty:
-                if not stop_q.empty():
-                    stopped = True
-                    break
-        for worker in workers:
-            worker.join()
-        inter_q.close()
-        inter_q.join_thread()
-        if stopped:
-            output_q.close()
-            return
-        assert len(results) == len(workers)
-        results.sort()
-        for _, X, Y in results:
-            output_q.put((X, Y))
-
-
 def train(args):
     corpus_index = load_index(open(args.index))
     print("Index contains %d chunks in %d physical files" % (
         corpus_index.num_chunks, len(corpus_index.physical_files)))
     if not os.path.exists(args.progress):
         print('%s does not exist. Run train.py init first.' % (args.progress,))
-    else:
-        run = TrainingRun.load(args.progress)
-
-    q = multiprocessing.Queue(maxsize=2 * args.workers)
-    stop_q = multiprocessing.Queue()
-    p = multiprocessing.Process(target=prepare_training_data,
-                                args=(args.workers, run.chunks_completed, corpus_index, q, stop_q))
-    p.start()
-    try:
-        while True:
-            print("Waiting for prepared training chunk...")
-            wait_start_ts = time.time()
-            X, Y = q.get()
-            wait_end_ts = time.time()
-            print("Idle %.1f seconds" % (wait_end_ts - wait_start_ts,))
+        return
+    run = TrainingRun.load(args.progress)
+
+    encoder = BetaGoEncoder(board_size=(19, 19))
+    nb_classes = 19 * 19
+    # Seconds the trainer waited for chunks, the workers waited for
+    # tasks, and the workers spent preparing chunks.
+    trainer_idle = worker_idle = preparing = 0.0
+    print("Starting %d workers..." % (args.workers,))
+    with ChunkPipeline(corpus_index, encoder, args.workers) as pipeline:
+        for chunk_number, X, labels, timing in pipeline.chunks(run.chunks_completed):
+            trainer_idle += timing.trainer_idle
+            worker_idle += timing.worker_idle
+            preparing += timing.prepare
+            print("Chunk %d: prepared by worker %d in %.1f seconds after "
+                  "%.1f seconds idle; trainer idle %.1f seconds" % (
+                      chunk_number, timing.worker, timing.prepare,
+                      timing.worker_idle, timing.trainer_idle))
+            print("Idle so far: trainer %.1f seconds, workers %.1f seconds "
+                  "(%.0f%% of their time)" % (
+                      trainer_idle, worker_idle,
+                      100 * worker_idle / max(worker_idle + preparing, 1e-9)))
+            # one-hot encode the moves
+            Y = np.zeros((len(labels), nb_classes), dtype=np.float32)
+            Y[np.arange(len(labels)), labels] = 1
             print("Training epoch %d chunk %d/%d..." % (
                 run.epochs_completed + 1,
                 run.chunks_completed + 1,
                 run.num_chunks))
             run.model.fit(X, Y, epochs=1)
             run.complete_chunk()
-    finally:
-        # Drain the receive queue.
-        while not q.empty():
-            q.get()
-        q.close()
-        q.join_thread()
-        print("Shutting down workers, please wait...")
-        stop_q.put(1)
-        stop_q.close()
-        p.join()
 
 
 def export(args):